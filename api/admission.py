@@ -0,0 +1,262 @@
+"""Admission control for the CAR-T Intelligence Agent API.
+
+Bounds how many requests of each cost class run at once, so a burst of
+LLM-bound calls cannot pile up invisibly in worker threads and drag
+evidence-only traffic down with it.  Each lane has:
+
+  - ``max_in_flight``   requests allowed to run concurrently
+  - ``max_queue``       requests allowed to wait for a slot; beyond that
+                        new arrivals are rejected at once with 429
+  - ``queue_timeout``   longest a queued request waits before it is
+                        rejected with 503
+
+Both rejections carry a ``Retry-After`` estimated from the lane's recent
+service time and current queue depth.  Lanes are independent, so the
+``search`` lane (/search, /find-related) keeps flat latency however
+saturated the ``llm`` lane (/query, /api/ask) is.  Admitted requests
+also get their lane's own engine retrieval pool (see
+``src.rag_engine.retrieval_lane``), so llm-lane retrievals never queue
+ahead of search-lane ones for worker threads.  In-flight counts,
+queue depth, wait time and rejections are exported through src.metrics
+and the API's /metrics endpoint.
+
+Usage:
+    async with get_admission_controller().admit("llm"):
+        answer = await engine.agenerate(prompt)
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from fastapi import HTTPException
+
+from config.settings import settings
+from src.metrics import (
+    record_admission_rejected,
+    record_admission_state,
+    record_admission_wait,
+)
+from src.rag_engine import retrieval_lane
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the per-lane service-time average
+_LATENCY_SMOOTHING = 0.2
+
+# Bounds on the advertised Retry-After (seconds)
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 60
+
+
+class AdmissionLane:
+    """Concurrency limit plus bounded FIFO wait queue for one request class.
+
+    Runs entirely on the event loop: a released slot is handed directly
+    to the oldest waiter, so queued requests are admitted in arrival
+    order and never raced by newcomers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+    ):
+        """Initialize the lane.
+
+        Args:
+            name: Lane name used in metrics and log lines.
+            max_in_flight: Requests allowed to run concurrently.
+            max_queue: Requests allowed to wait; 0 rejects as soon as
+                every slot is taken.
+            queue_timeout: Seconds a queued request may wait for a slot.
+        """
+        self.name = name
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_time: Optional[float] = None
+
+    @property
+    def queued(self) -> int:
+        """Requests currently waiting for a slot."""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold one slot of this lane for the duration of the block.
+
+        Raises:
+            HTTPException: 429 when the queue is full, 503 when the wait
+                exceeded ``queue_timeout``; both with a Retry-After header.
+        """
+        await self.acquire()
+        start = time.monotonic()
+        try:
+            with retrieval_lane(self.name):
+                yield
+        finally:
+            self._observe(time.monotonic() - start)
+            self.release()
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if all are busy."""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self._admitted(0.0)
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full", 429)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._forfeit(waiter)
+            raise self._reject("queue_timeout", 503)
+        except asyncio.CancelledError:
+            self._forfeit(waiter)  # client went away while queued
+            raise
+        self._admitted(time.monotonic() - start)
+
+    def check(self) -> None:
+        """Reject now, with 429, if acquire() would find the queue full.
+
+        Streaming endpoints acquire their slot inside the response body;
+        calling this first lets an obviously saturated lane fail with a
+        real status code before the response has started.
+        """
+        if self.in_flight >= self.max_in_flight and len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full", 429)
+
+    def release(self) -> None:
+        """Give a slot back, handing it to the oldest live waiter if any."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # slot transfers; in_flight unchanged
+                self._publish()
+                return
+        self.in_flight -= 1
+        self._publish()
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying."""
+        service_time = self._service_time or MIN_RETRY_AFTER
+        backlog = (len(self._waiters) + 1) / self.max_in_flight
+        return int(min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, math.ceil(service_time * backlog))))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limits, occupancy and counters."""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _forfeit(self, waiter: asyncio.Future) -> None:
+        """Leave the queue; pass on a slot that was granted as we gave up."""
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+        if waiter.done() and not waiter.cancelled():
+            self.release()
+        self._publish()
+
+    def _reject(self, reason: str, status_code: int) -> HTTPException:
+        self.rejected[reason] += 1
+        record_admission_rejected(self.name, reason)
+        retry_after = self.retry_after()
+        logger.warning(
+            f"Admission lane '{self.name}' rejected a request ({reason}): "
+            f"{self.in_flight} in flight, {self.queued} queued"
+        )
+        detail = (
+            "Server busy, request queue is full" if reason == "queue_full"
+            else "Server busy, timed out waiting for capacity"
+        )
+        return HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    def _admitted(self, waited: float) -> None:
+        self.admitted += 1
+        record_admission_wait(self.name, waited)
+        self._publish()
+
+    def _observe(self, duration: float) -> None:
+        if self._service_time is None:
+            self._service_time = duration
+        else:
+            self._service_time += _LATENCY_SMOOTHING * (duration - self._service_time)
+
+    def _publish(self) -> None:
+        record_admission_state(self.name, self.in_flight, self.queued)
+
+
+class AdmissionController:
+    """Named admission lanes for the API endpoints."""
+
+    def __init__(self, lanes: Dict[str, AdmissionLane]):
+        self.lanes = lanes
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        """Build the ``search`` and ``llm`` lanes from API_* settings."""
+        return cls({
+            "search": AdmissionLane(
+                "search",
+                settings.API_SEARCH_MAX_IN_FLIGHT,
+                settings.API_SEARCH_MAX_QUEUE,
+                settings.API_SEARCH_QUEUE_TIMEOUT,
+            ),
+            "llm": AdmissionLane(
+                "llm",
+                settings.API_LLM_MAX_IN_FLIGHT,
+                settings.API_LLM_MAX_QUEUE,
+                settings.API_LLM_QUEUE_TIMEOUT,
+            ),
+        })
+
+    def admit(self, lane: str):
+        """Async context manager holding one slot of ``lane``."""
+        return self.lanes[lane].admit()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-lane occupancy and counters."""
+        return {name: lane.snapshot() for name, lane in self.lanes.items()}
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide AdmissionController built from settings."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController.from_settings()
+    return _controller
@@ -4,11 +4,21 @@ Wraps the multi-collection RAG engine as a production-ready REST API with
 CORS, health checks, Prometheus-compatible metrics, and Pydantic request /
 response schemas.
 
+Endpoints never block the event loop: retrieval and LLM generation run on
+the engine's worker pools (CARTRAGEngine.aretrieve / agenerate) and Milvus
+stats calls on Starlette's threadpool, so a slow LLM call does not stall
+/search or /health.  Admission control (api/admission.py) bounds how many
+/search and /query calls run at once, in separate lanes, and rejects
+overflow quickly with 429/503 + Retry-After.
+
 Endpoints:
     GET  /health          -- Service health with collection and vector counts
+    GET  /ready           -- Readiness: every collection loaded and searchable
     GET  /collections     -- Collection names and record counts
     POST /query           -- Full RAG query (retrieve + LLM synthesis)
+    POST /query/stream    -- /query as SSE (or NDJSON): evidence, then tokens
     POST /search          -- Evidence-only retrieval (no LLM, fast)
+    POST /search/batch    -- /search for many questions in one request
     POST /find-related    -- Cross-collection entity linking
     GET  /knowledge/stats -- Knowledge graph statistics
     GET  /metrics         -- Prometheus-compatible metrics (placeholder)
@@ -22,6 +32,7 @@ Author: Adam Jones
 Date: February 2026
 """
 
+import asyncio
 import logging
 import os
 import sys
@@ -31,10 +42,11 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +72,9 @@ from src.knowledge import get_knowledge_stats
 from src.models import AgentQuery, CrossCollectionResult, SearchHit
 from src.rag_engine import CARTRAGEngine
 
+from api.admission import get_admission_controller
+from api.streaming import streaming_response
+
 # Route modules (meta-agent, reports, events)
 from api.routes.meta_agent import router as meta_agent_router
 from api.routes.reports import router as reports_router
@@ -98,6 +113,12 @@ async def lifespan(app: FastAPI):
     )
     _manager.connect()
 
+    # ── Preload collections so searches never pay for load() ──
+    try:
+        _manager.load_all()
+    except Exception as e:
+        logger.error(f"Collection preload failed; searches will load lazily: {e}")
+
     # ── Embedder ──
     try:
         from sentence_transformers import SentenceTransformer
@@ -109,6 +130,9 @@ async def lifespan(app: FastAPI):
             def embed_text(self, text: str) -> List[float]:
                 return self.model.encode(text).tolist()
 
+            def encode(self, texts: List[str]) -> List[List[float]]:
+                return self.model.encode(texts).tolist()
+
         embedder = _Embedder()
     except ImportError:
         embedder = None
@@ -168,6 +192,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # ── Shutdown ──
+    if _engine:
+        _engine.shutdown_pools()
     if _manager:
         _manager.disconnect()
 
@@ -202,7 +228,7 @@ app.add_middleware(
 
 
 # ── Auth middleware (optional, based on API_KEY setting) ──
-_AUTH_SKIP_PATHS = {"/health", "/healthz", "/metrics", "/docs", "/openapi.json"}
+_AUTH_SKIP_PATHS = {"/health", "/healthz", "/ready", "/metrics", "/docs", "/openapi.json"}
 
 
 @app.middleware("http")
@@ -226,7 +252,7 @@ _RATE_LIMIT_WINDOW = 60
 
 @app.middleware("http")
 async def rate_limit(request: Request, call_next):
-    if request.url.path in {"/health", "/healthz", "/metrics", "/docs", "/openapi.json"}:
+    if request.url.path in {"/health", "/healthz", "/ready", "/metrics", "/docs", "/openapi.json"}:
         return await call_next(request)
     client_ip = request.client.host if request.client else "unknown"
     now = time.time()
@@ -273,6 +299,14 @@ class HealthResponse(BaseModel):
     total_vectors: int = Field(..., description="Total vectors across all collections")
 
 
+class ReadinessResponse(BaseModel):
+    """Response schema for GET /ready."""
+    ready: bool
+    collections: Dict[str, bool] = Field(
+        default_factory=dict, description="Load state of each preloaded collection",
+    )
+
+
 class CollectionInfo(BaseModel):
     """Single collection metadata."""
     name: str
@@ -311,6 +345,7 @@ class QueryResponse(BaseModel):
     knowledge_context: str = ""
     collections_searched: int = 0
     search_time_ms: float = 0.0
+    timed_out_collections: List[str] = Field(default_factory=list)
 
 
 class SearchResponse(BaseModel):
@@ -320,6 +355,21 @@ class SearchResponse(BaseModel):
     knowledge_context: str = ""
     collections_searched: int = 0
     search_time_ms: float = 0.0
+    timed_out_collections: List[str] = Field(default_factory=list)
+
+
+class BatchSearchRequest(BaseModel):
+    """Request schema for POST /search/batch."""
+    queries: List[QueryRequest] = Field(
+        ..., min_length=1, max_length=settings.API_SEARCH_BATCH_MAX,
+        description="Questions to search, each with its own filters",
+    )
+
+
+class BatchSearchResponse(BaseModel):
+    """Response schema for POST /search/batch (one result per query, in order)."""
+    results: List[SearchResponse]
+    total_time_ms: float = 0.0
 
 
 class FindRelatedRequest(BaseModel):
@@ -377,7 +427,7 @@ async def health():
         raise HTTPException(status_code=503, detail="Engine not initialized")
 
     try:
-        stats = _manager.get_collection_stats()
+        stats = await run_in_threadpool(_manager.get_collection_stats)
         total_collections = sum(1 for v in stats.values() if v > 0)
         total_vectors = sum(stats.values())
         return HealthResponse(
@@ -391,6 +441,24 @@ async def health():
         raise HTTPException(status_code=503, detail="Service temporarily unavailable")
 
 
+@app.get("/ready", response_model=ReadinessResponse, tags=["status"])
+async def ready(response: Response):
+    """Return whether every collection is loaded and searchable.
+
+    Returns 503 until startup preloading has finished, or while a
+    collection is waiting to be reloaded after a release or failure.
+    """
+    _metrics["requests_total"] += 1
+
+    if not _manager:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+
+    is_ready = _manager.is_ready
+    if not is_ready:
+        response.status_code = 503
+    return ReadinessResponse(ready=is_ready, collections=_manager.readiness())
+
+
 @app.get("/collections", response_model=CollectionsResponse, tags=["status"])
 async def list_collections():
     """Return all collection names and their record counts."""
@@ -400,7 +468,7 @@ async def list_collections():
         raise HTTPException(status_code=503, detail="Engine not initialized")
 
     try:
-        stats = _manager.get_collection_stats()
+        stats = await run_in_threadpool(_manager.get_collection_stats)
         items = [
             CollectionInfo(name=name, record_count=count)
             for name, count in stats.items()
@@ -438,23 +506,18 @@ async def query(request: QueryRequest):
             target_antigen=request.target_antigen,
         )
 
-        # Retrieve evidence
-        evidence: CrossCollectionResult = _engine.retrieve(
-            query=agent_query,
-            collections_filter=request.collections,
-            year_min=request.year_min,
-            year_max=request.year_max,
-        )
+        async with get_admission_controller().admit("llm"):
+            # Retrieve evidence
+            evidence: CrossCollectionResult = await _engine.aretrieve(
+                agent_query,
+                collections_filter=request.collections,
+                year_min=request.year_min,
+                year_max=request.year_max,
+            )
 
-        # Generate LLM response
-        from src.rag_engine import CART_SYSTEM_PROMPT
-        prompt_text = _engine._build_prompt(request.question, evidence)
-        answer = _engine.llm.generate(
-            prompt=prompt_text,
-            system_prompt=CART_SYSTEM_PROMPT,
-            max_tokens=2048,
-            temperature=0.7,
-        )
+            # Generate LLM response
+            prompt_text = _engine._build_prompt(request.question, evidence)
+            answer = await _engine.agenerate(prompt_text)
 
         return QueryResponse(
             question=request.question,
@@ -463,6 +526,7 @@ async def query(request: QueryRequest):
             knowledge_context=evidence.knowledge_context,
             collections_searched=evidence.total_collections_searched,
             search_time_ms=evidence.search_time_ms,
+            timed_out_collections=evidence.timed_out_collections,
         )
 
     except HTTPException:
@@ -473,6 +537,56 @@ async def query(request: QueryRequest):
         raise HTTPException(status_code=500, detail="Internal processing error")
 
 
+@app.post("/query/stream", tags=["rag"])
+async def query_stream(request: QueryRequest, http_request: Request):
+    """Streaming /query: Server-Sent Events, or NDJSON with
+    ``Accept: application/x-ndjson``.
+
+    Sends an ``evidence`` event (SearchResponse fields) as soon as
+    retrieval completes, then one ``token`` event per LLM chunk, then
+    ``done`` with the full answer.  Errors after the stream has started
+    arrive as an ``error`` event.
+    """
+    _metrics["requests_total"] += 1
+    _metrics["query_requests_total"] += 1
+
+    if not _engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+    if not _engine.llm:
+        raise HTTPException(status_code=503, detail="LLM client not available")
+    if not _engine.embedder:
+        raise HTTPException(status_code=503, detail="Embedding model not loaded")
+
+    agent_query = AgentQuery(
+        question=request.question,
+        target_antigen=request.target_antigen,
+    )
+
+    async def events():
+        async for item in _engine.aquery_stream(
+            agent_query,
+            collections_filter=request.collections,
+            year_min=request.year_min,
+            year_max=request.year_max,
+        ):
+            if item["type"] == "evidence":
+                evidence: CrossCollectionResult = item["content"]
+                yield "evidence", SearchResponse(
+                    question=request.question,
+                    evidence=[_hit_to_evidence(h) for h in evidence.hits],
+                    knowledge_context=evidence.knowledge_context,
+                    collections_searched=evidence.total_collections_searched,
+                    search_time_ms=evidence.search_time_ms,
+                    timed_out_collections=evidence.timed_out_collections,
+                ).model_dump()
+            elif item["type"] == "token":
+                yield "token", {"text": item["content"]}
+            else:
+                yield "done", {"answer": item["content"]}
+
+    return streaming_response(http_request, "llm", events())
+
+
 @app.post("/search", response_model=SearchResponse, tags=["rag"])
 async def search(request: QueryRequest):
     """Evidence-only retrieval (no LLM). Useful for fast retrieval when
@@ -492,12 +606,13 @@ async def search(request: QueryRequest):
             target_antigen=request.target_antigen,
         )
 
-        evidence: CrossCollectionResult = _engine.retrieve(
-            query=agent_query,
-            collections_filter=request.collections,
-            year_min=request.year_min,
-            year_max=request.year_max,
-        )
+        async with get_admission_controller().admit("search"):
+            evidence: CrossCollectionResult = await _engine.aretrieve(
+                agent_query,
+                collections_filter=request.collections,
+                year_min=request.year_min,
+                year_max=request.year_max,
+            )
 
         return SearchResponse(
             question=request.question,
@@ -505,6 +620,7 @@ async def search(request: QueryRequest):
             knowledge_context=evidence.knowledge_context,
             collections_searched=evidence.total_collections_searched,
             search_time_ms=evidence.search_time_ms,
+            timed_out_collections=evidence.timed_out_collections,
         )
 
     except HTTPException:
@@ -515,6 +631,74 @@ async def search(request: QueryRequest):
         raise HTTPException(status_code=500, detail="Internal processing error")
 
 
+@app.post("/search/batch", response_model=BatchSearchResponse, tags=["rag"])
+async def search_batch(request: BatchSearchRequest):
+    """Evidence-only retrieval for many questions in one round trip.
+
+    All questions are embedded in a single encode call.  Questions that
+    share collections and year range are searched together, and within
+    each of those the engine issues one multi-vector Milvus search per
+    identical filter expression instead of one search per question.
+    """
+    _metrics["requests_total"] += 1
+    _metrics["search_requests_total"] += len(request.queries)
+
+    if not _engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+    if not _engine.embedder:
+        raise HTTPException(status_code=503, detail="Embedding model not loaded")
+
+    start = time.time()
+    try:
+        agent_queries = [
+            AgentQuery(question=q.question, target_antigen=q.target_antigen)
+            for q in request.queries
+        ]
+
+        # Group questions by the request-level filters retrieve_many() takes
+        groups: Dict[tuple, List[int]] = defaultdict(list)
+        for idx, q in enumerate(request.queries):
+            key = (tuple(q.collections) if q.collections else None, q.year_min, q.year_max)
+            groups[key].append(idx)
+
+        async with get_admission_controller().admit("search"):
+            embeddings = await _engine.aembed_queries([q.question for q in agent_queries])
+            grouped = await asyncio.gather(*(
+                _engine.aretrieve_many(
+                    [agent_queries[i] for i in indices],
+                    embeddings=[embeddings[i] for i in indices],
+                    collections_filter=list(collections) if collections else None,
+                    year_min=year_min,
+                    year_max=year_max,
+                )
+                for (collections, year_min, year_max), indices in groups.items()
+            ))
+
+        results: List[Optional[SearchResponse]] = [None] * len(agent_queries)
+        for indices, evidences in zip(groups.values(), grouped):
+            for idx, evidence in zip(indices, evidences):
+                results[idx] = SearchResponse(
+                    question=agent_queries[idx].question,
+                    evidence=[_hit_to_evidence(h) for h in evidence.hits],
+                    knowledge_context=evidence.knowledge_context,
+                    collections_searched=evidence.total_collections_searched,
+                    search_time_ms=evidence.search_time_ms,
+                    timed_out_collections=evidence.timed_out_collections,
+                )
+
+        return BatchSearchResponse(
+            results=results,
+            total_time_ms=round((time.time() - start) * 1000, 1),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        _metrics["errors_total"] += 1
+        logger.error(f"Batch search failed: {e}")
+        raise HTTPException(status_code=500, detail="Internal processing error")
+
+
 @app.post("/find-related", response_model=FindRelatedResponse, tags=["rag"])
 async def find_related(request: FindRelatedRequest):
     """Find all evidence related to an entity across all 10 collections.
@@ -531,10 +715,11 @@ async def find_related(request: FindRelatedRequest):
         raise HTTPException(status_code=503, detail="Embedding model not loaded")
 
     try:
-        raw_results: Dict[str, List[SearchHit]] = _engine.find_related(
-            entity=request.entity,
-            top_k=request.top_k,
-        )
+        async with get_admission_controller().admit("search"):
+            raw_results: Dict[str, List[SearchHit]] = await _engine.afind_related(
+                entity=request.entity,
+                top_k=request.top_k,
+            )
 
         # Convert to API schema
         api_results: Dict[str, List[EvidenceItem]] = {}
@@ -605,10 +790,29 @@ async def metrics():
         "",
     ]
 
+    # Admission lanes: occupancy and rejections
+    lanes = get_admission_controller().snapshot()
+    lines.append("# HELP cart_api_admission_in_flight Requests running per lane")
+    lines.append("# TYPE cart_api_admission_in_flight gauge")
+    for name, lane in lanes.items():
+        lines.append(f'cart_api_admission_in_flight{{lane="{name}"}} {lane["in_flight"]}')
+    lines.append("# HELP cart_api_admission_queue_depth Requests queued per lane")
+    lines.append("# TYPE cart_api_admission_queue_depth gauge")
+    for name, lane in lanes.items():
+        lines.append(f'cart_api_admission_queue_depth{{lane="{name}"}} {lane["queued"]}')
+    lines.append("# HELP cart_api_admission_rejected_total Requests rejected per lane")
+    lines.append("# TYPE cart_api_admission_rejected_total counter")
+    for name, lane in lanes.items():
+        for reason, count in lane["rejected"].items():
+            lines.append(
+                f'cart_api_admission_rejected_total{{lane="{name}",reason="{reason}"}} {count}'
+            )
+    lines.append("")
+
     # Add collection vector counts if available
     if _manager:
         try:
-            stats = _manager.get_collection_stats()
+            stats = await run_in_threadpool(_manager.get_collection_stats)
             lines.append("# HELP cart_collection_vectors Number of vectors per collection")
             lines.append("# TYPE cart_collection_vectors gauge")
             for name, count in stats.items():
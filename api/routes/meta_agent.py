@@ -2,7 +2,8 @@
 
 Accepts a natural-language question, routes it through the meta-agent
 orchestrator, and returns a synthesised answer with provenance, confidence
-score, and suggested follow-up questions.
+score, and suggested follow-up questions.  POST /api/ask/stream returns
+the same as Server-Sent Events (or NDJSON): sources first, then tokens.
 
 Author: Adam Jones
 Date: February 2026
@@ -14,11 +15,13 @@ import logging
 import time
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
 logger = logging.getLogger(__name__)
 from pydantic import BaseModel, Field
 
+from api.admission import get_admission_controller
+from api.streaming import streaming_response
 from src.metrics import record_query, record_pipeline_stage
 
 router = APIRouter(prefix="/api", tags=["meta-agent"])
@@ -119,18 +122,10 @@ class AskResponse(BaseModel):
     processing_time_ms: float = Field(0.0, description="Server-side latency in ms")
 
 
-# ── Endpoint ─────────────────────────────────────────────────────────
-
-@router.post("/ask", response_model=AskResponse)
-async def ask(request: AskRequest):
-    """Accept a question, route through the meta-agent, and return a
-    synthesised answer with sources and confidence.
-
-    The meta-agent orchestrates retrieval across all CAR-T collections,
-    augments with the knowledge graph, and synthesises via LLM.
-    """
-    t0 = time.perf_counter()
+# ── Helpers ──────────────────────────────────────────────────────────
 
+def _get_engine():
+    """Return the app's RAG engine, or raise 503 if it cannot answer."""
     # Import engine state from main app module (populated during lifespan)
     try:
         from api.main import _engine
@@ -145,44 +140,59 @@ async def ask(request: AskRequest):
             status_code=503,
             detail="Embedding model or LLM client not available",
         )
+    return _engine
+
+
+def _source_refs(evidence) -> List[SourceRef]:
+    """Build source references from retrieved evidence."""
+    return [
+        SourceRef(
+            collection=h.collection,
+            doc_id=h.id,
+            title=h.text[:120] if h.text else "",
+            score=h.score,
+        )
+        for h in evidence.hits
+    ]
+
+
+def _confidence(sources: List[SourceRef]) -> float:
+    """Derive confidence from mean evidence score."""
+    if not sources:
+        return 0.0
+    return round(min(1.0, sum(s.score for s in sources) / len(sources)), 3)
+
+
+# ── Endpoint ─────────────────────────────────────────────────────────
+
+@router.post("/ask", response_model=AskResponse)
+async def ask(request: AskRequest):
+    """Accept a question, route through the meta-agent, and return a
+    synthesised answer with sources and confidence.
+
+    The meta-agent orchestrates retrieval across all CAR-T collections,
+    augments with the knowledge graph, and synthesises via LLM.
+    """
+    t0 = time.perf_counter()
+    engine = _get_engine()
 
     try:
         from src.models import AgentQuery
-        from src.rag_engine import CART_SYSTEM_PROMPT
 
         agent_query = AgentQuery(
             question=request.question,
             target_antigen=request.target_gene,
         )
 
-        # Retrieve evidence across collections
-        evidence = _engine.retrieve(query=agent_query)
-
-        # Generate LLM synthesis
-        prompt_text = _engine._build_prompt(request.question, evidence)
-        answer = _engine.llm.generate(
-            prompt=prompt_text,
-            system_prompt=CART_SYSTEM_PROMPT,
-            max_tokens=2048,
-            temperature=0.7,
-        )
+        async with get_admission_controller().admit("llm"):
+            # Retrieve evidence across collections (off the event loop)
+            evidence = await engine.aretrieve(agent_query)
 
-        # Build source references
-        sources = [
-            SourceRef(
-                collection=h.collection,
-                doc_id=h.id,
-                title=h.text[:120] if h.text else "",
-                score=h.score,
-            )
-            for h in evidence.hits
-        ]
-
-        # Derive confidence from mean evidence score
-        confidence = 0.0
-        if sources:
-            confidence = min(1.0, sum(s.score for s in sources) / len(sources))
+            # Generate LLM synthesis on the engine's generation pool
+            prompt_text = engine._build_prompt(request.question, evidence)
+            answer = await engine.agenerate(prompt_text)
 
+        sources = _source_refs(evidence)
         elapsed_ms = (time.perf_counter() - t0) * 1000
 
         # Record metrics
@@ -192,7 +202,7 @@ async def ask(request: AskRequest):
         return AskResponse(
             answer=answer,
             sources=sources,
-            confidence=round(confidence, 3),
+            confidence=_confidence(sources),
             follow_up_questions=[],
             processing_time_ms=round(elapsed_ms, 1),
         )
@@ -202,3 +212,46 @@ async def ask(request: AskRequest):
     except Exception as exc:
         logger.error(f"Meta-agent query failed: {exc}")
         raise HTTPException(status_code=500, detail="Internal processing error")
+
+
+@router.post("/ask/stream")
+async def ask_stream(request: AskRequest, http_request: Request):
+    """Streaming /api/ask: Server-Sent Events, or NDJSON with
+    ``Accept: application/x-ndjson``.
+
+    Sends ``sources`` (with confidence) as soon as retrieval completes,
+    then one ``token`` event per LLM chunk, then ``done`` with the full
+    answer and processing time.
+    """
+    t0 = time.perf_counter()
+    engine = _get_engine()
+
+    from src.models import AgentQuery
+
+    agent_query = AgentQuery(
+        question=request.question,
+        target_antigen=request.target_gene,
+    )
+
+    async def events():
+        sources: List[SourceRef] = []
+        async for item in engine.aquery_stream(agent_query):
+            if item["type"] == "evidence":
+                sources = _source_refs(item["content"])
+                yield "sources", {
+                    "sources": [s.model_dump() for s in sources],
+                    "confidence": _confidence(sources),
+                }
+            elif item["type"] == "token":
+                yield "token", {"text": item["content"]}
+            else:
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                record_query("meta_agent", elapsed_ms / 1000, len(sources))
+                record_pipeline_stage("meta_agent_ask", elapsed_ms / 1000)
+                yield "done", {
+                    "answer": item["content"],
+                    "follow_up_questions": [],
+                    "processing_time_ms": round(elapsed_ms, 1),
+                }
+
+    return streaming_response(http_request, "llm", events())
@@ -0,0 +1,104 @@
+"""Streaming responses for the CAR-T Intelligence Agent API.
+
+Encodes an endpoint's ``(event, data)`` stream as Server-Sent Events
+(``text/event-stream``, the default) or newline-delimited JSON
+(``application/x-ndjson``, chosen with the Accept header):
+
+    event: evidence                    {"type": "evidence", ...}
+    data: {...}                        {"type": "token", "text": "..."}
+                                       {"type": "done", ...}
+    event: token
+    data: {"text": "..."}
+
+The evidence event is sent as soon as retrieval completes, so clients
+can render sources long before the answer is finished.  The admission
+slot is held for the whole stream.  Failures after the response has
+started arrive as a final ``error`` event carrying the status code
+(and ``retry_after`` for admission rejections).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from api.admission import get_admission_controller
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Keep proxies (nginx) from buffering the stream
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+StreamEvent = Tuple[str, Dict[str, Any]]
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True when the client asked for NDJSON rather than SSE."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def encode_event(event: str, data: Dict[str, Any], ndjson: bool = False) -> str:
+    """Encode one event as an SSE frame or an NDJSON line."""
+    if ndjson:
+        return json.dumps({"type": event, **data}) + "\n"
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def admitted_stream(
+    lane: str,
+    events: AsyncIterator[StreamEvent],
+    ndjson: bool = False,
+) -> AsyncIterator[str]:
+    """Hold an admission slot of ``lane`` while encoding ``events``.
+
+    Args:
+        lane: Admission lane name (e.g. "llm").
+        events: Async iterator of ``(event, data)`` pairs.
+        ndjson: Encode as NDJSON instead of SSE.
+
+    Yields:
+        Encoded frames; an ``error`` frame ends the stream on failure.
+    """
+    try:
+        async with get_admission_controller().admit(lane):
+            async for event, data in events:
+                yield encode_event(event, data, ndjson)
+    except HTTPException as exc:
+        error = {"status": exc.status_code, "detail": exc.detail}
+        if exc.headers and "Retry-After" in exc.headers:
+            error["retry_after"] = int(exc.headers["Retry-After"])
+        yield encode_event("error", error, ndjson)
+    except Exception as exc:
+        logger.error(f"Streaming response failed: {exc}")
+        yield encode_event(
+            "error", {"status": 500, "detail": "Internal processing error"}, ndjson,
+        )
+
+
+def streaming_response(
+    request: Request,
+    lane: str,
+    events: AsyncIterator[StreamEvent],
+) -> StreamingResponse:
+    """Build the SSE/NDJSON response for an endpoint's event stream.
+
+    Raises:
+        HTTPException: 429 with Retry-After if ``lane`` is already saturated.
+    """
+    get_admission_controller().lanes[lane].check()
+    ndjson = wants_ndjson(request)
+    return StreamingResponse(
+        admitted_stream(lane, events, ndjson),
+        media_type=NDJSON_MEDIA_TYPE if ndjson else SSE_MEDIA_TYPE,
+        headers=STREAM_HEADERS,
+    )
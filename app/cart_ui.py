@@ -83,6 +83,7 @@ def init_engine():
 
         manager = CARTCollectionManager()
         manager.connect()
+        manager.load_all()  # Preload once so searches skip collection.load()
 
         try:
             from sentence_transformers import SentenceTransformer
@@ -689,9 +690,11 @@ with tab_chat:
 
                             if quality == "insufficient" and plan.sub_questions:
                                 status.update(label="Deep Research: expanding with sub-questions...")
-                                for sub_q in plan.sub_questions[:2]:
-                                    sub_query = AgentQuery(question=sub_q, include_genomic=False)
-                                    sub_evidence = engine.retrieve(sub_query)
+                                sub_queries = [
+                                    AgentQuery(question=sub_q, include_genomic=False)
+                                    for sub_q in plan.sub_questions[:2]
+                                ]
+                                for sub_evidence in engine.retrieve_many(sub_queries):
                                     evidence.hits.extend(sub_evidence.hits)
                                 st.write(f"**Augmented to:** {evidence.hit_count} hits")
 
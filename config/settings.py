@@ -5,7 +5,7 @@ Follows the same Pydantic BaseSettings pattern as rag-chat-pipeline/config/setti
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -28,6 +28,26 @@ class CARTSettings(BaseSettings):
     MILVUS_HOST: str = "localhost"
     MILVUS_PORT: int = 19530
 
+    # Shared cross-collection search pool and per-collection deadline.  The
+    # deadline runs from when a search leaves the pool queue, so a busy pool
+    # adds latency instead of timeouts; size the pool for API_RETRIEVE_WORKERS
+    # concurrent fan-outs x 11 collections to keep queueing rare
+    MILVUS_SEARCH_WORKERS: int = 32
+    MILVUS_SEARCH_TIMEOUT_SECONDS: float = 2.0  # 0 = wait for every collection
+
+    # Size-aware index selection (src/index_policy.py)
+    INDEX_RECALL_TARGET: float = 0.95
+    INDEX_FLAT_MAX_ROWS: int = 20000       # FLAT (exact) at or below this size
+    INDEX_LARGE_MIN_ROWS: int = 2000000    # IVF_SQ8 / high-M HNSW above this size
+
+    # Partition-key layout by target_antigen for newly created collections
+    # (existing collections must be recreated to adopt it)
+    PARTITION_KEY_BY_ANTIGEN: bool = False
+    PARTITION_KEY_NUM_PARTITIONS: int = 64
+
+    # Per-collection nprobe/ef written by scripts/tune_search_params.py
+    SEARCH_PARAMS_FILE: Path = CACHE_DIR / "search_params.json"
+
     # Collection names
     COLLECTION_LITERATURE: str = "cart_literature"
     COLLECTION_TRIALS: str = "cart_trials"
@@ -46,6 +66,15 @@ class CARTSettings(BaseSettings):
     EMBEDDING_DIMENSION: int = 384
     EMBEDDING_BATCH_SIZE: int = 32
 
+    # Query-embedding cache (src/embedding_cache.py)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_SIZE: int = 2048
+    EMBEDDING_CACHE_TTL_SECONDS: int = 86400  # 0 = never expire
+    EMBEDDING_CACHE_DISK: bool = False  # Persist under CACHE_DIR/query_embeddings
+
+    # Precomputed query-expansion term vectors (scripts/build_expansion_embeddings.py)
+    EXPANSION_EMBEDDINGS_DIR: Path = CACHE_DIR / "expansion_embeddings"
+
     # ── LLM ──
     LLM_PROVIDER: str = "anthropic"
     LLM_MODEL: str = "claude-sonnet-4-6"
@@ -55,6 +84,20 @@ class CARTSettings(BaseSettings):
     TOP_K_PER_COLLECTION: int = 5
     SCORE_THRESHOLD: float = 0.4
 
+    # Collection routing when no explicit collection filter is given:
+    #   "all"   — search every collection (stage plans only re-weight)
+    #   "stage" — stage-boosted plans search only their boosted collections
+    #             plus literature and trials
+    COLLECTION_ROUTING_POLICY: str = "all"
+
+    # Coalesce concurrent identical retrievals (same normalized question,
+    # filters, year range and stages) into one search (src/single_flight.py)
+    RETRIEVE_SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Search with id/score/short scalars only, then hydrate the ranked hits
+    # with one batched query per collection
+    SEARCH_PROJECTION_ENABLED: bool = True
+
     # Collection search weights (must sum to ~1.0)
     WEIGHT_LITERATURE: float = 0.20
     WEIGHT_TRIALS: float = 0.16
@@ -80,6 +123,30 @@ class CARTSettings(BaseSettings):
     API_PORT: int = 8522
     API_KEY: str = ""
 
+    # Request-path worker pools (CARTRAGEngine.aretrieve / agenerate):
+    # async endpoints run blocking Milvus and LLM calls here instead of on
+    # the event loop; generation has its own pool so slow LLM calls never
+    # queue ahead of evidence-only searches.  Each admission lane gets its
+    # own API_RETRIEVE_WORKERS retrieval pool; keep it >= the lane's
+    # MAX_IN_FLIGHT so admitted requests never wait for a thread
+    API_RETRIEVE_WORKERS: int = 16
+    API_GENERATE_WORKERS: int = 8
+
+    # Admission control (api/admission.py): per-lane concurrent requests,
+    # queued waiters (a full queue is rejected at once with 429) and max
+    # queue wait in seconds (then 503).  "search" = /search, /find-related;
+    # "llm" = /query, /api/ask
+    API_SEARCH_MAX_IN_FLIGHT: int = 16
+    API_SEARCH_MAX_QUEUE: int = 64
+    API_SEARCH_QUEUE_TIMEOUT: float = 2.0
+    API_LLM_MAX_IN_FLIGHT: int = 8
+    API_LLM_MAX_QUEUE: int = 16
+    API_LLM_QUEUE_TIMEOUT: float = 10.0
+
+    # Max questions per POST /search/batch request (one embedding pass,
+    # one multi-vector search per filter group)
+    API_SEARCH_BATCH_MAX: int = 100
+
     # ── Streamlit ──
     STREAMLIT_PORT: int = 8521
 
@@ -90,6 +157,60 @@ class CARTSettings(BaseSettings):
     INGEST_SCHEDULE_HOURS: int = 168  # Weekly (7 * 24)
     INGEST_ENABLED: bool = False
 
+    # Bulk ingest (CARTCollectionManager.bulk_ingest): flush a collection
+    # once this many rows are pending or this many seconds have passed
+    # (0 disables either trigger), then compact when the session closes
+    INGEST_FLUSH_ROWS: int = 5000
+    INGEST_FLUSH_SECONDS: float = 60.0
+    INGEST_COMPACT_AFTER_BULK: bool = True
+
+    # Persistent ingest embedding store (src/embedding_store.py): vectors
+    # keyed by content hash so re-ingest and rebuilds skip the model
+    INGEST_EMBEDDING_STORE_ENABLED: bool = True
+    INGEST_EMBEDDING_STORE_DIR: Path = CACHE_DIR / "ingest_embeddings"
+
+    # Pipelined ingest (BaseIngestPipeline.run_pipelined): workers per stage
+    # and the capacity of each bounded inter-stage queue (in batches)
+    INGEST_PARSE_WORKERS: int = 2
+    INGEST_EMBED_WORKERS: int = 1
+    INGEST_INSERT_WORKERS: int = 2
+    INGEST_QUEUE_SIZE: int = 4
+
+    # Delta refresh watermarks (src/ingest/watermarks.py): last complete
+    # ingest per source; delta queries start this many hours earlier
+    INGEST_WATERMARK_FILE: Path = CACHE_DIR / "ingest_watermarks.json"
+    INGEST_WATERMARK_OVERLAP_HOURS: float = 24.0
+
+    # Shared ingest HTTP client (src/utils/http_client.py): retries with
+    # exponential backoff, per-host request rates (req/sec), and an
+    # on-disk ETag/Last-Modified response cache
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_BACKOFF_BASE: float = 1.0
+    HTTP_BACKOFF_MAX: float = 30.0
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_HOST_RATE_LIMITS: Dict[str, float] = {
+        "api.fda.gov": 4.0,  # openFDA: 240 req/min
+        "dailymed.nlm.nih.gov": 2.0,
+        "rest.uniprot.org": 2.0,
+        "www.cibmtr.org": 1.0,
+    }
+    HTTP_DEFAULT_RATE_LIMIT: float = 2.0
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_DIR: Path = CACHE_DIR / "http"
+
+    # FAERS (openFDA) concurrent page requests; pacing comes from the
+    # api.fda.gov entry in HTTP_HOST_RATE_LIMITS
+    FAERS_FETCH_WORKERS: int = 4
+
+    # UniProt: read rest.uniprot.org/uniprotkb/stream with a fields=
+    # projection (False falls back to paged /search with full entries)
+    UNIPROT_USE_STREAM: bool = True
+
+    # Record/replay for offline parser benchmarks: "live", "record"
+    # (capture every response) or "replay" (serve captures, no network)
+    HTTP_MODE: str = "live"
+    HTTP_CASSETTE_DIR: Path = DATA_DIR / "http_cassettes"
+
     # ── Conversation Memory ──
     MAX_CONVERSATION_CONTEXT: int = 3  # Number of prior exchanges to inject
 
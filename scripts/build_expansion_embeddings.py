@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Precompute embeddings for every query-expansion term.
+
+Embeds the full vocabulary of ALL_EXPANSION_MAPS once with BGE-small-en-v1.5
+and writes a memory-mappable float32 matrix plus term index, so the RAG
+engine's expansion path does no model inference at query time.
+
+Re-run after editing src/query_expansion.py.
+
+Usage:
+    python3 scripts/build_expansion_embeddings.py [--output-dir DIR]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sentence_transformers import SentenceTransformer
+from config.settings import settings
+from src.expansion_embeddings import build_expansion_table, collect_expansion_terms
+
+
+class SimpleEmbedder:
+    def __init__(self):
+        self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
+    def encode(self, texts):
+        return self.model.encode(texts).tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the expansion-term embedding table")
+    parser.add_argument("--output-dir", type=Path, default=settings.EXPANSION_EMBEDDINGS_DIR,
+                        help="Directory for vectors.npy and index.json")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CAR-T Expansion Embedding Builder")
+    print("=" * 60)
+
+    print(f"\n[1/2] Loading {settings.EMBEDDING_MODEL} embedder...")
+    embedder = SimpleEmbedder()
+
+    print(f"\n[2/2] Embedding {len(collect_expansion_terms())} expansion terms...")
+    count = build_expansion_table(embedder, args.output_dir)
+
+    print(f"\n{'=' * 60}")
+    print(f"DONE: Wrote {count} term embeddings to {args.output_dir}")
+    print(f"{'=' * 60}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
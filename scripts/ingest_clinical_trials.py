@@ -160,7 +160,10 @@ def main():
     count = pipeline.embed_and_store(records, "cart_trials", batch_size=args.batch_size)
 
     elapsed = time.time() - start_time
-    logger.info(f"Ingest complete: {count} records stored in {elapsed:.1f}s")
+    logger.info(
+        f"Ingest complete: {count} records stored in {elapsed:.1f}s "
+        f"({pipeline.last_stats})"
+    )
 
     # Show final stats
     stats = manager.get_collection_stats()
@@ -77,18 +77,18 @@ def main():
 
     client = PubMedClient()
 
-    # --- Step 2: Search for PMIDs ---
+    # --- Step 2: Search (result set stays on the NCBI history server) ---
     logger.info(f"Searching PubMed for up to {args.max_results} articles...")
-    pmids = client.search(args.query, max_results=args.max_results)
-    logger.info(f"Found {len(pmids)} PMIDs")
+    history = client.search_history(args.query, max_results=args.max_results)
 
-    if not pmids:
+    if history is None or not history.count:
         logger.warning("No PMIDs found. Exiting.")
         return
+    logger.info(f"Found {history.count} PMIDs")
 
-    # --- Step 3: Fetch abstracts ---
-    logger.info(f"Fetching abstracts for {len(pmids)} PMIDs...")
-    articles = client.fetch_abstracts(pmids)
+    # --- Step 3: Fetch abstracts (concurrent efetch pages via WebEnv) ---
+    logger.info(f"Fetching abstracts for {history.count} PMIDs...")
+    articles = list(client.iter_history(history))
     logger.info(f"Fetched {len(articles)} article records")
 
     if not articles:
@@ -163,7 +163,10 @@ def main():
     count = pipeline.embed_and_store(records, "cart_literature", batch_size=args.batch_size)
 
     elapsed = time.time() - start_time
-    logger.info(f"Ingest complete: {count} records stored in {elapsed:.1f}s")
+    logger.info(
+        f"Ingest complete: {count} records stored in {elapsed:.1f}s "
+        f"({pipeline.last_stats})"
+    )
 
     # Show final stats
     stats = manager.get_collection_stats()
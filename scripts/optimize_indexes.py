@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Report and apply size-aware index plans for all CAR-T collections.
+
+Chooses FLAT / IVF_FLAT / IVF_SQ8 / HNSW per collection from its row count
+and the recall target (see src/index_policy.py), prints the plan, and
+rebuilds every collection whose planned index type differs from its
+current one.
+
+Usage:
+    python3 scripts/optimize_indexes.py [--dry-run] [--force]
+        [--recall-target 0.95] [--include-read-only] [--json]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import settings
+from src.collections import CARTCollectionManager
+from src.index_policy import IndexPolicy, format_plan_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan and rebuild CAR-T collection indexes")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only report the plan; do not rebuild")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild even when the index type is unchanged")
+    parser.add_argument("--recall-target", type=float, default=settings.INDEX_RECALL_TARGET,
+                        help="Desired recall@k (default from settings)")
+    parser.add_argument("--include-read-only", action="store_true",
+                        help="Also rebuild read-only collections (genomic_evidence)")
+    parser.add_argument("--json", action="store_true",
+                        help="Print the plan as JSON")
+    parser.add_argument("--host", default=None, help="Milvus host")
+    parser.add_argument("--port", type=int, default=None, help="Milvus port")
+    args = parser.parse_args()
+
+    policy = IndexPolicy(
+        recall_target=args.recall_target,
+        flat_max_rows=settings.INDEX_FLAT_MAX_ROWS,
+        large_min_rows=settings.INDEX_LARGE_MIN_ROWS,
+    )
+    manager = CARTCollectionManager(host=args.host, port=args.port, index_policy=policy)
+    manager.connect()
+
+    try:
+        plans = manager.plan_indexes()
+        if args.json:
+            print(json.dumps({name: p.to_dict() for name, p in plans.items()}, indent=2))
+        else:
+            print("=" * 60)
+            print(f"CAR-T Index Plan (recall target {args.recall_target:.2f})")
+            print("=" * 60)
+            print(format_plan_table(plans))
+
+        if args.dry_run:
+            return 0
+
+        rebuilt = manager.rebuild_indexes(
+            force=args.force, include_read_only=args.include_read_only,
+        )
+        if not args.json:
+            print(f"\n{'=' * 60}")
+            print(f"DONE: Rebuilt {len(rebuilt)} index(es)"
+                  + (f": {', '.join(rebuilt)}" if rebuilt else ""))
+            print(f"{'=' * 60}")
+        return 0
+    finally:
+        manager.disconnect()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,9 @@
 """Seed the cart_literature collection with curated patent data.
 
 Loads patent records from data/reference/patent_seed_data.json, creates
-CARTLiterature models with source_type=patent, embeds the text chunks,
-and inserts into the cart_literature Milvus collection.
+CARTLiterature models with source_type=patent, and embeds and stores them
+in the cart_literature Milvus collection through the standard ingest path
+(unchanged patents are skipped; stored embeddings are reused).
 
 Usage:
     python3 scripts/seed_patents.py
@@ -18,6 +19,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from sentence_transformers import SentenceTransformer
 from src.collections import CARTCollectionManager
+from src.ingest.literature_parser import PubMedIngestPipeline
 from src.models import CARTLiterature, CARTStage, SourceType
 
 
@@ -77,27 +79,9 @@ def main():
     embedder = SimpleEmbedder()
 
     print("\n[3/3] Embedding and inserting patent records...")
-    total_inserted = 0
-    batch_size = 32
-
-    for i in range(0, len(records), batch_size):
-        batch = records[i : i + batch_size]
-        texts = [r.to_embedding_text() for r in batch]
-        embeddings = embedder.encode(texts)
-
-        batch_dicts = []
-        for record, embedding in zip(batch, embeddings):
-            d = record.model_dump()
-            d["embedding"] = embedding
-            # Convert enums to string values
-            for key, value in d.items():
-                if hasattr(value, "value"):
-                    d[key] = value.value
-            batch_dicts.append(d)
-
-        manager.insert_batch("cart_literature", batch_dicts)
-        total_inserted += len(batch_dicts)
-        print(f"  Inserted batch {i // batch_size + 1} ({total_inserted}/{len(records)})")
+    pipeline = PubMedIngestPipeline(collection_manager=manager, embedder=embedder)
+    total_inserted = pipeline.embed_and_store(records, "cart_literature", batch_size=32)
+    print(f"  {pipeline.last_stats}")
 
     stats = manager.get_collection_stats()
     final = stats.get("cart_literature", 0)
@@ -3,10 +3,12 @@
 
 Usage:
     python scripts/setup_collections.py [--drop-existing] [--seed-constructs]
+                                        [--partition-by-antigen]
 
 Options:
-    --drop-existing    Drop and recreate all collections
-    --seed-constructs  Seed cart_constructs with 6 FDA-approved products
+    --drop-existing         Drop and recreate all collections
+    --seed-constructs       Seed cart_constructs with 6 FDA-approved products
+    --partition-by-antigen  Use target_antigen as partition key for new collections
 """
 
 import argparse
@@ -28,18 +30,28 @@ def main():
                        help="Drop and recreate all collections")
     parser.add_argument("--seed-constructs", action="store_true",
                        help="Seed cart_constructs with FDA-approved products")
+    parser.add_argument("--partition-by-antigen", action="store_true", default=None,
+                       help="Use target_antigen as partition key for new collections")
     parser.add_argument("--host", default=None, help="Milvus host")
     parser.add_argument("--port", type=int, default=None, help="Milvus port")
     args = parser.parse_args()
 
     # Connect to Milvus
-    manager = CARTCollectionManager(host=args.host, port=args.port)
+    manager = CARTCollectionManager(
+        host=args.host, port=args.port,
+        partition_key_by_antigen=args.partition_by_antigen,
+    )
     manager.connect()
 
     # Create all collections
     logger.info("Creating all CAR-T collections...")
     manager.create_all_collections(drop_existing=args.drop_existing)
 
+    # Backfill scalar filter indexes on collections created before they existed
+    created = manager.ensure_scalar_indexes()
+    for name, fields in created.items():
+        logger.info(f"  {name}: indexed {', '.join(fields)}")
+
     # Show stats
     stats = manager.get_collection_stats()
     logger.info("Collection stats:")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Tune per-collection nprobe / ef against brute-force ground truth.
+
+Samples stored embeddings from each collection, computes their exact
+top-k with NumPy, sweeps nprobe (IVF) or ef (HNSW), and writes the
+cheapest setting that meets the recall target to SEARCH_PARAMS_FILE.
+CARTCollectionManager picks the file up on start (or via
+reload_tuned_params()) while the tuned index is unchanged.
+
+Usage:
+    python3 scripts/tune_search_params.py [--k 10] [--recall-target 0.95]
+        [--sample-size 100] [--collections cart_literature cart_trials]
+        [--output PATH] [--dry-run]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import settings
+from src.collections import CARTCollectionManager
+from src.search_tuning import format_tuning_table, save_tuned_params, tune_collection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune CAR-T Milvus search params")
+    parser.add_argument("--k", type=int, default=settings.TOP_K_PER_COLLECTION,
+                        help="Neighbours per query for recall@k")
+    parser.add_argument("--recall-target", type=float, default=settings.INDEX_RECALL_TARGET,
+                        help="Recall@k the chosen setting must reach")
+    parser.add_argument("--sample-size", type=int, default=100,
+                        help="Stored vectors sampled as queries per collection")
+    parser.add_argument("--collections", nargs="*", default=None,
+                        help="Collections to tune (default: all existing)")
+    parser.add_argument("--output", type=Path, default=settings.SEARCH_PARAMS_FILE,
+                        help="Tuned-params JSON file")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report results without writing the file")
+    parser.add_argument("--host", default=None, help="Milvus host")
+    parser.add_argument("--port", type=int, default=None, help="Milvus port")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"CAR-T Search Param Tuner (recall@{args.k} >= {args.recall_target:.2f})")
+    print("=" * 60)
+
+    manager = CARTCollectionManager(host=args.host, port=args.port)
+    manager.connect()
+
+    results = []
+    try:
+        plans = manager.plan_indexes(args.collections)
+        for i, name in enumerate(plans, 1):
+            collection = manager.ensure_loaded(name)
+            index = manager.describe_index(collection)
+            if index is None:
+                print(f"\n[{i}/{len(plans)}] {name}: no embedding index, skipped")
+                continue
+            print(f"\n[{i}/{len(plans)}] {name} ({index.get('index_type')}, "
+                  f"{plans[name].row_count:,} rows)...")
+            result = tune_collection(
+                name, collection, index,
+                k=args.k, recall_target=args.recall_target, sample_size=args.sample_size,
+            )
+            if result is not None:
+                results.append(result)
+    finally:
+        manager.disconnect()
+
+    print(f"\n{format_tuning_table(results)}")
+
+    if not args.dry_run and results:
+        save_tuned_params(results, args.output)
+        print(f"\n{'=' * 60}")
+        print(f"DONE: Wrote tuned params for {len(results)} collection(s) to {args.output}")
+        print(f"{'=' * 60}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -97,9 +97,11 @@ class CARTIntelligenceAgent:
 
         # Phase 4: If evidence is thin, try sub-questions
         if quality == "insufficient" and plan.sub_questions:
-            for sub_q in plan.sub_questions[:2]:
-                sub_query = AgentQuery(question=sub_q, include_genomic=False)
-                sub_evidence = self.rag.retrieve(sub_query)
+            sub_queries = [
+                AgentQuery(question=sub_q, include_genomic=False)
+                for sub_q in plan.sub_questions[:2]
+            ]
+            for sub_evidence in self.rag.retrieve_many(sub_queries):
                 evidence.hits.extend(sub_evidence.hits)
 
         # Phase 5: Generate answer (reuse already-retrieved evidence)
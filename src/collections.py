@@ -19,9 +19,14 @@ Author: Adam Jones
 Date: February 2026
 """
 
+import json
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
 
 from loguru import logger
 from pymilvus import (
@@ -32,7 +37,11 @@ from pymilvus import (
     connections,
     utility,
 )
+from pymilvus.client.types import SegmentState
 
+from config.settings import settings
+from src.index_policy import IndexPlan, IndexPolicy
+from src.metrics import record_milvus_search, record_milvus_search_timeout
 from src.models import (
     AssayResult,
     BiomarkerRecord,
@@ -45,6 +54,7 @@ from src.models import (
     SafetyRecord,
     SequenceRecord,
 )
+from src.search_tuning import load_tuned_params, tuned_entry_matches
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -53,6 +63,19 @@ from src.models import (
 
 EMBEDDING_DIM = 384  # BGE-small-en-v1.5
 
+# SHA-256 of each record's to_embedding_text(); lets re-ingest skip
+# unchanged records and upsert changed ones (see BaseIngestPipeline)
+CONTENT_HASH_FIELD = "content_hash"
+
+
+def _content_hash_field() -> FieldSchema:
+    return FieldSchema(
+        name=CONTENT_HASH_FIELD,
+        dtype=DataType.VARCHAR,
+        max_length=64,
+        description="SHA-256 of the embedding text",
+    )
+
 # ── cart_literature ──────────────────────────────────────────────────
 
 LITERATURE_FIELDS = [
@@ -122,6 +145,7 @@ LITERATURE_FIELDS = [
         max_length=200,
         description="Journal name",
     ),
+    _content_hash_field(),
 ]
 
 LITERATURE_SCHEMA = CollectionSchema(
@@ -215,6 +239,7 @@ TRIALS_FIELDS = [
         max_length=2000,
         description="Outcome summary if available",
     ),
+    _content_hash_field(),
 ]
 
 TRIALS_SCHEMA = CollectionSchema(
@@ -304,6 +329,7 @@ CONSTRUCTS_FIELDS = [
         max_length=500,
         description="Known toxicities (CRS, ICANS, etc.)",
     ),
+    _content_hash_field(),
 ]
 
 CONSTRUCTS_SCHEMA = CollectionSchema(
@@ -386,6 +412,7 @@ ASSAYS_FIELDS = [
         max_length=1000,
         description="Additional notes",
     ),
+    _content_hash_field(),
 ]
 
 ASSAYS_SCHEMA = CollectionSchema(
@@ -463,6 +490,7 @@ MANUFACTURING_FIELDS = [
         max_length=1000,
         description="Additional notes",
     ),
+    _content_hash_field(),
 ]
 
 MANUFACTURING_SCHEMA = CollectionSchema(
@@ -485,6 +513,7 @@ SAFETY_FIELDS = [
     FieldSchema(name="outcome", dtype=DataType.VARCHAR, max_length=100),
     FieldSchema(name="reporting_source", dtype=DataType.VARCHAR, max_length=50),
     FieldSchema(name="year", dtype=DataType.INT64),
+    _content_hash_field(),
 ]
 
 SAFETY_SCHEMA = CollectionSchema(
@@ -507,6 +536,7 @@ BIOMARKER_FIELDS = [
     FieldSchema(name="target_antigen", dtype=DataType.VARCHAR, max_length=100),
     FieldSchema(name="disease", dtype=DataType.VARCHAR, max_length=200),
     FieldSchema(name="evidence_level", dtype=DataType.VARCHAR, max_length=20),
+    _content_hash_field(),
 ]
 
 BIOMARKER_SCHEMA = CollectionSchema(
@@ -528,6 +558,7 @@ REGULATORY_FIELDS = [
     FieldSchema(name="decision", dtype=DataType.VARCHAR, max_length=100),
     FieldSchema(name="conditions", dtype=DataType.VARCHAR, max_length=500),
     FieldSchema(name="pivotal_trial", dtype=DataType.VARCHAR, max_length=100),
+    _content_hash_field(),
 ]
 
 REGULATORY_SCHEMA = CollectionSchema(
@@ -551,6 +582,7 @@ SEQUENCE_FIELDS = [
     FieldSchema(name="species_origin", dtype=DataType.VARCHAR, max_length=30),
     FieldSchema(name="immunogenicity_risk", dtype=DataType.VARCHAR, max_length=20),
     FieldSchema(name="structural_notes", dtype=DataType.VARCHAR, max_length=1000),
+    _content_hash_field(),
 ]
 
 SEQUENCE_SCHEMA = CollectionSchema(
@@ -574,6 +606,7 @@ REALWORLD_FIELDS = [
     FieldSchema(name="outcome_value", dtype=DataType.VARCHAR, max_length=100),
     FieldSchema(name="setting", dtype=DataType.VARCHAR, max_length=50),
     FieldSchema(name="special_population", dtype=DataType.VARCHAR, max_length=200),
+    _content_hash_field(),
 ]
 
 REALWORLD_SCHEMA = CollectionSchema(
@@ -628,6 +661,54 @@ COLLECTION_SCHEMAS: Dict[str, CollectionSchema] = {
     "genomic_evidence": GENOMIC_EVIDENCE_SCHEMA,
 }
 
+# ── Scalar filter indexes & partition keys ─────────────────────────
+
+# Fields filtered by CARTRAGEngine._build_filter_exprs and the safety /
+# product views.  VARCHAR fields get an INVERTED index and INT64 fields a
+# sorted (STL_SORT) index so Milvus stops scanning them on every search.
+SCALAR_INDEX_CANDIDATES = ("target_antigen", "year", "start_year", "event_type", "product")
+SCALAR_INDEX_TYPES = {DataType.VARCHAR: "INVERTED", DataType.INT64: "STL_SORT"}
+
+# Projection mode: searches return only id, score and short scalar fields
+# (numbers and VARCHARs up to this length); long text such as text_chunk /
+# text_summary is fetched afterwards for the surviving hits only.
+PROJECTION_MAX_VARCHAR = 200
+
+# Max ids per hydration query expression
+HYDRATE_BATCH_SIZE = 1000
+
+# Optional partition key: antigen-filtered searches prune whole partitions
+PARTITION_KEY_FIELD = "target_antigen"
+
+
+def scalar_index_fields(schema: CollectionSchema) -> Dict[str, str]:
+    """Return ``{field_name: scalar index type}`` for a schema's filter fields."""
+    fields: Dict[str, str] = {}
+    for field in schema.fields:
+        if field.name in SCALAR_INDEX_CANDIDATES and field.dtype in SCALAR_INDEX_TYPES:
+            fields[field.name] = SCALAR_INDEX_TYPES[field.dtype]
+    return fields
+
+
+def with_partition_key(
+    schema: CollectionSchema,
+    field_name: str = PARTITION_KEY_FIELD,
+) -> CollectionSchema:
+    """Return a copy of ``schema`` with ``field_name`` as its partition key.
+
+    Schemas without the field are returned unchanged.
+    """
+    if field_name not in {f.name for f in schema.fields}:
+        return schema
+    fields = []
+    for field in schema.fields:
+        data = field.to_dict()
+        if field.name == field_name:
+            data["is_partition_key"] = True
+        fields.append(FieldSchema.construct_from_dict(data))
+    return CollectionSchema(fields=fields, description=schema.description)
+
+
 # Maps collection names to their Pydantic model class for validation
 # genomic_evidence is None because it's read-only (no inserts from this agent)
 COLLECTION_MODELS: Dict[str, type] = {
@@ -650,6 +731,113 @@ COLLECTION_MODELS: Dict[str, type] = {
 # ═══════════════════════════════════════════════════════════════════════
 
 
+class SearchAllResult(dict):
+    """Per-collection results from a deadline-bounded cross-collection search.
+
+    Behaves exactly like the plain ``{collection: results}`` dict returned
+    before deadlines existed, so existing callers keep working.  Collections
+    that missed the deadline are absent from the mapping and listed in
+    ``timed_out`` instead.
+    """
+
+    def __init__(self, *args, timed_out: Optional[List[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timed_out: List[str] = list(timed_out or [])
+
+    @property
+    def partial(self) -> bool:
+        """True when at least one collection missed the deadline."""
+        return bool(self.timed_out)
+
+
+class BulkIngestSession:
+    """Deferred-flush state for one ``CARTCollectionManager.bulk_ingest()`` block.
+
+    While a session is active, ``insert_batch`` buffers rows in Milvus'
+    growing segments instead of flushing after every call.  A collection is
+    flushed when its pending rows reach ``flush_rows`` or ``flush_seconds``
+    have passed since its last flush, and once more when the session closes
+    (followed by compaction).  Safe to share between ingest threads.
+    """
+
+    def __init__(
+        self,
+        flush_rows: int,
+        flush_seconds: float,
+        compact: bool = True,
+    ):
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.compact = compact
+        self.started = time.monotonic()
+        self.inserted: Dict[str, int] = {}
+        self.flushes: Dict[str, int] = {}
+        self.growing_segments: Dict[str, Optional[int]] = {}
+        self._pending: Dict[str, int] = {}
+        self._last_flush: Dict[str, float] = {}
+        self._collections: Dict[str, Collection] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, collection: Collection, count: int) -> bool:
+        """Account for an insert and flush if a threshold was crossed.
+
+        Args:
+            name: Collection name.
+            collection: The pymilvus Collection that received the rows.
+            count: Number of rows inserted.
+
+        Returns:
+            True if the collection was flushed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._collections[name] = collection
+            self.inserted[name] = self.inserted.get(name, 0) + count
+            self._pending[name] = self._pending.get(name, 0) + count
+            last = self._last_flush.setdefault(name, self.started)
+            due = (
+                (self.flush_rows > 0 and self._pending[name] >= self.flush_rows)
+                or (self.flush_seconds > 0 and now - last >= self.flush_seconds)
+            )
+            if due:
+                self._flush_locked(name)
+        return due
+
+    def _flush_locked(self, name: str) -> None:
+        self._collections[name].flush()
+        self._pending[name] = 0
+        self._last_flush[name] = time.monotonic()
+        self.flushes[name] = self.flushes.get(name, 0) + 1
+
+    def flush_pending(self) -> List[str]:
+        """Flush every collection that still has unflushed rows.
+
+        Returns:
+            Names of the collections flushed.
+        """
+        with self._lock:
+            names = [name for name, pending in self._pending.items() if pending]
+            for name in names:
+                self._flush_locked(name)
+        return names
+
+    @property
+    def collections(self) -> List[str]:
+        """Collections written to during the session."""
+        return sorted(self.inserted)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-collection rows inserted, flushes, and growing segments."""
+        return {
+            name: {
+                "inserted": self.inserted[name],
+                "flushes": self.flushes.get(name, 0),
+                "growing_segments": self.growing_segments.get(name),
+            }
+            for name in self.collections
+        }
+
+
 class CARTCollectionManager:
     """Manages 11 CAR-T Milvus collections (10 owned + 1 read-only genomic).
 
@@ -657,6 +845,23 @@ class CARTCollectionManager:
     CAR-T domain collections, following the same pymilvus patterns as
     rag-chat-pipeline/src/milvus_client.py.
 
+    Cross-collection searches run on one long-lived thread pool owned by
+    the manager (sized by ``MILVUS_SEARCH_WORKERS``) and are bounded by a
+    per-collection deadline, so a single slow collection cannot hold up the
+    whole query.  The deadline starts when a search leaves the pool queue,
+    so time spent waiting behind other requests' searches is never
+    counted against it.
+
+    Load state is tracked per collection: ``load_all()`` preloads everything
+    at startup, searches skip ``collection.load()`` once a collection is
+    known to be loaded, and a collection is reloaded lazily only after
+    ``release_collection()`` or a failed search.  ``is_ready`` and
+    ``readiness()`` expose the result for health checks.
+
+    ``insert_batch`` flushes after every call unless it runs inside a
+    ``bulk_ingest()`` block, which defers flushes to size/time thresholds
+    and compacts the touched collections at the end.
+
     Usage:
         manager = CARTCollectionManager()
         manager.connect()
@@ -664,7 +869,12 @@ class CARTCollectionManager:
         stats = manager.get_collection_stats()
     """
 
-    # IVF_FLAT index params shared across all collections
+    # Collections owned by another agent; their indexes are only rebuilt
+    # when explicitly requested
+    READ_ONLY_COLLECTIONS = {"genomic_evidence"}
+
+    # Legacy IVF_FLAT params.  New indexes come from IndexPolicy; these
+    # remain the fallback for collections whose index cannot be inspected.
     INDEX_PARAMS = {
         "metric_type": "COSINE",
         "index_type": "IVF_FLAT",
@@ -681,6 +891,11 @@ class CARTCollectionManager:
         host: Optional[str] = None,
         port: Optional[int] = None,
         embedding_dim: int = EMBEDDING_DIM,
+        search_workers: Optional[int] = None,
+        search_timeout: Optional[float] = None,
+        index_policy: Optional[IndexPolicy] = None,
+        tuned_params_path: Optional[Path] = None,
+        partition_key_by_antigen: Optional[bool] = None,
     ):
         """Initialize the collection manager.
 
@@ -688,11 +903,46 @@ class CARTCollectionManager:
             host: Milvus server host. Defaults to MILVUS_HOST env var or localhost.
             port: Milvus server port. Defaults to MILVUS_PORT env var or 19530.
             embedding_dim: Embedding vector dimension (384 for BGE-small-en-v1.5).
+            search_workers: Size of the shared search thread pool.  Defaults
+                to settings.MILVUS_SEARCH_WORKERS.
+            search_timeout: Default per-request search deadline in seconds
+                (0 waits for every collection).  Defaults to
+                settings.MILVUS_SEARCH_TIMEOUT_SECONDS.
+            index_policy: Size-aware index selection policy.  Defaults to
+                IndexPolicy.from_settings().
+            tuned_params_path: JSON file of measured per-collection search
+                params (see src/search_tuning.py).  Defaults to
+                settings.SEARCH_PARAMS_FILE.
+            partition_key_by_antigen: Create new collections that have a
+                target_antigen field with it as partition key.  Defaults to
+                settings.PARTITION_KEY_BY_ANTIGEN.
         """
         self.host = host or os.environ.get("MILVUS_HOST", "localhost")
         self.port = port or int(os.environ.get("MILVUS_PORT", "19530"))
         self.embedding_dim = embedding_dim
+        self.search_workers = search_workers or settings.MILVUS_SEARCH_WORKERS
+        self.search_timeout = (
+            settings.MILVUS_SEARCH_TIMEOUT_SECONDS
+            if search_timeout is None else search_timeout
+        )
         self._collections: Dict[str, Collection] = {}
+        self._search_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._loaded: Set[str] = set()
+        # Reentrant so index rebuilds can hold it across release -> reload
+        self._load_lock = threading.RLock()
+        self._preload_targets: Optional[List[str]] = None
+        self.index_policy = index_policy or IndexPolicy.from_settings()
+        self._search_params: Dict[str, Dict[str, Any]] = {}
+        self.tuned_params_path = Path(tuned_params_path or settings.SEARCH_PARAMS_FILE)
+        self._tuned_params = load_tuned_params(self.tuned_params_path)
+        self.partition_key_by_antigen = (
+            settings.PARTITION_KEY_BY_ANTIGEN
+            if partition_key_by_antigen is None else partition_key_by_antigen
+        )
+        self._bulk_session: Optional[BulkIngestSession] = None
+        self._content_hash_support: Dict[str, bool] = {}
+        self._bulk_lock = threading.Lock()
 
     def connect(self) -> None:
         """Connect to the Milvus server."""
@@ -705,11 +955,40 @@ class CARTCollectionManager:
         logger.info("Connected to Milvus")
 
     def disconnect(self) -> None:
-        """Disconnect from the Milvus server."""
+        """Disconnect from the Milvus server and stop the search pool."""
+        self.shutdown_executor()
         connections.disconnect("default")
         self._collections.clear()
+        with self._load_lock:
+            self._loaded.clear()
+            self._preload_targets = None
         logger.info("Disconnected from Milvus")
 
+    # ── Shared search pool ───────────────────────────────────────────
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the shared search pool, creating it on first use."""
+        with self._executor_lock:
+            if self._search_executor is None:
+                self._search_executor = ThreadPoolExecutor(
+                    max_workers=self.search_workers,
+                    thread_name_prefix="cart-milvus-search",
+                )
+                logger.info(
+                    f"Started shared search pool with {self.search_workers} workers"
+                )
+            return self._search_executor
+
+    def shutdown_executor(self) -> None:
+        """Shut down the shared search pool without waiting on stragglers.
+
+        Queued searches are cancelled; a later search starts a fresh pool.
+        """
+        with self._executor_lock:
+            executor, self._search_executor = self._search_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     # ── Collection lifecycle ─────────────────────────────────────────
 
     def create_collection(
@@ -718,7 +997,11 @@ class CARTCollectionManager:
         schema: CollectionSchema,
         drop_existing: bool = False,
     ) -> Collection:
-        """Create a single collection with IVF_FLAT index on the embedding field.
+        """Create a single collection and index its embedding field.
+
+        The embedding index comes from ``index_policy`` planned for an empty
+        collection (FLAT by default); rebuild_indexes() replaces it as the
+        collection grows.  Scalar filter indexes are created alongside.
 
         Args:
             name: Collection name (must be a recognized CAR-T or genomic collection).
@@ -731,6 +1014,7 @@ class CARTCollectionManager:
         if drop_existing and utility.has_collection(name):
             logger.warning(f"Dropping existing collection: {name}")
             utility.drop_collection(name)
+            self._content_hash_support.pop(name, None)
 
         if utility.has_collection(name):
             logger.info(f"Collection '{name}' already exists, loading reference")
@@ -739,14 +1023,32 @@ class CARTCollectionManager:
             return collection
 
         logger.info(f"Creating collection: {name}")
-        collection = Collection(name=name, schema=schema)
+        if self.partition_key_by_antigen and name not in self.READ_ONLY_COLLECTIONS:
+            keyed = with_partition_key(schema)
+            if keyed is not schema:
+                logger.info(
+                    f"Partitioning '{name}' by {PARTITION_KEY_FIELD} "
+                    f"({settings.PARTITION_KEY_NUM_PARTITIONS} partitions)"
+                )
+                collection = Collection(
+                    name=name, schema=keyed,
+                    num_partitions=settings.PARTITION_KEY_NUM_PARTITIONS,
+                )
+            else:
+                collection = Collection(name=name, schema=schema)
+        else:
+            collection = Collection(name=name, schema=schema)
 
-        # Create IVF_FLAT index on the embedding field
-        logger.info(f"Creating IVF_FLAT/COSINE index on '{name}.embedding'")
+        # Index for an empty collection; rebuild_indexes() upgrades it
+        # as the collection grows past the policy's size thresholds
+        plan = self.index_policy.plan(name, row_count=0)
+        logger.info(f"Creating {plan.index_type}/{plan.metric_type} index on '{name}.embedding'")
         collection.create_index(
             field_name="embedding",
-            index_params=self.INDEX_PARAMS,
+            index_params=plan.index_params,
         )
+        self._search_params[name] = plan.search_param
+        self._create_scalar_indexes(name, collection)
 
         self._collections[name] = collection
         logger.info(f"Collection '{name}' created with index")
@@ -776,6 +1078,9 @@ class CARTCollectionManager:
         if utility.has_collection(name):
             utility.drop_collection(name)
             self._collections.pop(name, None)
+            self._search_params.pop(name, None)
+            self._content_hash_support.pop(name, None)
+            self._mark_unloaded(name)
             logger.info(f"Collection '{name}' dropped")
         else:
             logger.warning(f"Collection '{name}' does not exist, nothing to drop")
@@ -808,6 +1113,302 @@ class CARTCollectionManager:
             f"Valid collections: {list(COLLECTION_SCHEMAS.keys())}"
         )
 
+    # ── Load state ───────────────────────────────────────────────────
+
+    def ensure_loaded(self, name: str) -> Collection:
+        """Return a collection reference, loading it into memory if needed.
+
+        ``collection.load()`` is only issued the first time, or again after
+        the collection was released or a search on it failed.
+
+        Args:
+            name: The collection name.
+
+        Returns:
+            The loaded pymilvus Collection object.
+        """
+        collection = self.get_collection(name)
+        if name in self._loaded:
+            return collection
+        with self._load_lock:
+            if name not in self._loaded:
+                collection.load()
+                self._loaded.add(name)
+                logger.info(f"Collection '{name}' loaded")
+        return collection
+
+    def _mark_unloaded(self, name: str) -> None:
+        """Forget that a collection is loaded so the next search reloads it."""
+        with self._load_lock:
+            self._loaded.discard(name)
+
+    def release_collection(self, name: str) -> None:
+        """Release a collection from Milvus memory.
+
+        Args:
+            name: The collection name.
+        """
+        self._mark_unloaded(name)
+        if utility.has_collection(name):
+            Collection(name).release()
+            logger.info(f"Collection '{name}' released")
+
+    def load_all(self) -> Dict[str, bool]:
+        """Preload every existing collection so the first searches skip load().
+
+        Collections that do not exist yet are skipped and do not count
+        against readiness.  Failures are logged, not raised, so callers can
+        start serving and let searches retry the load lazily.
+
+        Returns:
+            Dict mapping each existing collection name -> whether it loaded.
+        """
+        targets = [name for name in COLLECTION_SCHEMAS if utility.has_collection(name)]
+        status: Dict[str, bool] = {}
+        for name in targets:
+            try:
+                self.ensure_loaded(name)
+                status[name] = True
+            except Exception as e:
+                logger.error(f"Failed to preload collection '{name}': {e}")
+                status[name] = False
+        self._preload_targets = targets
+        logger.info(
+            f"Preloaded {sum(status.values())}/{len(targets)} collections"
+        )
+        return status
+
+    def readiness(self) -> Dict[str, bool]:
+        """Return the load state of every preloaded collection.
+
+        Empty until load_all() has run.
+        """
+        return {name: name in self._loaded for name in self._preload_targets or []}
+
+    @property
+    def is_ready(self) -> bool:
+        """True once load_all() has run and every preloaded collection is loaded."""
+        return self._preload_targets is not None and all(self.readiness().values())
+
+    # ── Index management ─────────────────────────────────────────────
+
+    @staticmethod
+    def _embedding_index(collection: Collection) -> Optional[Any]:
+        """Return the pymilvus Index on the embedding field, if any."""
+        for index in collection.indexes:
+            if index.field_name == "embedding":
+                return index
+        return None
+
+    @classmethod
+    def describe_index(cls, collection: Collection) -> Optional[Dict[str, Any]]:
+        """Return the embedding-field index params of a collection, if any."""
+        index = cls._embedding_index(collection)
+        if index is None:
+            return None
+        params = dict(index.params)
+        # Some server versions return the nested params as JSON text
+        if isinstance(params.get("params"), str):
+            params["params"] = json.loads(params["params"])
+        return params
+
+    def get_search_params(self, name: str, top_k: Optional[int] = None) -> Dict[str, Any]:
+        """Return the ``Collection.search`` params for a collection.
+
+        Uses params set by set_search_params() or rebuild_indexes() when
+        present.  Otherwise uses the tuned params measured for the
+        collection's current index, if any, then params derived from that
+        index via the index policy, falling back to SEARCH_PARAMS.
+
+        Args:
+            name: The collection name.
+            top_k: Result limit of the search; HNSW ``ef`` is raised to at
+                least this value, as Milvus requires.
+
+        Returns:
+            Dict with ``metric_type`` and ``params``.
+        """
+        param = self._search_params.get(name)
+        if param is None:
+            param = self.SEARCH_PARAMS
+            try:
+                current = self.describe_index(self.get_collection(name))
+                tuned = self._tuned_params.get(name)
+                if current and tuned and tuned_entry_matches(tuned, current):
+                    param = {
+                        "metric_type": tuned.get("metric_type", "COSINE"),
+                        "params": dict(tuned.get("params") or {}),
+                    }
+                elif current and current.get("index_type"):
+                    param = {
+                        "metric_type": current.get("metric_type", "COSINE"),
+                        "params": self.index_policy.search_params(
+                            current["index_type"], current.get("params") or {},
+                        ),
+                    }
+            except Exception as e:
+                logger.warning(f"Could not inspect index on '{name}': {e}")
+            self._search_params[name] = param
+
+        if top_k and param["params"].get("ef", top_k) < top_k:
+            param = {**param, "params": {**param["params"], "ef": top_k}}
+        return param
+
+    def reload_tuned_params(self) -> None:
+        """Re-read the tuned-params file and drop cached search params."""
+        self._tuned_params = load_tuned_params(self.tuned_params_path)
+        self._search_params.clear()
+        logger.info(
+            f"Loaded tuned search params for {len(self._tuned_params)} collection(s)"
+        )
+
+    def set_search_params(self, name: str, params: Dict[str, Any]) -> None:
+        """Override the search params used for a collection.
+
+        Args:
+            name: The collection name.
+            params: Index-specific search params, e.g. ``{"nprobe": 32}``.
+        """
+        metric = self.get_search_params(name).get("metric_type", "COSINE")
+        self._search_params[name] = {"metric_type": metric, "params": dict(params)}
+
+    def plan_indexes(
+        self,
+        collections: Optional[Iterable[str]] = None,
+    ) -> Dict[str, IndexPlan]:
+        """Report the index the policy would choose for each existing collection.
+
+        Args:
+            collections: Optional collection names; defaults to all.
+
+        Returns:
+            Dict mapping collection name -> IndexPlan, including the index
+            type each collection has now.
+        """
+        plans: Dict[str, IndexPlan] = {}
+        for name in self._resolve_collections(collections):
+            if not utility.has_collection(name):
+                continue
+            collection = self.get_collection(name)
+            current = self.describe_index(collection) or {}
+            plans[name] = self.index_policy.plan(
+                name,
+                row_count=collection.num_entities,
+                current_index_type=current.get("index_type"),
+            )
+        return plans
+
+    def rebuild_indexes(
+        self,
+        collections: Optional[Iterable[str]] = None,
+        force: bool = False,
+        include_read_only: bool = False,
+    ) -> Dict[str, IndexPlan]:
+        """Rebuild indexes on collections that crossed a size threshold.
+
+        A collection is rebuilt when its planned index type differs from
+        its current one (or always, with ``force``).  The collection is
+        released, re-indexed, and reloaded; searches against it return
+        empty results while the rebuild runs.
+
+        Args:
+            collections: Optional collection names; defaults to all.
+            force: Rebuild even when the index type is unchanged.
+            include_read_only: Also rebuild READ_ONLY_COLLECTIONS.
+
+        Returns:
+            Dict mapping collection name -> IndexPlan for every collection
+            that was rebuilt.
+        """
+        rebuilt: Dict[str, IndexPlan] = {}
+        for name, plan in self.plan_indexes(collections).items():
+            if not (force or plan.needs_rebuild):
+                continue
+            if name in self.READ_ONLY_COLLECTIONS and not include_read_only:
+                logger.info(
+                    f"Skipping read-only '{name}': planned {plan.index_type} "
+                    f"({plan.reason})"
+                )
+                continue
+            self._rebuild_index(name, plan)
+            rebuilt[name] = plan
+        return rebuilt
+
+    def _create_scalar_indexes(self, name: str, collection: Collection) -> List[str]:
+        """Create any missing scalar filter indexes; return the fields indexed."""
+        schema = COLLECTION_SCHEMAS.get(name)
+        if schema is None:
+            return []
+        created: List[str] = []
+        for field_name, index_type in scalar_index_fields(schema).items():
+            index_name = f"{field_name}_idx"
+            if collection.has_index(index_name=index_name):
+                continue
+            collection.create_index(
+                field_name=field_name,
+                index_params={"index_type": index_type},
+                index_name=index_name,
+            )
+            created.append(field_name)
+        if created:
+            logger.info(f"Created scalar indexes on '{name}': {', '.join(created)}")
+        return created
+
+    def ensure_scalar_indexes(
+        self,
+        collections: Optional[Iterable[str]] = None,
+        include_read_only: bool = False,
+    ) -> Dict[str, List[str]]:
+        """Backfill scalar filter indexes on existing collections.
+
+        Collections that gain an index and are loaded are reloaded so
+        searches use it.
+
+        Args:
+            collections: Optional collection names; defaults to all.
+            include_read_only: Also index READ_ONLY_COLLECTIONS.
+
+        Returns:
+            Dict mapping collection name -> fields newly indexed.
+        """
+        created: Dict[str, List[str]] = {}
+        for name in self._resolve_collections(collections):
+            if name in self.READ_ONLY_COLLECTIONS and not include_read_only:
+                continue
+            if not utility.has_collection(name):
+                continue
+            fields = self._create_scalar_indexes(name, self.get_collection(name))
+            if fields:
+                created[name] = fields
+                with self._load_lock:
+                    if name in self._loaded:
+                        self._mark_unloaded(name)
+                        self.ensure_loaded(name)
+        return created
+
+    def _rebuild_index(self, name: str, plan: IndexPlan) -> None:
+        """Replace a collection's embedding index with the planned one.
+
+        The load lock is held from release to reload, so a concurrent
+        search's ensure_loaded() waits for the new index instead of
+        loading the collection while it has none.
+        """
+        logger.info(
+            f"Rebuilding index on '{name}': {plan.current_index_type or 'none'} -> "
+            f"{plan.index_type} ({plan.reason})"
+        )
+        collection = self.get_collection(name)
+        with self._load_lock:
+            self._mark_unloaded(name)
+            collection.release()
+            # Drop only the vector index; scalar filter indexes stay in place
+            index = self._embedding_index(collection)
+            if index is not None:
+                collection.drop_index(index_name=index.index_name)
+            collection.create_index(field_name="embedding", index_params=plan.index_params)
+            self._search_params[name] = plan.search_param
+            self.ensure_loaded(name)
+
     # ── Stats ────────────────────────────────────────────────────────
 
     def get_collection_stats(self) -> Dict[str, int]:
@@ -828,15 +1429,21 @@ class CARTCollectionManager:
 
     # ── Data operations ──────────────────────────────────────────────
 
-    def _get_output_fields(self, collection_name: str) -> List[str]:
+    def _get_output_fields(
+        self,
+        collection_name: str,
+        projection: bool = False,
+    ) -> List[str]:
         """Return non-embedding field names for a given collection.
 
         Used to build the output_fields list for search results.
         Excludes the 'embedding' field since it is large and not
-        needed in result payloads.
+        needed in result payloads, and the internal content_hash.
 
         Args:
             collection_name: The collection to get fields for.
+            projection: If True, return only the id and short scalar fields
+                (see PROJECTION_MAX_VARCHAR), leaving long text for hydrate().
 
         Returns:
             List of field name strings (e.g. ["id", "title", "text_chunk", ...]).
@@ -851,11 +1458,74 @@ class CARTCollectionManager:
             )
 
         schema = COLLECTION_SCHEMAS[collection_name]
-        return [
-            field.name
-            for field in schema.fields
-            if field.name != "embedding"
+        fields = [
+            field for field in schema.fields
+            if field.dtype != DataType.FLOAT_VECTOR and field.name != CONTENT_HASH_FIELD
         ]
+        if projection:
+            fields = [
+                field for field in fields
+                if field.is_primary
+                or field.dtype != DataType.VARCHAR
+                or field.params.get("max_length", 0) <= PROJECTION_MAX_VARCHAR
+            ]
+        return [field.name for field in fields]
+
+    def hydrate(
+        self,
+        collection_name: str,
+        ids: Iterable[Any],
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Fetch the full records for search hits found in projection mode.
+
+        Issues one ``query(expr="id in [...]")`` per HYDRATE_BATCH_SIZE ids.
+
+        Args:
+            collection_name: The collection the ids belong to.
+            ids: Primary keys of the hits to hydrate.
+
+        Returns:
+            Dict mapping id -> record dict with every non-embedding field.
+            Ids that are not found (or a failed query) are simply absent.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return {}
+
+        records: Dict[Any, Dict[str, Any]] = {}
+        try:
+            collection = self.ensure_loaded(collection_name)
+            output_fields = self._get_output_fields(collection_name)
+            for start in range(0, len(unique_ids), HYDRATE_BATCH_SIZE):
+                batch = unique_ids[start:start + HYDRATE_BATCH_SIZE]
+                expr = f"id in {json.dumps(batch)}"
+                for row in collection.query(expr=expr, output_fields=output_fields):
+                    records[row["id"]] = row
+        except Exception as e:
+            logger.error(f"Hydration failed on {collection_name}: {e}")
+        return records
+
+    def hydrate_many(
+        self,
+        ids_by_collection: Dict[str, Iterable[Any]],
+    ) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+        """Hydrate hits from several collections in parallel.
+
+        Args:
+            ids_by_collection: Dict of collection name -> ids to hydrate.
+
+        Returns:
+            Dict of collection name -> {id: full record}.
+        """
+        requests = {name: list(ids) for name, ids in ids_by_collection.items() if ids}
+        if not requests:
+            return {}
+        executor = self._get_executor()
+        futures = {
+            name: executor.submit(self.hydrate, name, ids)
+            for name, ids in requests.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
 
     def insert_batch(
         self,
@@ -876,15 +1546,230 @@ class CARTCollectionManager:
         """
         try:
             collection = self.get_collection(collection_name)
+            self._default_content_hash(collection_name, records)
             result = collection.insert(records)
-            collection.flush()
             count = result.insert_count
+            self._after_write(collection_name, collection, count)
             logger.info(f"Inserted {count} records into {collection_name}")
             return count
         except Exception as e:
             logger.error(f"Failed to insert batch into {collection_name}: {e}")
             raise
 
+    def upsert_batch(
+        self,
+        collection_name: str,
+        records: List[Dict[str, Any]],
+    ) -> int:
+        """Insert-or-replace a batch of records by primary key.
+
+        Used by re-ingest for records whose content hash changed, so the
+        stored row is replaced rather than duplicated.  Flushing follows the
+        same rules as insert_batch().
+
+        Args:
+            collection_name: Target collection name.
+            records: List of dicts with field names matching the schema.
+
+        Returns:
+            Number of records upserted.
+        """
+        try:
+            collection = self.get_collection(collection_name)
+            self._default_content_hash(collection_name, records)
+            result = collection.upsert(records)
+            count = result.upsert_count
+            self._after_write(collection_name, collection, count)
+            logger.info(f"Upserted {count} records into {collection_name}")
+            return count
+        except Exception as e:
+            logger.error(f"Failed to upsert batch into {collection_name}: {e}")
+            raise
+
+    def _after_write(self, name: str, collection: Collection, count: int) -> None:
+        """Flush now, or leave it to the active bulk-ingest session."""
+        session = self._bulk_session
+        if session is None:
+            collection.flush()
+        elif session.record(name, collection, count):
+            logger.debug(f"Bulk ingest flushed {name}")
+
+    def _default_content_hash(
+        self,
+        collection_name: str,
+        records: List[Dict[str, Any]],
+    ) -> None:
+        """Give records written without a hash (e.g. seed scripts) an empty one.
+
+        An empty hash never matches, so the next pipeline run re-embeds and
+        upserts those records once and records their real hash.
+        """
+        if self.has_content_hash(collection_name):
+            for record in records:
+                record.setdefault(CONTENT_HASH_FIELD, "")
+
+    def has_content_hash(self, collection_name: str) -> bool:
+        """Whether a collection stores CONTENT_HASH_FIELD.
+
+        Collections created before content hashing was added lack the
+        field; re-ingest then treats every existing record as changed.
+        """
+        if collection_name not in self._content_hash_support:
+            collection = self.get_collection(collection_name)
+            self._content_hash_support[collection_name] = any(
+                field.name == CONTENT_HASH_FIELD for field in collection.schema.fields
+            )
+        return self._content_hash_support[collection_name]
+
+    def get_content_hashes(
+        self,
+        collection_name: str,
+        ids: Iterable[Any],
+    ) -> Dict[Any, Optional[str]]:
+        """Look up stored content hashes for a set of primary keys.
+
+        Issues one ``query(expr="id in [...]")`` per HYDRATE_BATCH_SIZE ids.
+
+        Args:
+            collection_name: The collection to check.
+            ids: Primary keys of the incoming records.
+
+        Returns:
+            Dict mapping each id that already exists to its stored hash
+            (None when the collection has no content_hash field).  Ids that
+            are not stored are absent.
+
+        Raises:
+            Exception: If the lookup query fails; callers must not assume
+                records are new when existence is unknown.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return {}
+
+        collection = self.ensure_loaded(collection_name)
+        with_hash = self.has_content_hash(collection_name)
+        output_fields = ["id", CONTENT_HASH_FIELD] if with_hash else ["id"]
+        hashes: Dict[Any, Optional[str]] = {}
+        for start in range(0, len(unique_ids), HYDRATE_BATCH_SIZE):
+            batch = unique_ids[start:start + HYDRATE_BATCH_SIZE]
+            expr = f"id in {json.dumps(batch)}"
+            for row in collection.query(expr=expr, output_fields=output_fields):
+                hashes[row["id"]] = row.get(CONTENT_HASH_FIELD)
+        return hashes
+
+    @contextmanager
+    def bulk_ingest(
+        self,
+        flush_rows: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        compact: Optional[bool] = None,
+    ) -> Iterator[BulkIngestSession]:
+        """Defer per-batch flushes for the duration of a bulk load.
+
+        Inside the block ``insert_batch`` no longer flushes after every
+        call; each collection is flushed when ``flush_rows`` rows are
+        pending or ``flush_seconds`` have passed, and once more on exit,
+        after which compaction is triggered to merge the small segments.
+        Nested calls join the outermost session, so pipelines that open
+        their own session can run inside a larger one.
+
+        Args:
+            flush_rows: Pending rows per collection that force a flush
+                (0 disables).  Defaults to settings.INGEST_FLUSH_ROWS.
+            flush_seconds: Seconds since the last flush that force one
+                (0 disables).  Defaults to settings.INGEST_FLUSH_SECONDS.
+            compact: Compact the touched collections on exit.  Defaults to
+                settings.INGEST_COMPACT_AFTER_BULK.
+
+        Yields:
+            The active BulkIngestSession (see ``summary()`` for per-collection
+            rows, flushes, and growing-segment counts).
+        """
+        with self._bulk_lock:
+            outer = self._bulk_session
+            if outer is None:
+                session = BulkIngestSession(
+                    flush_rows=settings.INGEST_FLUSH_ROWS if flush_rows is None else flush_rows,
+                    flush_seconds=(
+                        settings.INGEST_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+                    ),
+                    compact=settings.INGEST_COMPACT_AFTER_BULK if compact is None else compact,
+                )
+                self._bulk_session = session
+        if outer is not None:
+            yield outer
+            return
+
+        try:
+            yield session
+        finally:
+            with self._bulk_lock:
+                self._bulk_session = None
+            self._finish_bulk_session(session)
+
+    def _finish_bulk_session(self, session: BulkIngestSession) -> None:
+        """Flush, compact, and report on a closing bulk-ingest session."""
+        try:
+            session.flush_pending()
+        except Exception as e:
+            logger.error(f"Final bulk-ingest flush failed: {e}")
+            raise
+        for name in session.collections:
+            if session.compact:
+                try:
+                    self.get_collection(name).compact()
+                except Exception as e:
+                    logger.warning(f"Compaction of {name} failed: {e}")
+            session.growing_segments[name] = self.growing_segment_count(name)
+            stats = session.summary()[name]
+            logger.info(
+                f"Bulk ingest into {name}: {stats['inserted']} rows, "
+                f"{stats['flushes']} flush(es), "
+                f"{stats['growing_segments']} growing segment(s)"
+            )
+
+    def growing_segment_count(self, name: str) -> Optional[int]:
+        """Count the growing (unsealed) segments a collection is serving.
+
+        Args:
+            name: Collection name.
+
+        Returns:
+            Number of growing segments, or None if the collection is not
+            loaded or segment info is unavailable.
+        """
+        try:
+            segments = utility.get_query_segment_info(name)
+        except Exception as e:
+            logger.debug(f"Segment info unavailable for {name}: {e}")
+            return None
+        return sum(1 for seg in segments if seg.state == SegmentState.Growing)
+
+    def _resolve_collections(
+        self,
+        collections: Optional[Iterable[str]],
+    ) -> List[str]:
+        """Return the de-duplicated, known collection names to search.
+
+        Args:
+            collections: Requested names, or None for every collection.
+
+        Returns:
+            Names in request order, restricted to COLLECTION_SCHEMAS.
+        """
+        if collections is None:
+            return list(COLLECTION_SCHEMAS.keys())
+
+        resolved: List[str] = []
+        for name in collections:
+            if name not in COLLECTION_SCHEMAS:
+                logger.warning(f"Skipping unknown collection '{name}' in search request")
+                continue
+            if name not in resolved:
+                resolved.append(name)
+        return resolved
+
     def search(
         self,
         collection_name: str,
@@ -892,6 +1777,7 @@ class CARTCollectionManager:
         top_k: int = 5,
         filter_expr: Optional[str] = None,
         score_threshold: float = 0.0,
+        projection: bool = False,
     ) -> List[Dict[str, Any]]:
         """Search a single collection by vector similarity.
 
@@ -902,28 +1788,79 @@ class CARTCollectionManager:
             filter_expr: Optional Milvus boolean filter expression
                 (e.g. 'target_antigen == "CD19"').
             score_threshold: Minimum cosine similarity score (0.0-1.0).
+            projection: Return only id, score and short scalar fields.
 
         Returns:
             List of dicts with 'id', 'score', 'collection', and all output fields.
         """
-        try:
-            collection = self.get_collection(collection_name)
-            collection.load()
+        return self.search_many(
+            collection_name,
+            [query_embedding],
+            top_k=top_k,
+            filter_expr=filter_expr,
+            score_threshold=score_threshold,
+            projection=projection,
+        )[0]
+
+    def search_many(
+        self,
+        collection_name: str,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filter_expr: Optional[str] = None,
+        score_threshold: float = 0.0,
+        timeout: Optional[float] = None,
+        projection: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search a single collection with several query vectors in one request.
 
-            output_fields = self._get_output_fields(collection_name)
+        All vectors are sent as one Milvus search (nq = len(query_embeddings))
+        and the hits are demultiplexed back per query, so N queries cost one
+        RPC instead of N.  The same filter applies to every vector.  The RPC
+        latency is exported per collection to MILVUS_SEARCH_LATENCY.
 
-            results = collection.search(
-                data=[query_embedding],
-                anns_field="embedding",
-                param=self.SEARCH_PARAMS,
-                limit=top_k,
-                output_fields=output_fields,
-                expr=filter_expr,
-            )
+        Args:
+            collection_name: The collection to search.
+            query_embeddings: List of 384-dim query vectors.
+            top_k: Maximum number of results to return per query.
+            filter_expr: Optional Milvus boolean filter expression.
+            score_threshold: Minimum cosine similarity score (0.0-1.0).
+            timeout: Optional RPC timeout in seconds passed to pymilvus.
+            projection: Return only id, score and short scalar fields; fetch
+                the rest later with hydrate().
+
+        Returns:
+            One list of result dicts per query vector, in input order.
+            On failure every query gets an empty list.
+        """
+        if not query_embeddings:
+            return []
 
-            # Convert results to list of dicts
-            evidence_results: List[Dict[str, Any]] = []
+        try:
+            collection = self.ensure_loaded(collection_name)
+
+            output_fields = self._get_output_fields(collection_name, projection)
+
+            search_start = time.perf_counter()
+            try:
+                results = collection.search(
+                    data=list(query_embeddings),
+                    anns_field="embedding",
+                    param=self.get_search_params(collection_name, top_k),
+                    limit=top_k,
+                    output_fields=output_fields,
+                    expr=filter_expr,
+                    timeout=timeout,
+                )
+            finally:
+                record_milvus_search(
+                    time.perf_counter() - search_start, collection=collection_name,
+                )
+
+            # Convert results to one list of dicts per query vector
+            per_query: List[List[Dict[str, Any]]] = []
             for hits in results:
+                evidence_results: List[Dict[str, Any]] = []
                 for hit in hits:
                     score = hit.score  # Cosine similarity (0-1)
                     if score < score_threshold:
@@ -939,12 +1876,50 @@ class CARTCollectionManager:
                             record[field_name] = hit.entity.get(field_name)
 
                     evidence_results.append(record)
+                per_query.append(evidence_results)
 
-            return evidence_results
+            # Pad defensively so callers can always index by query position
+            while len(per_query) < len(query_embeddings):
+                per_query.append([])
+            return per_query
 
         except Exception as e:
             logger.error(f"Search failed on {collection_name}: {e}")
-            return []
+            # The collection may have been released server-side; reload lazily
+            self._mark_unloaded(collection_name)
+            return [[] for _ in query_embeddings]
+
+    @staticmethod
+    def _wait_from_start(
+        futures: Dict[Future, str],
+        started: Dict[str, float],
+        timeout: Optional[float],
+    ) -> Set[Future]:
+        """Wait for searches, timing each from when it started running.
+
+        Returns the futures still unfinished ``timeout`` seconds after their
+        search started.  A queued search has not started its clock, so the
+        wait never ends before it has had the full ``timeout`` to run.
+        """
+        if timeout is None:
+            wait(futures)
+            return set()
+        pending, expired = set(futures), set()
+        while pending:
+            now = time.monotonic()
+            for future in [f for f in pending if futures[f] in started]:
+                if now >= started[futures[future]] + timeout:
+                    pending.discard(future)
+                    expired.add(future)
+            if not pending:
+                break
+            # Unstarted searches cannot expire before now + timeout
+            wake = min(
+                (started[futures[f]] + timeout for f in pending if futures[f] in started),
+                default=now + timeout,
+            )
+            _, pending = wait(pending, timeout=max(wake - now, 0), return_when=FIRST_COMPLETED)
+        return expired
 
     def search_all(
         self,
@@ -952,11 +1927,13 @@ class CARTCollectionManager:
         top_k_per_collection: int = 5,
         filter_exprs: Optional[Dict[str, str]] = None,
         score_threshold: float = 0.0,
+        collections: Optional[Iterable[str]] = None,
+        timeout: Optional[float] = None,
     ) -> Dict[str, List[Dict[str, Any]]]:
-        """Search ALL CAR-T collections in parallel.
+        """Search CAR-T collections in parallel.
 
-        Performs vector similarity search across every collection
-        concurrently using a thread pool, then merges results.
+        Performs vector similarity search across every requested collection
+        concurrently on the shared search pool, then merges results.
 
         Args:
             query_embedding: 384-dim query vector (BGE-small-en-v1.5).
@@ -964,41 +1941,114 @@ class CARTCollectionManager:
             filter_exprs: Optional dict of collection_name -> filter expression.
                 Collections not in the dict get no filter.
             score_threshold: Minimum cosine similarity score (0.0-1.0).
+            collections: Optional collection names to search.  Defaults to
+                all collections; only the named ones are queried.
+            timeout: Deadline in seconds (see search_all_many).
+
+        Returns:
+            SearchAllResult mapping collection name -> list of result dicts;
+            collections that missed the deadline are listed in ``timed_out``.
+        """
+        batched = self.search_all_many(
+            [query_embedding],
+            top_k_per_collection=top_k_per_collection,
+            filter_exprs=filter_exprs,
+            score_threshold=score_threshold,
+            collections=collections,
+            timeout=timeout,
+        )
+        return SearchAllResult(
+            {name: per_query[0] for name, per_query in batched.items()},
+            timed_out=batched.timed_out,
+        )
+
+    def search_all_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k_per_collection: int = 5,
+        filter_exprs: Optional[Dict[str, str]] = None,
+        score_threshold: float = 0.0,
+        collections: Optional[Iterable[str]] = None,
+        timeout: Optional[float] = None,
+        projection: bool = False,
+    ) -> Dict[str, List[List[Dict[str, Any]]]]:
+        """Search CAR-T collections in parallel with several query vectors.
+
+        Issues one multi-vector search per collection (see search_many),
+        so K queries across 11 collections cost 11 RPCs instead of 11 x K.
+        Searches run on the manager's shared pool and the call returns once
+        every collection has answered or run past the deadline.  Each
+        collection's deadline starts when its search starts running, not
+        when it is queued, so a busy pool delays searches instead of timing
+        them out.  Late collections are dropped from the result, flagged in
+        ``timed_out`` and counted in MILVUS_SEARCH_TIMEOUTS.
+
+        Args:
+            query_embeddings: List of 384-dim query vectors.
+            top_k_per_collection: Max results per collection per query.
+            filter_exprs: Optional dict of collection_name -> filter expression.
+                Collections not in the dict get no filter.
+            score_threshold: Minimum cosine similarity score (0.0-1.0).
+            collections: Optional collection names to search.  Defaults to
+                all collections; unknown names are skipped with a warning.
+            timeout: Deadline in seconds for each collection's search, from
+                when it starts running.  Defaults to the manager's
+                ``search_timeout``; 0 waits for every collection.
+            projection: Return only id, score and short scalar fields (see
+                search_many); hydrate the surviving hits with hydrate_many().
 
         Returns:
-            Dict mapping collection name -> list of result dicts.
+            SearchAllResult mapping each collection that finished in time ->
+            one result list per query vector.
         """
-        collections = list(COLLECTION_SCHEMAS.keys())
-        all_results: Dict[str, List[Dict[str, Any]]] = {}
+        collections = self._resolve_collections(collections)
+        if not query_embeddings or not collections:
+            return SearchAllResult({name: [] for name in collections})
+
+        deadline = self.search_timeout if timeout is None else timeout
+        rpc_timeout = deadline if deadline and deadline > 0 else None
+
+        started: Dict[str, float] = {}
 
-        def _search_one(name: str) -> tuple:
-            expr = (filter_exprs or {}).get(name)
-            return name, self.search(
+        def _search_one(name: str) -> List[List[Dict[str, Any]]]:
+            started[name] = time.monotonic()
+            return self.search_many(
                 collection_name=name,
-                query_embedding=query_embedding,
+                query_embeddings=query_embeddings,
                 top_k=top_k_per_collection,
-                filter_expr=expr,
+                filter_expr=(filter_exprs or {}).get(name),
                 score_threshold=score_threshold,
+                timeout=rpc_timeout,
+                projection=projection,
             )
 
-        with ThreadPoolExecutor(max_workers=len(collections)) as executor:
-            futures = {
-                executor.submit(_search_one, name): name
-                for name in collections
-            }
-            for future in as_completed(futures):
-                coll_name = futures[future]
-                try:
-                    name, hits = future.result()
-                    all_results[name] = hits
-                except Exception as e:
-                    logger.warning(
-                        f"Search failed for collection '{coll_name}': {e}"
-                    )
-                    all_results[coll_name] = []
+        executor = self._get_executor()
+        futures = {executor.submit(_search_one, name): name for name in collections}
+        not_done = self._wait_from_start(futures, started, rpc_timeout)
+
+        all_results = SearchAllResult()
+        for future, coll_name in futures.items():
+            if future in not_done:
+                future.cancel()
+                all_results.timed_out.append(coll_name)
+                record_milvus_search_timeout(coll_name)
+                continue
+            try:
+                all_results[coll_name] = future.result()
+            except Exception as e:
+                logger.warning(f"Search failed for collection '{coll_name}': {e}")
+                all_results[coll_name] = [[] for _ in query_embeddings]
+
+        if all_results.timed_out:
+            logger.warning(
+                f"Search deadline of {deadline:.2f}s missed by "
+                f"{len(all_results.timed_out)} collection(s): "
+                f"{', '.join(all_results.timed_out)}"
+            )
 
-        total = sum(len(v) for v in all_results.values())
+        total = sum(len(h) for per_query in all_results.values() for h in per_query)
         logger.info(
-            f"Searched {len(collections)} collections, found {total} results"
+            f"Searched {len(collections)} collections with "
+            f"{len(query_embeddings)} query vector(s), found {total} results"
         )
         return all_results
@@ -0,0 +1,282 @@
+"""Query-embedding cache for the CAR-T Intelligence Agent.
+
+Production traffic is dominated by a few hundred recurring questions,
+``find_related`` entities, and query-expansion terms.  Re-encoding the
+same BGE-prefixed text on every request wastes 10-30 ms of CPU per call,
+so the RAG engine routes ``_embed_query`` through this cache.
+
+Two tiers:
+  - Memory — bounded, thread-safe LRU with per-entry TTL
+  - Disk   — optional ``.npy`` tier under ``settings.CACHE_DIR`` that
+             survives process restarts (one file per key)
+
+Keys are the whitespace-normalized text combined with the embedding
+model name, so switching models never serves stale vectors.  Every
+lookup feeds the ``cart_embedding_cache_hits_total`` /
+``cart_embedding_cache_misses_total`` Prometheus counters.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from config.settings import settings
+
+from .metrics import record_embedding
+
+# BGE-small-en-v1.5 instruction prefix for retrieval queries
+BGE_QUERY_PREFIX = "Represent this sentence for searching relevant passages: "
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace and strip the ends of ``text``.
+
+    Args:
+        text: Raw text to be embedded.
+
+    Returns:
+        Normalized text used as the cache key.
+    """
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """Bounded, thread-safe LRU cache for text embeddings.
+
+    Usage:
+        cache = EmbeddingCache(max_size=2048, ttl_seconds=86400)
+        vector = cache.get_or_compute(text, embedder.embed_text)
+        cache.stats()  # {"hits": 12, "misses": 3, "size": 3, ...}
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2048,
+        ttl_seconds: float = 86400,
+        disk_dir: Optional[Path] = None,
+        model_name: str = settings.EMBEDDING_MODEL,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept in memory.
+            ttl_seconds: Entry lifetime in seconds.  ``0`` disables expiry.
+            disk_dir: Optional directory for the persistent ``.npy`` tier.
+                ``None`` keeps the cache memory-only.
+            model_name: Embedding model identifier mixed into every key.
+        """
+        self.max_size = max(1, int(max_size))
+        self.ttl_seconds = float(ttl_seconds)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.model_name = model_name
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._disk_hits = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls) -> "EmbeddingCache":
+        """Build a cache from the ``EMBEDDING_CACHE_*`` settings."""
+        disk_dir = None
+        if settings.EMBEDDING_CACHE_DISK:
+            disk_dir = settings.CACHE_DIR / "query_embeddings"
+        return cls(
+            max_size=settings.EMBEDDING_CACHE_SIZE,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+            disk_dir=disk_dir,
+        )
+
+    # ── Public API ───────────────────────────────────────────────────
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for ``text`` or ``None``.
+
+        Checks the memory tier first, then the disk tier (promoting disk
+        hits back into memory).  Does not touch hit/miss counters; use
+        :meth:`get_or_compute` for instrumented lookups.  Returns a copy,
+        so callers may modify the vector without corrupting the cache.
+        """
+        key = self._key(text)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, vector = entry
+                if not self._expired(stored_at, now):
+                    self._entries.move_to_end(key)
+                    return list(vector)
+                del self._entries[key]
+
+        vector = self._disk_get(key, now)
+        if vector is not None:
+            with self._lock:
+                self._disk_hits += 1
+            self._memory_put(key, list(vector), now)
+        return vector
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        """Store ``embedding`` for ``text`` in every enabled tier."""
+        key = self._key(text)
+        vector = list(embedding)
+        now = time.time()
+        self._memory_put(key, vector, now)
+        self._disk_put(key, vector)
+
+    def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[str], List[float]],
+    ) -> List[float]:
+        """Return a cached embedding, computing and storing it on a miss.
+
+        Args:
+            text: Text to embed (already carrying any instruction prefix).
+            compute: Callable that embeds a single string.
+
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        start = time.time()
+        cached = self.get(text)
+        if cached is not None:
+            with self._lock:
+                self._hits += 1
+            record_embedding(time.time() - start, cache_hit=True)
+            return cached
+
+        embedding = compute(text)
+        if hasattr(embedding, "tolist"):
+            embedding = embedding.tolist()
+        self.put(text, embedding)
+        with self._lock:
+            self._misses += 1
+        record_embedding(time.time() - start, cache_hit=False)
+        return embedding
+
+    def get_or_compute_many(
+        self,
+        texts: List[str],
+        compute_many: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """Batch get_or_compute(): every miss is embedded in one call.
+
+        Args:
+            texts: Texts to embed (already carrying any instruction prefix).
+            compute_many: Callable that embeds a list of strings, e.g. a
+                SentenceTransformer-style ``encode``.
+
+        Returns:
+            One embedding per input text, in order.
+        """
+        start = time.time()
+        vectors: List[Optional[List[float]]] = [self.get(text) for text in texts]
+        missing = [idx for idx, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            unique = list(dict.fromkeys(texts[idx] for idx in missing))
+            computed: Dict[str, List[float]] = {}
+            for text, embedding in zip(unique, compute_many(unique)):
+                embedding = embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
+                self.put(text, embedding)
+                computed[text] = embedding
+            for idx in missing:
+                vectors[idx] = list(computed[texts[idx]])
+
+        with self._lock:
+            self._hits += len(texts) - len(missing)
+            self._misses += len(missing)
+        elapsed = (time.time() - start) / max(1, len(texts))
+        missed = set(missing)
+        for idx in range(len(texts)):
+            record_embedding(elapsed, cache_hit=idx not in missed)
+        return vectors
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset counters (disk is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._disk_hits = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "disk_hits": self._disk_hits,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _key(self, text: str) -> str:
+        payload = f"{self.model_name}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and (now - stored_at) > self.ttl_seconds
+
+    def _memory_put(self, key: str, vector: List[float], now: float) -> None:
+        with self._lock:
+            self._entries[key] = (now, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.npy"
+
+    def _disk_get(self, key: str, now: float) -> Optional[List[float]]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            if self._expired(path.stat().st_mtime, now):
+                path.unlink(missing_ok=True)
+                return None
+            return np.load(path).astype(np.float32).tolist()
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning(f"Embedding cache: unreadable disk entry {path.name}: {exc}")
+            return None
+
+    def _disk_put(self, key: str, vector: List[float]) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as fh:
+                np.save(fh, np.asarray(vector, dtype=np.float32))
+            os.replace(tmp_path, path)
+        except Exception as exc:
+            logger.warning(f"Embedding cache: failed to persist {path.name}: {exc}")
+            tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,251 @@
+"""Persistent ingest embedding store for the CAR-T Intelligence Agent.
+
+Every seed script and scheduled refresh re-encodes the corpus with
+BGE-small, even though almost all of the text has been embedded before.
+This store keeps every ingest embedding on disk, keyed by the SHA-256 of
+the record's embedding text (the same ``content_hash`` Milvus stores), so
+``BaseIngestPipeline.embed_and_store`` only runs the model on text it has
+never seen and rebuilding a Milvus instance from scratch needs no
+inference at all.
+
+Layout under ``settings.INGEST_EMBEDDING_STORE_DIR / <model>``:
+  - ``vectors.f32`` — append-only float32 rows (``dim`` values each),
+                      read through a NumPy memory map
+  - ``index.txt``   — one hex hash per line; line ``i`` names row ``i``
+  - ``meta.json``   — model name and dimension the rows were built with
+
+Rows are appended before their index lines, so a crash can at worst leave
+unindexed trailing rows, which are truncated on the next open.  A write
+that fails mid-append (e.g. ENOSPC) is rolled back to the last indexed row
+before the error propagates, so row numbers always match file offsets.
+One process should write a given store at a time; readers in that
+process are thread-safe.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from config.settings import settings
+
+HASH_LENGTH = 64  # hex SHA-256
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.txt"
+META_FILE = "meta.json"
+
+
+def _model_dirname(model_name: str) -> str:
+    """Filesystem-safe directory name for a model identifier."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "__", model_name)
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped ``hash -> float32[dim]`` store.
+
+    Usage:
+        store = EmbeddingStore(settings.INGEST_EMBEDDING_STORE_DIR)
+        found = store.get_many(hashes)          # {hash: np.ndarray}
+        store.put_many(new_hashes, new_vectors)
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        dim: int = settings.EMBEDDING_DIMENSION,
+        model_name: str = settings.EMBEDDING_MODEL,
+    ):
+        """Open (or create) the store for one embedding model.
+
+        Args:
+            directory: Root directory; each model gets its own subdirectory
+                so switching models never serves stale vectors.
+            dim: Embedding dimension (384 for BGE-small-en-v1.5).
+            model_name: Embedding model identifier.
+
+        Raises:
+            ValueError: If an existing store was built with another dimension.
+        """
+        self.dim = int(dim)
+        self.model_name = model_name
+        self.path = Path(directory) / _model_dirname(model_name)
+        self._row_bytes = self.dim * np.dtype(np.float32).itemsize
+        self._rows: Dict[str, int] = {}
+        self._map: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._check_meta()
+        self._load_index()
+
+    @classmethod
+    def from_settings(cls) -> "EmbeddingStore":
+        """Build a store from the ``INGEST_EMBEDDING_STORE_*`` settings."""
+        return cls(settings.INGEST_EMBEDDING_STORE_DIR)
+
+    # ── Public API ───────────────────────────────────────────────────
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return stored vectors for the hashes that are present.
+
+        Args:
+            hashes: Content hashes to look up.
+
+        Returns:
+            Dict of hash -> float32 vector (a copy, safe to keep).
+        """
+        with self._lock:
+            rows = {h: self._rows[h] for h in hashes if h in self._rows}
+            if not rows:
+                return {}
+            vectors = self._mapped()
+            return {h: np.array(vectors[row]) for h, row in rows.items()}
+
+    def put_many(self, hashes: Sequence[str], vectors: Sequence[Sequence[float]]) -> int:
+        """Append vectors for hashes not already stored.
+
+        Args:
+            hashes: Content hashes, one per vector.
+            vectors: Embeddings of length ``dim``.
+
+        Returns:
+            Number of rows appended.
+
+        Raises:
+            ValueError: On a length/dimension mismatch or a malformed hash.
+        """
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        if len(hashes) != len(matrix):
+            raise ValueError(f"{len(hashes)} hashes for {len(matrix)} vectors")
+        if len(matrix) and matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors, got {matrix.shape[1]}")
+
+        with self._lock:
+            fresh: Dict[str, int] = {}
+            for i, digest in enumerate(hashes):
+                if len(digest) != HASH_LENGTH:
+                    raise ValueError(f"Malformed content hash: {digest!r}")
+                if digest not in self._rows and digest not in fresh:
+                    fresh[digest] = i
+            if not fresh:
+                return 0
+
+            # Appends must land exactly at the end of the indexed rows; cut
+            # off anything an earlier failed or torn write left behind
+            start = len(self._rows)
+            self._truncate(start)
+            try:
+                with open(self.path / VECTORS_FILE, "ab") as fh:
+                    fh.write(matrix[list(fresh.values())].tobytes())
+                with open(self.path / INDEX_FILE, "a", encoding="ascii") as fh:
+                    fh.write("".join(f"{digest}\n" for digest in fresh))
+            except BaseException:
+                try:
+                    self._truncate(start)
+                except OSError as exc:
+                    logger.error(f"Embedding store {self.path.name}: rollback failed: {exc}")
+                raise
+
+            for offset, digest in enumerate(fresh):
+                self._rows[digest] = start + offset
+            self._map = None
+            return len(fresh)
+
+    def __contains__(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._rows
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _check_meta(self) -> None:
+        meta_path = self.path / META_FILE
+        meta = {"model_name": self.model_name, "dim": self.dim}
+        if meta_path.exists():
+            stored = json.loads(meta_path.read_text())
+            if int(stored.get("dim", self.dim)) != self.dim:
+                raise ValueError(
+                    f"Embedding store {self.path} holds {stored['dim']}-dim "
+                    f"vectors, not {self.dim}"
+                )
+        else:
+            meta_path.write_text(json.dumps(meta, indent=2))
+
+    def _load_index(self) -> None:
+        """Read the index, dropping torn lines and unindexed trailing rows."""
+        vectors_path = self.path / VECTORS_FILE
+        index_path = self.path / INDEX_FILE
+        vectors_path.touch()
+        index_path.touch()
+
+        rows_on_disk = vectors_path.stat().st_size // self._row_bytes
+        hashes: List[str] = []
+        for line in index_path.read_text(encoding="ascii").splitlines():
+            if len(hashes) >= rows_on_disk or len(line) != HASH_LENGTH:
+                break
+            hashes.append(line)
+
+        if vectors_path.stat().st_size != len(hashes) * self._row_bytes:
+            logger.warning(
+                f"Embedding store {self.path.name}: truncating to "
+                f"{len(hashes)} indexed rows"
+            )
+            with open(vectors_path, "r+b") as fh:
+                fh.truncate(len(hashes) * self._row_bytes)
+            index_path.write_text("".join(f"{h}\n" for h in hashes), encoding="ascii")
+
+        self._rows = {digest: row for row, digest in enumerate(hashes)}
+        logger.info(f"Embedding store {self.path.name}: {len(self._rows)} vectors")
+
+    def _truncate(self, rows: int) -> None:
+        """Cut both files back to exactly ``rows`` indexed rows."""
+        with open(self.path / VECTORS_FILE, "r+b") as fh:
+            fh.truncate(rows * self._row_bytes)
+        with open(self.path / INDEX_FILE, "r+b") as fh:
+            fh.truncate(rows * (HASH_LENGTH + 1))
+
+    def _mapped(self) -> np.memmap:
+        """Memory map covering every indexed row (remapped after appends)."""
+        if self._map is None or self._map.shape[0] < len(self._rows):
+            self._map = np.memmap(
+                self.path / VECTORS_FILE,
+                dtype=np.float32,
+                mode="r",
+                shape=(len(self._rows), self.dim),
+            )
+        return self._map
+
+
+_default_stores: Dict[Path, EmbeddingStore] = {}
+_default_lock = threading.Lock()
+
+
+def get_default_store() -> Optional[EmbeddingStore]:
+    """Return the process-wide store from settings, or None if disabled.
+
+    Failures to open the store are logged and treated as disabled, so
+    ingest never depends on the cache directory being writable.
+    """
+    if not settings.INGEST_EMBEDDING_STORE_ENABLED:
+        return None
+    directory = Path(settings.INGEST_EMBEDDING_STORE_DIR)
+    with _default_lock:
+        if directory not in _default_stores:
+            try:
+                _default_stores[directory] = EmbeddingStore(directory)
+            except Exception as exc:
+                logger.warning(f"Ingest embedding store unavailable at {directory}: {exc}")
+                return None
+        return _default_stores[directory]
@@ -0,0 +1,166 @@
+"""Precomputed embedding table for query-expansion terms.
+
+Every expansion term in ``src/query_expansion.py`` is a static string,
+yet ``CARTRAGEngine._expanded_search`` used to embed each one at query
+time (10-30 ms of CPU per term on CPU-only nodes).  This module embeds
+the full vocabulary of ``ALL_EXPANSION_MAPS`` once and persists it as:
+
+  - ``vectors.npy``  — float32 matrix (n_terms x dim), memory-mapped on load
+  - ``index.json``   — model name, dimension, and term -> row mapping
+
+Build the table with ``scripts/build_expansion_embeddings.py``; the
+engine loads it from ``settings.EXPANSION_EMBEDDINGS_DIR`` at startup and
+falls back to live embedding only for terms missing from the table.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from config.settings import settings
+
+from .embedding_cache import BGE_QUERY_PREFIX, normalize_text
+from .query_expansion import ALL_EXPANSION_MAPS
+
+VECTORS_FILE = "vectors.npy"
+INDEX_FILE = "index.json"
+
+
+def collect_expansion_terms() -> List[str]:
+    """Return the sorted, de-duplicated vocabulary of all expansion maps."""
+    terms = set()
+    for _category, mapping in ALL_EXPANSION_MAPS:
+        for values in mapping.values():
+            terms.update(normalize_text(v) for v in values if v and v.strip())
+    return sorted(terms)
+
+
+def build_expansion_table(
+    embedder: Any,
+    output_dir: Path,
+    batch_size: int = 64,
+    model_name: str = settings.EMBEDDING_MODEL,
+) -> int:
+    """Embed every expansion term and write the table to ``output_dir``.
+
+    Terms are embedded with the same BGE query instruction prefix used by
+    ``CARTRAGEngine._embed_query`` so vectors are interchangeable.
+
+    Args:
+        embedder: Object with an ``encode(List[str]) -> List[List[float]]``
+            method (SentenceTransformer or compatible wrapper).
+        output_dir: Directory that receives ``vectors.npy`` and ``index.json``.
+        batch_size: Number of terms per ``encode`` call.
+        model_name: Embedding model identifier recorded in the index.
+
+    Returns:
+        Number of terms written.
+    """
+    terms = collect_expansion_terms()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    rows: List[np.ndarray] = []
+    for i in range(0, len(terms), batch_size):
+        batch = [BGE_QUERY_PREFIX + t for t in terms[i : i + batch_size]]
+        rows.append(np.asarray(embedder.encode(batch), dtype=np.float32))
+        logger.info(f"Embedded expansion terms {i + len(batch)}/{len(terms)}")
+
+    matrix = np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+    index = {
+        "model": model_name,
+        "dim": int(matrix.shape[1]) if matrix.size else 0,
+        "count": len(terms),
+        "terms": {term: row for row, term in enumerate(terms)},
+    }
+
+    # Write to temp files first so a running engine never maps a half-written table
+    vectors_tmp = output_dir / f"{VECTORS_FILE}.tmp"
+    index_tmp = output_dir / f"{INDEX_FILE}.tmp"
+    with open(vectors_tmp, "wb") as fh:
+        np.save(fh, matrix)
+    index_tmp.write_text(json.dumps(index))
+    os.replace(vectors_tmp, output_dir / VECTORS_FILE)
+    os.replace(index_tmp, output_dir / INDEX_FILE)
+
+    logger.info(f"Wrote {len(terms)} expansion embeddings to {output_dir}")
+    return len(terms)
+
+
+class ExpansionEmbeddingTable:
+    """Read-only, memory-mapped lookup of precomputed expansion embeddings.
+
+    Usage:
+        table = ExpansionEmbeddingTable.load(settings.EXPANSION_EMBEDDINGS_DIR)
+        if table:
+            vector = table.get("tocilizumab")
+    """
+
+    def __init__(self, vectors: np.ndarray, rows: Dict[str, int], model_name: str):
+        self._vectors = vectors
+        self._rows = rows
+        self.model_name = model_name
+
+    @classmethod
+    def load(
+        cls,
+        table_dir: Path,
+        model_name: str = settings.EMBEDDING_MODEL,
+    ) -> Optional["ExpansionEmbeddingTable"]:
+        """Load a table built by :func:`build_expansion_table`.
+
+        Args:
+            table_dir: Directory containing ``vectors.npy`` and ``index.json``.
+            model_name: Model the caller embeds queries with.  Tables built
+                with a different model are rejected.
+
+        Returns:
+            The table, or ``None`` if it is missing, stale, or unreadable.
+        """
+        table_dir = Path(table_dir)
+        index_path = table_dir / INDEX_FILE
+        vectors_path = table_dir / VECTORS_FILE
+        if not index_path.exists() or not vectors_path.exists():
+            return None
+
+        try:
+            index = json.loads(index_path.read_text())
+            if index.get("model") != model_name:
+                logger.warning(
+                    f"Expansion table at {table_dir} was built with "
+                    f"{index.get('model')!r}, expected {model_name!r}; ignoring"
+                )
+                return None
+            vectors = np.load(vectors_path, mmap_mode="r")
+            rows = index.get("terms", {})
+            if vectors.shape[0] != len(rows):
+                logger.warning(f"Expansion table at {table_dir} is inconsistent; ignoring")
+                return None
+        except Exception as exc:
+            logger.warning(f"Failed to load expansion table from {table_dir}: {exc}")
+            return None
+
+        logger.info(f"Loaded {len(rows)} precomputed expansion embeddings")
+        return cls(vectors, rows, index["model"])
+
+    def get(self, term: str) -> Optional[List[float]]:
+        """Return the precomputed embedding for ``term`` or ``None``."""
+        row = self._rows.get(normalize_text(term))
+        if row is None:
+            return None
+        return self._vectors[row].tolist()
+
+    def __contains__(self, term: str) -> bool:
+        return normalize_text(term) in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
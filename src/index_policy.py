@@ -0,0 +1,261 @@
+"""Size-aware Milvus index selection for CAR-T collections.
+
+Picks an index type plus build and search parameters for each collection
+from its row count and a recall target, instead of applying one IVF_FLAT
+(nlist=1024) index everywhere.  Seed collections with a few hundred rows
+would otherwise have more IVF clusters than vectors.
+
+Size bands (thresholds from config/settings.py):
+  - rows <= INDEX_FLAT_MAX_ROWS           -> FLAT (exact; brute force is cheap)
+  - rows <= INDEX_LARGE_MIN_ROWS          -> HNSW at recall >= 0.95, else IVF_FLAT
+  - rows >  INDEX_LARGE_MIN_ROWS          -> HNSW at recall >= 0.99, else IVF_SQ8
+                                             (4x smaller than IVF_FLAT in memory)
+
+IVF lists are sized at ~4 * sqrt(rows); nprobe and HNSW ef are scaled from
+the recall target.  A collection is rebuilt only when its planned index
+*type* changes.  Crossing a band boundary that keeps the same type is not
+a rebuild: at recall >= 0.99 both upper bands are HNSW, so a collection
+that grows past INDEX_LARGE_MIN_ROWS keeps its M=16 graph; M=32 applies
+only to indexes built (or force-rebuilt) above that size.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RECALL → SEARCH-EFFORT TABLES
+# ═══════════════════════════════════════════════════════════════════════
+
+# (recall target, fraction of IVF lists to probe)
+IVF_NPROBE_STEPS: List[Tuple[float, float]] = [
+    (0.90, 0.01),
+    (0.95, 0.03),
+    (0.98, 0.06),
+    (0.99, 0.10),
+]
+
+# (recall target, HNSW ef)
+HNSW_EF_STEPS: List[Tuple[float, int]] = [
+    (0.90, 32),
+    (0.95, 64),
+    (0.98, 128),
+    (0.99, 256),
+]
+
+MIN_NLIST = 16
+MAX_NLIST = 65536
+MIN_NPROBE = 8
+HNSW_EF_CONSTRUCTION = 200
+
+
+def _step_for(recall_target: float, steps: List[Tuple[float, Any]]) -> Any:
+    """Return the effort of the first step that meets recall_target."""
+    for recall, effort in steps:
+        if recall_target <= recall:
+            return effort
+    return steps[-1][1]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# INDEX PLAN
+# ═══════════════════════════════════════════════════════════════════════
+
+
+@dataclass
+class IndexPlan:
+    """Chosen index for one collection."""
+    collection: str
+    row_count: int
+    index_type: str
+    build_params: Dict[str, Any] = field(default_factory=dict)
+    search_params: Dict[str, Any] = field(default_factory=dict)
+    metric_type: str = "COSINE"
+    reason: str = ""
+    current_index_type: Optional[str] = None
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """True when the collection has no index or its planned type differs."""
+        return self.current_index_type != self.index_type
+
+    @property
+    def index_params(self) -> Dict[str, Any]:
+        """Params for ``Collection.create_index``."""
+        return {
+            "metric_type": self.metric_type,
+            "index_type": self.index_type,
+            "params": dict(self.build_params),
+        }
+
+    @property
+    def search_param(self) -> Dict[str, Any]:
+        """Params for ``Collection.search(param=...)``."""
+        return {"metric_type": self.metric_type, "params": dict(self.search_params)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "collection": self.collection,
+            "row_count": self.row_count,
+            "index_type": self.index_type,
+            "build_params": dict(self.build_params),
+            "search_params": dict(self.search_params),
+            "metric_type": self.metric_type,
+            "reason": self.reason,
+            "current_index_type": self.current_index_type,
+            "needs_rebuild": self.needs_rebuild,
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# POLICY
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class IndexPolicy:
+    """Maps a collection's row count and a recall target to an IndexPlan.
+
+    Usage:
+        policy = IndexPolicy.from_settings()
+        plan = policy.plan("cart_literature", row_count=4_800)
+        plan.index_type   # "FLAT"
+    """
+
+    def __init__(
+        self,
+        recall_target: float = 0.95,
+        flat_max_rows: int = 20_000,
+        large_min_rows: int = 2_000_000,
+        metric_type: str = "COSINE",
+    ):
+        """Initialize the policy.
+
+        Args:
+            recall_target: Desired recall@k in (0, 1].
+            flat_max_rows: Largest collection served by an exact FLAT index.
+            large_min_rows: Row count above which memory-lean IVF_SQ8 is used
+                unless the recall target demands HNSW.
+            metric_type: Milvus metric for every index.
+        """
+        if not 0.0 < recall_target <= 1.0:
+            raise ValueError(f"recall_target must be in (0, 1], got {recall_target}")
+        if flat_max_rows >= large_min_rows:
+            raise ValueError("flat_max_rows must be below large_min_rows")
+        self.recall_target = recall_target
+        self.flat_max_rows = flat_max_rows
+        self.large_min_rows = large_min_rows
+        self.metric_type = metric_type
+
+    @classmethod
+    def from_settings(cls) -> "IndexPolicy":
+        """Build a policy from the INDEX_* values in config/settings.py."""
+        return cls(
+            recall_target=settings.INDEX_RECALL_TARGET,
+            flat_max_rows=settings.INDEX_FLAT_MAX_ROWS,
+            large_min_rows=settings.INDEX_LARGE_MIN_ROWS,
+        )
+
+    # ── Planning ─────────────────────────────────────────────────────
+
+    def choose_index_type(self, row_count: int) -> str:
+        """Return the index type for a collection of ``row_count`` rows."""
+        if row_count <= self.flat_max_rows:
+            return "FLAT"
+        if row_count <= self.large_min_rows:
+            return "HNSW" if self.recall_target >= 0.95 else "IVF_FLAT"
+        return "HNSW" if self.recall_target >= 0.99 else "IVF_SQ8"
+
+    def build_params(self, index_type: str, row_count: int) -> Dict[str, Any]:
+        """Return ``create_index`` params for ``index_type`` at ``row_count``."""
+        if index_type == "HNSW":
+            return {
+                "M": 16 if row_count <= self.large_min_rows else 32,
+                "efConstruction": HNSW_EF_CONSTRUCTION,
+            }
+        if index_type in ("IVF_FLAT", "IVF_SQ8"):
+            nlist = int(4 * math.sqrt(max(row_count, 1)))
+            return {"nlist": max(MIN_NLIST, min(MAX_NLIST, nlist))}
+        return {}
+
+    def search_params(self, index_type: str, build_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return search params for an index, scaled to the recall target.
+
+        Works for indexes this policy did not build (e.g. an existing
+        IVF_FLAT index discovered on a collection at load time).
+        """
+        if index_type == "HNSW":
+            return {"ef": _step_for(self.recall_target, HNSW_EF_STEPS)}
+        if index_type.startswith("IVF"):
+            nlist = int(build_params.get("nlist", 1024))
+            fraction = _step_for(self.recall_target, IVF_NPROBE_STEPS)
+            return {"nprobe": max(min(MIN_NPROBE, nlist), min(nlist, math.ceil(nlist * fraction)))}
+        return {}
+
+    def plan(
+        self,
+        collection: str,
+        row_count: int,
+        current_index_type: Optional[str] = None,
+    ) -> IndexPlan:
+        """Choose the index, build params, and search params for a collection.
+
+        Args:
+            collection: Collection name.
+            row_count: Number of entities in the collection.
+            current_index_type: Index type the collection has now, if any;
+                used only to report whether a rebuild is needed.
+        """
+        index_type = self.choose_index_type(row_count)
+        build = self.build_params(index_type, row_count)
+
+        if index_type == "FLAT":
+            reason = f"{row_count:,} rows <= {self.flat_max_rows:,}: exact search is cheap"
+        elif row_count <= self.large_min_rows:
+            reason = (
+                f"{row_count:,} rows, recall target {self.recall_target:.2f}: "
+                + ("graph index for high recall" if index_type == "HNSW" else "IVF lists")
+            )
+        else:
+            reason = (
+                f"{row_count:,} rows > {self.large_min_rows:,}, recall target "
+                f"{self.recall_target:.2f}: "
+                + ("graph index for high recall" if index_type == "HNSW"
+                   else "scalar-quantized IVF to bound memory")
+            )
+
+        return IndexPlan(
+            collection=collection,
+            row_count=row_count,
+            index_type=index_type,
+            build_params=build,
+            search_params=self.search_params(index_type, build),
+            metric_type=self.metric_type,
+            reason=reason,
+            current_index_type=current_index_type,
+        )
+
+
+def format_plan_table(plans: Dict[str, IndexPlan]) -> str:
+    """Render index plans as a fixed-width text table for reports and logs."""
+    lines = [
+        f"{'Collection':<22} {'Rows':>12}  {'Current':<9} {'Planned':<9} "
+        f"{'Build':<28} {'Search':<12}",
+        "-" * 97,
+    ]
+    for name, plan in plans.items():
+        build = ", ".join(f"{k}={v}" for k, v in plan.build_params.items()) or "-"
+        search = ", ".join(f"{k}={v}" for k, v in plan.search_params.items()) or "-"
+        current = plan.current_index_type or "-"
+        marker = " *" if plan.needs_rebuild else ""
+        lines.append(
+            f"{name:<22} {plan.row_count:>12,}  {current:<9} {plan.index_type:<9} "
+            f"{build:<28} {search:<12}{marker}"
+        )
+    lines.append("(* = index will be rebuilt)")
+    return "\n".join(lines)
@@ -9,14 +9,66 @@ Author: Adam Jones
 Date: February 2026
 """
 
+import hashlib
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 from loguru import logger
 from pydantic import BaseModel
 
-from src.collections import CARTCollectionManager
+from src.collections import CONTENT_HASH_FIELD, CARTCollectionManager
+from src.embedding_store import EmbeddingStore, get_default_store
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of a record's embedding text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IngestStats:
+    """Per-run outcome of BaseIngestPipeline.embed_and_store()."""
+
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    written: int = 0  # new + changed records actually inserted / upserted
+    reused: int = 0  # embeddings served from the embedding store
+
+    def to_dict(self) -> Dict[str, int]:
+        """Counts keyed by outcome, for logs and scheduler reports."""
+        return {
+            "new": self.new,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "written": self.written,
+            "reused": self.reused,
+        }
+
+    def merge(self, other: "IngestStats") -> None:
+        """Add another run's (or batch's) counts to this one."""
+        for key, value in other.to_dict().items():
+            setattr(self, key, getattr(self, key) + value)
+
+    def __str__(self) -> str:
+        return ", ".join(f"{key}={value}" for key, value in self.to_dict().items())
+
+
+class PendingRecord(NamedTuple):
+    """A serialized record awaiting embedding and write."""
+
+    record: Dict[str, Any]
+    text: str
+    digest: str
+    is_new: bool  # insert when True, upsert when False
+
+
+def _as_list(vector: Any) -> List[float]:
+    return vector.tolist() if hasattr(vector, "tolist") else list(vector)
 
 
 class BaseIngestPipeline(ABC):
@@ -27,8 +79,11 @@ class BaseIngestPipeline(ABC):
       - parse(raw_data)   — convert raw data into validated Pydantic models
 
     The base class provides:
-      - embed_and_store() — embed text and insert into Milvus
+      - embed_and_store() — embed new/changed records and insert or upsert
+                            them into Milvus (unchanged records are skipped)
       - run()             — orchestrate the full fetch -> parse -> store pipeline
+      - run_pipelined()   — the same, with the stages overlapped on bounded
+                            queues (override fetch_stream() to page sources)
 
     Usage:
         class MyPipeline(BaseIngestPipeline):
@@ -43,6 +98,7 @@ class BaseIngestPipeline(ABC):
         self,
         collection_manager: CARTCollectionManager,
         embedder: Any,
+        embedding_store: Optional[EmbeddingStore] = None,
     ):
         """Initialize the ingest pipeline.
 
@@ -53,9 +109,18 @@ class BaseIngestPipeline(ABC):
                 method returning List[List[float]].  Expected to be a
                 SentenceTransformer or compatible wrapper using
                 BGE-small-en-v1.5 (384-dim).
+            embedding_store: Persistent embeddings keyed by content hash,
+                consulted before `embedder.encode()`.  Defaults to the
+                process-wide store from settings (None when disabled).
         """
         self.collection_manager = collection_manager
         self.embedder = embedder
+        self.embedding_store = embedding_store or get_default_store()
+        self.last_stats = IngestStats()
+        # False when the last fetch knowingly missed records (failed search
+        # or page, or truncated at max_results); delta refreshes only
+        # advance their watermark after a complete fetch
+        self.last_fetch_complete = True
 
     @abstractmethod
     def fetch(self, **kwargs) -> Any:
@@ -85,79 +150,290 @@ class BaseIngestPipeline(ABC):
         """
         ...
 
+    def fetch_stream(self, **kwargs) -> Iterator[Any]:
+        """Yield raw data in chunks that can each be passed to parse().
+
+        The default yields the whole fetch() result once.  Sources that page
+        through an API override this to yield each page as it arrives, so
+        the pipelined runner can parse and embed earlier pages while later
+        ones are still downloading.
+
+        Args:
+            **kwargs: Same parameters as fetch().
+
+        Yields:
+            Raw data chunks in the source's native format.
+        """
+        yield self.fetch(**kwargs)
+
     def embed_and_store(
         self,
         records: List[BaseModel],
         collection_name: str,
         batch_size: int = 32,
+        skip_unchanged: bool = True,
     ) -> int:
-        """Embed record text and insert into the target Milvus collection.
+        """Embed record text and write new or changed records to Milvus.
+
+        Each record's `to_embedding_text()` is hashed (SHA-256) and the
+        hashes already stored for the incoming ids are fetched in bulk.
+        Records whose hash is unchanged are skipped without being embedded;
+        new records are inserted and changed records are upserted, so
+        re-running a refresh never duplicates primary keys.  Vectors for
+        text embedded before (by any pipeline or seed script) come from the
+        persistent embedding store instead of the model.  All batches run
+        inside one `bulk_ingest()` session, so Milvus is flushed on size/time
+        thresholds rather than after every batch.
 
-        Calls each record's `to_embedding_text()` method to produce the
-        string that gets embedded, then inserts records in batches.
+        New/changed/unchanged/failed counts are logged and kept on
+        `self.last_stats`.
 
         Args:
             records: List of Pydantic model instances.  Each must have a
                 `to_embedding_text() -> str` method.
             collection_name: Target Milvus collection name.
-            batch_size: Number of records to embed and insert at a time.
+            batch_size: Number of records to embed and write at a time.
+            skip_unchanged: If False, re-embed and upsert existing records
+                even when their hash matches (e.g. after a model change).
 
         Returns:
-            Total number of records inserted.
-
-        Raises:
-            RuntimeError: If embedding or insertion fails.
+            Total number of records written (new + changed).
         """
-        total_inserted = 0
+        stats = IngestStats()
+        self.last_stats = stats
+        if not records:
+            return 0
+
+        prepared = self._prepare_records(records, collection_name, stats)
+        pending = self._classify_records(prepared, collection_name, stats, skip_unchanged)
+
+        # One deferred-flush session for the whole run: flushes happen on
+        # size/time thresholds and once at the end, followed by compaction
+        with self.collection_manager.bulk_ingest():
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i : i + batch_size]
+
+                try:
+                    # Encode texts into embedding vectors (384-dim each),
+                    # reusing any the embedding store already holds
+                    embeddings = self._embed(
+                        [p.text for p in batch], [p.digest for p in batch], stats,
+                    )
+                    self._write_pending(batch, embeddings, collection_name)
+                    stats.written += len(batch)
+
+                except Exception as exc:
+                    stats.failed += len(batch)
+                    logger.error(
+                        f"Failed batch {i // batch_size + 1} "
+                        f"({i}-{i + len(batch)}) into '{collection_name}': {exc}"
+                    )
+                    continue
+
+                logger.info(
+                    f"Stored batch {i // batch_size + 1} "
+                    f"({stats.written}/{len(pending)} records) "
+                    f"into '{collection_name}'"
+                )
 
-        for i in range(0, len(records), batch_size):
-            batch = records[i : i + batch_size]
+        logger.info(f"Ingest into '{collection_name}': {stats}")
+        return stats.written
 
-            try:
-                # Build embedding texts from each record
-                texts = [record.to_embedding_text() for record in batch]
-
-                # Encode texts into embedding vectors (384-dim each)
-                embeddings = self.embedder.encode(texts)
-
-                # Build dicts for insertion with embedding field added
-                batch_records = []
-                for record, embedding in zip(batch, embeddings):
-                    record_dict = record.model_dump()
-                    record_dict["embedding"] = embedding
-
-                    # Convert any Enum values to their string .value
-                    # and truncate strings to safe UTF-8 byte lengths
-                    for key, value in record_dict.items():
-                        if isinstance(value, Enum):
-                            record_dict[key] = value.value
-                        elif isinstance(value, str):
-                            # Safety: truncate to Milvus VARCHAR byte limit
-                            encoded = value.encode("utf-8")
-                            if len(encoded) > 2990 and key in ("text_chunk", "text_summary"):
-                                record_dict[key] = encoded[:2990].decode("utf-8", errors="ignore")
-                            elif len(encoded) > 490 and key in ("title", "name", "known_toxicities"):
-                                record_dict[key] = encoded[:490].decode("utf-8", errors="ignore")
-
-                    batch_records.append(record_dict)
-
-                self.collection_manager.insert_batch(collection_name, batch_records)
-                total_inserted += len(batch_records)
+    # ── Stage helpers (shared with PipelinedIngestRunner) ─────────────
 
+    def _prepare_records(
+        self,
+        records: List[BaseModel],
+        collection_name: str,
+        stats: IngestStats,
+    ) -> Dict[Any, Tuple[Dict[str, Any], str, str]]:
+        """Serialize and hash records, keyed by id.
+
+        A later duplicate id replaces an earlier one, so a single call never
+        writes the same key twice.  Records that fail to serialize are
+        counted in ``stats.failed``.
+        """
+        prepared: Dict[Any, Tuple[Dict[str, Any], str, str]] = {}
+        failed = 0
+        for record in records:
+            try:
+                text = record.to_embedding_text()
+                record_dict = self._to_insert_dict(record)
             except Exception as exc:
-                logger.error(
-                    f"Failed batch {i // batch_size + 1} "
-                    f"({i}-{i + len(batch)}) into '{collection_name}': {exc}"
-                )
+                failed += 1
+                logger.error(f"Failed to prepare record for '{collection_name}': {exc}")
                 continue
-
-            logger.info(
-                f"Inserted batch {i // batch_size + 1} "
-                f"({total_inserted}/{len(records)} records) "
-                f"into '{collection_name}'"
+            prepared[record_dict.get("id")] = (record_dict, text, content_hash(text))
+        stats.failed += failed
+        duplicates = len(records) - failed - len(prepared)
+        if duplicates:
+            logger.warning(f"Dropped {duplicates} duplicate ids bound for '{collection_name}'")
+        return prepared
+
+    def _classify_records(
+        self,
+        prepared: Dict[Any, Tuple[Dict[str, Any], str, str]],
+        collection_name: str,
+        stats: IngestStats,
+        skip_unchanged: bool = True,
+    ) -> List[PendingRecord]:
+        """Split prepared records into new / changed (pending) and unchanged.
+
+        Stored hashes for all ids are fetched with one bulk lookup.  If the
+        lookup fails, every record is marked for upsert so existing rows are
+        never duplicated.
+        """
+        try:
+            store_hash = bool(self.collection_manager.has_content_hash(collection_name))
+            existing = self.collection_manager.get_content_hashes(
+                collection_name, list(prepared),
+            )
+        except Exception as exc:
+            # Existence unknown: upsert everything rather than risk duplicates
+            logger.warning(
+                f"Content-hash lookup on '{collection_name}' failed ({exc}); "
+                f"upserting all {len(prepared)} records"
             )
+            store_hash, existing = False, None
+
+        pending: List[PendingRecord] = []
+        for record_id, (record_dict, text, digest) in prepared.items():
+            if store_hash:
+                record_dict[CONTENT_HASH_FIELD] = digest
+            if existing is None or record_id not in existing:
+                pending.append(PendingRecord(record_dict, text, digest, existing is not None))
+                stats.new += 1
+            elif skip_unchanged and existing[record_id] == digest:
+                stats.unchanged += 1
+            else:
+                pending.append(PendingRecord(record_dict, text, digest, False))
+                stats.changed += 1
+        return pending
+
+    def _write_pending(
+        self,
+        batch: List[PendingRecord],
+        embeddings: List[List[float]],
+        collection_name: str,
+    ) -> None:
+        """Insert new records and upsert changed ones with their embeddings."""
+        inserts, upserts = [], []
+        for pending, embedding in zip(batch, embeddings):
+            pending.record["embedding"] = embedding
+            (inserts if pending.is_new else upserts).append(pending.record)
+
+        if inserts:
+            self.collection_manager.insert_batch(collection_name, inserts)
+        if upserts:
+            self.collection_manager.upsert_batch(collection_name, upserts)
+
+    def _embed(
+        self,
+        texts: List[str],
+        digests: List[str],
+        stats: IngestStats,
+    ) -> List[List[float]]:
+        """Embed texts, serving stored vectors and persisting new ones.
+
+        The store is an optimization only: lookup or write failures are
+        logged and fall back to (or keep) the freshly encoded vectors.
+        """
+        store = self.embedding_store
+        if store is None:
+            return self.embedder.encode(texts)
+
+        try:
+            found = store.get_many(digests)
+        except Exception as exc:
+            logger.warning(f"Embedding store lookup failed: {exc}")
+            found = {}
+
+        missing = [i for i, digest in enumerate(digests) if digest not in found]
+        encoded: Dict[int, Any] = {}
+        if missing:
+            vectors = self.embedder.encode([texts[i] for i in missing])
+            encoded = dict(zip(missing, vectors))
+            try:
+                store.put_many([digests[i] for i in missing], [encoded[i] for i in missing])
+            except Exception as exc:
+                logger.warning(f"Embedding store write failed: {exc}")
+        stats.reused += len(digests) - len(missing)
+
+        return [
+            found[digest].tolist() if i not in encoded else _as_list(encoded[i])
+            for i, digest in enumerate(digests)
+        ]
+
+    @staticmethod
+    def _to_insert_dict(record: BaseModel) -> Dict[str, Any]:
+        """Serialize a record for Milvus (Enum values, VARCHAR byte limits)."""
+        record_dict = record.model_dump()
+
+        # Convert any Enum values to their string .value
+        # and truncate strings to safe UTF-8 byte lengths
+        for key, value in record_dict.items():
+            if isinstance(value, Enum):
+                record_dict[key] = value.value
+            elif isinstance(value, str):
+                # Safety: truncate to Milvus VARCHAR byte limit
+                encoded = value.encode("utf-8")
+                if len(encoded) > 2990 and key in ("text_chunk", "text_summary"):
+                    record_dict[key] = encoded[:2990].decode("utf-8", errors="ignore")
+                elif len(encoded) > 490 and key in ("title", "name", "known_toxicities"):
+                    record_dict[key] = encoded[:490].decode("utf-8", errors="ignore")
+
+        return record_dict
+
+    def run_pipelined(
+        self,
+        collection_name: Optional[str] = None,
+        batch_size: int = 32,
+        parse_workers: Optional[int] = None,
+        embed_workers: Optional[int] = None,
+        insert_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        skip_unchanged: bool = True,
+        **fetch_kwargs,
+    ) -> int:
+        """Run fetch -> parse -> embed -> insert as overlapping stages.
+
+        Same result as run(), but the stages are connected by bounded
+        queues (see src/ingest/pipeline_runner.py): inserting batch N
+        overlaps with embedding batch N+1 and with fetching further
+        chunks from fetch_stream(), while the queue bounds keep memory flat.
+        Worker counts and queue size default to the INGEST_* settings.
+
+        Args:
+            collection_name: Target Milvus collection.  Defaults to the
+                subclass's COLLECTION_NAME.
+            batch_size: Records per embed/insert batch.
+            parse_workers: Parse threads.
+            embed_workers: Embedding threads.
+            insert_workers: Milvus write threads.
+            queue_size: Capacity of each inter-stage queue.
+            skip_unchanged: Skip records whose content hash is unchanged.
+            **fetch_kwargs: Passed through to self.fetch_stream().
 
-        return total_inserted
+        Returns:
+            Total number of records written (new + changed).
+        """
+        from .pipeline_runner import PipelinedIngestRunner
+
+        target = collection_name or getattr(self, "COLLECTION_NAME", None)
+        if not target:
+            raise ValueError(f"{type(self).__name__} needs a collection_name")
+
+        runner = PipelinedIngestRunner(
+            self,
+            target,
+            batch_size=batch_size,
+            parse_workers=parse_workers,
+            embed_workers=embed_workers,
+            insert_workers=insert_workers,
+            queue_size=queue_size,
+            skip_unchanged=skip_unchanged,
+        )
+        return runner.run(self.fetch_stream(**fetch_kwargs)).written
 
     def run(
         self,
@@ -15,14 +15,13 @@ Date: February 2026
 
 import hashlib
 import re
-import time
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 
 from src.collections import CARTCollectionManager
 from src.models import RealWorldRecord, RWEStudyType
+from src.utils.http_client import HTTPClient, get_http_client
 
 from .base import BaseIngestPipeline
 
@@ -254,12 +253,6 @@ _CURATED_CIBMTR_DATA: List[Dict[str, Any]] = [
     },
 ]
 
-# Maximum retry attempts for network requests
-MAX_RETRIES = 3
-
-# Delay between requests
-REQUEST_DELAY_SEC = 1.0
-
 
 class CIBMTRIngestPipeline(BaseIngestPipeline):
     """Ingest pipeline for CIBMTR registry real-world CAR-T outcomes data.
@@ -285,14 +278,18 @@ class CIBMTRIngestPipeline(BaseIngestPipeline):
         self,
         collection_manager: CARTCollectionManager,
         embedder: Any,
+        http_client: Optional[HTTPClient] = None,
     ):
         """Initialize the CIBMTR ingest pipeline.
 
         Args:
             collection_manager: CARTCollectionManager for Milvus operations.
             embedder: Embedding model with encode() method.
+            http_client: Shared HTTP client (retries, CIBMTR rate limit,
+                response cache).  Defaults to get_http_client().
         """
         super().__init__(collection_manager, embedder)
+        self.http = http_client or get_http_client()
 
     def fetch(self) -> List[Dict[str, Any]]:
         """Fetch CIBMTR CAR-T outcomes data.
@@ -347,8 +344,9 @@ class CIBMTRIngestPipeline(BaseIngestPipeline):
         Returns:
             List of scraped data dicts, or empty list on failure.
         """
-        response = self._request_with_retry(
-            CIBMTR_REPORTS_URL, params=None
+        response = self.http.get(
+            CIBMTR_REPORTS_URL,
+            headers={"Accept": "text/html,application/xhtml+xml"},
         )
         if response is None:
             return []
@@ -499,62 +497,6 @@ class CIBMTRIngestPipeline(BaseIngestPipeline):
             special_population=str(data.get("special_population", ""))[:200],
         )
 
-    @staticmethod
-    def _request_with_retry(
-        url: str,
-        params: Optional[Dict[str, Any]],
-        max_retries: int = MAX_RETRIES,
-    ) -> Optional[requests.Response]:
-        """Make an HTTP GET request with retry logic.
-
-        Args:
-            url: Request URL.
-            params: Query parameters (or None).
-            max_retries: Maximum number of retry attempts.
-
-        Returns:
-            requests.Response on success, None on failure.
-        """
-        for attempt in range(1, max_retries + 1):
-            try:
-                kwargs: Dict[str, Any] = {
-                    "headers": {
-                        "Accept": "text/html,application/xhtml+xml",
-                        "User-Agent": (
-                            "HCLS-AI-Factory/1.0 CAR-T-Intelligence-Agent "
-                            "(research; contact: adam@hcls-ai-factory.org)"
-                        ),
-                    },
-                    "timeout": 30,
-                }
-                if params is not None:
-                    kwargs["params"] = params
-
-                response = requests.get(url, **kwargs)
-                response.raise_for_status()
-                return response
-            except requests.exceptions.HTTPError as exc:
-                status_code = exc.response.status_code if exc.response else 0
-                logger.warning(
-                    f"CIBMTR HTTP error {status_code} on attempt "
-                    f"{attempt}/{max_retries}: {exc}"
-                )
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-            except requests.exceptions.RequestException as exc:
-                logger.warning(
-                    f"CIBMTR request failed on attempt "
-                    f"{attempt}/{max_retries}: {exc}"
-                )
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-
-        return None
-
     def run(
         self,
         collection_name: Optional[str] = None,
@@ -12,6 +12,7 @@ Date: February 2026
 
 import re
 import time
+from datetime import date
 from typing import Any, Dict, List, Optional
 
 import requests
@@ -100,6 +101,7 @@ class ClinicalTrialsIngestPipeline(BaseIngestPipeline):
         intervention: str = DEFAULT_INTERVENTION,
         max_results: int = 1000,
         page_size: int = 100,
+        since: Optional[date] = None,
     ) -> List[Dict[str, Any]]:
         """Fetch CAR-T clinical trials from ClinicalTrials.gov API v2.
 
@@ -108,10 +110,12 @@ class ClinicalTrialsIngestPipeline(BaseIngestPipeline):
 
         API endpoint: {base_url}/studies
         Query parameters:
-            query.cond  — condition/disease search
-            query.intr  — intervention search
-            pageSize    — results per page (max 1000)
-            pageToken   — pagination cursor
+            query.cond      — condition/disease search
+            query.intr      — intervention search
+            filter.advanced — Essie expression; used for the
+                              LastUpdatePostDate range when ``since`` is set
+            pageSize        — results per page (max 1000)
+            pageToken       — pagination cursor
 
         Args:
             condition: Condition search term (e.g. "CAR-T").
@@ -119,10 +123,16 @@ class ClinicalTrialsIngestPipeline(BaseIngestPipeline):
                 (e.g. "chimeric antigen receptor").
             max_results: Maximum total number of studies to retrieve.
             page_size: Number of studies per API request (max 1000).
+            since: Delta refresh — only studies whose last update was
+                posted on or after this date.  None fetches all.
 
         Returns:
-            List of study JSON objects from the API response.
+            List of study JSON objects from the API response.  Sets
+            ``last_fetch_complete`` to False when a delta (``since``) left
+            matching studies beyond max_results; a fetch without ``since``
+            is a bounded backfill and counts as complete.
         """
+        self.last_fetch_complete = False
         url = f"{self.base_url}/studies"
         all_studies: List[Dict[str, Any]] = []
         page_token: Optional[str] = None
@@ -134,6 +144,10 @@ class ClinicalTrialsIngestPipeline(BaseIngestPipeline):
                 "query.intr": intervention,
                 "pageSize": min(page_size, max_results - len(all_studies)),
             }
+            if since is not None:
+                params["filter.advanced"] = (
+                    f"AREA[LastUpdatePostDate]RANGE[{since.isoformat()},MAX]"
+                )
             if page_token:
                 params["pageToken"] = page_token
 
@@ -161,6 +175,16 @@ class ClinicalTrialsIngestPipeline(BaseIngestPipeline):
             # Rate-limit: 1 request per second
             time.sleep(1)
 
+        # More pages (or a trimmed page) mean a delta was cut off
+        self.last_fetch_complete = since is None or (
+            not page_token and len(all_studies) <= max_results
+        )
+        if not self.last_fetch_complete:
+            logger.warning(
+                f"ClinicalTrials.gov fetch stopped at max_results={max_results}; "
+                f"more matching studies remain"
+            )
+
         # Trim to exact max_results
         return all_studies[:max_results]
 
@@ -11,14 +11,13 @@ Date: February 2026
 """
 
 import hashlib
-import time
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 
 from src.collections import CARTCollectionManager
 from src.models import RegulatoryEvent, RegulatoryRecord
+from src.utils.http_client import HTTPClient, get_http_client
 
 from .base import BaseIngestPipeline
 
@@ -175,12 +174,6 @@ _FALLBACK_SEED_DATA: List[Dict[str, Any]] = [
     },
 ]
 
-# Maximum retry attempts for network requests
-MAX_RETRIES = 3
-
-# Delay between requests to be respectful to the DailyMed API
-REQUEST_DELAY_SEC = 0.5
-
 
 class DailyMedIngestPipeline(BaseIngestPipeline):
     """Ingest pipeline for DailyMed FDA drug label data for CAR-T products.
@@ -203,14 +196,18 @@ class DailyMedIngestPipeline(BaseIngestPipeline):
         self,
         collection_manager: CARTCollectionManager,
         embedder: Any,
+        http_client: Optional[HTTPClient] = None,
     ):
         """Initialize the DailyMed ingest pipeline.
 
         Args:
             collection_manager: CARTCollectionManager for Milvus operations.
             embedder: Embedding model with encode() method.
+            http_client: Shared HTTP client (retries, DailyMed rate limit,
+                response cache).  Defaults to get_http_client().
         """
         super().__init__(collection_manager, embedder)
+        self.http = http_client or get_http_client()
 
     def fetch(
         self,
@@ -243,7 +240,9 @@ class DailyMedIngestPipeline(BaseIngestPipeline):
                 break
 
             params = {"drug_name": name}
-            response = self._request_with_retry(DAILYMED_SPL_URL, params)
+            response = self.http.get(
+                DAILYMED_SPL_URL, params, headers={"Accept": "application/json"},
+            )
 
             if response is None:
                 logger.warning(
@@ -269,9 +268,6 @@ class DailyMedIngestPipeline(BaseIngestPipeline):
                 f"DailyMed: fetched {len(spl_data)} SPL records for '{name}'"
             )
 
-            # Respectful rate limiting
-            time.sleep(REQUEST_DELAY_SEC)
-
         if not all_spls:
             logger.info(
                 "No live DailyMed results obtained; using static fallback seed data"
@@ -475,54 +471,6 @@ class DailyMedIngestPipeline(BaseIngestPipeline):
 
         return cleaned[:20]
 
-    @staticmethod
-    def _request_with_retry(
-        url: str,
-        params: Dict[str, Any],
-        max_retries: int = MAX_RETRIES,
-    ) -> Optional[requests.Response]:
-        """Make an HTTP GET request with retry logic.
-
-        Args:
-            url: Request URL.
-            params: Query parameters.
-            max_retries: Maximum number of retry attempts.
-
-        Returns:
-            requests.Response on success, None on failure.
-        """
-        for attempt in range(1, max_retries + 1):
-            try:
-                response = requests.get(
-                    url,
-                    params=params,
-                    headers={"Accept": "application/json"},
-                    timeout=30,
-                )
-                response.raise_for_status()
-                return response
-            except requests.exceptions.HTTPError as exc:
-                status_code = exc.response.status_code if exc.response else 0
-                logger.warning(
-                    f"DailyMed HTTP error {status_code} on attempt "
-                    f"{attempt}/{max_retries}: {exc}"
-                )
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-            except requests.exceptions.RequestException as exc:
-                logger.warning(
-                    f"DailyMed request failed on attempt "
-                    f"{attempt}/{max_retries}: {exc}"
-                )
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-
-        return None
-
     def run(
         self,
         collection_name: Optional[str] = None,
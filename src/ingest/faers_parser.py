@@ -7,19 +7,27 @@ in the cart_safety Milvus collection.
 openFDA API docs: https://open.fda.gov/apis/drug/event/
 Rate limits: 240 requests per minute / 120,000 per day (without API key)
 
+Fetching is count-first: one ``limit=1`` query reads ``meta.results.total``,
+the skip windows are planned from it, and pages are fetched concurrently.
+Pacing comes from the shared HTTP client's api.fda.gov token bucket
+(4 req/sec = 240/min), so workers overlap round trips without exceeding
+the budget.  ``fetch_stream`` yields each page as it arrives so the
+pipelined runner can parse and embed while the pull is still running.
+
 Author: Adam Jones
 Date: February 2026
 """
 
 import hashlib
-import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-import requests
 from loguru import logger
 
+from config.settings import settings
 from src.collections import CARTCollectionManager
 from src.models import SafetyEventType, SafetyRecord
+from src.utils.http_client import HTTPClient, get_http_client
 
 from .base import BaseIngestPipeline
 
@@ -27,6 +35,16 @@ from .base import BaseIngestPipeline
 # openFDA drug adverse event endpoint
 OPENFDA_EVENT_URL = "https://api.fda.gov/drug/event.json"
 
+# openFDA paging limits: skip <= 25,000 and limit <= 1000, so at most the
+# first 26,000 results of a search are reachable
+OPENFDA_MAX_SKIP = 25000
+OPENFDA_MAX_LIMIT = 1000
+OPENFDA_MAX_WINDOW = OPENFDA_MAX_SKIP + OPENFDA_MAX_LIMIT
+
+# Key added to each raw event with its position in the result set, so
+# fallback IDs stay stable when pages arrive out of order
+OFFSET_KEY = "_faers_offset"
+
 # Search query for FDA-approved CAR-T products
 CART_PRODUCTS_SEARCH = (
     "patient.drug.openfda.brand_name:"
@@ -83,12 +101,6 @@ _REACTION_TO_EVENT_TYPE: Dict[str, SafetyEventType] = {
     "tumour lysis syndrome": SafetyEventType.ORGAN_TOXICITY,
 }
 
-# Maximum retry attempts for network requests
-MAX_RETRIES = 3
-
-# Delay between requests to stay within rate limits (4 req/sec = 0.25s)
-REQUEST_DELAY_SEC = 0.30
-
 
 class FAERSIngestPipeline(BaseIngestPipeline):
     """Ingest pipeline for FDA Adverse Event Reporting System (FAERS) CAR-T data.
@@ -112,6 +124,7 @@ class FAERSIngestPipeline(BaseIngestPipeline):
         collection_manager: CARTCollectionManager,
         embedder: Any,
         api_key: Optional[str] = None,
+        http_client: Optional[HTTPClient] = None,
     ):
         """Initialize the FAERS ingest pipeline.
 
@@ -120,78 +133,170 @@ class FAERSIngestPipeline(BaseIngestPipeline):
             embedder: Embedding model with encode() method.
             api_key: Optional openFDA API key for higher rate limits
                 (1000 req/day without key, 120,000/day with key).
+            http_client: Shared HTTP client (retries, api.fda.gov rate
+                limit, response cache).  Defaults to get_http_client().
         """
         super().__init__(collection_manager, embedder)
         self.api_key = api_key
+        self.http = http_client or get_http_client()
 
     def fetch(
         self,
         search: str = CART_PRODUCTS_SEARCH,
         max_results: int = 500,
         page_size: int = 100,
+        workers: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Fetch adverse event reports from the openFDA drug/event API.
 
-        Paginates through results using the skip parameter. openFDA limits
-        skip + limit to 26,000 total results.
+        Collects fetch_stream() and restores result-set order.
 
         API endpoint: https://api.fda.gov/drug/event.json
         Query parameters:
             search — openFDA search query
-            limit  — results per page (max 100)
+            limit  — results per page (max 1000)
             skip   — pagination offset
             api_key — optional API key
 
         Args:
             search: openFDA search query string targeting CAR-T brand names.
             max_results: Maximum total number of events to retrieve.
-            page_size: Number of events per API request (max 100).
+            page_size: Number of events per API request (max 1000).
+            workers: Concurrent page requests.  Defaults to
+                settings.FAERS_FETCH_WORKERS.
 
         Returns:
             List of adverse event JSON objects from the API response.
         """
-        all_events: List[Dict[str, Any]] = []
-        skip = 0
-        page_num = 0
-
-        while len(all_events) < max_results:
-            params: Dict[str, Any] = {
-                "search": search,
-                "limit": min(page_size, max_results - len(all_events)),
-                "skip": skip,
-            }
-            if self.api_key:
-                params["api_key"] = self.api_key
-
-            response = self._request_with_retry(OPENFDA_EVENT_URL, params)
-            if response is None:
-                logger.warning(
-                    f"FAERS fetch failed after {MAX_RETRIES} retries at skip={skip}; "
-                    f"returning {len(all_events)} events collected so far"
-                )
-                break
+        events = [
+            event
+            for page in self.fetch_stream(search, max_results, page_size, workers)
+            for event in page
+        ]
+        events.sort(key=lambda event: event[OFFSET_KEY])
+        logger.info(f"FAERS fetch complete: {len(events)} adverse event reports")
+        return events
 
-            data = response.json()
-            results = data.get("results", [])
-            if not results:
-                logger.info("No more FAERS results returned; pagination complete")
-                break
+    def fetch_stream(
+        self,
+        search: str = CART_PRODUCTS_SEARCH,
+        max_results: int = 500,
+        page_size: int = 100,
+        workers: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of adverse event reports as they arrive.
+
+        Issues a count query, plans every skip window up front (openFDA
+        caps skip + limit at 26,000), then fetches the windows on a worker
+        pool.  At most ``2 * workers`` pages are in flight or buffered, so
+        a slow consumer applies backpressure.  A failed page is logged and
+        skipped; the others still arrive.
 
-            all_events.extend(results)
-            page_num += 1
-            skip += len(results)
+        Args:
+            search: openFDA search query string.
+            max_results: Maximum total number of events to retrieve.
+            page_size: Number of events per API request (max 1000).
+            workers: Concurrent page requests.  Defaults to
+                settings.FAERS_FETCH_WORKERS.
 
-            logger.info(
-                f"FAERS: fetched page {page_num} ({len(results)} events), "
-                f"total {len(all_events)} so far"
-            )
+        Yields:
+            Lists of event dicts, each tagged with its result-set offset.
+        """
+        total = self._count_events(search)
+        windows = self._plan_windows(total, max_results, page_size)
+        if not windows:
+            return
+        workers = max(1, workers or settings.FAERS_FETCH_WORKERS)
+        logger.info(
+            f"FAERS: {total} matching events; fetching {sum(w[1] for w in windows)} "
+            f"in {len(windows)} pages with {workers} workers"
+        )
 
-            # Rate limit: stay under 4 req/sec (240/min)
-            time.sleep(REQUEST_DELAY_SEC)
+        failed = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="faers-fetch") as pool:
+            queued = iter(windows)
+            pending: Set[Future] = set()
 
-        trimmed = all_events[:max_results]
-        logger.info(f"FAERS fetch complete: {len(trimmed)} adverse event reports")
-        return trimmed
+            def _submit(count: int) -> None:
+                while len(pending) < count:
+                    window = next(queued, None)
+                    if window is None:
+                        return
+                    pending.add(pool.submit(self._fetch_page, search, *window))
+
+            _submit(2 * workers)
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.discard(future)
+                        page = future.result()
+                        if page is None:
+                            failed += 1
+                        elif page:
+                            yield page
+                    _submit(2 * workers)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        if failed:
+            logger.warning(f"FAERS: {failed}/{len(windows)} pages failed and were skipped")
+
+    def _count_events(self, search: str) -> int:
+        """Total events matching ``search`` (0 if none or the query failed)."""
+        response = self.http.get(
+            OPENFDA_EVENT_URL, self._params(search, skip=0, limit=1),
+            headers={"Accept": "application/json"},
+        )
+        if response is None:
+            logger.warning("FAERS count query returned no results or failed")
+            return 0
+        try:
+            return int(response.json()["meta"]["results"]["total"])
+        except (KeyError, TypeError, ValueError) as exc:
+            logger.warning(f"FAERS count query returned no total: {exc}")
+            return 0
+
+    @staticmethod
+    def _plan_windows(total: int, max_results: int, page_size: int) -> List[Tuple[int, int]]:
+        """(skip, limit) windows covering min(total, max_results, 26,000).
+
+        Pages of ``page_size`` run up to skip 25,000; anything beyond that
+        is one final window at skip 25,000, since openFDA rejects larger
+        skips with 400.
+        """
+        page_size = max(1, min(page_size, OPENFDA_MAX_LIMIT))
+        wanted = min(total, max_results, OPENFDA_MAX_WINDOW)
+        paged = min(wanted, OPENFDA_MAX_SKIP)
+        windows = [
+            (skip, min(page_size, paged - skip))
+            for skip in range(0, paged, page_size)
+        ]
+        if wanted > OPENFDA_MAX_SKIP:
+            windows.append((OPENFDA_MAX_SKIP, wanted - OPENFDA_MAX_SKIP))
+        return windows
+
+    def _fetch_page(self, search: str, skip: int, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one window (runs on a worker thread); None on failure."""
+        response = self.http.get(
+            OPENFDA_EVENT_URL, self._params(search, skip, limit),
+            headers={"Accept": "application/json"},
+        )
+        if response is None:
+            logger.warning(f"FAERS page at skip={skip} returned no results or failed")
+            return None
+        results = response.json().get("results", [])
+        for offset, event in enumerate(results, start=skip):
+            event[OFFSET_KEY] = offset
+        logger.info(f"FAERS: fetched {len(results)} events at skip={skip}")
+        return results
+
+    def _params(self, search: str, skip: int, limit: int) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"search": search, "limit": limit, "skip": skip}
+        if self.api_key:
+            params["api_key"] = self.api_key
+        return params
 
     def parse(self, raw_data: List[Dict[str, Any]]) -> List[SafetyRecord]:
         """Parse openFDA adverse event JSON into SafetyRecord models.
@@ -213,7 +318,7 @@ class FAERSIngestPipeline(BaseIngestPipeline):
 
         for idx, event in enumerate(raw_data):
             try:
-                record = self._parse_single_event(event, idx)
+                record = self._parse_single_event(event, event.get(OFFSET_KEY, idx))
                 if record is not None:
                     records.append(record)
             except Exception as exc:
@@ -413,65 +518,6 @@ class FAERSIngestPipeline(BaseIngestPipeline):
             return "serious (grade unspecified)"
         return "non-serious"
 
-    @staticmethod
-    def _request_with_retry(
-        url: str,
-        params: Dict[str, Any],
-        max_retries: int = MAX_RETRIES,
-    ) -> Optional[requests.Response]:
-        """Make an HTTP GET request with retry logic.
-
-        Args:
-            url: Request URL.
-            params: Query parameters.
-            max_retries: Maximum number of retry attempts.
-
-        Returns:
-            requests.Response on success, None on failure.
-        """
-        for attempt in range(1, max_retries + 1):
-            try:
-                response = requests.get(
-                    url,
-                    params=params,
-                    headers={"Accept": "application/json"},
-                    timeout=30,
-                )
-                response.raise_for_status()
-                return response
-            except requests.exceptions.HTTPError as exc:
-                status_code = exc.response.status_code if exc.response else 0
-                if status_code == 404:
-                    logger.info("FAERS API returned 404 (no results for query)")
-                    return None
-                if status_code == 429:
-                    wait = 2 ** attempt
-                    logger.warning(
-                        f"FAERS rate limited (429); retrying in {wait}s "
-                        f"(attempt {attempt}/{max_retries})"
-                    )
-                    time.sleep(wait)
-                    continue
-                logger.error(
-                    f"FAERS HTTP error {status_code} on attempt "
-                    f"{attempt}/{max_retries}: {exc}"
-                )
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-            except requests.exceptions.RequestException as exc:
-                logger.error(
-                    f"FAERS request failed on attempt "
-                    f"{attempt}/{max_retries}: {exc}"
-                )
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-
-        return None
-
     def run(
         self,
         collection_name: Optional[str] = None,
@@ -485,7 +531,8 @@ class FAERSIngestPipeline(BaseIngestPipeline):
             collection_name: Target Milvus collection (defaults to 'cart_safety').
             batch_size: Batch size for embedding and insertion.
             max_results: Maximum number of adverse events to fetch.
-            **fetch_kwargs: Additional keyword arguments passed to fetch().
+            **fetch_kwargs: Additional keyword arguments passed to
+                fetch_stream() (search, page_size, workers).
 
         Returns:
             Total number of records ingested.
@@ -493,12 +540,9 @@ class FAERSIngestPipeline(BaseIngestPipeline):
         target = collection_name or self.COLLECTION_NAME
         logger.info(f"Starting FAERS ingest pipeline -> {target}")
 
-        raw = self.fetch(max_results=max_results, **fetch_kwargs)
-        logger.info(f"Fetched {len(raw)} raw adverse event reports from FAERS")
-
-        records = self.parse(raw)
-        logger.info(f"Parsed {len(records)} SafetyRecord instances")
-
-        count = self.embed_and_store(records, target, batch_size)
-        logger.info(f"FAERS ingest complete: {count} records into {target}")
+        # Pages stream into parse/embed/insert as they arrive
+        count = self.run_pipelined(
+            target, batch_size, max_results=max_results, **fetch_kwargs,
+        )
+        logger.info(f"FAERS ingest complete: {count} records into {target} ({self.last_stats})")
         return count
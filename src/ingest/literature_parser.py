@@ -9,7 +9,8 @@ Date: February 2026
 """
 
 import re
-from typing import Any, Dict, List, Optional
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
 
 from loguru import logger
 
@@ -140,6 +141,9 @@ DEFAULT_QUERY = (
     '"chimeric antigen receptor" OR "CAR-T" OR "CAR T cell"'
 )
 
+# Articles per chunk handed to parse() when streaming efetch results
+STREAM_CHUNK_SIZE = 100
+
 
 def _truncate_utf8(text: str, max_bytes: int) -> str:
     """Truncate a string to fit within max_bytes when UTF-8 encoded.
@@ -191,26 +195,87 @@ class PubMedIngestPipeline(BaseIngestPipeline):
         self,
         query: str = DEFAULT_QUERY,
         max_results: int = 5000,
+        since: Optional[date] = None,
     ) -> List[Dict[str, Any]]:
         """Fetch abstracts from PubMed via NCBI E-utilities.
 
         Performs a two-step retrieval:
-          1. esearch — get PMIDs matching the query
-          2. efetch  — retrieve full abstract records for those PMIDs
+          1. esearch — store the matching result set on the history server
+          2. efetch  — retrieve full records page by page via WebEnv
 
         Args:
             query: PubMed search query string.
             max_results: Maximum number of articles to retrieve.
+            since: Delta refresh — only records that entered PubMed
+                (Entrez date) on or after this date.  None fetches all.
 
         Returns:
             List of dicts with keys: pmid, title, abstract, authors,
             journal, year, mesh_terms.
 
         """
-        pmids = self.pubmed_client.search(query, max_results)
-        logger.info(f"Found {len(pmids)} PMIDs")
-        articles = self.pubmed_client.fetch_abstracts(pmids)
-        return articles
+        return [
+            article
+            for chunk in self.fetch_stream(query, max_results, since)
+            for article in chunk
+        ]
+
+    def fetch_stream(
+        self,
+        query: str = DEFAULT_QUERY,
+        max_results: int = 5000,
+        since: Optional[date] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream abstracts from PubMed in chunks as efetch parses them.
+
+        Used by run_pipelined() so parsing and embedding start on the first
+        efetch pages while later pages are still downloading.  Pages are
+        fetched by WebEnv/query_key, so no PMID list is sent or received.
+
+        Args:
+            query: PubMed search query string.
+            max_results: Maximum number of articles to retrieve.
+            since: Delta refresh start date (see fetch()).
+
+        Yields:
+            Lists of up to STREAM_CHUNK_SIZE article dicts (see fetch()).
+
+        Sets ``last_fetch_complete`` once the stream is exhausted: False if
+        the search failed, an efetch page failed, or a delta (``since``)
+        was cut off at max_results.  Without ``since`` the fetch is a
+        bounded backfill of max_results records and counts as complete, so
+        the first scheduled run seeds the watermark and later runs are
+        deltas.
+        """
+        self.last_fetch_complete = False
+        history = self.pubmed_client.search_history(query, max_results, mindate=since)
+        if history is None:
+            return
+        if not history.count:
+            self.last_fetch_complete = True
+            return
+        logger.info(f"Fetching {history.count} PubMed records")
+        failed: List[str] = []
+        chunk: List[Dict[str, Any]] = []
+        for article in self.pubmed_client.iter_history(history, failed=failed):
+            chunk.append(article)
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+        truncated = (
+            since is not None
+            and history.total is not None
+            and history.total > history.count
+        )
+        if failed or truncated:
+            logger.warning(
+                f"PubMed fetch incomplete: {len(failed)} failed pages, "
+                f"{history.count} of {history.total} matching records requested"
+            )
+        self.last_fetch_complete = not failed and not truncated
 
     def parse(self, raw_data: List[Dict[str, Any]]) -> List[CARTLiterature]:
         """Parse PubMed article dicts into CARTLiterature models.
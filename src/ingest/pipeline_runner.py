@@ -0,0 +1,337 @@
+"""Pipelined fetch -> parse -> embed -> insert runner for CAR-T ingest.
+
+``BaseIngestPipeline.run`` is strictly sequential: the network, the CPU and
+Milvus each sit idle while the others work.  This runner connects the four
+stages with bounded queues so they overlap -- batch N is written while
+batch N+1 is embedded and the next page is being fetched -- and the queue
+bounds apply backpressure, so memory stays flat however large the source.
+
+  fetch  (1 thread)    — iterates ``pipeline.fetch_stream(**kwargs)``
+  parse  (N workers)   — ``pipeline.parse(chunk)``, sliced into batches
+  embed  (N workers)   — content-hash check + store lookup + encode
+  insert (N workers)   — insert new / upsert changed, in one bulk session
+
+An id that reappears in a later batch is upserted, and that batch is held
+in the embed stage until the batch that first wrote the id has been
+written, so the upsert can never overtake the insert on another insert
+worker and duplicate the primary key.
+
+Every stage reports per-item durations through ``record_pipeline_stage``
+(``ingest_fetch``, ``ingest_parse``, ``ingest_embed``, ``ingest_insert``)
+and a throughput summary is logged at the end.  Any BaseIngestPipeline
+subclass gets this via ``run_pipelined()``; sources that override
+``fetch_stream()`` to yield pages also overlap fetching with the rest.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from config.settings import settings
+from src.metrics import record_pipeline_stage
+
+from .base import IngestStats, PendingRecord
+
+if TYPE_CHECKING:
+    from .base import BaseIngestPipeline
+
+# Queue sentinel marking the end of a stage's output
+_DONE = object()
+
+
+@dataclass
+class StageMetrics:
+    """Work done by one pipeline stage."""
+
+    items: int = 0
+    records: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        """Throughput while the stage was busy."""
+        return self.records / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+
+class PipelinedIngestRunner:
+    """Run one ingest pipeline with overlapping, bounded stages.
+
+    Usage:
+        runner = PipelinedIngestRunner(pipeline, "cart_literature")
+        stats = runner.run(pipeline.fetch_stream(max_results=5000))
+        runner.stage_metrics["embed"].records_per_second
+    """
+
+    STAGES = ("fetch", "parse", "embed", "insert")
+
+    def __init__(
+        self,
+        pipeline: "BaseIngestPipeline",
+        collection_name: str,
+        batch_size: int = 32,
+        parse_workers: Optional[int] = None,
+        embed_workers: Optional[int] = None,
+        insert_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        skip_unchanged: bool = True,
+    ):
+        """Initialize the runner.
+
+        Args:
+            pipeline: The ingest pipeline supplying parse/embed/write logic.
+            collection_name: Target Milvus collection.
+            batch_size: Records per embed/insert batch.
+            parse_workers: Parse threads.  Defaults to settings.INGEST_PARSE_WORKERS.
+            embed_workers: Embed threads.  Defaults to settings.INGEST_EMBED_WORKERS.
+            insert_workers: Insert threads.  Defaults to settings.INGEST_INSERT_WORKERS.
+            queue_size: Capacity of each inter-stage queue.  Defaults to
+                settings.INGEST_QUEUE_SIZE.
+            skip_unchanged: Passed through to content-hash classification.
+        """
+        self.pipeline = pipeline
+        self.collection_name = collection_name
+        self.batch_size = max(1, int(batch_size))
+        self.parse_workers = max(1, parse_workers or settings.INGEST_PARSE_WORKERS)
+        self.embed_workers = max(1, embed_workers or settings.INGEST_EMBED_WORKERS)
+        self.insert_workers = max(1, insert_workers or settings.INGEST_INSERT_WORKERS)
+        self.queue_size = max(1, queue_size or settings.INGEST_QUEUE_SIZE)
+        self.skip_unchanged = skip_unchanged
+
+        self.stats = IngestStats()
+        self.stage_metrics: Dict[str, StageMetrics] = {
+            stage: StageMetrics() for stage in self.STAGES
+        }
+        self._lock = threading.Lock()
+        # id -> set once the first batch holding that id has been written
+        self._first_writes: Dict[Any, threading.Event] = {}
+        self._errors: List[BaseException] = []
+
+    # ── Public API ───────────────────────────────────────────────────
+
+    def run(self, raw_chunks: Iterable[Any]) -> IngestStats:
+        """Drive ``raw_chunks`` through parse, embed and insert.
+
+        Args:
+            raw_chunks: Iterable of raw source data; each item is passed to
+                ``pipeline.parse()`` (typically ``pipeline.fetch_stream()``).
+
+        Returns:
+            Aggregated IngestStats for the run.
+
+        Raises:
+            Exception: The first fetch or parse error, re-raised after the
+                records already in flight have been written.
+        """
+        parse_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embed_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        insert_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        start = time.time()
+
+        with self.pipeline.collection_manager.bulk_ingest():
+            threads = [
+                self._spawn("fetch", 1, lambda: self._fetch(raw_chunks, parse_q),
+                            done=(parse_q, self.parse_workers)),
+                self._spawn("parse", self.parse_workers,
+                            lambda: self._consume(parse_q, self._parse, embed_q),
+                            done=(embed_q, self.embed_workers)),
+                self._spawn("embed", self.embed_workers,
+                            lambda: self._consume(embed_q, self._embed, insert_q),
+                            done=(insert_q, self.insert_workers)),
+                self._spawn("insert", self.insert_workers,
+                            lambda: self._consume(insert_q, self._insert, None)),
+            ]
+            for thread in threads:
+                thread.join()
+
+        self.pipeline.last_stats = self.stats
+        self._log_summary(time.time() - start)
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
+
+    # ── Stage plumbing ───────────────────────────────────────────────
+
+    def _spawn(
+        self,
+        stage: str,
+        workers: int,
+        target: Callable[[], None],
+        done: Optional[tuple] = None,
+    ) -> threading.Thread:
+        """Start ``workers`` threads, then signal ``done`` once all exit.
+
+        Returns a supervisor thread that joins the workers and puts one
+        sentinel per downstream worker on the downstream queue.
+        """
+        pool = [
+            threading.Thread(target=target, name=f"ingest-{stage}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in pool:
+            thread.start()
+
+        def _supervise() -> None:
+            for thread in pool:
+                thread.join()
+            if done is not None:
+                out_q, downstream = done
+                for _ in range(downstream):
+                    out_q.put(_DONE)
+
+        supervisor = threading.Thread(target=_supervise, name=f"ingest-{stage}", daemon=True)
+        supervisor.start()
+        return supervisor
+
+    def _consume(
+        self,
+        in_q: queue.Queue,
+        handler: Callable[[Any], Iterable[Any]],
+        out_q: Optional[queue.Queue],
+    ) -> None:
+        """Worker loop: apply ``handler`` to items until the sentinel."""
+        while True:
+            item = in_q.get()
+            if item is _DONE:
+                return
+            try:
+                results = list(handler(item))
+            except Exception as exc:
+                # Keep draining so upstream stages never block on a full queue
+                self._fail(handler.__name__.lstrip("_"), exc)
+                continue
+            if out_q is not None:
+                for result in results:
+                    out_q.put(result)
+
+    def _timed(self, stage: str, started: float, items: int, records: int) -> None:
+        duration = time.monotonic() - started
+        record_pipeline_stage(f"ingest_{stage}", duration)
+        with self._lock:
+            metrics = self.stage_metrics[stage]
+            metrics.items += items
+            metrics.records += records
+            metrics.busy_seconds += duration
+
+    def _fail(self, stage: str, exc: BaseException) -> None:
+        logger.error(f"Ingest {stage} stage failed for '{self.collection_name}': {exc}")
+        with self._lock:
+            self._errors.append(exc)
+
+    # ── Stages ───────────────────────────────────────────────────────
+
+    def _fetch(self, raw_chunks: Iterable[Any], parse_q: queue.Queue) -> None:
+        try:
+            iterator = iter(raw_chunks)
+            while True:
+                started = time.monotonic()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+                size = len(chunk) if hasattr(chunk, "__len__") else 1
+                self._timed("fetch", started, 1, size)
+                parse_q.put(chunk)
+        except Exception as exc:
+            self._fail("fetch", exc)
+
+    def _parse(self, chunk: Any) -> Iterable[List[Any]]:
+        started = time.monotonic()
+        try:
+            records = self.pipeline.parse(chunk)
+        except Exception as exc:
+            self._fail("parse", exc)
+            return []
+        self._timed("parse", started, 1, len(records))
+        return [
+            records[i : i + self.batch_size]
+            for i in range(0, len(records), self.batch_size)
+        ]
+
+    def _embed(self, records: List[Any]) -> Iterable[tuple]:
+        started = time.monotonic()
+        stats = IngestStats()
+        prepared = self.pipeline._prepare_records(records, self.collection_name, stats)
+        # An id already handled earlier in this run must be upserted (and
+        # re-checked), never inserted a second time
+        written = threading.Event()
+        with self._lock:
+            earlier = {
+                record_id: self._first_writes[record_id]
+                for record_id in prepared if record_id in self._first_writes
+            }
+            for record_id in prepared:
+                self._first_writes.setdefault(record_id, written)
+        try:
+            pending = [
+                p._replace(is_new=False) if p.is_new and p.record.get("id") in earlier else p
+                for p in self.pipeline._classify_records(
+                    prepared, self.collection_name, stats, self.skip_unchanged,
+                )
+            ]
+        except BaseException:
+            written.set()
+            raise
+        if not pending:
+            written.set()
+            self._merge(stats)
+            return []
+
+        try:
+            embeddings = self.pipeline._embed(
+                [p.text for p in pending], [p.digest for p in pending], stats,
+            )
+        except Exception as exc:
+            written.set()
+            stats.failed += len(pending)
+            logger.error(f"Failed to embed batch for '{self.collection_name}': {exc}")
+            self._merge(stats)
+            return []
+        self._merge(stats)
+        self._timed("embed", started, 1, len(pending))
+
+        # Insert workers run in parallel, so hold the upserts until the
+        # batch that inserted these ids has been written
+        for record_id in {p.record.get("id") for p in pending} & earlier.keys():
+            earlier[record_id].wait()
+        return [(list(zip(pending, embeddings)), written)]
+
+    def _insert(self, item: tuple) -> Iterable[Any]:
+        batch, written = item
+        started = time.monotonic()
+        pending: List[PendingRecord] = [p for p, _ in batch]
+        try:
+            self.pipeline._write_pending(pending, [e for _, e in batch], self.collection_name)
+        except Exception as exc:
+            logger.error(f"Failed to write batch into '{self.collection_name}': {exc}")
+            self._merge(IngestStats(failed=len(batch)))
+            return []
+        finally:
+            written.set()
+        self._merge(IngestStats(written=len(batch)))
+        self._timed("insert", started, 1, len(batch))
+        return []
+
+    # ── Reporting ────────────────────────────────────────────────────
+
+    def _merge(self, other: IngestStats) -> None:
+        with self._lock:
+            self.stats.merge(other)
+
+    def _log_summary(self, elapsed: float) -> None:
+        rates = ", ".join(
+            f"{stage} {m.records} in {m.busy_seconds:.1f}s ({m.records_per_second:.0f}/s)"
+            for stage, m in self.stage_metrics.items()
+        )
+        logger.info(
+            f"Pipelined ingest into '{self.collection_name}' finished in "
+            f"{elapsed:.1f}s: {self.stats} | {rates}"
+        )
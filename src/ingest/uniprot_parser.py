@@ -4,20 +4,31 @@ Fetches protein records for CAR-T target antigens via the UniProt REST API,
 parses JSON responses into SequenceRecord models, and stores embeddings
 in the cart_sequences Milvus collection.
 
+By default the whole result set is read from the ``/stream`` endpoint in
+one request, projected with ``fields=`` down to the annotations
+SequenceRecord uses (UNIPROT_FIELDS), and decoded entry by entry as the
+body arrives, so a wide query neither pages 500 entries at a time nor
+downloads full entries only to discard most of them.  Set
+``settings.UNIPROT_USE_STREAM = False`` (or pass ``stream=False``) for
+the paged ``/search`` endpoint with full entries.
+
 UniProt REST API docs: https://www.uniprot.org/help/api_queries
 
 Author: Adam Jones
 Date: February 2026
 """
 
-import time
-from typing import Any, Dict, List, Optional
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import requests
 from loguru import logger
 
+from config.settings import settings
 from src.collections import CARTCollectionManager
 from src.models import SequenceRecord
+from src.utils.http_client import HTTPClient, get_http_client
 
 from .base import BaseIngestPipeline
 
@@ -25,6 +36,31 @@ from .base import BaseIngestPipeline
 # UniProt REST API search endpoint
 UNIPROT_SEARCH_URL = "https://rest.uniprot.org/uniprotkb/search"
 
+# UniProt REST API stream endpoint (entire result set in one response)
+UNIPROT_STREAM_URL = "https://rest.uniprot.org/uniprotkb/stream"
+
+# Return fields read by _parse_single_entry; everything else is dropped
+# server-side (cross-references, publications, keywords, most comments)
+UNIPROT_FIELDS = (
+    "accession",
+    "protein_name",
+    "gene_primary",
+    "organism_name",
+    "length",
+    "mass",
+    "sequence",
+    "cc_function",
+    "ft_binding",
+    "ft_act_site",
+    "ft_region",
+    "ft_domain",
+    "ft_topo_dom",
+)
+
+# Entries per chunk yielded by fetch_stream(), and bytes per body read
+STREAM_CHUNK_SIZE = 100
+STREAM_READ_BYTES = 64 * 1024
+
 # Default query for CAR-T target proteins
 DEFAULT_QUERY = "CD19 OR BCMA OR TNFRSF17 OR MS4A1"
 
@@ -50,11 +86,57 @@ _GENE_TO_ANTIGEN: Dict[str, str] = {
     "CS1": "CS1/SLAMF7",
 }
 
-# Maximum retry attempts for network requests
-MAX_RETRIES = 3
+# UniProt returns JSON for both the first page and Link-header follow-ups
+JSON_HEADERS = {"Accept": "application/json"}
+
+
+def iter_results(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Incrementally decode the entries of a ``{"results": [...]}`` body.
+
+    Each entry is yielded as soon as its closing brace has arrived, so
+    memory is bounded by one entry plus one read rather than the whole
+    response.
+
+    Args:
+        chunks: Decoded text pieces of the response body, in order.
 
-# Delay between requests to be respectful to UniProt servers
-REQUEST_DELAY_SEC = 0.5
+    Yields:
+        UniProt entry dicts.
+
+    Raises:
+        ValueError: If the body ends before the results array is closed.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    in_array = False
+    closed = False
+
+    for chunk in chunks:
+        buffer += chunk
+        if not in_array:
+            start = buffer.find("[")
+            if start < 0:
+                continue
+            buffer = buffer[start + 1:]
+            in_array = True
+        while True:
+            buffer = buffer.lstrip()
+            if buffer.startswith(","):
+                buffer = buffer[1:].lstrip()
+            if buffer.startswith("]"):
+                closed = True
+                break
+            try:
+                entry, end = decoder.raw_decode(buffer)
+            except ValueError:
+                break  # entry not complete yet; read more
+            yield entry
+            buffer = buffer[end:]
+        if closed:
+            return
+
+    if not closed:
+        raise ValueError("UniProt stream ended before the results array was closed")
 
 
 class UniProtIngestPipeline(BaseIngestPipeline):
@@ -80,25 +162,32 @@ class UniProtIngestPipeline(BaseIngestPipeline):
         self,
         collection_manager: CARTCollectionManager,
         embedder: Any,
+        http_client: Optional[HTTPClient] = None,
     ):
         """Initialize the UniProt ingest pipeline.
 
         Args:
             collection_manager: CARTCollectionManager for Milvus operations.
             embedder: Embedding model with encode() method.
+            http_client: Shared HTTP client (retries, UniProt rate limit,
+                response cache).  Defaults to get_http_client().
         """
         super().__init__(collection_manager, embedder)
+        self.http = http_client or get_http_client()
 
     def fetch(
         self,
         query: str = DEFAULT_QUERY,
         max_results: int = 50,
         format: str = "json",
+        stream: Optional[bool] = None,
     ) -> List[Dict[str, Any]]:
         """Fetch protein records from the UniProt REST API.
 
-        Uses the UniProt search endpoint with a query targeting CAR-T-relevant
-        proteins. Retrieves results in JSON format with full protein annotations.
+        Uses the stream endpoint with a field projection (see
+        fetch_stream()) unless streaming is disabled, in which case the
+        search endpoint is paged via Link headers with full protein
+        annotations.
 
         API endpoint: https://rest.uniprot.org/uniprotkb/search
         Query parameters:
@@ -110,10 +199,21 @@ class UniProtIngestPipeline(BaseIngestPipeline):
             query: UniProt search query string for CAR-T target proteins.
             max_results: Maximum number of protein entries to retrieve.
             format: Response format (default: json).
+            stream: Use the stream endpoint.  Defaults to
+                settings.UNIPROT_USE_STREAM.
 
         Returns:
             List of protein entry JSON objects from the UniProt API.
         """
+        if settings.UNIPROT_USE_STREAM if stream is None else stream:
+            entries = [
+                entry
+                for chunk in self.fetch_stream(query=query, max_results=max_results)
+                for entry in chunk
+            ]
+            logger.info(f"UniProt fetch complete: {len(entries)} protein entries")
+            return entries
+
         params: Dict[str, Any] = {
             "query": query,
             "format": format,
@@ -125,7 +225,7 @@ class UniProtIngestPipeline(BaseIngestPipeline):
         page_num = 0
 
         # First request
-        response = self._request_with_retry(UNIPROT_SEARCH_URL, params)
+        response = self.http.get(UNIPROT_SEARCH_URL, params, headers=JSON_HEADERS)
         if response is None:
             logger.warning("UniProt API unavailable; returning empty result set")
             return []
@@ -147,9 +247,7 @@ class UniProtIngestPipeline(BaseIngestPipeline):
             if not next_url:
                 break
 
-            time.sleep(REQUEST_DELAY_SEC)
-
-            response = self._request_with_retry(next_url, params=None)
+            response = self.http.get(next_url, headers=JSON_HEADERS)
             if response is None:
                 logger.warning("UniProt pagination request failed; stopping")
                 break
@@ -171,6 +269,63 @@ class UniProtIngestPipeline(BaseIngestPipeline):
         logger.info(f"UniProt fetch complete: {len(trimmed)} protein entries")
         return trimmed
 
+    def fetch_stream(
+        self,
+        query: str = DEFAULT_QUERY,
+        max_results: int = 50,
+        fields: Iterable[str] = UNIPROT_FIELDS,
+        **kwargs,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield projected protein entries from the stream endpoint.
+
+        One request returns the whole result set; only ``fields`` are
+        included in each entry.  Entries are decoded as the body arrives
+        and yielded in chunks of STREAM_CHUNK_SIZE, and the connection is
+        closed as soon as ``max_results`` entries have been read.  A
+        connection or decoding error mid-body ends the stream after the
+        entries already received.
+
+        API endpoint: https://rest.uniprot.org/uniprotkb/stream
+        Query parameters:
+            query  — UniProt query string (supports field searches)
+            format — response format (json)
+            fields — comma-separated return fields
+
+        Args:
+            query: UniProt search query string for CAR-T target proteins.
+            max_results: Maximum number of protein entries to yield.
+            fields: UniProt return fields to request.
+            **kwargs: Ignored (accepts the fetch() keyword arguments).
+
+        Yields:
+            Lists of protein entry JSON objects.
+        """
+        params = {"query": query, "format": "json", "fields": ",".join(fields)}
+        response = self.http.stream(UNIPROT_STREAM_URL, params, headers=JSON_HEADERS)
+        if response is None:
+            logger.warning("UniProt API unavailable; returning empty result set")
+            return
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        text = (decoder.decode(b) for b in response.iter_content(STREAM_READ_BYTES))
+        chunk: List[Dict[str, Any]] = []
+        count = 0
+        with response:
+            try:
+                for entry in iter_results(text):
+                    chunk.append(entry)
+                    count += 1
+                    if len(chunk) >= STREAM_CHUNK_SIZE or count >= max_results:
+                        yield chunk
+                        chunk = []
+                    if count >= max_results:
+                        break
+            except (requests.RequestException, ValueError) as exc:
+                logger.error(f"UniProt stream interrupted after {count} entries: {exc}")
+        if chunk:
+            yield chunk
+        logger.info(f"UniProt stream: {count} projected entries")
+
     def parse(self, raw_data: List[Dict[str, Any]]) -> List[SequenceRecord]:
         """Parse UniProt protein entries into SequenceRecord models.
 
@@ -527,65 +682,6 @@ class UniProtIngestPipeline(BaseIngestPipeline):
                     return url
         return None
 
-    @staticmethod
-    def _request_with_retry(
-        url: str,
-        params: Optional[Dict[str, Any]],
-        max_retries: int = MAX_RETRIES,
-    ) -> Optional[requests.Response]:
-        """Make an HTTP GET request with retry logic.
-
-        Args:
-            url: Request URL.
-            params: Query parameters (None for paginated follow-up requests
-                where the URL already contains parameters).
-            max_retries: Maximum number of retry attempts.
-
-        Returns:
-            requests.Response on success, None on failure.
-        """
-        for attempt in range(1, max_retries + 1):
-            try:
-                kwargs: Dict[str, Any] = {
-                    "headers": {"Accept": "application/json"},
-                    "timeout": 30,
-                }
-                if params is not None:
-                    kwargs["params"] = params
-
-                response = requests.get(url, **kwargs)
-                response.raise_for_status()
-                return response
-            except requests.exceptions.HTTPError as exc:
-                status_code = exc.response.status_code if exc.response else 0
-                if status_code == 429:
-                    wait = 2 ** attempt
-                    logger.warning(
-                        f"UniProt rate limited (429); retrying in {wait}s "
-                        f"(attempt {attempt}/{max_retries})"
-                    )
-                    time.sleep(wait)
-                    continue
-                logger.warning(
-                    f"UniProt HTTP error {status_code} on attempt "
-                    f"{attempt}/{max_retries}: {exc}"
-                )
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-            except requests.exceptions.RequestException as exc:
-                logger.warning(
-                    f"UniProt request failed on attempt "
-                    f"{attempt}/{max_retries}: {exc}"
-                )
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-
-        return None
-
     def run(
         self,
         collection_name: Optional[str] = None,
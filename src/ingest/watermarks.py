@@ -0,0 +1,150 @@
+"""Persisted per-source ingest watermarks for delta refreshes.
+
+A watermark records when a source was last ingested *completely*.  The
+scheduler passes it back to the source's ``fetch`` as ``since`` so each
+refresh only asks the upstream API for records added or updated after
+it (PubMed ``mindate`` with ``datetype=edat``; ClinicalTrials.gov
+``LastUpdatePostDate``).  Anything re-fetched because of the overlap
+window is recognised by its unchanged content hash and skipped, and
+changed records are upserted, so overlap is cheap and a delta run is
+always safe to repeat.
+
+The store is a small JSON file (``settings.INGEST_WATERMARK_FILE``)
+written atomically; a missing or unreadable file means "no watermark",
+which makes the next run a full refresh.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from config.settings import settings
+
+WATERMARKS_VERSION = 1
+
+
+class WatermarkStore:
+    """JSON-backed ``source -> last complete ingest time`` map.
+
+    Usage:
+        watermarks = WatermarkStore()
+        since = watermarks.since("pubmed")          # date or None
+        started = datetime.now(timezone.utc)
+        ...run the delta ingest...
+        watermarks.advance("pubmed", started, records=count)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        overlap_hours: Optional[float] = None,
+    ):
+        """Initialize the store.
+
+        Args:
+            path: JSON file location.  Defaults to settings.INGEST_WATERMARK_FILE.
+            overlap_hours: How far before the stored watermark a delta
+                query starts, to cover late-indexed records and the
+                day granularity of both upstream date filters.  Defaults
+                to settings.INGEST_WATERMARK_OVERLAP_HOURS.
+        """
+        self.path = Path(path or settings.INGEST_WATERMARK_FILE)
+        self.overlap = timedelta(
+            hours=settings.INGEST_WATERMARK_OVERLAP_HOURS
+            if overlap_hours is None else overlap_hours
+        )
+        self._lock = threading.Lock()
+
+    # ── Public API ───────────────────────────────────────────────────
+
+    def get(self, source: str) -> Optional[datetime]:
+        """Return the stored watermark for a source, or None."""
+        entry = self._load().get(source)
+        if not entry:
+            return None
+        try:
+            return datetime.fromisoformat(entry["watermark"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed ingest watermark for '{source}'")
+            return None
+
+    def since(self, source: str) -> Optional[date]:
+        """Start date for a delta query: watermark minus the overlap.
+
+        Returns:
+            A UTC date, or None when the source has never completed a run
+            (the caller should then do a full refresh).
+        """
+        watermark = self.get(source)
+        if watermark is None:
+            return None
+        return (watermark - self.overlap).astimezone(timezone.utc).date()
+
+    def advance(self, source: str, started_at: datetime, **details: Any) -> None:
+        """Record a completed run.
+
+        Pass the time the run *started*, so records that appeared while it
+        was running are picked up next time.
+
+        Args:
+            source: Source name (e.g. "pubmed").
+            started_at: Timezone-aware start time of the completed run.
+            **details: Extra fields stored alongside (e.g. records=120).
+        """
+        if started_at.tzinfo is None:
+            started_at = started_at.replace(tzinfo=timezone.utc)
+        with self._lock:
+            data = self._load()
+            data[source] = {
+                "watermark": started_at.isoformat(),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                **details,
+            }
+            self._save(data)
+        logger.info(f"Ingest watermark for '{source}' advanced to {started_at.isoformat()}")
+
+    def reset(self, source: str) -> None:
+        """Forget a source's watermark so its next run is a full refresh."""
+        with self._lock:
+            data = self._load()
+            if data.pop(source, None) is not None:
+                self._save(data)
+
+    # ── Persistence ──────────────────────────────────────────────────
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as fh:
+                payload = json.load(fh)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ingest watermarks at {self.path}: {e}")
+            return {}
+        if payload.get("version") != WATERMARKS_VERSION:
+            logger.warning(f"Ignoring ingest watermarks at {self.path}: unsupported version")
+            return {}
+        return dict(payload.get("sources", {}))
+
+    def _save(self, data: Dict[str, Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                json.dump({"version": WATERMARKS_VERSION, "sources": data}, fh, indent=2)
+            os.replace(tmp, self.path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
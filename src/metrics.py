@@ -93,9 +93,16 @@ try:
     MILVUS_SEARCH_LATENCY = Histogram(
         "cart_milvus_search_latency_seconds",
         "Milvus vector search latency",
+        ["collection"],
         buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1, 2],
     )
 
+    MILVUS_SEARCH_TIMEOUTS = Counter(
+        "cart_milvus_search_timeouts_total",
+        "Collection searches dropped for missing the request deadline",
+        ["collection"],
+    )
+
     MILVUS_UPSERT_LATENCY = Histogram(
         "cart_milvus_upsert_latency_seconds",
         "Milvus upsert latency",
@@ -161,6 +168,39 @@ try:
         ["service"],
     )
 
+    # ── API admission control ─────────────────────────────────────────
+    ADMISSION_IN_FLIGHT = Gauge(
+        "cart_admission_in_flight",
+        "Requests running per admission lane",
+        ["lane"],
+    )
+
+    ADMISSION_QUEUE_DEPTH = Gauge(
+        "cart_admission_queue_depth",
+        "Requests waiting for a slot per admission lane",
+        ["lane"],
+    )
+
+    ADMISSION_WAIT = Histogram(
+        "cart_admission_wait_seconds",
+        "Time admitted requests spent queued",
+        ["lane"],
+        buckets=[0, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10],
+    )
+
+    ADMISSION_REJECTED = Counter(
+        "cart_admission_rejected_total",
+        "Requests rejected by admission control",
+        ["lane", "reason"],
+    )
+
+    # ── Request coalescing ────────────────────────────────────────────
+    SINGLE_FLIGHT_SHARED = Counter(
+        "cart_single_flight_shared_total",
+        "Calls served by an identical call already in flight",
+        ["flight"],
+    )
+
     _PROMETHEUS_AVAILABLE = True
 
 except ImportError:
@@ -213,6 +253,7 @@ except ImportError:
     EMBEDDING_LATENCY = _NoOpLabeled()                 # type: ignore[assignment]
     PIPELINE_STAGE_DURATION = _NoOpLabeled()           # type: ignore[assignment]
     MILVUS_SEARCH_LATENCY = _NoOpLabeled()             # type: ignore[assignment]
+    MILVUS_SEARCH_TIMEOUTS = _NoOpLabeled()            # type: ignore[assignment]
     MILVUS_UPSERT_LATENCY = _NoOpLabeled()             # type: ignore[assignment]
     LLM_COST_ESTIMATE = _NoOpLabeled()                 # type: ignore[assignment]
     EMBEDDING_CACHE_HITS = _NoOpGauge()                # type: ignore[assignment]
@@ -221,6 +262,11 @@ except ImportError:
     EVENT_BUS_EVENTS_EMITTED = _NoOpLabeled()          # type: ignore[assignment]
     REPORT_GENERATED = _NoOpLabeled()                  # type: ignore[assignment]
     CIRCUIT_BREAKER_STATE = _NoOpLabeled()             # type: ignore[assignment]
+    ADMISSION_IN_FLIGHT = _NoOpLabeled()               # type: ignore[assignment]
+    ADMISSION_QUEUE_DEPTH = _NoOpLabeled()             # type: ignore[assignment]
+    ADMISSION_WAIT = _NoOpLabeled()                    # type: ignore[assignment]
+    ADMISSION_REJECTED = _NoOpLabeled()                # type: ignore[assignment]
+    SINGLE_FLIGHT_SHARED = _NoOpLabeled()              # type: ignore[assignment]
 
     def generate_latest() -> bytes:  # type: ignore[misc]
         return b""
@@ -355,13 +401,23 @@ def record_pipeline_stage(stage: str, duration: float) -> None:
     PIPELINE_STAGE_DURATION.labels(stage=stage).observe(duration)
 
 
-def record_milvus_search(latency: float) -> None:
+def record_milvus_search(latency: float, collection: str = "unknown") -> None:
     """Record Milvus vector search latency.
 
     Args:
         latency: Search time in **seconds**.
+        collection: Collection that was searched.
+    """
+    MILVUS_SEARCH_LATENCY.labels(collection=collection).observe(latency)
+
+
+def record_milvus_search_timeout(collection: str) -> None:
+    """Record a collection search that missed its request deadline.
+
+    Args:
+        collection: Collection whose result was dropped.
     """
-    MILVUS_SEARCH_LATENCY.observe(latency)
+    MILVUS_SEARCH_TIMEOUTS.labels(collection=collection).inc()
 
 
 def record_milvus_upsert(latency: float) -> None:
@@ -391,6 +447,47 @@ def record_report_generated(fmt: str) -> None:
     REPORT_GENERATED.labels(format=fmt).inc()
 
 
+def record_admission_state(lane: str, in_flight: int, queued: int) -> None:
+    """Set the current occupancy of an API admission lane.
+
+    Args:
+        lane: Lane name (e.g. ``"search"``, ``"llm"``).
+        in_flight: Requests currently running in the lane.
+        queued: Requests currently waiting for a slot.
+    """
+    ADMISSION_IN_FLIGHT.labels(lane=lane).set(in_flight)
+    ADMISSION_QUEUE_DEPTH.labels(lane=lane).set(queued)
+
+
+def record_admission_wait(lane: str, waited: float) -> None:
+    """Record how long an admitted request waited for its slot.
+
+    Args:
+        lane: Lane name.
+        waited: Queue wait in **seconds** (0 when admitted immediately).
+    """
+    ADMISSION_WAIT.labels(lane=lane).observe(waited)
+
+
+def record_admission_rejected(lane: str, reason: str) -> None:
+    """Record a request rejected by admission control.
+
+    Args:
+        lane: Lane name.
+        reason: ``"queue_full"`` (429) or ``"queue_timeout"`` (503).
+    """
+    ADMISSION_REJECTED.labels(lane=lane, reason=reason).inc()
+
+
+def record_single_flight_shared(flight: str) -> None:
+    """Record a call that reused an identical in-flight call's result.
+
+    Args:
+        flight: SingleFlight name (e.g. ``"retrieve"``).
+    """
+    SINGLE_FLIGHT_SHARED.labels(flight=flight).inc()
+
+
 def get_metrics_text() -> str:
     """Return the current Prometheus metrics exposition in text format.
 
@@ -435,6 +435,7 @@ class CrossCollectionResult(BaseModel):
     knowledge_context: str = ""
     total_collections_searched: int = 0
     search_time_ms: float = 0.0
+    timed_out_collections: List[str] = Field(default_factory=list)
 
     @property
     def hit_count(self) -> int:
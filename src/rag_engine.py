@@ -10,25 +10,57 @@ Author: Adam Jones
 Date: February 2026
 """
 
+import asyncio
+import functools
 import logging
 import re
+import threading
 import time
-from typing import Dict, Generator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any, AsyncIterator, Callable, Dict, Generator, Iterator, List, Optional, Tuple,
+)
 
 from config.settings import settings
 
+from .embedding_cache import BGE_QUERY_PREFIX, EmbeddingCache, normalize_text
+from .expansion_embeddings import ExpansionEmbeddingTable
 from .models import (
     AgentQuery,
     CARTStage,
     CrossCollectionResult,
     SearchHit,
 )
+from .single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 # Allowed characters for Milvus filter expressions to prevent injection
 _SAFE_FILTER_RE = re.compile(r"^[A-Za-z0-9 _.\-/]+$")
 
+# Admission lane of the current request (api/admission.py); each lane's
+# async retrievals run on their own pool so one lane cannot starve another
+_retrieval_lane: ContextVar[Optional[str]] = ContextVar("cart_retrieval_lane", default=None)
+
+
+@contextmanager
+def retrieval_lane(name: Optional[str]) -> Iterator[None]:
+    """Route async retrievals in this context to ``name``'s retrieval pool.
+
+    Set by AdmissionLane.admit(); asyncio tasks started inside the block
+    inherit it.  ``None`` selects the shared default pool.
+    """
+    previous = _retrieval_lane.get()
+    _retrieval_lane.set(name)
+    try:
+        yield
+    finally:
+        # set() rather than reset(): an async generator may be closed in
+        # a different context than the one it was entered in
+        _retrieval_lane.set(previous)
+
 # ═══════════════════════════════════════════════════════════════════════
 # SYSTEM PROMPT
 # ═══════════════════════════════════════════════════════════════════════
@@ -100,6 +132,10 @@ STAGE_COLLECTION_BOOST: Dict[CARTStage, List[str]] = {
     CARTStage.TARGET_ID: ["cart_literature", "cart_biomarkers"],
 }
 
+# Collections always searched under the "stage" routing policy — cross-cutting
+# evidence (papers, trials) that answers for every development stage cite
+STAGE_ROUTING_CORE_COLLECTIONS: List[str] = ["cart_literature", "cart_trials"]
+
 # Known target antigens — derived from knowledge graph (single source of truth)
 from .knowledge import CART_TARGETS
 
@@ -124,15 +160,36 @@ class CARTRAGEngine:
     - Collection selection filtering
     - Cross-collection entity linking
     - Conversation memory context injection
+
+    Async callers (the FastAPI endpoints) use aretrieve / agenerate /
+    aquery / aquery_stream / afind_related, which run the blocking calls on two managed
+    worker pools (retrieval and LLM generation) so the event loop keeps
+    serving other requests while they are in flight.
+
+    Concurrent identical retrievals (same normalized question, filters,
+    year range and stages) are coalesced: one caller runs the search and
+    the others share its result.
     """
 
     def __init__(self, collection_manager, embedder, llm_client,
-                 knowledge=None, query_expander=None):
+                 knowledge=None, query_expander=None, embedding_cache=None,
+                 expansion_table=None):
         self.collections = collection_manager
         self.embedder = embedder
         self.llm = llm_client
         self.knowledge = knowledge
         self.expander = query_expander
+        if embedding_cache is None and settings.EMBEDDING_CACHE_ENABLED:
+            embedding_cache = EmbeddingCache.from_settings()
+        self.embedding_cache = embedding_cache
+        if expansion_table is None and query_expander is not None:
+            expansion_table = ExpansionEmbeddingTable.load(settings.EXPANSION_EMBEDDINGS_DIR)
+        self.expansion_table = expansion_table
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._pool_lock = threading.Lock()
+        self._retrievals = (
+            SingleFlight("retrieve") if settings.RETRIEVE_SINGLE_FLIGHT_ENABLED else None
+        )
 
     def _compute_boosted_weights(self, stages: List[CARTStage]) -> Dict[str, float]:
         """Compute adjusted collection weights based on relevant CAR-T stages.
@@ -187,77 +244,178 @@ class CARTRAGEngine:
             year_max: Optional maximum year filter
             conversation_context: Optional prior conversation context for follow-ups
             stages: Optional list of CARTStage values for dynamic weight boosting
+
+        Callers that arrive while an identical retrieval is already in
+        flight wait for it instead of searching again.
         """
-        top_k = top_k_per_collection or settings.TOP_K_PER_COLLECTION
-        start = time.time()
+        kwargs = dict(
+            top_k_per_collection=top_k_per_collection,
+            collections_filter=collections_filter,
+            year_min=year_min,
+            year_max=year_max,
+            conversation_context=conversation_context,
+            stages=stages,
+        )
+        if self._retrievals is None:
+            return self.retrieve_many([query], **kwargs)[0]
+        result = self._retrievals.do(
+            self._retrieval_key(query, **kwargs),
+            lambda: self.retrieve_many([query], **kwargs)[0],
+        )
+        return self._share_result(result, query)
+
+    def _retrieval_key(self, query: AgentQuery,
+                       top_k_per_collection: int = None,
+                       collections_filter: List[str] = None,
+                       year_min: int = None,
+                       year_max: int = None,
+                       conversation_context: str = None,
+                       stages: List[CARTStage] = None) -> tuple:
+        """Identity of a retrieve() call for single-flight coalescing."""
+        return (
+            normalize_text(query.question),
+            query.target_antigen,
+            query.cart_stage,
+            query.include_genomic,
+            tuple(sorted(collections_filter)) if collections_filter else None,
+            year_min,
+            year_max,
+            tuple(stages) if stages else None,
+            top_k_per_collection or settings.TOP_K_PER_COLLECTION,
+            conversation_context,
+        )
 
-        # Optionally prepend conversation context for follow-up queries
-        search_text = query.question
-        if conversation_context:
-            search_text = f"{conversation_context}\n\nCurrent question: {query.question}"
+    @staticmethod
+    def _share_result(result: CrossCollectionResult,
+                      query: AgentQuery) -> CrossCollectionResult:
+        """Per-caller copy of a coalesced result.
 
-        # Step 1: Embed query
-        query_embedding = self._embed_query(search_text)
+        Callers extend ``hits`` with sub-question evidence, so each gets
+        its own lists; the SearchHit objects themselves are shared.
+        """
+        return result.model_copy(update={
+            "query": query.question,
+            "hits": list(result.hits),
+            "timed_out_collections": list(result.timed_out_collections),
+        })
+
+    def retrieve_many(self, queries: List[AgentQuery],
+                      top_k_per_collection: int = None,
+                      collections_filter: List[str] = None,
+                      year_min: int = None,
+                      year_max: int = None,
+                      conversation_context: str = None,
+                      stages: List[CARTStage] = None,
+                      embeddings: List = None) -> List[CrossCollectionResult]:
+        """Retrieve evidence for several queries with batched vector search.
+
+        All queries are embedded in one batched encode call, and queries
+        that resolve to the same per-collection filter expressions share
+        one multi-vector ``search_all_many`` call, so K sub-questions cost
+        one request per collection instead of K.
 
-        # Step 2: Determine collections to search
-        collections_to_search = collections_filter or list(COLLECTION_CONFIG.keys())
+        Args:
+            queries: Agent queries to answer (order is preserved).
+            top_k_per_collection: Max results per collection (default from settings)
+            collections_filter: Optional list of collection names to search
+            year_min: Optional minimum year filter
+            year_max: Optional maximum year filter
+            conversation_context: Optional prior conversation context for follow-ups
+            stages: Optional list of CARTStage values for dynamic weight boosting
+            embeddings: Optional precomputed query embeddings (one per
+                query, from embed_queries()); skips the embedding step
 
-        # Step 3: Build per-collection filters
-        filter_exprs = {}
-        for coll in collections_to_search:
-            parts = []
-            cfg = COLLECTION_CONFIG.get(coll, {})
-            if query.target_antigen and cfg.get("has_target_antigen"):
-                # Sanitize user input before embedding in filter expression
-                safe_antigen = query.target_antigen.strip()
-                if _SAFE_FILTER_RE.match(safe_antigen):
-                    parts.append(f'target_antigen == "{safe_antigen}"')
-                else:
-                    logger.warning("Rejected unsafe target_antigen filter value: %r", safe_antigen)
-            year_field = cfg.get("year_field")
-            if year_field:
-                if year_min:
-                    parts.append(f'{year_field} >= {int(year_min)}')
-                if year_max:
-                    parts.append(f'{year_field} <= {int(year_max)}')
-            if parts:
-                filter_exprs[coll] = " and ".join(parts)
+        Returns:
+            One CrossCollectionResult per query.  ``search_time_ms`` is the
+            wall-clock time of the whole batch.
+        """
+        if not queries:
+            return []
+
+        top_k = top_k_per_collection or settings.TOP_K_PER_COLLECTION
+        start = time.time()
+
+        # Step 1: Embed all queries in one batch (optionally prefixed with
+        # conversation context) unless the caller already did
+        if embeddings is None:
+            search_texts = [query.question for query in queries]
+            if conversation_context:
+                search_texts = [
+                    f"{conversation_context}\n\nCurrent question: {text}"
+                    for text in search_texts
+                ]
+            embeddings = self.embed_queries(search_texts)
+
+        # Step 2: Route each query to only the collections it needs
+        routed = [
+            self._route_collections(query, collections_filter, stages)
+            for query in queries
+        ]
+
+        # Step 3: Build per-collection filters and group queries that share
+        # both their collection set and their filters
+        groups: Dict[tuple, List[int]] = {}
+        group_filters: Dict[tuple, Dict[str, str]] = {}
+        for idx, query in enumerate(queries):
+            filter_exprs = self._build_filter_exprs(
+                query, routed[idx], year_min, year_max,
+            )
+            key = (tuple(routed[idx]), tuple(sorted(filter_exprs.items())))
+            groups.setdefault(key, []).append(idx)
+            group_filters[key] = filter_exprs
 
         # Step 3b: Compute boosted weights if stages provided
         boosted_weights = None
         if stages:
             boosted_weights = self._compute_boosted_weights(stages)
 
-        # Step 4: Parallel search across all collections
-        all_hits = self._search_all_collections(
-            query_embedding, collections_to_search, top_k, filter_exprs,
-            weight_overrides=boosted_weights,
-        )
-
-        # Step 5: Query expansion (semantic search, not field-filter)
-        if self.expander:
-            expanded_hits = self._expanded_search(
-                query.question, query_embedding, collections_to_search, top_k,
+        # Step 4: One batched parallel search per filter group
+        all_hits: List[List[SearchHit]] = [[] for _ in queries]
+        timed_out: List[List[str]] = [[] for _ in queries]
+        for key, indices in groups.items():
+            group_hits, group_timed_out = self._search_all_collections(
+                [embeddings[i] for i in indices], list(key[0]), top_k,
+                group_filters[key], weight_overrides=boosted_weights,
             )
-            all_hits.extend(expanded_hits)
+            for idx, hits in zip(indices, group_hits):
+                all_hits[idx].extend(hits)
+                timed_out[idx] = group_timed_out
 
-        # Step 6: Deduplicate, score citations, rank
-        hits = self._merge_and_rank(all_hits)
+        results = []
+        for idx, query in enumerate(queries):
+            # Step 5: Query expansion (semantic search, not field-filter)
+            if self.expander:
+                all_hits[idx].extend(self._expanded_search(
+                    query.question, embeddings[idx], routed[idx], top_k,
+                ))
 
-        # Step 7: Full knowledge graph augmentation
-        knowledge_context = ""
-        if self.knowledge:
-            knowledge_context = self._get_knowledge_context(query.question)
+            # Step 6: Deduplicate, score citations, rank
+            hits = self._merge_and_rank(all_hits[idx])
+
+            # Step 7: Full knowledge graph augmentation
+            knowledge_context = ""
+            if self.knowledge:
+                knowledge_context = self._get_knowledge_context(query.question)
+
+            results.append((query, hits, knowledge_context, len(routed[idx]), timed_out[idx]))
+
+        # Step 8: Fetch full text for the surviving hits only
+        if settings.SEARCH_PROJECTION_ENABLED:
+            self._hydrate_hits([hit for _, hits, *_ in results for hit in hits])
 
         elapsed = (time.time() - start) * 1000
 
-        return CrossCollectionResult(
-            query=query.question,
-            hits=hits,
-            knowledge_context=knowledge_context,
-            total_collections_searched=len(collections_to_search),
-            search_time_ms=elapsed,
-        )
+        return [
+            CrossCollectionResult(
+                query=query.question,
+                hits=hits,
+                knowledge_context=knowledge_context,
+                total_collections_searched=searched,
+                search_time_ms=elapsed,
+                timed_out_collections=late,
+            )
+            for query, hits, knowledge_context, searched, late in results
+        ]
 
     def query(self, question: str, **kwargs) -> str:
         """Full RAG query: retrieve evidence + generate LLM response."""
@@ -290,6 +448,152 @@ class CARTRAGEngine:
             yield {"type": "token", "content": token}
         yield {"type": "done", "content": full_answer}
 
+    # ── Async request path ─────────────────────────────────────────
+
+    async def aretrieve(self, query: AgentQuery, **kwargs) -> CrossCollectionResult:
+        """retrieve() on the retrieval pool; takes the same arguments.
+
+        If an identical retrieval is already in flight, awaits it on the
+        event loop instead of tying up a worker thread.
+        """
+        if self._retrievals is not None:
+            pending = self._retrievals.pending(self._retrieval_key(query, **kwargs))
+            if pending is not None:
+                # shield: a disconnecting waiter must not cancel the shared call
+                result = await asyncio.shield(asyncio.wrap_future(pending))
+                return self._share_result(result, query)
+        return await self._run_in_pool("retrieve", self.retrieve, query, **kwargs)
+
+    async def aretrieve_many(self, queries: List[AgentQuery],
+                             **kwargs) -> List[CrossCollectionResult]:
+        """retrieve_many() on the retrieval pool; takes the same arguments."""
+        return await self._run_in_pool("retrieve", self.retrieve_many, queries, **kwargs)
+
+    async def aembed_queries(self, texts: List[str]) -> List:
+        """embed_queries() on the retrieval pool."""
+        return await self._run_in_pool("retrieve", self.embed_queries, texts)
+
+    async def agenerate(self, prompt: str, system_prompt: str = CART_SYSTEM_PROMPT,
+                        max_tokens: int = 2048, temperature: float = 0.7) -> str:
+        """llm.generate() on the generation pool."""
+        return await self._run_in_pool(
+            "generate", self.llm.generate,
+            prompt=prompt, system_prompt=system_prompt,
+            max_tokens=max_tokens, temperature=temperature,
+        )
+
+    async def aquery(self, question: str, **kwargs) -> str:
+        """Async full RAG query: aretrieve() then agenerate()."""
+        agent_query = AgentQuery(question=question, **kwargs)
+        evidence = await self.aretrieve(agent_query)
+        return await self.agenerate(self._build_prompt(agent_query.question, evidence))
+
+    async def aquery_stream(self, query: AgentQuery,
+                            **retrieve_kwargs) -> AsyncIterator[Dict]:
+        """Async query_stream(): evidence as soon as retrieval finishes, then tokens.
+
+        Yields the same ``evidence`` / ``token`` / ``done`` dicts as
+        query_stream().  Retrieval runs on the retrieval pool and the
+        blocking ``llm.generate_stream`` iterator on the generation pool;
+        tokens are handed to the event loop as they are produced.  If the
+        consumer stops early the worker abandons the LLM stream at the
+        next token.
+
+        Args:
+            query: The agent query.
+            **retrieve_kwargs: Passed to retrieve() (collections_filter,
+                year_min, year_max, ...).
+        """
+        evidence = await self.aretrieve(query, **retrieve_kwargs)
+        yield {"type": "evidence", "content": evidence}
+
+        prompt = self._build_prompt(query.question, evidence)
+        full_answer = ""
+        async for token in self._astream_tokens(prompt):
+            full_answer += token
+            yield {"type": "token", "content": token}
+        yield {"type": "done", "content": full_answer}
+
+    async def _astream_tokens(self, prompt: str) -> AsyncIterator[str]:
+        """Drive llm.generate_stream on the generation pool, yielding tokens."""
+        loop = asyncio.get_running_loop()
+        tokens: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def put(kind: str, value: Any = None) -> None:
+            try:
+                loop.call_soon_threadsafe(tokens.put_nowait, (kind, value))
+            except RuntimeError:
+                stop.set()  # event loop already closed
+
+        def produce() -> None:
+            try:
+                for token in self.llm.generate_stream(
+                    prompt=prompt,
+                    system_prompt=CART_SYSTEM_PROMPT,
+                    max_tokens=2048,
+                    temperature=0.7,
+                ):
+                    if stop.is_set():
+                        return
+                    put("token", token)
+            except Exception as exc:
+                put("error", exc)
+            else:
+                put("end")
+
+        loop.run_in_executor(self._get_pool("generate"), produce)
+        try:
+            while True:
+                kind, value = await tokens.get()
+                if kind == "end":
+                    return
+                if kind == "error":
+                    raise value
+                yield value
+        finally:
+            stop.set()
+
+    async def afind_related(self, entity: str, top_k: int = 5) -> Dict[str, List[SearchHit]]:
+        """find_related() on the retrieval pool."""
+        return await self._run_in_pool("retrieve", self.find_related, entity, top_k)
+
+    async def _run_in_pool(self, lane: str, fn: Callable[..., Any],
+                           *args, **kwargs) -> Any:
+        admitted = _retrieval_lane.get()
+        if lane == "retrieve" and admitted:
+            lane = f"retrieve-{admitted}"
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(lane), functools.partial(fn, *args, **kwargs),
+        )
+
+    def _get_pool(self, lane: str) -> ThreadPoolExecutor:
+        """Return the worker pool for a lane, creating it on first use.
+
+        "generate" is sized by API_GENERATE_WORKERS; "retrieve" and the
+        per-admission-lane "retrieve-<lane>" pools by API_RETRIEVE_WORKERS.
+        """
+        with self._pool_lock:
+            pool = self._pools.get(lane)
+            if pool is None:
+                workers = (
+                    settings.API_GENERATE_WORKERS if lane == "generate"
+                    else settings.API_RETRIEVE_WORKERS
+                )
+                pool = self._pools[lane] = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix=f"cart-rag-{lane}",
+                )
+                logger.info(f"Started {lane} pool with {workers} workers")
+            return pool
+
+    def shutdown_pools(self) -> None:
+        """Shut down the request-path pools; queued calls are cancelled."""
+        with self._pool_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     # ── Cross-Collection Entity Linking ─────────────────────────────
 
     def find_related(self, entity: str, top_k: int = 5) -> Dict[str, List[SearchHit]]:
@@ -330,29 +634,127 @@ class CARTRAGEngine:
     # ── Private Methods ──────────────────────────────────────────────
 
     def _embed_query(self, text: str):
-        """Embed query text with BGE instruction prefix."""
-        prefix = "Represent this sentence for searching relevant passages: "
-        return self.embedder.embed_text(prefix + text)
+        """Embed query text with BGE instruction prefix.
+
+        Served from the query-embedding cache when one is configured.
+        """
+        if self.embedding_cache is None:
+            return self.embedder.embed_text(BGE_QUERY_PREFIX + text)
+        return self.embedding_cache.get_or_compute(
+            BGE_QUERY_PREFIX + text, self.embedder.embed_text,
+        )
+
+    def embed_queries(self, texts: List[str]) -> List:
+        """Embed several query texts with the BGE prefix in one model call.
+
+        Uses the embedder's batch ``encode()`` when it has one (cache misses
+        only, when the query-embedding cache is enabled); single texts and
+        embedders without ``encode()`` go through _embed_query().
+        """
+        encode = getattr(self.embedder, "encode", None)
+        if encode is None or len(texts) < 2:
+            return [self._embed_query(text) for text in texts]
+        prefixed = [BGE_QUERY_PREFIX + text for text in texts]
+        if self.embedding_cache is not None:
+            return self.embedding_cache.get_or_compute_many(prefixed, encode)
+        return [
+            vector.tolist() if hasattr(vector, "tolist") else list(vector)
+            for vector in encode(prefixed)
+        ]
+
+    def _embed_expansion_term(self, term: str):
+        """Return the precomputed embedding for an expansion term.
+
+        Falls back to live (cached) embedding for terms missing from the
+        precomputed table, e.g. when the table has not been rebuilt after
+        an expansion map edit.
+        """
+        if self.expansion_table is not None:
+            vector = self.expansion_table.get(term)
+            if vector is not None:
+                return vector
+        return self._embed_query(term)
+
+    def _route_collections(self, query: AgentQuery,
+                           collections_filter: List[str] = None,
+                           stages: List[CARTStage] = None) -> List[str]:
+        """Decide which collections a query is sent to.
+
+        - An explicit ``collections_filter`` is honored exactly (unknown
+          names are dropped).
+        - Otherwise, under ``COLLECTION_ROUTING_POLICY = "stage"``, a query
+          with stages goes only to the stage-boosted collections plus
+          STAGE_ROUTING_CORE_COLLECTIONS.
+        - Otherwise every collection is searched.
+
+        ``genomic_evidence`` is skipped when ``query.include_genomic`` is False.
+        """
+        if collections_filter:
+            routed = [c for c in collections_filter if c in COLLECTION_CONFIG]
+            dropped = set(collections_filter) - set(routed)
+            if dropped:
+                logger.warning("Ignoring unknown collections in filter: %s", sorted(dropped))
+        elif stages and settings.COLLECTION_ROUTING_POLICY == "stage":
+            wanted = set(STAGE_ROUTING_CORE_COLLECTIONS)
+            for stage in stages:
+                wanted.update(STAGE_COLLECTION_BOOST.get(stage, []))
+            routed = [c for c in COLLECTION_CONFIG if c in wanted]
+        else:
+            routed = list(COLLECTION_CONFIG.keys())
+
+        if not query.include_genomic:
+            routed = [c for c in routed if c != "genomic_evidence"]
+        return routed
+
+    def _build_filter_exprs(self, query: AgentQuery, collections: List[str],
+                            year_min: int = None,
+                            year_max: int = None) -> Dict[str, str]:
+        """Build per-collection Milvus filter expressions for a query."""
+        filter_exprs = {}
+        for coll in collections:
+            parts = []
+            cfg = COLLECTION_CONFIG.get(coll, {})
+            if query.target_antigen and cfg.get("has_target_antigen"):
+                # Sanitize user input before embedding in filter expression
+                safe_antigen = query.target_antigen.strip()
+                if _SAFE_FILTER_RE.match(safe_antigen):
+                    parts.append(f'target_antigen == "{safe_antigen}"')
+                else:
+                    logger.warning("Rejected unsafe target_antigen filter value: %r", safe_antigen)
+            year_field = cfg.get("year_field")
+            if year_field:
+                if year_min:
+                    parts.append(f'{year_field} >= {int(year_min)}')
+                if year_max:
+                    parts.append(f'{year_field} <= {int(year_max)}')
+            if parts:
+                filter_exprs[coll] = " and ".join(parts)
+        return filter_exprs
 
     def _search_all_collections(
-        self, query_embedding, collections: List[str],
+        self, query_embeddings, collections: List[str],
         top_k: int, filter_exprs: Dict[str, str],
         weight_overrides: Dict[str, float] = None,
-    ) -> List[SearchHit]:
-        """Search all collections in parallel via ThreadPoolExecutor."""
-        all_hits = []
+    ) -> Tuple[List[List[SearchHit]], List[str]]:
+        """Search all collections in parallel with one or more query vectors.
+
+        Returns one list of weighted SearchHits per query vector, plus the
+        collections that missed the search deadline (their hits are absent).
+        """
+        all_hits: List[List[SearchHit]] = [[] for _ in query_embeddings]
 
-        # Use the parallel search_all method from CARTCollectionManager
-        parallel_results = self.collections.search_all(
-            query_embedding,
+        # Use the parallel multi-vector search from CARTCollectionManager,
+        # sending RPCs only to the routed collections
+        parallel_results = self.collections.search_all_many(
+            query_embeddings,
             top_k_per_collection=top_k,
             filter_exprs=filter_exprs,
             score_threshold=settings.SCORE_THRESHOLD,
+            collections=collections,
+            projection=settings.SEARCH_PROJECTION_ENABLED,
         )
 
-        for coll_name, results in parallel_results.items():
-            if coll_name not in [c for c in collections]:
-                continue
+        for coll_name, per_query in parallel_results.items():
             cfg = COLLECTION_CONFIG.get(coll_name, {})
             if weight_overrides and coll_name in weight_overrides:
                 weight = weight_overrides[coll_name]
@@ -360,31 +762,32 @@ class CARTRAGEngine:
                 weight = cfg.get("weight", 0.1)
             label = cfg.get("label", coll_name)
 
-            for r in results:
-                raw_score = r.get("score", 0.0)
-                weighted_score = raw_score * (1 + weight)
-
-                # Citation relevance scoring
-                if raw_score >= settings.CITATION_HIGH_THRESHOLD:
-                    relevance = "high"
-                elif raw_score >= settings.CITATION_MEDIUM_THRESHOLD:
-                    relevance = "medium"
-                else:
-                    relevance = "low"
-
-                metadata = {k: v for k, v in r.items() if k not in ("embedding",)}
-                metadata["relevance"] = relevance
-
-                hit = SearchHit(
-                    collection=label,
-                    id=r.get("id", ""),
-                    score=weighted_score,
-                    text=r.get("text_summary", r.get("text_chunk", "")),
-                    metadata=metadata,
-                )
-                all_hits.append(hit)
+            for idx, results in enumerate(per_query):
+                for r in results:
+                    raw_score = r.get("score", 0.0)
+                    weighted_score = raw_score * (1 + weight)
+
+                    # Citation relevance scoring
+                    if raw_score >= settings.CITATION_HIGH_THRESHOLD:
+                        relevance = "high"
+                    elif raw_score >= settings.CITATION_MEDIUM_THRESHOLD:
+                        relevance = "medium"
+                    else:
+                        relevance = "low"
+
+                    metadata = {k: v for k, v in r.items() if k not in ("embedding",)}
+                    metadata["relevance"] = relevance
+
+                    hit = SearchHit(
+                        collection=label,
+                        id=r.get("id", ""),
+                        score=weighted_score,
+                        text=r.get("text_summary", r.get("text_chunk", "")),
+                        metadata=metadata,
+                    )
+                    all_hits[idx].append(hit)
 
-        return all_hits
+        return all_hits, list(getattr(parallel_results, "timed_out", []))
 
     def _expanded_search(
         self, query: str, query_embedding,
@@ -393,7 +796,9 @@ class CARTRAGEngine:
         """Use query expansion for additional coverage.
 
         Expansion terms that are target antigens use field filters.
-        Non-antigen terms are re-embedded for semantic search across all collections.
+        Non-antigen terms are looked up in the precomputed expansion table
+        (see ``src/expansion_embeddings.py``) for semantic search across all
+        collections.
         """
         if not self.expander:
             return []
@@ -402,6 +807,7 @@ class CARTRAGEngine:
         expanded_terms = expand_query(query)
 
         additional_hits = []
+        semantic_terms = []
         for term in expanded_terms[:5]:
             term_upper = term.upper().replace("-", "").replace(" ", "")
 
@@ -423,6 +829,7 @@ class CARTRAGEngine:
                         filter_expr = f'target_antigen == "{safe_term}"'
                         results = self.collections.search(
                             coll_name, query_embedding, min(3, top_k), filter_expr,
+                            projection=settings.SEARCH_PROJECTION_ENABLED,
                         )
                         label = COLLECTION_CONFIG.get(coll_name, {}).get("label", coll_name)
                         for r in results:
@@ -436,17 +843,22 @@ class CARTRAGEngine:
                     except Exception as exc:
                         logger.warning("Expanded antigen search failed for %s/%s: %s", coll_name, safe_term, exc)
             else:
-                # Semantic search: re-embed the expansion term and search all collections
-                try:
-                    term_embedding = self._embed_query(term)
-                    term_results = self.collections.search_all(
-                        term_embedding, top_k_per_collection=2,
-                        score_threshold=settings.SCORE_THRESHOLD,
-                    )
-                    for coll_name, results in term_results.items():
-                        if coll_name not in collections:
-                            continue
-                        label = COLLECTION_CONFIG.get(coll_name, {}).get("label", coll_name)
+                semantic_terms.append(term)
+
+        # Semantic search: all non-antigen terms go out as one multi-vector
+        # request per collection instead of one fan-out per term
+        if semantic_terms:
+            try:
+                term_embeddings = [self._embed_expansion_term(t) for t in semantic_terms]
+                term_results = self.collections.search_all_many(
+                    term_embeddings, top_k_per_collection=2,
+                    score_threshold=settings.SCORE_THRESHOLD,
+                    collections=collections,
+                    projection=settings.SEARCH_PROJECTION_ENABLED,
+                )
+                for coll_name, per_term in term_results.items():
+                    label = COLLECTION_CONFIG.get(coll_name, {}).get("label", coll_name)
+                    for results in per_term:
                         for r in results:
                             additional_hits.append(SearchHit(
                                 collection=label,
@@ -455,11 +867,42 @@ class CARTRAGEngine:
                                 text=r.get("text_summary", r.get("text_chunk", "")),
                                 metadata=r,
                             ))
-                except Exception as exc:
-                    logger.warning("Expanded semantic search failed for '%s': %s", term[:50], exc)
+            except Exception as exc:
+                logger.warning("Expanded semantic search failed for %d terms: %s", len(semantic_terms), exc)
 
         return additional_hits
 
+    def _hydrate_hits(self, hits: List[SearchHit]) -> None:
+        """Fill in text and metadata for hits returned by a projected search.
+
+        One batched ``id in [...]`` query per collection fetches the full
+        records; hits are updated in place.  Scores and relevance tags from
+        the search are kept.  Hits that cannot be hydrated keep their
+        projected metadata and an empty text.
+        """
+        ids_by_collection: Dict[str, List[str]] = {}
+        for hit in hits:
+            coll_name = hit.metadata.get("collection")
+            if coll_name:
+                ids_by_collection.setdefault(coll_name, []).append(hit.id)
+        if not ids_by_collection:
+            return
+
+        try:
+            records = self.collections.hydrate_many(ids_by_collection)
+        except Exception as exc:
+            logger.warning("Hit hydration failed: %s", exc)
+            return
+
+        for hit in hits:
+            record = records.get(hit.metadata.get("collection"), {}).get(hit.id)
+            if not record:
+                continue
+            for key, value in record.items():
+                hit.metadata.setdefault(key, value)
+            if not hit.text:
+                hit.text = record.get("text_summary", record.get("text_chunk", "")) or ""
+
     def _merge_and_rank(self, hits: List[SearchHit]) -> List[SearchHit]:
         """Deduplicate by ID, sort by score descending, cap at 30."""
         seen = set()
@@ -683,10 +1126,10 @@ class CARTRAGEngine:
         query_a = AgentQuery(question=question, target_antigen=entity_a.get("target"))
         query_b = AgentQuery(question=question, target_antigen=entity_b.get("target"))
 
-        evidence_a = self.retrieve(query_a, collections_filter=collections_filter,
-                                   year_min=year_min, year_max=year_max)
-        evidence_b = self.retrieve(query_b, collections_filter=collections_filter,
-                                   year_min=year_min, year_max=year_max)
+        evidence_a, evidence_b = self.retrieve_many(
+            [query_a, query_b], collections_filter=collections_filter,
+            year_min=year_min, year_max=year_max,
+        )
 
         comparison_context = ""
         if self.knowledge:
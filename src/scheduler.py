@@ -7,6 +7,11 @@ in a daemon thread alongside the FastAPI / Streamlit application.
 
 Default cadence: every 168 hours (once per week).
 
+Refreshes are incremental: each source keeps a persisted watermark (see
+``src/ingest/watermarks.py``) and a run only fetches records added or
+updated since the last complete one, so the cadence can be raised to
+daily without re-downloading the corpus.
+
 If ``apscheduler`` is not installed the module exports a no-op
 ``IngestScheduler`` stub so dependent code can import unconditionally.
 
@@ -17,10 +22,13 @@ Date: February 2026
 from __future__ import annotations
 
 import time
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from loguru import logger
 
+from .ingest.watermarks import WatermarkStore
+
 # Import metrics (always available — stubs if prometheus_client missing)
 from .metrics import LAST_INGEST
 
@@ -39,8 +47,10 @@ if _APSCHEDULER_AVAILABLE:
 
         Wraps ``apscheduler.BackgroundScheduler`` with two recurring interval
         jobs — one for each upstream data source.  Each job creates a
-        short-lived ingest pipeline, runs it, and updates the
-        ``cart_last_ingest_timestamp`` Prometheus gauge.
+        short-lived ingest pipeline, runs a delta fetch from the source's
+        watermark, advances the watermark if every record landed, updates
+        the ``cart_last_ingest_timestamp`` Prometheus gauge, and rebuilds
+        any index whose collection crossed a size threshold.
 
         Usage::
 
@@ -57,6 +67,7 @@ if _APSCHEDULER_AVAILABLE:
             collection_manager: Any,
             embedder: Any,
             interval_hours: int = 168,
+            watermarks: Optional[WatermarkStore] = None,
         ):
             """Initialize the ingest scheduler.
 
@@ -67,10 +78,13 @@ if _APSCHEDULER_AVAILABLE:
                     (e.g. SentenceTransformer wrapping BGE-small-en-v1.5).
                 interval_hours: How often (in hours) each ingest job should
                     run.  Defaults to **168** (once per week).
+                watermarks: Per-source delta watermarks.  Defaults to a
+                    store at settings.INGEST_WATERMARK_FILE.
             """
             self.collection_manager = collection_manager
             self.embedder = embedder
             self.interval_hours = interval_hours
+            self.watermarks = watermarks or WatermarkStore()
             self._scheduler = BackgroundScheduler(daemon=True)
             self._last_run_time: Optional[float] = None
 
@@ -118,9 +132,10 @@ if _APSCHEDULER_AVAILABLE:
             """Return a status summary of all scheduled jobs.
 
             Returns:
-                Dict with ``next_run_time``, ``last_run_time``, and
-                ``job_count`` keys.  Times are ISO-8601 strings or
-                ``None`` if not yet available.
+                Dict with ``next_run_time``, ``last_run_time``,
+                ``job_count`` and ``watermarks`` (source -> ISO-8601)
+                keys.  Times are ISO-8601 strings or ``None`` if not yet
+                available.
             """
             jobs = self._scheduler.get_jobs()
 
@@ -134,6 +149,11 @@ if _APSCHEDULER_AVAILABLE:
                 "next_run_time": next_run_times[0] if next_run_times else None,
                 "last_run_time": self._last_run_time,
                 "job_count": len(jobs),
+                "watermarks": {
+                    source: watermark.isoformat() if watermark else None
+                    for source in ("pubmed", "clinical_trials")
+                    for watermark in [self.watermarks.get(source)]
+                },
             }
 
         # ── Private job wrappers ──────────────────────────────────────
@@ -141,12 +161,16 @@ if _APSCHEDULER_AVAILABLE:
         def _refresh_pubmed(self) -> None:
             """Run the PubMed ingest pipeline with default CAR-T query.
 
-            Updates the ``cart_last_ingest_timestamp{source="pubmed"}``
-            Prometheus gauge on success.
+            Only records that entered PubMed since the watermark are
+            fetched (``mindate`` with ``datetype=edat``).  Updates the
+            ``cart_last_ingest_timestamp{source="pubmed"}`` Prometheus
+            gauge on success.
             """
             from .ingest.literature_parser import PubMedIngestPipeline
 
-            logger.info("Scheduler: starting PubMed refresh")
+            since = self.watermarks.since("pubmed")
+            started_at = datetime.now(timezone.utc)
+            logger.info(f"Scheduler: starting PubMed refresh ({self._describe(since)})")
             start = time.time()
 
             try:
@@ -154,15 +178,18 @@ if _APSCHEDULER_AVAILABLE:
                     self.collection_manager,
                     self.embedder,
                 )
-                count = pipeline.run()
+                count = pipeline.run_pipelined(since=since)
                 elapsed = time.time() - start
                 self._last_run_time = time.time()
 
                 LAST_INGEST.labels(source="pubmed").set(time.time())
                 logger.info(
                     f"Scheduler: PubMed refresh complete — "
-                    f"{count} records in {elapsed:.1f}s"
+                    f"{count} records written in {elapsed:.1f}s "
+                    f"({pipeline.last_stats})"
                 )
+                self._advance_watermark("pubmed", started_at, pipeline)
+                self._refresh_indexes()
 
             except Exception as exc:
                 logger.error(f"Scheduler: PubMed refresh failed — {exc}")
@@ -170,14 +197,20 @@ if _APSCHEDULER_AVAILABLE:
         def _refresh_clinical_trials(self) -> None:
             """Run the ClinicalTrials.gov ingest pipeline.
 
-            Updates the ``cart_last_ingest_timestamp{source="clinical_trials"}``
+            Only studies whose last update was posted since the watermark
+            are fetched (``LastUpdatePostDate`` range).  Updates the
+            ``cart_last_ingest_timestamp{source="clinical_trials"}``
             Prometheus gauge on success.
             """
             from .ingest.clinical_trials_parser import (
                 ClinicalTrialsIngestPipeline,
             )
 
-            logger.info("Scheduler: starting ClinicalTrials.gov refresh")
+            since = self.watermarks.since("clinical_trials")
+            started_at = datetime.now(timezone.utc)
+            logger.info(
+                f"Scheduler: starting ClinicalTrials.gov refresh ({self._describe(since)})"
+            )
             start = time.time()
 
             try:
@@ -185,21 +218,69 @@ if _APSCHEDULER_AVAILABLE:
                     self.collection_manager,
                     self.embedder,
                 )
-                count = pipeline.run()
+                count = pipeline.run_pipelined(since=since)
                 elapsed = time.time() - start
                 self._last_run_time = time.time()
 
                 LAST_INGEST.labels(source="clinical_trials").set(time.time())
                 logger.info(
                     f"Scheduler: ClinicalTrials.gov refresh complete — "
-                    f"{count} records in {elapsed:.1f}s"
+                    f"{count} records written in {elapsed:.1f}s "
+                    f"({pipeline.last_stats})"
                 )
+                self._advance_watermark("clinical_trials", started_at, pipeline)
+                self._refresh_indexes()
 
             except Exception as exc:
                 logger.error(
                     f"Scheduler: ClinicalTrials.gov refresh failed — {exc}"
                 )
 
+        @staticmethod
+        def _describe(since: Any) -> str:
+            return f"delta since {since.isoformat()}" if since else "full refresh"
+
+        def _advance_watermark(self, source: str, started_at: datetime, pipeline: Any) -> None:
+            """Move a source's watermark to ``started_at`` if nothing failed.
+
+            A run with failed records, or whose fetch was incomplete (failed
+            search or page, or cut off at max_results), keeps the old
+            watermark so the next delta re-fetches that window; records that
+            did land are skipped then as unchanged.
+            """
+            stats = pipeline.last_stats
+            if not pipeline.last_fetch_complete:
+                logger.warning(
+                    f"Scheduler: {source} fetch was incomplete — "
+                    f"keeping previous watermark"
+                )
+                return
+            if stats.failed:
+                logger.warning(
+                    f"Scheduler: {stats.failed} {source} records failed — "
+                    f"keeping previous watermark"
+                )
+                return
+            try:
+                self.watermarks.advance(source, started_at, records=stats.written)
+            except Exception as exc:
+                logger.error(f"Scheduler: could not save {source} watermark — {exc}")
+
+        def _refresh_indexes(self) -> None:
+            """Rebuild indexes on collections that grew past a size threshold.
+
+            Failures are logged only; the refreshed data is already stored.
+            """
+            try:
+                rebuilt = self.collection_manager.rebuild_indexes()
+                for name, plan in rebuilt.items():
+                    logger.info(
+                        f"Scheduler: rebuilt '{name}' as {plan.index_type} "
+                        f"({plan.row_count:,} rows)"
+                    )
+            except Exception as exc:
+                logger.error(f"Scheduler: index rebuild check failed — {exc}")
+
 else:
     # ── No-op stub when apscheduler is not installed ──────────────────
 
@@ -223,4 +304,5 @@ else:
                 "next_run_time": None,
                 "last_run_time": None,
                 "job_count": 0,
+                "watermarks": {},
             }
@@ -0,0 +1,403 @@
+"""Recall-vs-latency tuning of per-collection Milvus search params.
+
+Measures the recall each collection actually delivers instead of trusting
+a hard-coded nprobe.  For every collection:
+
+  1. Sample real embeddings from the collection as query vectors.
+  2. Compute the exact top-k for those queries by brute-force NumPy
+     cosine similarity over every stored vector (streamed in batches, so
+     memory stays bounded by the batch size).
+  3. Sweep nprobe (IVF_*) or ef (HNSW) against the live index, measuring
+     recall@k and per-query latency.
+  4. Keep the cheapest setting that meets the recall target.
+
+Results are written to ``settings.SEARCH_PARAMS_FILE`` and picked up by
+``CARTCollectionManager.get_search_params`` for as long as the
+collection keeps the index it was tuned against.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SWEEP GRIDS
+# ═══════════════════════════════════════════════════════════════════════
+
+NPROBE_GRID: List[int] = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+EF_GRID: List[int] = [16, 32, 64, 128, 256, 512]
+
+TUNED_PARAMS_VERSION = 1
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RESULTS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+@dataclass
+class SweepPoint:
+    """Recall and latency at one search-param value."""
+    value: int
+    recall: float
+    latency_ms_p50: float
+    latency_ms_p95: float
+
+
+@dataclass
+class TuningResult:
+    """Tuned search params for one collection."""
+    collection: str
+    index_type: str
+    build_params: Dict[str, Any]
+    param_name: Optional[str]
+    chosen_value: Optional[int]
+    recall: float
+    latency_ms_p50: float
+    k: int
+    recall_target: float
+    sample_size: int
+    row_count: int
+    metric_type: str = "COSINE"
+    sweep: List[SweepPoint] = field(default_factory=list)
+
+    @property
+    def meets_target(self) -> bool:
+        return self.recall >= self.recall_target
+
+    @property
+    def search_params(self) -> Dict[str, Any]:
+        """Index-specific search params, e.g. ``{"nprobe": 32}``."""
+        if self.param_name is None:
+            return {}
+        return {self.param_name: self.chosen_value}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# GROUND TRUTH
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Return L2-normalized float32 rows (cosine == dot product)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def exact_top_k(
+    queries: np.ndarray,
+    corpus_batches: Iterator[Tuple[Sequence[Any], np.ndarray]],
+    k: int,
+) -> List[List[Any]]:
+    """Exact cosine top-k ids for each query by brute-force dot products.
+
+    The corpus is consumed batch by batch and merged into a running top-k,
+    so it never has to fit in memory at once.
+
+    Args:
+        queries: (nq, dim) query vectors.
+        corpus_batches: Iterator of (ids, (n, dim) vectors) batches.
+        k: Number of neighbours per query.
+
+    Returns:
+        One list of up to k ids per query, best first.
+    """
+    q = _normalize(queries)
+    nq = q.shape[0]
+    best_scores = np.full((nq, 0), -np.inf, dtype=np.float32)
+    best_ids = np.empty((nq, 0), dtype=object)
+
+    for ids, vectors in corpus_batches:
+        if len(ids) == 0:
+            continue
+        scores = q @ _normalize(vectors).T
+        batch_ids = np.broadcast_to(np.asarray(ids, dtype=object), scores.shape)
+
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_ids = np.concatenate([best_ids, batch_ids], axis=1)
+        keep = min(k, merged_scores.shape[1])
+        top = np.argpartition(-merged_scores, keep - 1, axis=1)[:, :keep]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_ids = np.take_along_axis(merged_ids, top, axis=1)
+
+    order = np.argsort(-best_scores, axis=1)
+    best_ids = np.take_along_axis(best_ids, order, axis=1)
+    return [list(row) for row in best_ids]
+
+
+def recall_at_k(approx: Sequence[Sequence[Any]], exact: Sequence[Sequence[Any]], k: int) -> float:
+    """Mean fraction of the exact top-k found by the approximate search."""
+    if not exact:
+        return 0.0
+    total = 0.0
+    for found, truth in zip(approx, exact):
+        truth_k = set(list(truth)[:k])
+        if not truth_k:
+            total += 1.0
+            continue
+        total += len(truth_k & set(list(found)[:k])) / len(truth_k)
+    return total / len(exact)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# COLLECTION ACCESS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def iter_vectors(collection: Any, batch_size: int = 4096) -> Iterator[Tuple[List[Any], np.ndarray]]:
+    """Stream (ids, vectors) batches from a collection with query_iterator."""
+    iterator = collection.query_iterator(
+        batch_size=batch_size, output_fields=["id", "embedding"],
+    )
+    try:
+        while True:
+            rows = iterator.next()
+            if not rows:
+                break
+            yield (
+                [row["id"] for row in rows],
+                np.asarray([row["embedding"] for row in rows], dtype=np.float32),
+            )
+    finally:
+        iterator.close()
+
+
+def sample_vectors(
+    collection: Any,
+    sample_size: int,
+    seed: int = 0,
+    batch_size: int = 4096,
+) -> np.ndarray:
+    """Reservoir-sample ``sample_size`` stored embeddings as query vectors."""
+    rng = np.random.default_rng(seed)
+    reservoir: List[np.ndarray] = []
+    seen = 0
+    for _, vectors in iter_vectors(collection, batch_size):
+        for vector in vectors:
+            if len(reservoir) < sample_size:
+                reservoir.append(vector)
+            else:
+                slot = rng.integers(0, seen + 1)
+                if slot < sample_size:
+                    reservoir[slot] = vector
+            seen += 1
+    return np.asarray(reservoir, dtype=np.float32)
+
+
+def _sweep_grid(index_type: str, build_params: Dict[str, Any], k: int) -> Tuple[Optional[str], List[int]]:
+    """Return the search param to sweep and its candidate values."""
+    if index_type == "HNSW":
+        return "ef", [ef for ef in EF_GRID if ef >= k] or [k]
+    if index_type.startswith("IVF"):
+        nlist = int(build_params.get("nlist", 1024))
+        return "nprobe", [n for n in NPROBE_GRID if n <= nlist] or [nlist]
+    return None, []
+
+
+def _measure(
+    collection: Any,
+    queries: np.ndarray,
+    param: Dict[str, Any],
+    k: int,
+) -> Tuple[List[List[Any]], List[float]]:
+    """Run one search per query; return hit ids and latencies in ms."""
+    found: List[List[Any]] = []
+    latencies: List[float] = []
+    for query in queries:
+        start = time.perf_counter()
+        results = collection.search(
+            data=[query.tolist()], anns_field="embedding", param=param, limit=k,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        found.append([hit.id for hit in results[0]])
+    return found, latencies
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# TUNING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def tune_collection(
+    name: str,
+    collection: Any,
+    index: Dict[str, Any],
+    k: int = 10,
+    recall_target: float = 0.95,
+    sample_size: int = 100,
+    seed: int = 0,
+    batch_size: int = 4096,
+) -> Optional[TuningResult]:
+    """Sweep search params for one loaded collection against exact ground truth.
+
+    Args:
+        name: Collection name.
+        collection: Loaded pymilvus Collection.
+        index: Embedding index params (``index_type``, ``metric_type``,
+            ``params``) as reported by the collection.
+        k: Neighbours per query for recall@k.
+        recall_target: Recall the chosen setting must reach.
+        sample_size: Number of stored vectors used as queries.
+        seed: RNG seed for the query sample.
+        batch_size: Rows per query_iterator batch.
+
+    Returns:
+        TuningResult, or None if the collection is empty.
+    """
+    index_type = index.get("index_type", "")
+    build_params = index.get("params") or {}
+    metric_type = index.get("metric_type", "COSINE")
+
+    queries = sample_vectors(collection, sample_size, seed=seed, batch_size=batch_size)
+    if len(queries) == 0:
+        logger.warning(f"Skipping '{name}': no vectors to sample")
+        return None
+
+    exact = exact_top_k(queries, iter_vectors(collection, batch_size), k)
+    param_name, grid = _sweep_grid(index_type, build_params, k)
+
+    if param_name is None:
+        # FLAT (or unknown) indexes are exact; record a single measurement
+        found, latencies = _measure(collection, queries, {"metric_type": metric_type, "params": {}}, k)
+        recall = recall_at_k(found, exact, k)
+        p50 = float(np.percentile(latencies, 50))
+        sweep = [SweepPoint(0, recall, p50, float(np.percentile(latencies, 95)))]
+        chosen: Optional[SweepPoint] = sweep[0]
+    else:
+        sweep = []
+        chosen = None
+        for value in grid:
+            param = {"metric_type": metric_type, "params": {param_name: value}}
+            found, latencies = _measure(collection, queries, param, k)
+            point = SweepPoint(
+                value=value,
+                recall=recall_at_k(found, exact, k),
+                latency_ms_p50=float(np.percentile(latencies, 50)),
+                latency_ms_p95=float(np.percentile(latencies, 95)),
+            )
+            sweep.append(point)
+            logger.debug(
+                f"{name}: {param_name}={value} recall@{k}={point.recall:.3f} "
+                f"p50={point.latency_ms_p50:.1f}ms"
+            )
+            if point.recall >= recall_target:
+                chosen = point
+                break
+        if chosen is None:
+            chosen = max(sweep, key=lambda p: p.recall)
+            logger.warning(
+                f"'{name}' never reached recall {recall_target:.2f}; "
+                f"using {param_name}={chosen.value} (recall {chosen.recall:.3f})"
+            )
+
+    return TuningResult(
+        collection=name,
+        index_type=index_type,
+        build_params=dict(build_params),
+        param_name=param_name,
+        chosen_value=chosen.value if param_name else None,
+        recall=chosen.recall,
+        latency_ms_p50=chosen.latency_ms_p50,
+        k=k,
+        recall_target=recall_target,
+        sample_size=len(queries),
+        row_count=int(collection.num_entities),
+        metric_type=metric_type,
+        sweep=sweep,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PERSISTENCE
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def save_tuned_params(results: Sequence[TuningResult], path: Path) -> None:
+    """Merge tuning results into the tuned-params JSON file atomically.
+
+    Entries for collections not in ``results`` are kept.
+    """
+    path = Path(path)
+    data = load_tuned_params(path)
+    tuned_at = datetime.now(timezone.utc).isoformat()
+    for result in results:
+        data[result.collection] = {
+            "index_type": result.index_type,
+            "build_params": result.build_params,
+            "metric_type": result.metric_type,
+            "params": result.search_params,
+            "recall": round(result.recall, 4),
+            "latency_ms_p50": round(result.latency_ms_p50, 3),
+            "k": result.k,
+            "recall_target": result.recall_target,
+            "sample_size": result.sample_size,
+            "row_count": result.row_count,
+            "tuned_at": tuned_at,
+            "sweep": [asdict(p) for p in result.sweep],
+        }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            json.dump({"version": TUNED_PARAMS_VERSION, "collections": data}, fh, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def load_tuned_params(path: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+    """Load tuned params keyed by collection; empty if missing or unreadable."""
+    if path is None or not Path(path).exists():
+        return {}
+    try:
+        with open(path) as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable tuned search params at {path}: {e}")
+        return {}
+    if payload.get("version") != TUNED_PARAMS_VERSION:
+        logger.warning(f"Ignoring tuned search params at {path}: unsupported version")
+        return {}
+    return dict(payload.get("collections", {}))
+
+
+def tuned_entry_matches(entry: Dict[str, Any], index: Dict[str, Any]) -> bool:
+    """True if a tuned entry was measured against this exact index."""
+    return (
+        entry.get("index_type") == index.get("index_type")
+        and (entry.get("build_params") or {}) == (index.get("params") or {})
+    )
+
+
+def format_tuning_table(results: Sequence[TuningResult]) -> str:
+    """Render tuning results as a fixed-width text table."""
+    lines = [
+        f"{'Collection':<22} {'Rows':>10}  {'Index':<9} {'Param':<12} "
+        f"{'Recall@k':>9} {'p50 ms':>8}",
+        "-" * 76,
+    ]
+    for r in results:
+        param = f"{r.param_name}={r.chosen_value}" if r.param_name else "exact"
+        flag = "" if r.meets_target else "  (below target)"
+        lines.append(
+            f"{r.collection:<22} {r.row_count:>10,}  {r.index_type:<9} {param:<12} "
+            f"{r.recall:>9.3f} {r.latency_ms_p50:>8.2f}{flag}"
+        )
+    return "\n".join(lines)
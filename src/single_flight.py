@@ -0,0 +1,118 @@
+"""Single-flight call coalescing for the CAR-T Intelligence Agent.
+
+When a demo button or dashboard refresh fires, many clients ask the
+byte-identical question at the same moment.  Without coalescing each one
+pays for its own embedding, 11-collection Milvus fan-out and knowledge
+lookup.  ``SingleFlight.do(key, fn)`` runs ``fn`` once per key at a time:
+the first caller (the leader) executes it, and callers arriving with the
+same key while it is in flight wait for and share its result (or its
+exception).  Once the call finishes the key is forgotten, so later
+callers trigger a fresh call and results are never served stale.
+
+Works across threads (Streamlit sessions, the engine's retrieval pool);
+async callers can await an in-flight call via ``pending()`` without
+occupying a worker thread.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .metrics import record_single_flight_shared
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key."""
+
+    def __init__(self, name: str = "single_flight"):
+        """Initialize an empty flight table.
+
+        Args:
+            name: Label used in metrics and stats.
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._executed = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` unless a call with ``key`` is in flight.
+
+        Args:
+            key: Hashable identity of the call; equal keys must mean
+                equal results.
+            fn: Callable to execute when this caller leads.
+
+        Returns:
+            The result of the leader's call.  Waiters receive the same
+            object, so callers that mutate results must copy them.
+
+        Raises:
+            Whatever ``fn`` raised, re-raised in every waiting caller.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            self._finish(key)
+            future.set_exception(exc)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def pending(self, key: Hashable) -> Optional[Future]:
+        """Return the in-flight call for ``key`` if there is one.
+
+        The returned future is owned by the leader; wrap it with
+        ``asyncio.shield(asyncio.wrap_future(...))`` to await it from a
+        coroutine without letting a cancelled waiter cancel the call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._shared += 1
+        if future is not None:
+            record_single_flight_shared(self.name)
+        return future
+
+    def stats(self) -> Dict[str, int]:
+        """Calls executed, calls served from another caller's flight, and in flight."""
+        with self._lock:
+            return {
+                "executed": self._executed,
+                "shared": self._shared,
+                "in_flight": len(self._calls),
+            }
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _join(self, key: Hashable):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                future.set_running_or_notify_cancel()  # waiters cannot cancel it
+                self._calls[key] = future
+                self._executed += 1
+            else:
+                self._shared += 1
+        if not leader:
+            record_single_flight_shared(self.name)
+        return future, leader
+
+    def _finish(self, key: Hashable) -> None:
+        # Forget the key before publishing the result, so a caller that
+        # arrives afterwards starts a fresh call instead of reusing it
+        with self._lock:
+            self._calls.pop(key, None)
@@ -0,0 +1,516 @@
+"""Shared HTTP client for CAR-T ingest sources.
+
+One pooled ``requests.Session`` used by the FAERS, DailyMed, UniProt and
+CIBMTR pipelines (previously each carried its own copy of
+``_request_with_retry`` opening fresh connections and sleeping fixed
+delays).  It provides:
+
+  - retries with exponential backoff and jitter on connection errors,
+    429 and 5xx (``Retry-After`` is honoured); other 4xx fail fast
+  - per-host token-bucket rate limits (``settings.HTTP_HOST_RATE_LIMITS``)
+    shared by every thread using the client
+  - an on-disk response cache: fresh ``Cache-Control: max-age`` entries
+    are served locally, stale ones are revalidated with ``If-None-Match``
+    / ``If-Modified-Since`` so unchanged pages come back as 304s
+  - record/replay (``settings.HTTP_MODE``): ``record`` captures every
+    successful response under ``HTTP_CASSETTE_DIR``; ``replay`` serves
+    only from those captures and never touches the network, so parsers
+    can be benchmarked offline against real payloads
+
+Responses are always returned as ``requests.Response`` objects (cached
+and replayed ones are rebuilt from disk) with a ``from_cache`` flag, so
+callers use ``.json()``, ``.text`` and ``.headers`` unchanged.  API keys
+are stripped from cache keys and stored URLs.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from loguru import logger
+
+from config.settings import settings
+
+# Status codes worth retrying (rate limited / transient server errors)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Query parameters never written to cache keys or stored URLs
+SECRET_PARAMS = frozenset({"api_key", "apikey", "access_token"})
+
+# Identifies the agent to upstream services
+USER_AGENT = (
+    "HCLS-AI-Factory/1.0 CAR-T-Intelligence-Agent "
+    "(research; contact: adam@hcls-ai-factory.org)"
+)
+
+MODES = ("live", "record", "replay")
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RATE LIMITING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    A caller that finds the bucket empty reserves the next token and
+    sleeps outside the lock, so concurrent callers are spaced evenly
+    instead of all waking at once.
+
+    The default capacity of one token paces requests evenly at ``rate``
+    per second; APIs such as NCBI count requests per wall-clock second, so
+    a larger burst allowance would risk 429s.  Throughput comes from
+    overlapping in-flight requests, not from bursting.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum tokens held (burst size).
+            clock: Monotonic time source (injectable for tests).
+            sleep: Sleep function (injectable for tests).
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RESPONSE STORE (cache + cassettes)
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def canonical_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Merge ``params`` into ``url`` with sorted keys and secrets removed."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(k, str(v)) for k, v in (params or {}).items() if v is not None]
+    query = sorted((k, v) for k, v in query if k.lower() not in SECRET_PARAMS)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def request_key(url: str, accept: str = "") -> str:
+    """Fingerprint of a GET request (canonical URL + Accept header)."""
+    return hashlib.sha256(f"GET {url}\n{accept}".encode("utf-8")).hexdigest()
+
+
+def build_response(url: str, status: int, headers: Dict[str, str], body: bytes) -> requests.Response:
+    """Rebuild a ``requests.Response`` from stored parts."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content_consumed = True  # iter_content() slices the stored body
+    response.from_cache = True
+    return response
+
+
+class ResponseStore:
+    """Directory of captured responses keyed by request fingerprint.
+
+    Each entry is ``<key>.body`` (raw bytes) plus ``<key>.json`` (URL,
+    status, headers, capture time).  The body is written before the
+    metadata, and both atomically, so a readable entry is always whole.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _paths(self, key: str):
+        shard = self.directory / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.body"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry (metadata plus ``body``), or None."""
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            meta["body"] = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def save(self, key: str, url: str, response: requests.Response) -> None:
+        """Store a response's status, headers and body under ``key``."""
+        meta_path, body_path = self._paths(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(body_path, response.content)
+        meta = {
+            "url": url,
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "stored_at": time.time(),
+        }
+        self._write(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+
+    def touch(self, key: str, headers: Dict[str, str]) -> None:
+        """Refresh an entry after a 304 (new validators, new capture time)."""
+        entry = self.load(key)
+        if entry is None:
+            return
+        entry.pop("body")
+        entry["headers"].update(headers)
+        entry["stored_at"] = time.time()
+        meta_path, _ = self._paths(key)
+        self._write(meta_path, json.dumps(entry, indent=2).encode("utf-8"))
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+
+def _max_age(headers: Dict[str, str]) -> Optional[int]:
+    cache_control = CaseInsensitiveDict(headers).get("Cache-Control", "")
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return None
+    match = _MAX_AGE.search(cache_control)
+    return int(match.group(1)) if match else None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CLIENT
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class HTTPClient:
+    """Pooled, rate-limited, caching HTTP GET client for ingest sources.
+
+    Usage:
+        http = get_http_client()
+        response = http.get(OPENFDA_EVENT_URL, params={"search": q, "limit": 100})
+        if response is not None:
+            data = response.json()
+    """
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        timeout: Optional[float] = None,
+        host_rate_limits: Optional[Dict[str, float]] = None,
+        default_rate_limit: Optional[float] = None,
+        cache_dir: Optional[Path] = None,
+        cache_enabled: Optional[bool] = None,
+        mode: Optional[str] = None,
+        cassette_dir: Optional[Path] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize the client; every argument defaults to its HTTP_* setting.
+
+        Args:
+            max_retries: Attempts per request (including the first).
+            backoff_base: First retry delay in seconds; doubles per attempt.
+            backoff_max: Upper bound on a single retry delay.
+            timeout: Per-request timeout in seconds.
+            host_rate_limits: Requests/second per hostname.
+            default_rate_limit: Requests/second for hosts not listed.
+            cache_dir: Conditional-request cache directory.
+            cache_enabled: Whether to use the response cache.
+            mode: "live", "record" or "replay".
+            cassette_dir: Where record mode writes and replay mode reads.
+            sleep: Sleep function for backoff (injectable for tests).
+        """
+        self.max_retries = max(1, max_retries or settings.HTTP_MAX_RETRIES)
+        self.backoff_base = settings.HTTP_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = settings.HTTP_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.timeout = timeout or settings.HTTP_TIMEOUT
+        self.host_rate_limits = dict(
+            settings.HTTP_HOST_RATE_LIMITS if host_rate_limits is None else host_rate_limits
+        )
+        self.default_rate_limit = default_rate_limit or settings.HTTP_DEFAULT_RATE_LIMIT
+        self.mode = (mode or settings.HTTP_MODE).lower()
+        if self.mode not in MODES:
+            raise ValueError(f"HTTP mode must be one of {MODES}, got {self.mode!r}")
+        enabled = settings.HTTP_CACHE_ENABLED if cache_enabled is None else cache_enabled
+        self.cache = ResponseStore(cache_dir or settings.HTTP_CACHE_DIR) if enabled else None
+        self.cassettes = ResponseStore(cassette_dir or settings.HTTP_CASSETTE_DIR)
+        self._sleep = sleep
+
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "requests": 0, "retries": 0, "cache_hits": 0,
+            "not_modified": 0, "replayed": 0, "recorded": 0, "failures": 0,
+        }
+
+    # ── Public API ───────────────────────────────────────────────────
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[requests.Response]:
+        """GET ``url`` with caching, rate limiting and retries.
+
+        Args:
+            url: Request URL (may already carry a query string).
+            params: Query parameters.
+            headers: Extra request headers (e.g. Accept).
+
+        Returns:
+            A successful requests.Response (``from_cache`` tells whether it
+            came from disk), or None on 404, non-retryable errors,
+            exhausted retries, or a replay miss.
+        """
+        headers = dict(headers or {})
+        stored_url = canonical_url(url, params)
+        key = request_key(stored_url, headers.get("Accept", ""))
+
+        if self.mode == "replay":
+            return self._replay(key, stored_url)
+
+        cached = self.cache.load(key) if self.cache else None
+        if cached is not None:
+            max_age = _max_age(cached["headers"])
+            if max_age is not None and time.time() - cached["stored_at"] < max_age:
+                self._count("cache_hits")
+                return self._from_entry(cached, stored_url)
+            headers.update(self._validators(cached["headers"]))
+
+        response = self._send(url, params, headers)
+        if response is None:
+            return None
+
+        if response.status_code == 304 and cached is not None:
+            self._count("not_modified")
+            self.cache.touch(key, dict(response.headers))
+            response = self._from_entry(cached, stored_url)
+        else:
+            response.from_cache = False
+            if self.cache and self._cacheable(response):
+                self._safe_save(self.cache, key, stored_url, response)
+
+        if self.mode == "record":
+            self._safe_save(self.cassettes, key, stored_url, response)
+            self._count("recorded")
+        return response
+
+    def stream(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[requests.Response]:
+        """GET ``url`` for incremental reading with ``iter_content()``.
+
+        The body is left on the connection instead of being buffered, so
+        live streams bypass the response cache; use the response as a
+        context manager (or close it) to release the connection early.
+        In record and replay mode this is get(), so streamed payloads are
+        captured and served like any other response.
+
+        Args:
+            url: Request URL.
+            params: Query parameters.
+            headers: Extra request headers (e.g. Accept).
+
+        Returns:
+            An unread requests.Response, or None on failure (see get()).
+        """
+        if self.mode != "live":
+            return self.get(url, params, headers)
+        response = self._send(url, params, dict(headers or {}), stream=True)
+        if response is not None:
+            response.from_cache = False
+        return response
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        stream: bool = False,
+    ) -> Optional[requests.Response]:
+        """Rate-limited GET with retries; None when the request failed."""
+        host = urlsplit(url).hostname or ""
+        for attempt in range(1, self.max_retries + 1):
+            self._bucket(host).acquire()
+            self._count("requests")
+            try:
+                response = self._session.get(
+                    url, params=params, headers=headers, timeout=self.timeout,
+                    stream=stream,
+                )
+            except requests.RequestException as exc:
+                logger.warning(
+                    f"{host} request failed on attempt {attempt}/{self.max_retries}: {exc}"
+                )
+                retry_after = None
+            else:
+                if response.status_code < 400:
+                    return response
+                if stream:
+                    response.close()  # return the unread connection to the pool
+                if response.status_code == 404:
+                    logger.info(f"{host} returned 404 for {canonical_url(url, params)}")
+                    return None
+                if response.status_code not in RETRY_STATUSES:
+                    logger.error(f"{host} HTTP error {response.status_code}; not retrying")
+                    self._count("failures")
+                    return None
+                logger.warning(
+                    f"{host} HTTP {response.status_code} on attempt "
+                    f"{attempt}/{self.max_retries}"
+                )
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt < self.max_retries:
+                self._count("retries")
+                self._sleep(self._backoff(attempt, retry_after))
+
+        self._count("failures")
+        logger.error(f"{host} request failed after {self.max_retries} attempts")
+        return None
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Delay before the next attempt: Retry-After, else jittered exponential."""
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return delay * (0.5 + random.random() / 2)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate = self.host_rate_limits.get(host, self.default_rate_limit)
+                bucket = self._buckets[host] = TokenBucket(rate)
+            return bucket
+
+    def _replay(self, key: str, url: str) -> Optional[requests.Response]:
+        entry = self.cassettes.load(key)
+        if entry is None:
+            logger.warning(f"Replay miss (no captured response) for {url}")
+            self._count("failures")
+            return None
+        self._count("replayed")
+        return self._from_entry(entry, url)
+
+    @staticmethod
+    def _from_entry(entry: Dict[str, Any], url: str) -> requests.Response:
+        return build_response(url, entry["status"], entry["headers"], entry["body"])
+
+    @staticmethod
+    def _validators(headers: Dict[str, str]) -> Dict[str, str]:
+        headers = CaseInsensitiveDict(headers)
+        conditional: Dict[str, str] = {}
+        if headers.get("ETag"):
+            conditional["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
+
+    @staticmethod
+    def _cacheable(response: requests.Response) -> bool:
+        if response.status_code != 200:
+            return False
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return False
+        return bool(
+            response.headers.get("ETag")
+            or response.headers.get("Last-Modified")
+            or _max_age(dict(response.headers))
+        )
+
+    def _safe_save(self, store: ResponseStore, key: str, url: str, response: requests.Response) -> None:
+        try:
+            store.save(key, url, response)
+        except OSError as exc:
+            logger.warning(f"Could not store response for {url}: {exc}")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+
+_default_client: Optional[HTTPClient] = None
+_default_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Return the process-wide HTTPClient built from settings."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
@@ -3,12 +3,22 @@
 Provides a client for searching PubMed and fetching abstract records
 via the NCBI E-utilities API:
   - esearch: search PubMed and return PMIDs
-  - efetch:  fetch full records (XML) for a list of PMIDs
+  - efetch:  fetch full records (XML) for a list of PMIDs, streamed and
+             parsed incrementally; each batch hands articles to the
+             consumer through a small bounded buffer, so at most
+             max_workers x EFETCH_BUFFER_ARTICLES parsed articles are
+             held in memory and downstream work starts mid-batch
 
 Rate limits:
   - Without API key: 3 requests/second
   - With API key:   10 requests/second
 
+All requests share one pooled ``requests.Session`` (keep-alive) and a
+thread-safe token bucket, so efetch batches run concurrently while the
+client as a whole never exceeds the NCBI limit.  Searches are posted to
+the E-utilities history server (``usehistory=y``); result pages are then
+fetched by WebEnv/query_key instead of resending PMID lists.
+
 API docs: https://www.ncbi.nlm.nih.gov/books/NBK25500/
 
 Author: Adam Jones
@@ -16,17 +26,29 @@ Date: February 2026
 """
 
 import os
-import time
+import queue
+import threading
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from datetime import date
+from typing import (
+    Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple,
+)
 from urllib.parse import urlencode
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 
 from loguru import logger
 
+from config.settings import settings
 from src.models import CARTLiterature
 
+from .http_client import TokenBucket
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -43,12 +65,165 @@ RATE_LIMIT_WITH_KEY = 10
 # Default batch size for efetch (max 10,000 per NCBI docs)
 EFETCH_BATCH_SIZE = 200
 
+# Parsed articles each in-flight efetch batch may hold for the consumer
+EFETCH_BUFFER_ARTICLES = 32
+
+# Maximum PMIDs per esearch page (NCBI hard limit)
+ESEARCH_PAGE_SIZE = 10000
+
+# Seconds before an E-utilities request is abandoned
+REQUEST_TIMEOUT = 60
+
+# Open-ended upper bound for date-restricted searches (NCBI requires both)
+MAXDATE_OPEN = "3000"
+
+# Direct children of <PubmedArticleSet>; cleared from the tree once parsed
+ARTICLE_TAGS = ("PubmedArticle", "PubmedBookArticle")
+
+
+# Marks the end of one batch in its article buffer
+_BATCH_END = object()
+
+
+class _FetchAbandoned(Exception):
+    """The consumer stopped reading; efetch workers should give up."""
+
+
+class SearchHistory(NamedTuple):
+    """A search result set stored on the E-utilities history server."""
+
+    webenv: str
+    query_key: str
+    count: int  # records to fetch (capped at max_results)
+    total: Optional[int] = None  # uncapped match count, when known
+
+
+def parse_article(article_elem: ET.Element) -> Dict[str, Any]:
+    """Convert one ``<PubmedArticle>`` element into an article dict.
+
+    Args:
+        article_elem: A parsed PubmedArticle element.
+
+    Returns:
+        Dict with pmid, title, abstract, authors, journal, year, mesh_terms.
+    """
+    article: Dict[str, Any] = {}
+
+    # PMID
+    pmid_elem = article_elem.find(".//PMID")
+    article["pmid"] = (
+        pmid_elem.text if pmid_elem is not None and pmid_elem.text else ""
+    )
+
+    # Title
+    title_elem = article_elem.find(".//ArticleTitle")
+    article["title"] = (
+        title_elem.text if title_elem is not None and title_elem.text else ""
+    )
+
+    # Abstract - join multiple AbstractText elements
+    abstract_parts = []
+    for abs_elem in article_elem.findall(".//AbstractText"):
+        if abs_elem.text:
+            # Include label if present (e.g., "BACKGROUND:", "METHODS:")
+            label = abs_elem.get("Label")
+            if label:
+                abstract_parts.append(f"{label}: {abs_elem.text}")
+            else:
+                abstract_parts.append(abs_elem.text)
+    article["abstract"] = " ".join(abstract_parts)
+
+    # Authors
+    authors = []
+    for author_elem in article_elem.findall(".//Author"):
+        last_name_elem = author_elem.find("LastName")
+        fore_name_elem = author_elem.find("ForeName")
+        last_name = (
+            last_name_elem.text
+            if last_name_elem is not None and last_name_elem.text
+            else ""
+        )
+        fore_name = (
+            fore_name_elem.text
+            if fore_name_elem is not None and fore_name_elem.text
+            else ""
+        )
+        if last_name and fore_name:
+            authors.append(f"{last_name} {fore_name}")
+        elif last_name:
+            authors.append(last_name)
+    article["authors"] = authors
+
+    # Journal
+    journal_elem = article_elem.find(".//Journal/Title")
+    article["journal"] = (
+        journal_elem.text
+        if journal_elem is not None and journal_elem.text
+        else ""
+    )
+
+    # Year - try PubDate/Year first, fallback to MedlineDate
+    year_elem = article_elem.find(".//PubDate/Year")
+    if year_elem is not None and year_elem.text:
+        article["year"] = year_elem.text
+    else:
+        medline_date_elem = article_elem.find(".//PubDate/MedlineDate")
+        if (
+            medline_date_elem is not None
+            and medline_date_elem.text
+        ):
+            # MedlineDate is freeform, e.g. "2023 Jan-Feb"
+            # Extract the first 4-digit year
+            date_text = medline_date_elem.text
+            article["year"] = date_text[:4] if len(date_text) >= 4 else ""
+        else:
+            article["year"] = ""
+
+    # MeSH terms
+    mesh_terms = []
+    for mesh_elem in article_elem.findall(
+        ".//MeshHeading/DescriptorName"
+    ):
+        if mesh_elem.text:
+            mesh_terms.append(mesh_elem.text)
+    article["mesh_terms"] = mesh_terms
+
+    return article
+
+
+def iter_articles(source: Any) -> Iterator[Dict[str, Any]]:
+    """Stream-parse a PubmedArticleSet document, yielding article dicts.
+
+    Uses ``iterparse`` and clears each article (and the root's reference
+    to it) once it has been converted, so memory stays bounded by a single
+    article regardless of how many the document holds.
+
+    Args:
+        source: File-like object (e.g. a streamed HTTP response body) or
+            path containing efetch XML.
+
+    Yields:
+        Article dicts as produced by parse_article().
+
+    Raises:
+        ET.ParseError: If the document is malformed; articles before the
+            error have already been yielded.
+    """
+    context = ET.iterparse(source, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event == "end" and elem.tag in ARTICLE_TAGS:
+            if elem.tag == "PubmedArticle":
+                yield parse_article(elem)
+            root.clear()
+
 
 class PubMedClient:
     """Client for NCBI E-utilities PubMed API.
 
     Handles search (esearch) and abstract retrieval (efetch) with
-    automatic rate limiting and pagination.
+    automatic rate limiting, connection pooling, concurrent batch
+    retrieval, and history-server pagination.
 
     Usage:
         client = PubMedClient(api_key="your_ncbi_key")
@@ -56,6 +231,11 @@ class PubMedClient:
         articles = client.fetch_abstracts(pmids)
         for article in articles:
             print(article["title"], article["year"])
+
+        # Large result sets: page through the stored search instead
+        history = client.search_history("CAR-T CD19", max_results=5000)
+        for article in client.iter_history(history):
+            ...
     """
 
     def __init__(
@@ -63,30 +243,51 @@ class PubMedClient:
         api_key: Optional[str] = None,
         email: Optional[str] = None,
         tool: str = "cart_intelligence_agent",
+        max_workers: Optional[int] = None,
     ):
         """Initialize the PubMed client.
 
         Args:
             api_key: NCBI API key for higher rate limits (10 req/sec).
-                If None, falls back to NCBI_API_KEY environment variable.
-                Without a key, rate limit is 3 req/sec.
+                If None, falls back to the NCBI_API_KEY environment variable,
+                then settings.NCBI_API_KEY.  Without a key, rate limit is
+                3 req/sec.
             email: Contact email for NCBI (recommended by their policy).
                 Falls back to NCBI_EMAIL environment variable.
             tool: Tool name sent in requests (NCBI tracking).
+            max_workers: Concurrent efetch requests.  Defaults to the
+                per-second rate limit (3 or 10).
         """
-        self.api_key = api_key or os.environ.get("NCBI_API_KEY")
+        self.api_key = api_key or os.environ.get("NCBI_API_KEY") or settings.NCBI_API_KEY
         self.email = email or os.environ.get("NCBI_EMAIL", "")
         self.tool = tool
 
         # Set rate limit based on API key presence
         if self.api_key:
-            self._min_interval = 1.0 / RATE_LIMIT_WITH_KEY
+            self.rate_limit = RATE_LIMIT_WITH_KEY
             logger.info("PubMed client initialized with API key (10 req/sec)")
         else:
-            self._min_interval = 1.0 / RATE_LIMIT_NO_KEY
+            self.rate_limit = RATE_LIMIT_NO_KEY
             logger.info("PubMed client initialized without API key (3 req/sec)")
 
-        self._last_request_time: float = 0.0
+        self.max_workers = max(1, max_workers or self.rate_limit)
+        self._bucket = TokenBucket(self.rate_limit)
+
+        # One keep-alive connection per concurrent worker
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "PubMedClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _build_base_params(self) -> Dict[str, str]:
         """Build the base query parameters shared by all E-utilities requests.
@@ -107,16 +308,23 @@ class PubMedClient:
         self,
         query: str,
         retstart: int = 0,
-        retmax: int = 10000,
+        retmax: int = ESEARCH_PAGE_SIZE,
+        history: Optional[SearchHistory] = None,
+        mindate: Optional[date] = None,
     ) -> str:
         """Build the full esearch URL with query parameters.
 
-        esearch returns a list of PMIDs matching the search query.
+        esearch returns a list of PMIDs matching the search query.  The
+        result set is always stored on the history server; pass the
+        ``history`` from a previous page to page through that stored set.
 
         Args:
             query: PubMed search query string.
             retstart: Index of first result to return (for pagination).
             retmax: Maximum number of PMIDs to return (max 10,000 per NCBI).
+            history: WebEnv/query_key of an earlier page of this search.
+            mindate: Only match records whose Entrez date (``edat``, when
+                the record entered PubMed) is on or after this date.
 
         Returns:
             Fully-formed URL string for the esearch request.
@@ -128,7 +336,17 @@ class PubMedClient:
             "retmode": "json",
             "retstart": str(retstart),
             "retmax": str(retmax),
+            "usehistory": "y",
         })
+        if history is not None:
+            params["WebEnv"] = history.webenv
+            params["query_key"] = history.query_key
+        if mindate is not None:
+            params.update({
+                "datetype": "edat",
+                "mindate": mindate.strftime("%Y/%m/%d"),
+                "maxdate": MAXDATE_OPEN,
+            })
         return f"{ESEARCH_URL}?{urlencode(params)}"
 
     def _build_efetch_url(
@@ -158,23 +376,75 @@ class PubMedClient:
         })
         return f"{EFETCH_URL}?{urlencode(params)}"
 
+    def _build_efetch_history_url(
+        self,
+        history: SearchHistory,
+        retstart: int,
+        retmax: int,
+        rettype: str = "xml",
+        retmode: str = "xml",
+    ) -> str:
+        """Build an efetch URL for one page of a stored search.
+
+        Args:
+            history: WebEnv/query_key returned by search_history().
+            retstart: Index of the first record in the page.
+            retmax: Number of records in the page.
+            rettype: Return type (xml for full records).
+            retmode: Return mode (xml).
+
+        Returns:
+            Fully-formed URL string for the efetch request.
+        """
+        params = self._build_base_params()
+        params.update({
+            "db": "pubmed",
+            "WebEnv": history.webenv,
+            "query_key": history.query_key,
+            "retstart": str(retstart),
+            "retmax": str(retmax),
+            "rettype": rettype,
+            "retmode": retmode,
+        })
+        return f"{EFETCH_URL}?{urlencode(params)}"
+
     def _rate_limit(self) -> None:
-        """Enforce rate limiting between API requests.
+        """Take a token from the shared bucket (3/sec without key, 10/sec with).
 
-        Sleeps if necessary to maintain the required minimum interval
-        between consecutive requests (3/sec without key, 10/sec with key).
+        Safe to call from any number of threads.
         """
-        now = time.time()
-        elapsed = now - self._last_request_time
-        if elapsed < self._min_interval:
-            sleep_time = self._min_interval - elapsed
-            time.sleep(sleep_time)
-        self._last_request_time = time.time()
+        self._bucket.acquire()
+
+    def _get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Rate-limited GET on the pooled session."""
+        self._rate_limit()
+        return self._session.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
+
+    def _esearch(
+        self,
+        query: str,
+        retstart: int,
+        retmax: int,
+        history: Optional[SearchHistory] = None,
+        mindate: Optional[date] = None,
+    ) -> Tuple[List[str], SearchHistory]:
+        """Run one esearch page; return its PMIDs and the stored result set."""
+        url = self._build_esearch_url(query, retstart, retmax, history, mindate)
+        response = self._get(url)
+        response.raise_for_status()
+        result = response.json()["esearchresult"]
+        stored = SearchHistory(
+            webenv=result["webenv"],
+            query_key=str(result["querykey"]),
+            count=int(result["count"]),
+        )
+        return result["idlist"], stored
 
     def search(
         self,
         query: str,
         max_results: int = 5000,
+        mindate: Optional[date] = None,
     ) -> List[str]:
         """Search PubMed and return matching PMIDs.
 
@@ -191,43 +461,33 @@ class PubMedClient:
                   - '"chimeric antigen receptor"[Title/Abstract]'
                   - '"CAR T cell" AND "clinical trial"[pt]'
             max_results: Maximum number of PMIDs to retrieve.
+            mindate: Only return records added to PubMed (Entrez date)
+                on or after this date.
 
         Returns:
             List of PMID strings (e.g. ["12345678", "23456789"]).
 
         """
         all_pmids: List[str] = []
-        retmax = 10000
-        retstart = 0
+        retmax = min(ESEARCH_PAGE_SIZE, max(1, max_results))
 
         try:
-            # First request to get total count and initial batch
-            url = self._build_esearch_url(query, retstart=retstart, retmax=retmax)
-            self._rate_limit()
-            response = requests.get(url)
-            response.raise_for_status()
-            result = response.json()
-
-            id_list = result["esearchresult"]["idlist"]
-            total_count = int(result["esearchresult"]["count"])
+            # First request runs the query and stores it on the history server
+            id_list, history = self._esearch(
+                query, retstart=0, retmax=retmax, mindate=mindate
+            )
             all_pmids.extend(id_list)
 
             logger.info(
-                f"PubMed search '{query[:80]}' returned {total_count} total results"
+                f"PubMed search '{query[:80]}' returned {history.count} total results"
             )
 
-            # Paginate if there are more results than the first batch
-            while len(all_pmids) < total_count and len(all_pmids) < max_results:
-                retstart += retmax
-                url = self._build_esearch_url(
-                    query, retstart=retstart, retmax=retmax
+            # Later pages read the stored result set instead of re-running the query
+            while len(all_pmids) < min(history.count, max_results):
+                id_list, _ = self._esearch(
+                    query, retstart=len(all_pmids), retmax=retmax,
+                    history=history, mindate=mindate,
                 )
-                self._rate_limit()
-                response = requests.get(url)
-                response.raise_for_status()
-                result = response.json()
-
-                id_list = result["esearchresult"]["idlist"]
                 if not id_list:
                     break
                 all_pmids.extend(id_list)
@@ -244,6 +504,216 @@ class PubMedClient:
             logger.error(f"Error parsing PubMed search response: {e}")
             return all_pmids
 
+    def search_history(
+        self,
+        query: str,
+        max_results: int = 5000,
+        mindate: Optional[date] = None,
+    ) -> Optional[SearchHistory]:
+        """Store a search on the history server without downloading PMIDs.
+
+        Pass the result to iter_history() to fetch the matching records
+        page by page; no PMID list ever crosses the wire.
+
+        Args:
+            query: PubMed search query string (see search()).
+            max_results: Cap applied to the returned ``count``.
+            mindate: Only match records added to PubMed (Entrez date) on
+                or after this date; used for delta refreshes.
+
+        Returns:
+            SearchHistory with ``count`` capped at max_results and the
+            uncapped ``total``, or None if the search failed.
+        """
+        try:
+            _, history = self._esearch(query, retstart=0, retmax=0, mindate=mindate)
+        except requests.RequestException as e:
+            logger.error(f"HTTP error during PubMed search: {e}")
+            return None
+        except (KeyError, ValueError) as e:
+            logger.error(f"Error parsing PubMed search response: {e}")
+            return None
+
+        logger.info(
+            f"PubMed search '{query[:80]}' returned {history.count} total results"
+        )
+        return history._replace(count=min(history.count, max_results), total=history.count)
+
+    def iter_history(
+        self,
+        history: SearchHistory,
+        batch_size: int = EFETCH_BATCH_SIZE,
+        failed: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream abstract records for a stored search (see search_history()).
+
+        Args:
+            history: WebEnv/query_key/count from search_history().
+            batch_size: Records per efetch page.
+            failed: Optional list that receives the URL of every page that
+                failed (see iter_abstracts()).
+
+        Yields:
+            Article dicts (see fetch_abstracts() for keys), in search order.
+        """
+        urls = [
+            self._build_efetch_history_url(
+                history, retstart, min(batch_size, history.count - retstart)
+            )
+            for retstart in range(0, history.count, batch_size)
+        ]
+        yield from self._fetch_concurrently(urls, failed)
+
+    def iter_abstracts(
+        self,
+        pmids: List[str],
+        batch_size: int = EFETCH_BATCH_SIZE,
+        failed: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream detailed abstract records for a list of PMIDs.
+
+        Batches are fetched concurrently (up to ``max_workers`` in flight,
+        paced by the shared token bucket) and yielded in order.  Each
+        response body is streamed and parsed incrementally (see
+        iter_articles()), so no full-document element tree is ever built,
+        and articles are yielded as they are parsed.  A batch that gets
+        ahead of the consumer blocks once EFETCH_BUFFER_ARTICLES articles
+        are waiting, so memory is bounded by max_workers x
+        EFETCH_BUFFER_ARTICLES articles, not by the batch size.
+
+        Args:
+            pmids: List of PubMed IDs to fetch records for.
+            batch_size: Number of PMIDs per efetch request (max ~10,000,
+                default 200 for reliability).
+            failed: Optional list that receives the URL of every batch that
+                failed, so callers can tell a partial result from a
+                complete one.
+
+        Yields:
+            Article dicts (see fetch_abstracts() for keys).  A failed batch
+            is logged and skipped after yielding any articles it produced.
+        """
+        urls = [
+            self._build_efetch_url(pmids[i : i + batch_size])
+            for i in range(0, len(pmids), batch_size)
+        ]
+        yield from self._fetch_concurrently(urls, failed)
+
+    def _fetch_concurrently(
+        self,
+        urls: List[str],
+        failed: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Fetch efetch URLs on a worker pool, yielding articles in order.
+
+        At most ``max_workers`` batches are in flight, and each passes its
+        articles through a buffer of EFETCH_BUFFER_ARTICLES, so a slow
+        consumer applies backpressure down to the HTTP stream instead of
+        batches piling up in memory.  Closing the generator early stops
+        the workers.
+        """
+        total = len(urls)
+        if not total:
+            return
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, total),
+            thread_name_prefix="pubmed-efetch",
+        )
+        stop = threading.Event()
+        pending: Deque[Tuple[str, queue.Queue, Future]] = deque()
+        queued = iter(enumerate(urls, start=1))
+
+        def _put(buffer: queue.Queue, item: Any) -> None:
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            raise _FetchAbandoned()
+
+        def _run(url: str, batch_idx: int, buffer: queue.Queue) -> bool:
+            try:
+                return self._efetch_batch(
+                    url, batch_idx, total, lambda article: _put(buffer, article)
+                )
+            except _FetchAbandoned:
+                return False
+            finally:
+                with suppress(_FetchAbandoned):
+                    _put(buffer, _BATCH_END)
+
+        def _submit_next() -> None:
+            item = next(queued, None)
+            if item is not None:
+                batch_idx, url = item
+                buffer: queue.Queue = queue.Queue(maxsize=EFETCH_BUFFER_ARTICLES)
+                pending.append((url, buffer, pool.submit(_run, url, batch_idx, buffer)))
+
+        try:
+            for _ in range(self.max_workers):
+                _submit_next()
+            while pending:
+                url, buffer, future = pending[0]
+                for article in iter(buffer.get, _BATCH_END):
+                    yield article
+                pending.popleft()
+                ok = future.result()
+                _submit_next()
+                if not ok and failed is not None:
+                    failed.append(url)
+        finally:
+            stop.set()
+            for _, _, future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def _efetch_batch(
+        self,
+        url: str,
+        batch_idx: int,
+        total_batches: int,
+        emit: Callable[[Dict[str, Any]], None],
+    ) -> bool:
+        """Fetch and stream-parse one efetch batch (runs on a worker thread).
+
+        Args:
+            emit: Called with each article as soon as it is parsed.
+
+        Returns:
+            Whether the whole batch was read.
+        """
+        count = 0
+        try:
+            with self._get(url, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                for article in iter_articles(response.raw):
+                    emit(article)
+                    count += 1
+
+            logger.info(f"Fetched batch {batch_idx}/{total_batches} ({count} articles)")
+
+        except requests.RequestException as e:
+            logger.error(
+                f"HTTP error fetching batch {batch_idx}/{total_batches}: {e}"
+            )
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            # Raised by response.raw while streaming (connection reset,
+            # read timeout, bad gzip) -- not wrapped in RequestException
+            logger.error(
+                f"Stream error for batch {batch_idx}/{total_batches} "
+                f"after {count} articles: {e}"
+            )
+        except ET.ParseError as e:
+            logger.error(
+                f"XML parse error for batch {batch_idx}/{total_batches} "
+                f"after {count} articles: {e}"
+            )
+        else:
+            return True
+        return False
+
     def fetch_abstracts(
         self,
         pmids: List[str],
@@ -251,9 +721,8 @@ class PubMedClient:
     ) -> List[Dict[str, Any]]:
         """Fetch detailed abstract records for a list of PMIDs.
 
-        Uses the efetch E-utility to retrieve PubMed XML records,
-        then parses them into structured dicts.  Processes PMIDs
-        in batches to respect API limits.
+        Collects iter_abstracts() into a list.  Prefer iter_abstracts()
+        for large PMID sets so articles can be processed as they stream in.
 
         Args:
             pmids: List of PubMed IDs to fetch records for.
@@ -274,117 +743,6 @@ class PubMedClient:
         if not pmids:
             return []
 
-        articles: List[Dict[str, Any]] = []
-
-        # Split PMIDs into batches
-        batches = [
-            pmids[i : i + batch_size] for i in range(0, len(pmids), batch_size)
-        ]
-        total_batches = len(batches)
-
-        for batch_idx, batch in enumerate(batches, start=1):
-            try:
-                url = self._build_efetch_url(batch)
-                self._rate_limit()
-                response = requests.get(url)
-                response.raise_for_status()
-
-                root = ET.fromstring(response.content)
-
-                for article_elem in root.findall(".//PubmedArticle"):
-                    article: Dict[str, Any] = {}
-
-                    # PMID
-                    pmid_elem = article_elem.find(".//PMID")
-                    article["pmid"] = (
-                        pmid_elem.text if pmid_elem is not None and pmid_elem.text else ""
-                    )
-
-                    # Title
-                    title_elem = article_elem.find(".//ArticleTitle")
-                    article["title"] = (
-                        title_elem.text if title_elem is not None and title_elem.text else ""
-                    )
-
-                    # Abstract - join multiple AbstractText elements
-                    abstract_parts = []
-                    for abs_elem in article_elem.findall(".//AbstractText"):
-                        if abs_elem.text:
-                            # Include label if present (e.g., "BACKGROUND:", "METHODS:")
-                            label = abs_elem.get("Label")
-                            if label:
-                                abstract_parts.append(f"{label}: {abs_elem.text}")
-                            else:
-                                abstract_parts.append(abs_elem.text)
-                    article["abstract"] = " ".join(abstract_parts)
-
-                    # Authors
-                    authors = []
-                    for author_elem in article_elem.findall(".//Author"):
-                        last_name_elem = author_elem.find("LastName")
-                        fore_name_elem = author_elem.find("ForeName")
-                        last_name = (
-                            last_name_elem.text
-                            if last_name_elem is not None and last_name_elem.text
-                            else ""
-                        )
-                        fore_name = (
-                            fore_name_elem.text
-                            if fore_name_elem is not None and fore_name_elem.text
-                            else ""
-                        )
-                        if last_name and fore_name:
-                            authors.append(f"{last_name} {fore_name}")
-                        elif last_name:
-                            authors.append(last_name)
-                    article["authors"] = authors
-
-                    # Journal
-                    journal_elem = article_elem.find(".//Journal/Title")
-                    article["journal"] = (
-                        journal_elem.text
-                        if journal_elem is not None and journal_elem.text
-                        else ""
-                    )
-
-                    # Year - try PubDate/Year first, fallback to MedlineDate
-                    year_elem = article_elem.find(".//PubDate/Year")
-                    if year_elem is not None and year_elem.text:
-                        article["year"] = year_elem.text
-                    else:
-                        medline_date_elem = article_elem.find(".//PubDate/MedlineDate")
-                        if (
-                            medline_date_elem is not None
-                            and medline_date_elem.text
-                        ):
-                            # MedlineDate is freeform, e.g. "2023 Jan-Feb"
-                            # Extract the first 4-digit year
-                            date_text = medline_date_elem.text
-                            article["year"] = date_text[:4] if len(date_text) >= 4 else ""
-                        else:
-                            article["year"] = ""
-
-                    # MeSH terms
-                    mesh_terms = []
-                    for mesh_elem in article_elem.findall(
-                        ".//MeshHeading/DescriptorName"
-                    ):
-                        if mesh_elem.text:
-                            mesh_terms.append(mesh_elem.text)
-                    article["mesh_terms"] = mesh_terms
-
-                    articles.append(article)
-
-                logger.info(f"Fetched batch {batch_idx}/{total_batches}")
-
-            except requests.RequestException as e:
-                logger.error(
-                    f"HTTP error fetching batch {batch_idx}/{total_batches}: {e}"
-                )
-            except ET.ParseError as e:
-                logger.error(
-                    f"XML parse error for batch {batch_idx}/{total_batches}: {e}"
-                )
-
+        articles = list(self.iter_abstracts(pmids, batch_size))
         logger.info(f"Fetched {len(articles)} articles total from {len(pmids)} PMIDs")
         return articles
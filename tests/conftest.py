@@ -1,7 +1,8 @@
 """Shared pytest fixtures for CAR-T Intelligence Agent test suite.
 
 Provides mock embedder, LLM client, collection manager, and sample
-search results so that tests run without Milvus or external services.
+search results so that tests run without Milvus or external services,
+and keeps on-disk caches out of the working tree.
 
 Author: Adam Jones
 Date: February 2026
@@ -24,6 +25,33 @@ if str(PROJECT_ROOT) not in sys.path:
 from src.models import CrossCollectionResult, SearchHit  # noqa: E402
 
 
+# ═══════════════════════════════════════════════════════════════════════
+# ISOLATED CACHE DIRECTORIES
+# ═══════════════════════════════════════════════════════════════════════
+
+
+@pytest.fixture(autouse=True)
+def isolated_ingest_embedding_store(tmp_path, monkeypatch):
+    """Point the persistent ingest embedding store at a per-test directory."""
+    from config.settings import settings
+
+    monkeypatch.setattr(
+        settings, "INGEST_EMBEDDING_STORE_DIR", tmp_path / "ingest_embeddings",
+    )
+    return settings.INGEST_EMBEDDING_STORE_DIR
+
+
+@pytest.fixture(autouse=True)
+def isolated_http_client(tmp_path, monkeypatch):
+    """Give each test a fresh shared HTTP client with per-test cache dirs."""
+    from config.settings import settings
+
+    monkeypatch.setattr(settings, "HTTP_CACHE_DIR", tmp_path / "http_cache")
+    monkeypatch.setattr(settings, "HTTP_CASSETTE_DIR", tmp_path / "http_cassettes")
+    monkeypatch.setattr("src.utils.http_client._default_client", None)
+    return settings.HTTP_CACHE_DIR
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # MOCK EMBEDDER
 # ═══════════════════════════════════════════════════════════════════════
@@ -34,6 +62,7 @@ def mock_embedder():
     """Return a mock embedder that produces 384-dim zero vectors."""
     embedder = MagicMock()
     embedder.embed_text.return_value = [0.0] * 384
+    embedder.encode.side_effect = lambda texts: [[0.0] * 384 for _ in texts]
     return embedder
 
 
@@ -62,6 +91,8 @@ def mock_collection_manager():
 
     - search()      -> empty list
     - search_all()  -> empty dict of lists for all 10 collections
+    - search_all_many() -> empty per-query result lists for all 10 collections
+    - hydrate_many() -> no records (hits keep their search payload)
     - get_collection_stats() -> dummy counts for all 10 collections
     - connect() / disconnect() -> no-ops
     """
@@ -82,6 +113,12 @@ def mock_collection_manager():
         "cart_realworld",
     ]
     manager.search_all.return_value = {name: [] for name in collection_names}
+    manager.search_all_many.side_effect = lambda query_embeddings, *args, **kwargs: {
+        name: [[] for _ in query_embeddings]
+        for name in (kwargs.get("collections") or collection_names)
+    }
+
+    manager.hydrate_many.return_value = {}
 
     manager.get_collection_stats.return_value = {
         name: 42 for name in collection_names
@@ -0,0 +1,224 @@
+"""Tests for CAR-T Intelligence Agent API admission control.
+
+Validates per-lane in-flight limits, FIFO hand-over of released slots,
+fast 429 (queue full) and 503 (queue timeout) rejections with
+Retry-After, cancellation while queued, lane independence, and the
+exported queue metrics (no server or network required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from api.admission import (
+    MAX_RETRY_AFTER,
+    AdmissionController,
+    AdmissionLane,
+)
+
+
+def _lane(max_in_flight=1, max_queue=1, queue_timeout=1.0):
+    return AdmissionLane("llm", max_in_flight, max_queue, queue_timeout)
+
+
+async def _hold(lane: AdmissionLane, release: asyncio.Event, order: list, tag: str):
+    async with lane.admit():
+        order.append(tag)
+        await release.wait()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# LIMITS & QUEUEING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestAdmissionLane:
+    """Tests for AdmissionLane limits and queueing."""
+
+    def test_limits_in_flight_and_hands_over_fifo(self):
+        """Requests beyond max_in_flight wait and are admitted in order."""
+        lane = _lane(max_in_flight=2, max_queue=5)
+
+        async def scenario():
+            release = asyncio.Event()
+            order = []
+            tasks = [
+                asyncio.create_task(_hold(lane, release, order, tag))
+                for tag in "abcd"
+            ]
+            await _settle()
+            busy = (lane.in_flight, lane.queued, list(order))
+            release.set()
+            await asyncio.gather(*tasks)
+            return busy, order
+
+        busy, order = asyncio.run(scenario())
+        assert busy == (2, 2, ["a", "b"])
+        assert order == ["a", "b", "c", "d"]
+        assert (lane.in_flight, lane.queued, lane.admitted) == (0, 0, 4)
+
+    def test_full_queue_rejected_with_429(self):
+        """With every slot and queue place taken, new requests fail fast."""
+        lane = _lane(max_in_flight=1, max_queue=1)
+
+        async def scenario():
+            release = asyncio.Event()
+            tasks = [asyncio.create_task(_hold(lane, release, [], t)) for t in "ab"]
+            await _settle()
+            with pytest.raises(HTTPException) as exc:
+                await lane.acquire()
+            release.set()
+            await asyncio.gather(*tasks)
+            return exc.value
+
+        error = asyncio.run(scenario())
+        assert error.status_code == 429
+        assert int(error.headers["Retry-After"]) >= 1
+        assert lane.rejected["queue_full"] == 1
+
+    def test_queue_timeout_rejected_with_503(self):
+        """A waiter that never gets a slot gives up with 503."""
+        lane = _lane(max_in_flight=1, max_queue=2, queue_timeout=0.05)
+
+        async def scenario():
+            release = asyncio.Event()
+            holder = asyncio.create_task(_hold(lane, release, [], "a"))
+            await _settle()
+            with pytest.raises(HTTPException) as exc:
+                await lane.acquire()
+            queued = lane.queued
+            release.set()
+            await holder
+            return exc.value, queued
+
+        error, queued = asyncio.run(scenario())
+        assert error.status_code == 503
+        assert "Retry-After" in error.headers
+        assert queued == 0
+        assert lane.in_flight == 0
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """A client that disconnects while queued frees its place."""
+        lane = _lane(max_in_flight=1, max_queue=2)
+
+        async def scenario():
+            release = asyncio.Event()
+            order = []
+            first = asyncio.create_task(_hold(lane, release, order, "a"))
+            gone = asyncio.create_task(_hold(lane, release, order, "gone"))
+            await _settle()
+            gone.cancel()
+            await _settle()
+            last = asyncio.create_task(_hold(lane, release, order, "c"))
+            await _settle()
+            release.set()
+            await asyncio.gather(first, last)
+            return order, gone.cancelled()
+
+        order, cancelled = asyncio.run(scenario())
+        assert cancelled
+        assert order == ["a", "c"]
+        assert lane.in_flight == 0
+
+    def test_retry_after_tracks_service_time_and_backlog(self):
+        """Retry-After grows with observed latency and queue depth."""
+        lane = _lane(max_in_flight=2, max_queue=10)
+        assert lane.retry_after() == 1
+
+        lane._observe(4.0)
+        assert lane.retry_after() == 2  # 4s * (0 queued + 1) / 2 slots
+        lane._observe(1000.0)
+        assert lane.retry_after() == MAX_RETRY_AFTER
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONTROLLER & METRICS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestAdmissionController:
+    """Tests for lane independence and exported state."""
+
+    def test_lanes_are_independent(self):
+        """A saturated llm lane does not affect the search lane."""
+        controller = AdmissionController({
+            "search": AdmissionLane("search", 1, 0, 1.0),
+            "llm": AdmissionLane("llm", 1, 0, 1.0),
+        })
+
+        async def scenario():
+            release = asyncio.Event()
+            holder = asyncio.create_task(_hold(controller.lanes["llm"], release, [], "q"))
+            await _settle()
+            with pytest.raises(HTTPException):
+                async with controller.admit("llm"):
+                    pass
+            async with controller.admit("search"):
+                searched = True
+            release.set()
+            await holder
+            return searched
+
+        assert asyncio.run(scenario())
+        snapshot = controller.snapshot()
+        assert snapshot["llm"]["rejected"]["queue_full"] == 1
+        assert snapshot["search"]["admitted"] == 1
+
+    def test_admit_selects_retrieval_pool(self):
+        """Admitted requests carry their lane to the engine's retrieval pools."""
+        from src.rag_engine import _retrieval_lane
+
+        controller = AdmissionController({
+            "search": AdmissionLane("search", 1, 0, 1.0),
+            "llm": AdmissionLane("llm", 1, 0, 1.0),
+        })
+
+        async def scenario():
+            seen = []
+            async with controller.admit("llm"):
+                seen.append(_retrieval_lane.get())
+                async with controller.admit("search"):
+                    seen.append(_retrieval_lane.get())
+                seen.append(_retrieval_lane.get())
+            seen.append(_retrieval_lane.get())
+            return seen
+
+        assert asyncio.run(scenario()) == ["llm", "search", "llm", None]
+
+    def test_from_settings(self, monkeypatch):
+        """Lane limits come from API_* settings."""
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "API_LLM_MAX_IN_FLIGHT", 3)
+        monkeypatch.setattr(settings, "API_SEARCH_MAX_QUEUE", 7)
+        controller = AdmissionController.from_settings()
+        assert controller.lanes["llm"].max_in_flight == 3
+        assert controller.lanes["search"].max_queue == 7
+
+    def test_metrics_recorded(self):
+        """Queue depth, waits and rejections are exported."""
+        lane = _lane(max_in_flight=1, max_queue=0)
+
+        async def scenario():
+            async with lane.admit():
+                with pytest.raises(HTTPException):
+                    await lane.acquire()
+
+        with patch("api.admission.record_admission_state") as state, \
+                patch("api.admission.record_admission_wait") as wait, \
+                patch("api.admission.record_admission_rejected") as rejected:
+            asyncio.run(scenario())
+
+        state.assert_called_with("llm", 0, 0)
+        wait.assert_called_once_with("llm", 0.0)
+        rejected.assert_called_once_with("llm", "queue_full")
@@ -0,0 +1,372 @@
+"""Tests for CAR-T Intelligence Agent FastAPI request path.
+
+Validates that the async endpoints run retrieval and LLM generation off
+the event loop, so /search and /health keep answering while slow /query
+and /api/ask calls are in flight, and that admission control sheds LLM
+overload with 429/503 + Retry-After without touching /search, and that
+the SSE/NDJSON streaming endpoints send evidence before the answer, and
+that /search/batch embeds once and groups filters into multi-vector
+searches (no Milvus, model or LLM required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+import api.main as api_main
+from src.rag_engine import CARTRAGEngine
+
+QUESTION = {"question": "What is the CRS rate for CD19 CAR-T?"}
+
+
+@pytest.fixture
+def engine(mock_collection_manager, mock_embedder, mock_llm_client, monkeypatch):
+    engine = CARTRAGEngine(
+        collection_manager=mock_collection_manager,
+        embedder=mock_embedder,
+        llm_client=mock_llm_client,
+        knowledge=None,
+        query_expander=None,
+    )
+    monkeypatch.setattr(api_main, "_engine", engine)
+    monkeypatch.setattr(api_main, "_manager", mock_collection_manager)
+    monkeypatch.setattr(api_main, "_rate_limit_store", {})
+    monkeypatch.setattr("api.admission._controller", None)
+    yield engine
+    engine.shutdown_pools()
+
+
+def _client() -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=api_main.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+class _BlockingLLM:
+    """LLM stand-in whose generate() blocks until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = 0
+        self.threads = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, system_prompt="", max_tokens=2048, temperature=0.7):
+        with self._lock:
+            self.started += 1
+            self.threads.append(threading.current_thread().name)
+        self.release.wait(timeout=10)
+        return "Slow answer"
+
+    def generate_stream(self, prompt, system_prompt="", max_tokens=2048, temperature=0.7):
+        with self._lock:
+            self.started += 1
+        self.release.wait(timeout=10)
+        yield from ["Slow ", "answer"]
+
+    async def wait_started(self, count: int) -> None:
+        while self.started < count:
+            await asyncio.sleep(0.01)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONCURRENCY
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestNonBlockingRequestPath:
+    """Slow LLM calls must not stall the event loop."""
+
+    def test_search_served_while_queries_in_flight(self, engine):
+        """/search and /health answer while three /query calls wait on the LLM."""
+        llm = engine.llm = _BlockingLLM()
+
+        async def scenario():
+            async with _client() as client:
+                queries = [
+                    asyncio.create_task(client.post("/query", json=QUESTION))
+                    for _ in range(3)
+                ]
+                await asyncio.wait_for(llm.wait_started(3), timeout=5)
+
+                search = await asyncio.wait_for(client.post("/search", json=QUESTION), timeout=5)
+                health = await asyncio.wait_for(client.get("/health"), timeout=5)
+                pending = sum(not q.done() for q in queries)
+
+                llm.release.set()
+                answers = await asyncio.wait_for(asyncio.gather(*queries), timeout=5)
+                return search, health, pending, answers
+
+        search, health, pending, answers = asyncio.run(scenario())
+        assert search.status_code == 200
+        assert health.status_code == 200
+        assert pending == 3
+        assert [a.json()["answer"] for a in answers] == ["Slow answer"] * 3
+        assert all(name.startswith("cart-rag-generate") for name in llm.threads)
+
+    def test_ask_generates_on_pool(self, engine):
+        """/api/ask retrieves and generates off the event loop."""
+        llm = engine.llm = _BlockingLLM()
+        llm.release.set()
+
+        async def scenario():
+            async with _client() as client:
+                return await client.post("/api/ask", json=QUESTION)
+
+        response = asyncio.run(scenario())
+        assert response.status_code == 200
+        assert response.json()["answer"] == "Slow answer"
+        assert llm.threads[0].startswith("cart-rag-generate")
+
+    def test_find_related_off_loop(self, engine):
+        """/find-related runs find_related on the retrieval pool."""
+        seen = []
+        engine.find_related = lambda entity, top_k: seen.append(
+            threading.current_thread().name
+        ) or {}
+
+        async def scenario():
+            async with _client() as client:
+                return await client.post("/find-related", json={"entity": "Yescarta"})
+
+        response = asyncio.run(scenario())
+        assert response.status_code == 200
+        assert seen[0].startswith("cart-rag-retrieve")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# ADMISSION CONTROL
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestAdmissionControl:
+    """LLM overload is rejected quickly; evidence-only traffic is unaffected."""
+
+    def test_llm_overload_rejected_search_still_served(self, engine, monkeypatch):
+        """With the llm lane full, /query gets 429 and /search still 200."""
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "API_LLM_MAX_IN_FLIGHT", 1)
+        monkeypatch.setattr(settings, "API_LLM_MAX_QUEUE", 1)
+        llm = engine.llm = _BlockingLLM()
+
+        async def scenario():
+            async with _client() as client:
+                running = asyncio.create_task(client.post("/query", json=QUESTION))
+                await asyncio.wait_for(llm.wait_started(1), timeout=5)
+                queued = asyncio.create_task(client.post("/api/ask", json=QUESTION))
+                await asyncio.sleep(0.05)
+
+                rejected = await asyncio.wait_for(client.post("/query", json=QUESTION), timeout=1)
+                search = await asyncio.wait_for(client.post("/search", json=QUESTION), timeout=5)
+                metrics = (await client.get("/metrics")).text
+
+                llm.release.set()
+                done = await asyncio.wait_for(asyncio.gather(running, queued), timeout=5)
+                return rejected, search, metrics, done
+
+        rejected, search, metrics, done = asyncio.run(scenario())
+        assert rejected.status_code == 429
+        assert int(rejected.headers["Retry-After"]) >= 1
+        assert search.status_code == 200
+        assert 'cart_api_admission_queue_depth{lane="llm"} 1' in metrics
+        assert 'cart_api_admission_rejected_total{lane="llm",reason="queue_full"} 1' in metrics
+        assert [r.status_code for r in done] == [200, 200]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# STREAMING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+async def _call_asgi(path: str, payload: dict, send) -> None:
+    """Invoke the ASGI app directly so each sent message is observable.
+
+    httpx's ASGITransport buffers whole responses, which hides when the
+    first streamed chunk was actually sent.
+    """
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "client": ("127.0.0.1", 1234), "server": ("test", 80),
+        "headers": [
+            (b"host", b"test"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()  # never disconnects
+
+    await api_main.app(scope, receive, send)
+
+
+def _sse_events(body: str):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreaming:
+    """Tests for /query/stream and /api/ask/stream."""
+
+    def test_query_stream_sends_evidence_before_answer(self, engine):
+        """The evidence event reaches the client while the LLM is still generating."""
+        llm = engine.llm = _BlockingLLM()
+
+        async def scenario():
+            sent: asyncio.Queue = asyncio.Queue()
+            app = asyncio.create_task(_call_asgi("/query/stream", QUESTION, sent.put))
+            start = await asyncio.wait_for(sent.get(), timeout=5)
+            first = await asyncio.wait_for(sent.get(), timeout=5)
+            generating = llm.started == 1 and not llm.release.is_set()
+
+            llm.release.set()
+            await asyncio.wait_for(app, timeout=5)
+            rest = []
+            while not sent.empty():
+                rest.append((await sent.get()).get("body", b"").decode())
+            return start, first["body"].decode(), generating, "".join(rest)
+
+        start, first, generating, rest = asyncio.run(scenario())
+        headers = dict(start["headers"])
+        assert start["status"] == 200
+        assert headers[b"content-type"].startswith(b"text/event-stream")
+        assert generating
+        assert first.startswith("event: evidence")
+
+        events = _sse_events(first + rest)
+        assert [e for e, _ in events] == ["evidence", "token", "token", "done"]
+        assert events[0][1]["question"] == QUESTION["question"]
+        assert "collections_searched" in events[0][1]
+        assert events[-1][1]["answer"] == "Slow answer"
+
+    def test_ask_stream_ndjson(self, engine):
+        """Accept: application/x-ndjson switches to one JSON object per line."""
+        llm = engine.llm = _BlockingLLM()
+        llm.release.set()
+
+        async def scenario():
+            async with _client() as client:
+                return await client.post(
+                    "/api/ask/stream", json=QUESTION,
+                    headers={"Accept": "application/x-ndjson"},
+                )
+
+        response = asyncio.run(scenario())
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["type"] for line in lines] == ["sources", "token", "token", "done"]
+        assert "confidence" in lines[0]
+        assert lines[-1]["answer"] == "Slow answer"
+
+    def test_saturated_lane_rejected_before_streaming(self, engine, monkeypatch):
+        """A full llm lane answers a stream request with a plain 429."""
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "API_LLM_MAX_IN_FLIGHT", 1)
+        monkeypatch.setattr(settings, "API_LLM_MAX_QUEUE", 0)
+        llm = engine.llm = _BlockingLLM()
+
+        async def scenario():
+            async with _client() as client:
+                running = asyncio.create_task(client.post("/query", json=QUESTION))
+                await asyncio.wait_for(llm.wait_started(1), timeout=5)
+                rejected = await client.post("/query/stream", json=QUESTION)
+                llm.release.set()
+                await running
+                return rejected
+
+        rejected = asyncio.run(scenario())
+        assert rejected.status_code == 429
+        assert "Retry-After" in rejected.headers
+
+    def test_failure_mid_stream_sends_error_event(self, engine):
+        """An LLM error after the evidence ends the stream with an error event."""
+
+        def _failing_stream(**kwargs):
+            raise RuntimeError("LLM overloaded")
+            yield  # pragma: no cover
+
+        engine.llm.generate_stream.side_effect = _failing_stream
+
+        async def scenario():
+            async with _client() as client:
+                return await client.post("/query/stream", json=QUESTION)
+
+        events = _sse_events(asyncio.run(scenario()).text)
+        assert [e for e, _ in events] == ["evidence", "error"]
+        assert events[-1][1] == {"status": 500, "detail": "Internal processing error"}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# BATCH SEARCH
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestBatchSearch:
+    """Tests for POST /search/batch."""
+
+    def test_one_encode_grouped_searches_ordered_results(
+        self, engine, mock_embedder, mock_collection_manager,
+    ):
+        """Questions are embedded once and searched per filter group, in order."""
+        engine.embedding_cache = None
+        queries = [
+            {"question": "CD19 efficacy", "target_antigen": "CD19"},
+            {"question": "BCMA efficacy", "target_antigen": "BCMA"},
+            {"question": "CD19 durability", "target_antigen": "CD19"},
+            {"question": "Recent CRS data", "year_min": 2022},
+        ]
+
+        async def scenario():
+            async with _client() as client:
+                return await client.post("/search/batch", json={"queries": queries})
+
+        response = asyncio.run(scenario())
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["question"] for r in results] == [q["question"] for q in queries]
+
+        assert mock_embedder.encode.call_count == 1
+        assert len(mock_embedder.encode.call_args.args[0]) == 4
+        mock_embedder.embed_text.assert_not_called()
+        sizes = sorted(
+            len(call.args[0])
+            for call in mock_collection_manager.search_all_many.call_args_list
+        )
+        assert sizes == [1, 1, 2]  # CD19 pair shares one search
+
+    def test_batch_size_limit(self, engine):
+        """More than API_SEARCH_BATCH_MAX questions is a 422."""
+        from config.settings import settings
+
+        queries = [QUESTION] * (settings.API_SEARCH_BATCH_MAX + 1)
+
+        async def scenario():
+            async with _client() as client:
+                return await client.post("/search/batch", json={"queries": queries})
+
+        assert asyncio.run(scenario()).status_code == 422
+
+    def test_empty_batch_rejected(self, engine):
+        """At least one question is required."""
+
+        async def scenario():
+            async with _client() as client:
+                return await client.post("/search/batch", json={"queries": []})
+
+        assert asyncio.run(scenario()).status_code == 422
@@ -0,0 +1,754 @@
+"""Tests for CAR-T Intelligence Agent Milvus collection manager.
+
+Validates multi-vector search demultiplexing, score thresholds, failure
+handling, and the parallel search_all / search_all_many fan-out on the
+shared search pool (including deadlines and partial results) using a
+fake pymilvus Collection (no Milvus server required).  Also covers load
+state, size-aware index selection, scalar filter indexes, projection
+hydration, deferred-flush bulk ingest sessions, and content-hash lookups.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.collections import (
+    COLLECTION_SCHEMAS,
+    CONTENT_HASH_FIELD,
+    CARTCollectionManager,
+    SearchAllResult,
+    scalar_index_fields,
+    with_partition_key,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _hit(record_id: str, score: float, **fields):
+    """Build an object shaped like a pymilvus Hit."""
+    return SimpleNamespace(id=record_id, score=score, entity=dict(fields))
+
+
+def _fake_collection():
+    """Return a MagicMock Collection whose search echoes one hit per query.
+
+    Query vector ``i`` yields hits ``q{i}-a`` (score 0.9) and ``q{i}-b``
+    (score 0.3), so tests can check demultiplexing and thresholds.
+    """
+    collection = MagicMock()
+
+    def _search(data, **kwargs):
+        return [
+            [
+                _hit(f"q{i}-a", 0.9, text_chunk=f"chunk {i}"),
+                _hit(f"q{i}-b", 0.3, text_chunk=f"weak {i}"),
+            ]
+            for i in range(len(data))
+        ]
+
+    collection.search.side_effect = _search
+    return collection
+
+
+@pytest.fixture
+def manager():
+    """Return a CARTCollectionManager wired to fake collections."""
+    mgr = CARTCollectionManager(host="localhost", port=19530, search_timeout=5.0)
+    for name in COLLECTION_SCHEMAS:
+        mgr._collections[name] = _fake_collection()
+    yield mgr
+    mgr.shutdown_executor()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SINGLE-COLLECTION SEARCH
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestSearchMany:
+    """Tests for search() and search_many()."""
+
+    def test_one_request_for_many_vectors(self, manager):
+        """search_many sends all vectors in a single Milvus search call."""
+        results = manager.search_many("cart_literature", [[0.1] * 384] * 3)
+        coll = manager._collections["cart_literature"]
+        assert coll.search.call_count == 1
+        assert len(coll.search.call_args.kwargs["data"]) == 3
+        assert len(results) == 3
+
+    def test_demultiplexes_per_query(self, manager):
+        """Hits are returned in per-query lists, in input order."""
+        results = manager.search_many("cart_literature", [[0.1] * 384] * 2)
+        assert [r["id"] for r in results[0]] == ["q0-a", "q0-b"]
+        assert [r["id"] for r in results[1]] == ["q1-a", "q1-b"]
+        assert results[1][0]["text_chunk"] == "chunk 1"
+        assert results[1][0]["collection"] == "cart_literature"
+
+    def test_score_threshold(self, manager):
+        """Hits below score_threshold are dropped."""
+        results = manager.search_many(
+            "cart_literature", [[0.1] * 384], score_threshold=0.5,
+        )
+        assert [r["id"] for r in results[0]] == ["q0-a"]
+
+    def test_search_is_single_vector_wrapper(self, manager):
+        """search() returns the first (only) per-query list."""
+        results = manager.search("cart_trials", [0.1] * 384)
+        assert [r["id"] for r in results] == ["q0-a", "q0-b"]
+
+    def test_failure_returns_empty_lists(self, manager):
+        """A Milvus error yields one empty list per query instead of raising."""
+        manager._collections["cart_trials"].search.side_effect = RuntimeError("down")
+        assert manager.search_many("cart_trials", [[0.1] * 384] * 2) == [[], []]
+        assert manager.search("cart_trials", [0.1] * 384) == []
+
+    def test_empty_input(self, manager):
+        """No vectors means no request and an empty result."""
+        assert manager.search_many("cart_trials", []) == []
+        manager._collections["cart_trials"].search.assert_not_called()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CROSS-COLLECTION SEARCH
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestSearchAllMany:
+    """Tests for search_all() and search_all_many()."""
+
+    def test_one_request_per_collection(self, manager):
+        """K query vectors cost one search call per collection, not K."""
+        results = manager.search_all_many([[0.1] * 384] * 5, top_k_per_collection=2)
+        assert set(results) == set(COLLECTION_SCHEMAS)
+        for name, coll in manager._collections.items():
+            assert coll.search.call_count == 1
+            assert len(results[name]) == 5
+
+    def test_filter_exprs_are_per_collection(self, manager):
+        """Each collection receives only its own filter expression."""
+        manager.search_all_many(
+            [[0.1] * 384],
+            filter_exprs={"cart_literature": 'target_antigen == "CD19"'},
+        )
+        lit = manager._collections["cart_literature"].search.call_args.kwargs
+        trials = manager._collections["cart_trials"].search.call_args.kwargs
+        assert lit["expr"] == 'target_antigen == "CD19"'
+        assert trials["expr"] is None
+
+    def test_search_all_flattens_single_query(self, manager):
+        """search_all() returns a flat list of hits per collection."""
+        results = manager.search_all([0.1] * 384)
+        assert [r["id"] for r in results["cart_safety"]] == ["q0-a", "q0-b"]
+
+    def test_explicit_collections_only(self, manager):
+        """Only the named collections are searched; others see no RPC."""
+        results = manager.search_all_many(
+            [[0.1] * 384], collections=["cart_safety", "cart_trials", "bogus"],
+        )
+        assert set(results) == {"cart_safety", "cart_trials"}
+        assert manager._collections["cart_literature"].search.call_count == 0
+        assert manager._collections["cart_safety"].search.call_count == 1
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SHARED POOL, DEADLINES & PARTIAL RESULTS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestSearchDeadline:
+    """Tests for the shared search pool and per-collection deadlines."""
+
+    def test_executor_is_reused_across_calls(self, manager):
+        """Every fan-out runs on the same long-lived pool."""
+        manager.search_all([0.1] * 384)
+        executor = manager._search_executor
+        manager.search_all([0.1] * 384)
+        assert executor is not None
+        assert manager._search_executor is executor
+
+    def test_pool_size_from_constructor(self):
+        """search_workers sizes the shared pool."""
+        mgr = CARTCollectionManager(search_workers=3)
+        try:
+            assert mgr._get_executor()._max_workers == 3
+        finally:
+            mgr.shutdown_executor()
+
+    def test_shutdown_allows_restart(self, manager):
+        """A search after shutdown_executor() starts a fresh pool."""
+        manager.search_all([0.1] * 384)
+        first = manager._search_executor
+        manager.shutdown_executor()
+        assert manager._search_executor is None
+        manager.search_all([0.1] * 384)
+        assert manager._search_executor is not first
+
+    def test_slow_collection_is_flagged_not_awaited(self, manager):
+        """A collection past the deadline is dropped and listed in timed_out."""
+        release = threading.Event()
+        slow = manager._collections["cart_safety"]
+        fast_search = slow.search.side_effect
+
+        def _slow_search(data, **kwargs):
+            release.wait(5)
+            return fast_search(data, **kwargs)
+
+        slow.search.side_effect = _slow_search
+        try:
+            results = manager.search_all_many([[0.1] * 384], timeout=0.2)
+        finally:
+            release.set()
+
+        assert isinstance(results, SearchAllResult)
+        assert results.partial
+        assert results.timed_out == ["cart_safety"]
+        assert "cart_safety" not in results
+        assert len(results["cart_literature"][0]) == 2
+
+    def test_queue_time_not_counted_against_deadline(self, manager):
+        """Searches queued behind others on a busy pool still get the full deadline."""
+        manager.search_workers = 1  # 11 collections run one after another
+        for coll in manager._collections.values():
+            fast_search = coll.search.side_effect
+
+            def _search(data, _fast=fast_search, **kwargs):
+                threading.Event().wait(0.05)
+                return _fast(data, **kwargs)
+
+            coll.search.side_effect = _search
+
+        results = manager.search_all_many([[0.1] * 384], timeout=0.2)
+        assert results.timed_out == []
+        assert set(results) == set(manager._collections)
+
+    def test_search_all_keeps_timed_out(self, manager):
+        """search_all() carries the timed_out flag through to its result."""
+        release = threading.Event()
+        manager._collections["cart_trials"].search.side_effect = (
+            lambda data, **kwargs: release.wait(5) and []
+        )
+        try:
+            results = manager.search_all([0.1] * 384, timeout=0.2)
+        finally:
+            release.set()
+        assert results.timed_out == ["cart_trials"]
+        assert "cart_literature" in results
+
+    def test_deadline_passed_as_rpc_timeout(self, manager):
+        """The deadline also bounds each pymilvus RPC."""
+        manager.search_all_many([[0.1] * 384], timeout=1.5)
+        kwargs = manager._collections["cart_literature"].search.call_args.kwargs
+        assert kwargs["timeout"] == 1.5
+
+    def test_zero_timeout_waits_for_all(self, manager):
+        """timeout=0 disables the deadline."""
+        results = manager.search_all_many([[0.1] * 384], timeout=0)
+        assert not results.partial
+        assert set(results) == set(COLLECTION_SCHEMAS)
+        kwargs = manager._collections["cart_literature"].search.call_args.kwargs
+        assert kwargs["timeout"] is None
+
+    def test_latency_recorded_per_collection(self, manager):
+        """Each collection's RPC latency is exported with its name."""
+        with patch("src.collections.record_milvus_search") as record:
+            manager.search_all_many(
+                [[0.1] * 384], collections=["cart_trials", "cart_safety"],
+            )
+        recorded = {c.kwargs["collection"] for c in record.call_args_list}
+        assert recorded == {"cart_trials", "cart_safety"}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# LOAD STATE & READINESS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestLoadState:
+    """Tests for load-state tracking, preloading, and readiness."""
+
+    def test_load_called_once_across_searches(self, manager):
+        """Repeated searches issue collection.load() only the first time."""
+        for _ in range(3):
+            manager.search("cart_trials", [0.1] * 384)
+        assert manager._collections["cart_trials"].load.call_count == 1
+
+    def test_failed_search_triggers_lazy_reload(self, manager):
+        """A failed search forgets the load state so the next one reloads."""
+        coll = manager._collections["cart_trials"]
+        manager.search("cart_trials", [0.1] * 384)
+        good_search = coll.search.side_effect
+        coll.search.side_effect = RuntimeError("collection not loaded")
+        manager.search("cart_trials", [0.1] * 384)
+        coll.search.side_effect = good_search
+        manager.search("cart_trials", [0.1] * 384)
+        assert coll.load.call_count == 2
+
+    def test_release_triggers_lazy_reload(self, manager):
+        """release_collection() causes exactly one reload on the next search."""
+        coll = manager._collections["cart_trials"]
+        manager.search("cart_trials", [0.1] * 384)
+        with patch("src.collections.utility.has_collection", return_value=True), \
+                patch("src.collections.Collection") as collection_cls:
+            manager.release_collection("cart_trials")
+        collection_cls.return_value.release.assert_called_once()
+        manager.search("cart_trials", [0.1] * 384)
+        manager.search("cart_trials", [0.1] * 384)
+        assert coll.load.call_count == 2
+
+    def test_load_all_preloads_existing_collections(self, manager):
+        """load_all() loads every existing collection and reports ready."""
+        assert not manager.is_ready
+        with patch("src.collections.utility.has_collection", return_value=True):
+            status = manager.load_all()
+        assert set(status) == set(COLLECTION_SCHEMAS)
+        assert all(status.values())
+        assert manager.is_ready
+        manager.search("cart_trials", [0.1] * 384)
+        assert manager._collections["cart_trials"].load.call_count == 1
+
+    def test_load_failure_is_not_ready(self, manager):
+        """A collection that fails to preload keeps readiness false."""
+        manager._collections["cart_safety"].load.side_effect = RuntimeError("oom")
+        with patch("src.collections.utility.has_collection", return_value=True):
+            status = manager.load_all()
+        assert status["cart_safety"] is False
+        assert manager.readiness()["cart_safety"] is False
+        assert not manager.is_ready
+
+    def test_missing_collections_do_not_block_readiness(self, manager):
+        """Collections that do not exist yet are skipped by load_all()."""
+        with patch(
+            "src.collections.utility.has_collection",
+            side_effect=lambda name: name != "genomic_evidence",
+        ):
+            status = manager.load_all()
+        assert "genomic_evidence" not in status
+        assert manager.is_ready
+
+    def test_failed_search_drops_readiness(self, manager):
+        """Readiness flips to false while a collection awaits reload."""
+        with patch("src.collections.utility.has_collection", return_value=True):
+            manager.load_all()
+        manager._collections["cart_trials"].search.side_effect = RuntimeError("down")
+        manager.search("cart_trials", [0.1] * 384)
+        assert not manager.is_ready
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# INDEX SELECTION
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _index(index_type, params=None):
+    """Build an object shaped like a pymilvus Index on the embedding field."""
+    return SimpleNamespace(
+        field_name="embedding",
+        index_name="embedding_idx",
+        params={"index_type": index_type, "metric_type": "COSINE", "params": params or {}},
+    )
+
+
+class TestIndexSelection:
+    """Tests for per-collection index planning, rebuilds, and search params."""
+
+    def test_search_params_from_existing_index(self, manager):
+        """Search params follow the collection's actual index."""
+        manager._collections["cart_trials"].indexes = [_index("HNSW", {"M": 16})]
+        manager.search("cart_trials", [0.1] * 384, top_k=5)
+        param = manager._collections["cart_trials"].search.call_args.kwargs["param"]
+        assert param["params"] == {"ef": 64}
+
+    def test_hnsw_ef_at_least_top_k(self, manager):
+        """ef is raised to top_k when a search asks for more results."""
+        manager._collections["cart_trials"].indexes = [_index("HNSW", {"M": 16})]
+        manager.search("cart_trials", [0.1] * 384, top_k=100)
+        param = manager._collections["cart_trials"].search.call_args.kwargs["param"]
+        assert param["params"]["ef"] == 100
+
+    def test_flat_index_has_no_search_params(self, manager):
+        """A FLAT index searches with empty params."""
+        manager._collections["cart_trials"].indexes = [_index("FLAT")]
+        manager.search("cart_trials", [0.1] * 384)
+        param = manager._collections["cart_trials"].search.call_args.kwargs["param"]
+        assert param["params"] == {}
+
+    def test_unknown_index_falls_back(self, manager):
+        """Without an inspectable index the legacy SEARCH_PARAMS apply."""
+        manager.search("cart_trials", [0.1] * 384)
+        param = manager._collections["cart_trials"].search.call_args.kwargs["param"]
+        assert param == CARTCollectionManager.SEARCH_PARAMS
+
+    def test_set_search_params_overrides(self, manager):
+        """Explicit search params win over derived ones."""
+        manager._collections["cart_trials"].indexes = [_index("IVF_FLAT", {"nlist": 1024})]
+        manager.set_search_params("cart_trials", {"nprobe": 48})
+        manager.search("cart_trials", [0.1] * 384)
+        param = manager._collections["cart_trials"].search.call_args.kwargs["param"]
+        assert param == {"metric_type": "COSINE", "params": {"nprobe": 48}}
+
+    def test_rebuild_when_band_changes(self, manager):
+        """A small collection on IVF_FLAT is rebuilt as FLAT; FLAT ones are left."""
+        for name, coll in manager._collections.items():
+            coll.num_entities = 300
+            coll.indexes = [_index("FLAT")]
+        trials = manager._collections["cart_trials"]
+        trials.indexes = [_index("IVF_FLAT", {"nlist": 1024})]
+
+        with patch("src.collections.utility.has_collection", return_value=True):
+            rebuilt = manager.rebuild_indexes()
+
+        assert list(rebuilt) == ["cart_trials"]
+        trials.release.assert_called_once()
+        trials.drop_index.assert_called_once_with(index_name="embedding_idx")
+        assert trials.create_index.call_args.kwargs["index_params"]["index_type"] == "FLAT"
+        assert manager._collections["cart_literature"].create_index.call_count == 0
+        assert manager.get_search_params("cart_trials")["params"] == {}
+
+    def test_concurrent_search_waits_for_rebuild(self, manager):
+        """A search during a rebuild never loads the collection without an index."""
+        trials = manager._collections["cart_trials"]
+        trials.num_entities = 300
+        trials.indexes = [_index("IVF_FLAT", {"nlist": 1024})]
+        events = []
+        creating, finish = threading.Event(), threading.Event()
+
+        def _create_index(**kwargs):
+            events.append("create_index")
+            creating.set()
+            finish.wait(timeout=5)
+
+        trials.release.side_effect = lambda: events.append("release")
+        trials.drop_index.side_effect = lambda **kw: events.append("drop_index")
+        trials.create_index.side_effect = _create_index
+        trials.load.side_effect = lambda: events.append("load")
+
+        with patch("src.collections.utility.has_collection", return_value=True):
+            rebuild = threading.Thread(
+                target=manager.rebuild_indexes, args=(["cart_trials"],),
+            )
+            rebuild.start()
+            assert creating.wait(timeout=5)
+            search = threading.Thread(
+                target=manager.search, args=("cart_trials", [0.1] * 384),
+            )
+            search.start()
+            search.join(timeout=0.2)
+            blocked = search.is_alive()
+            finish.set()
+            rebuild.join(timeout=5)
+            search.join(timeout=5)
+
+        assert blocked
+        assert events == ["release", "drop_index", "create_index", "load"]
+        assert trials.search.call_count == 1
+
+    def test_read_only_collection_needs_opt_in(self, manager):
+        """genomic_evidence is planned but only rebuilt with include_read_only."""
+        for coll in manager._collections.values():
+            coll.num_entities = 300
+            coll.indexes = [_index("FLAT")]
+        genomic = manager._collections["genomic_evidence"]
+        genomic.num_entities = 5_000_000
+        genomic.indexes = [_index("IVF_FLAT", {"nlist": 1024})]
+
+        with patch("src.collections.utility.has_collection", return_value=True):
+            plans = manager.plan_indexes()
+            assert plans["genomic_evidence"].index_type == "IVF_SQ8"
+            assert plans["genomic_evidence"].needs_rebuild
+            assert manager.rebuild_indexes() == {}
+            rebuilt = manager.rebuild_indexes(include_read_only=True)
+        assert list(rebuilt) == ["genomic_evidence"]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SCALAR INDEXES & PARTITION KEYS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestScalarIndexes:
+    """Tests for scalar filter indexes and the antigen partition key."""
+
+    def test_filter_fields_per_schema(self):
+        """Filter fields map to INVERTED (VARCHAR) or STL_SORT (INT64)."""
+        assert scalar_index_fields(COLLECTION_SCHEMAS["cart_literature"]) == {
+            "year": "STL_SORT", "target_antigen": "INVERTED",
+        }
+        assert scalar_index_fields(COLLECTION_SCHEMAS["cart_trials"])["start_year"] == "STL_SORT"
+        assert scalar_index_fields(COLLECTION_SCHEMAS["cart_safety"]) == {
+            "product": "INVERTED", "event_type": "INVERTED", "year": "STL_SORT",
+        }
+        assert scalar_index_fields(COLLECTION_SCHEMAS["genomic_evidence"]) == {}
+
+    def test_with_partition_key(self):
+        """The antigen field becomes the partition key in a copied schema."""
+        keyed = with_partition_key(COLLECTION_SCHEMAS["cart_literature"])
+        assert keyed.partition_key_field.name == "target_antigen"
+        assert COLLECTION_SCHEMAS["cart_literature"].partition_key_field is None
+        safety = COLLECTION_SCHEMAS["cart_safety"]
+        assert with_partition_key(safety) is safety
+
+    def test_new_collection_gets_scalar_indexes(self, manager):
+        """create_collection builds the vector index and every filter index."""
+        with patch("src.collections.utility.has_collection", return_value=False), \
+                patch("src.collections.Collection") as collection_cls:
+            coll = collection_cls.return_value
+            coll.has_index.return_value = False
+            manager.create_collection("cart_safety", COLLECTION_SCHEMAS["cart_safety"])
+        indexed = {c.kwargs["field_name"]: c.kwargs["index_params"] for c in coll.create_index.call_args_list}
+        assert indexed["product"] == {"index_type": "INVERTED"}
+        assert indexed["event_type"] == {"index_type": "INVERTED"}
+        assert indexed["year"] == {"index_type": "STL_SORT"}
+        assert "embedding" in indexed
+
+    def test_partition_key_layout_opt_in(self):
+        """With partition keys on, antigen collections are partitioned."""
+        mgr = CARTCollectionManager(partition_key_by_antigen=True)
+        with patch("src.collections.utility.has_collection", return_value=False), \
+                patch("src.collections.Collection") as collection_cls:
+            collection_cls.return_value.has_index.return_value = False
+            mgr.create_collection("cart_literature", COLLECTION_SCHEMAS["cart_literature"])
+            kwargs = collection_cls.call_args.kwargs
+            assert kwargs["schema"].partition_key_field.name == "target_antigen"
+            assert kwargs["num_partitions"] > 0
+
+            mgr.create_collection("cart_safety", COLLECTION_SCHEMAS["cart_safety"])
+            assert "num_partitions" not in collection_cls.call_args.kwargs
+
+    def test_backfill_skips_existing_and_reloads(self, manager):
+        """ensure_scalar_indexes creates only missing indexes and reloads."""
+        trials = manager._collections["cart_trials"]
+        trials.has_index.side_effect = lambda index_name: index_name == "start_year_idx"
+        with patch("src.collections.utility.has_collection", return_value=True):
+            manager.ensure_loaded("cart_trials")
+            created = manager.ensure_scalar_indexes(["cart_trials", "genomic_evidence"])
+        assert created == {"cart_trials": ["target_antigen"]}
+        assert trials.load.call_count == 2
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PROJECTION & HYDRATION
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestProjection:
+    """Tests for projected search output and batched hydration."""
+
+    def test_projection_drops_long_text(self, manager):
+        """Projected searches omit text_chunk, title and other long fields."""
+        fields = manager._get_output_fields("cart_literature", projection=True)
+        assert "id" in fields and "target_antigen" in fields and "year" in fields
+        assert "text_chunk" not in fields and "title" not in fields
+        assert "embedding" not in fields
+        full = manager._get_output_fields("cart_literature")
+        assert "text_chunk" in full and "embedding" not in full
+
+    def test_search_all_many_passes_projection(self, manager):
+        """projection=True narrows output_fields on every collection search."""
+        manager.search_all_many([[0.1] * 384], collections=["cart_safety"], projection=True)
+        kwargs = manager._collections["cart_safety"].search.call_args.kwargs
+        assert "text_summary" not in kwargs["output_fields"]
+        assert "event_type" in kwargs["output_fields"]
+
+    def test_hydrate_single_batched_query(self, manager):
+        """hydrate() fetches all ids with one id-in query."""
+        coll = manager._collections["cart_trials"]
+        coll.query.return_value = [
+            {"id": "NCT1", "text_summary": "one"},
+            {"id": "NCT2", "text_summary": "two"},
+        ]
+        records = manager.hydrate("cart_trials", ["NCT1", "NCT2", "NCT1"])
+        assert coll.query.call_count == 1
+        assert coll.query.call_args.kwargs["expr"] == 'id in ["NCT1", "NCT2"]'
+        assert "text_summary" in coll.query.call_args.kwargs["output_fields"]
+        assert records["NCT2"]["text_summary"] == "two"
+
+    def test_hydrate_batches_large_id_sets(self, manager):
+        """Large id sets are split into HYDRATE_BATCH_SIZE chunks."""
+        coll = manager._collections["cart_trials"]
+        coll.query.return_value = []
+        with patch("src.collections.HYDRATE_BATCH_SIZE", 2):
+            manager.hydrate("cart_trials", ["a", "b", "c"])
+        assert coll.query.call_count == 2
+
+    def test_hydrate_failure_returns_empty(self, manager):
+        """A failed hydration query yields no records instead of raising."""
+        manager._collections["cart_trials"].query.side_effect = RuntimeError("down")
+        assert manager.hydrate("cart_trials", ["NCT1"]) == {}
+        assert manager.hydrate("cart_trials", []) == {}
+
+    def test_hydrate_many_per_collection(self, manager):
+        """hydrate_many() issues one query per collection with ids."""
+        for name in ("cart_trials", "cart_safety"):
+            manager._collections[name].query.return_value = [{"id": f"{name}-1"}]
+        records = manager.hydrate_many({"cart_trials": ["x"], "cart_safety": ["y"], "cart_assays": []})
+        assert set(records) == {"cart_trials", "cart_safety"}
+        assert manager._collections["cart_assays"].query.call_count == 0
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# BULK INGEST
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _insertable(manager, name="cart_trials"):
+    coll = manager._collections[name]
+    coll.insert.side_effect = lambda records: SimpleNamespace(insert_count=len(records))
+    return coll
+
+
+def _segments(*states):
+    from pymilvus.client.types import SegmentState
+    return [SimpleNamespace(state=getattr(SegmentState, s)) for s in states]
+
+
+class TestBulkIngest:
+    """Tests for insert_batch() inside bulk_ingest() sessions."""
+
+    def test_insert_outside_session_flushes(self, manager):
+        """Plain insert_batch keeps the flush-per-call behaviour."""
+        coll = _insertable(manager)
+        manager.insert_batch("cart_trials", [{"id": "NCT1"}])
+        coll.flush.assert_called_once()
+
+    def test_session_defers_flush_until_exit(self, manager):
+        """Inserts inside a session flush once at the end, then compact."""
+        coll = _insertable(manager)
+        with patch("src.collections.utility.get_query_segment_info",
+                   return_value=_segments("Sealed", "Growing")):
+            with manager.bulk_ingest(flush_rows=0, flush_seconds=0) as session:
+                for i in range(10):
+                    manager.insert_batch("cart_trials", [{"id": f"NCT{i}"}] * 32)
+                assert coll.flush.call_count == 0
+        coll.flush.assert_called_once()
+        coll.compact.assert_called_once()
+        assert session.summary() == {
+            "cart_trials": {"inserted": 320, "flushes": 1, "growing_segments": 1},
+        }
+        assert manager._bulk_session is None
+
+    def test_row_threshold_triggers_flush(self, manager):
+        """Reaching flush_rows pending rows flushes mid-session."""
+        coll = _insertable(manager)
+        with manager.bulk_ingest(flush_rows=64, flush_seconds=0, compact=False) as session:
+            for i in range(5):
+                manager.insert_batch("cart_trials", [{"id": f"NCT{i}"}] * 32)
+            assert coll.flush.call_count == 2
+        assert coll.flush.call_count == 3
+        assert session.flushes["cart_trials"] == 3
+        coll.compact.assert_not_called()
+
+    def test_time_threshold_triggers_flush(self, manager):
+        """flush_seconds since the last flush forces one on the next insert."""
+        coll = _insertable(manager)
+        clock = [0.0]
+        with patch("src.collections.time.monotonic", side_effect=lambda: clock[0]):
+            with manager.bulk_ingest(flush_rows=0, flush_seconds=10, compact=False):
+                clock[0] = 1.0
+                manager.insert_batch("cart_trials", [{"id": "a"}])
+                assert coll.flush.call_count == 0
+                clock[0] = 30.0
+                manager.insert_batch("cart_trials", [{"id": "b"}])
+                assert coll.flush.call_count == 1
+        assert coll.flush.call_count == 1
+
+    def test_nested_sessions_join_outer(self, manager):
+        """An inner bulk_ingest() reuses the outer session."""
+        coll = _insertable(manager)
+        with manager.bulk_ingest(flush_rows=0, flush_seconds=0) as outer:
+            with manager.bulk_ingest() as inner:
+                manager.insert_batch("cart_trials", [{"id": "a"}])
+            assert inner is outer
+            assert coll.flush.call_count == 0
+        coll.flush.assert_called_once()
+
+    def test_only_touched_collections_flushed(self, manager):
+        """Collections without inserts are neither flushed nor compacted."""
+        _insertable(manager)
+        with manager.bulk_ingest(flush_rows=0, flush_seconds=0):
+            manager.insert_batch("cart_trials", [{"id": "a"}])
+        assert manager._collections["cart_safety"].flush.call_count == 0
+        assert manager._collections["cart_safety"].compact.call_count == 0
+
+    def test_growing_segments_unavailable(self, manager):
+        """Segment info errors report None instead of failing the session."""
+        with patch("src.collections.utility.get_query_segment_info",
+                   side_effect=RuntimeError("not loaded")):
+            assert manager.growing_segment_count("cart_trials") is None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONTENT HASHES & UPSERT
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestContentHashes:
+    """Tests for content-hash lookups and upsert_batch()."""
+
+    def test_owned_schemas_carry_content_hash(self):
+        """Every owned collection stores a 64-char content_hash."""
+        for name, schema in COLLECTION_SCHEMAS.items():
+            fields = {f.name: f for f in schema.fields}
+            if name in CARTCollectionManager.READ_ONLY_COLLECTIONS:
+                assert CONTENT_HASH_FIELD not in fields
+            else:
+                assert fields[CONTENT_HASH_FIELD].params["max_length"] == 64
+
+    def test_content_hash_not_returned_by_searches(self, manager):
+        """The internal hash never appears in search/hydration output."""
+        assert CONTENT_HASH_FIELD not in manager._get_output_fields("cart_trials")
+        assert CONTENT_HASH_FIELD not in manager._get_output_fields("cart_trials", projection=True)
+
+    def test_get_content_hashes(self, manager):
+        """Stored hashes are fetched with one id-in query."""
+        coll = manager._collections["cart_trials"]
+        coll.schema = COLLECTION_SCHEMAS["cart_trials"]
+        coll.query.return_value = [{"id": "NCT1", "content_hash": "abc"}]
+        hashes = manager.get_content_hashes("cart_trials", ["NCT1", "NCT2"])
+        assert hashes == {"NCT1": "abc"}
+        kwargs = coll.query.call_args.kwargs
+        assert kwargs["expr"] == 'id in ["NCT1", "NCT2"]'
+        assert kwargs["output_fields"] == ["id", "content_hash"]
+
+    def test_legacy_collection_reports_existence_only(self, manager):
+        """Collections created before hashing report ids with a None hash."""
+        coll = manager._collections["cart_trials"]
+        coll.schema = SimpleNamespace(fields=[SimpleNamespace(name="id")])
+        coll.query.return_value = [{"id": "NCT1"}]
+        assert manager.get_content_hashes("cart_trials", ["NCT1"]) == {"NCT1": None}
+        assert coll.query.call_args.kwargs["output_fields"] == ["id"]
+
+    def test_lookup_errors_propagate(self, manager):
+        """A failed lookup raises so callers never assume records are new."""
+        coll = manager._collections["cart_trials"]
+        coll.schema = COLLECTION_SCHEMAS["cart_trials"]
+        coll.query.side_effect = RuntimeError("down")
+        with pytest.raises(RuntimeError):
+            manager.get_content_hashes("cart_trials", ["NCT1"])
+
+    def test_upsert_batch_respects_bulk_session(self, manager):
+        """upsert_batch flushes like insert_batch, deferred inside a session."""
+        coll = manager._collections["cart_trials"]
+        coll.upsert.side_effect = lambda records: SimpleNamespace(upsert_count=len(records))
+        assert manager.upsert_batch("cart_trials", [{"id": "NCT1"}]) == 1
+        coll.flush.assert_called_once()
+        with manager.bulk_ingest(flush_rows=0, flush_seconds=0, compact=False) as session:
+            manager.upsert_batch("cart_trials", [{"id": "NCT1"}, {"id": "NCT2"}])
+            assert coll.flush.call_count == 1
+        assert coll.flush.call_count == 2
+        assert session.inserted["cart_trials"] == 2
+
+    def test_insert_defaults_missing_hash(self, manager):
+        """Rows written without a hash get an empty one on hashed collections."""
+        coll = _insertable(manager)
+        coll.schema = COLLECTION_SCHEMAS["cart_trials"]
+        records = [{"id": "NCT1"}, {"id": "NCT2", "content_hash": "abc"}]
+        manager.insert_batch("cart_trials", records)
+        assert [r["content_hash"] for r in coll.insert.call_args.args[0]] == ["", "abc"]
@@ -0,0 +1,173 @@
+"""Tests for CAR-T Intelligence Agent query-embedding cache.
+
+Validates key normalization, LRU eviction, TTL expiry, the optional
+on-disk tier, hit/miss accounting, and thread safety.
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+from src.embedding_cache import EmbeddingCache, normalize_text
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# NORMALIZATION
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestNormalizeText:
+    """Tests for normalize_text()."""
+
+    def test_collapses_whitespace(self):
+        """Runs of spaces, tabs and newlines collapse to single spaces."""
+        assert normalize_text("  CD19   CAR-T\n\ttherapy ") == "CD19 CAR-T therapy"
+
+    def test_preserves_case(self):
+        """Case is significant and is not folded."""
+        assert normalize_text("BCMA") != normalize_text("bcma")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# MEMORY TIER
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestMemoryTier:
+    """Tests for the in-memory LRU tier."""
+
+    def test_miss_then_hit(self):
+        """The first lookup computes, the second is served from cache."""
+        cache = EmbeddingCache(max_size=8)
+        compute = MagicMock(return_value=[0.1] * 384)
+
+        first = cache.get_or_compute("CD19 therapy", compute)
+        second = cache.get_or_compute("CD19   therapy", compute)
+
+        assert first == second
+        assert compute.call_count == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_returned_vectors_are_copies(self):
+        """Mutating a returned vector never changes later cache hits."""
+        cache = EmbeddingCache()
+        original = cache.get_or_compute("CRS", lambda _t: [1.0, 2.0])
+        original.append(99.0)
+        hit = cache.get("CRS")
+        hit[0] = -1.0
+        assert cache.get("CRS") == [1.0, 2.0]
+
+    def test_disk_hits_are_copies(self, tmp_path):
+        """A vector promoted from disk is not shared with the memory tier."""
+        EmbeddingCache(disk_dir=tmp_path).put("CRS", [1.0, 2.0])
+        cache = EmbeddingCache(disk_dir=tmp_path)
+        cache.get("CRS").append(3.0)
+        assert cache.get("CRS") == [1.0, 2.0]
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted once max_size is exceeded."""
+        cache = EmbeddingCache(max_size=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        assert cache.get("a") == [1.0]  # "a" becomes most recent
+        cache.put("c", [3.0])
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.get("c") == [3.0]
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Entries older than ttl_seconds are treated as misses."""
+        clock = [1000.0]
+        monkeypatch.setattr("src.embedding_cache.time.time", lambda: clock[0])
+        cache = EmbeddingCache(max_size=8, ttl_seconds=10)
+        cache.put("CRS", [0.5])
+
+        clock[0] += 5
+        assert cache.get("CRS") == [0.5]
+        clock[0] += 10
+        assert cache.get("CRS") is None
+
+    def test_model_name_is_part_of_key(self):
+        """Caches for different models never share entries."""
+        cache_a = EmbeddingCache(model_name="model-a")
+        cache_b = EmbeddingCache(model_name="model-b")
+        assert cache_a._key("BCMA") != cache_b._key("BCMA")
+
+    def test_converts_array_like_results(self):
+        """Results exposing tolist() (e.g. numpy arrays) are stored as lists."""
+        import numpy as np
+
+        cache = EmbeddingCache()
+        result = cache.get_or_compute("ICANS", lambda _t: np.ones(4, dtype=np.float32))
+        assert result == [1.0, 1.0, 1.0, 1.0]
+
+    def test_concurrent_access(self):
+        """Parallel get_or_compute calls neither crash nor exceed max_size."""
+        cache = EmbeddingCache(max_size=16)
+
+        def worker(offset):
+            for i in range(50):
+                cache.get_or_compute(f"q{(i + offset) % 32}", lambda t: [float(len(t))])
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == 400
+        assert len(cache) <= 16
+
+
+    def test_get_or_compute_many_batches_misses(self):
+        """Only uncached texts are embedded, once each, in a single call."""
+        cache = EmbeddingCache(max_size=8)
+        cache.put("CRS", [1.0])
+        compute_many = MagicMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+
+        vectors = cache.get_or_compute_many(["CRS", "ICANS", "CRS", "ICANS", "BCMA"], compute_many)
+
+        assert vectors == [[1.0], [5.0], [1.0], [5.0], [4.0]]
+        compute_many.assert_called_once_with(["ICANS", "BCMA"])
+        assert cache.get("BCMA") == [4.0]
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 3)
+
+    def test_get_or_compute_many_all_cached(self):
+        """A fully cached batch never calls the model."""
+        cache = EmbeddingCache()
+        cache.put("a", [1.0])
+        compute_many = MagicMock()
+        assert cache.get_or_compute_many(["a"], compute_many) == [[1.0]]
+        compute_many.assert_not_called()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# DISK TIER
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestDiskTier:
+    """Tests for the optional persistent tier."""
+
+    def test_survives_new_instance(self, tmp_path):
+        """A fresh cache over the same directory serves earlier entries."""
+        EmbeddingCache(disk_dir=tmp_path).put("Kymriah", [0.25, 0.5])
+
+        reloaded = EmbeddingCache(disk_dir=tmp_path)
+        compute = MagicMock()
+        assert reloaded.get_or_compute("Kymriah", compute) == [0.25, 0.5]
+        compute.assert_not_called()
+        assert reloaded.stats()["disk_hits"] == 1
+
+    def test_memory_only_writes_nothing(self, tmp_path):
+        """Without disk_dir, nothing is written to the filesystem."""
+        EmbeddingCache().put("Yescarta", [1.0])
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,202 @@
+"""Tests for CAR-T Intelligence Agent persistent ingest embedding store.
+
+Validates append/lookup round trips, persistence across reopen, crash
+recovery of torn writes, rollback of failed appends, model/dimension
+isolation, and the settings-based default store (no embedding model
+required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+from config.settings import settings
+from src.embedding_store import (
+    INDEX_FILE,
+    VECTORS_FILE,
+    EmbeddingStore,
+    get_default_store,
+)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# APPEND & LOOKUP
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestAppendAndLookup:
+    """Tests for put_many() / get_many()."""
+
+    def test_round_trip(self, tmp_path):
+        """Stored vectors come back bit-identical."""
+        store = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        hashes = [_digest(t) for t in ("a", "b", "c")]
+        vectors = _vectors(3)
+        assert store.put_many(hashes, vectors) == 3
+
+        found = store.get_many(hashes + [_digest("missing")])
+        assert set(found) == set(hashes)
+        for digest, vector in zip(hashes, vectors):
+            np.testing.assert_array_equal(found[digest], vector)
+        assert len(store) == 3
+        assert hashes[0] in store
+
+    def test_existing_hashes_are_not_appended(self, tmp_path):
+        """Append-only: known hashes and in-batch duplicates are skipped."""
+        store = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        h = _digest("a")
+        store.put_many([h], _vectors(1))
+        assert store.put_many([h, _digest("b"), _digest("b")], _vectors(3, seed=1)) == 1
+        assert (store.path / VECTORS_FILE).stat().st_size == 2 * 8 * 4
+
+    def test_lookups_see_rows_appended_after_mapping(self, tmp_path):
+        """The memory map is refreshed after appends."""
+        store = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        store.put_many([_digest("a")], _vectors(1))
+        assert store.get_many([_digest("a")])
+        store.put_many([_digest("b")], _vectors(1, seed=2))
+        assert _digest("b") in store.get_many([_digest("b")])
+
+    def test_rejects_bad_input(self, tmp_path):
+        """Dimension, count, and hash mismatches raise ValueError."""
+        store = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        with pytest.raises(ValueError):
+            store.put_many([_digest("a")], _vectors(1, dim=4))
+        with pytest.raises(ValueError):
+            store.put_many([_digest("a"), _digest("b")], _vectors(1))
+        with pytest.raises(ValueError):
+            store.put_many(["short"], _vectors(1))
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PERSISTENCE
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestPersistence:
+    """Tests for reopening, crash recovery, and model isolation."""
+
+    def test_reopen_serves_stored_vectors(self, tmp_path):
+        """A new process (new instance) reads what an earlier one wrote."""
+        vectors = _vectors(2)
+        EmbeddingStore(tmp_path, dim=8, model_name="test-model").put_many(
+            [_digest("a"), _digest("b")], vectors,
+        )
+        reopened = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        assert len(reopened) == 2
+        np.testing.assert_array_equal(reopened.get_many([_digest("b")])[_digest("b")], vectors[1])
+
+    def test_unindexed_trailing_rows_are_truncated(self, tmp_path):
+        """Rows written without their index line (crash) are dropped."""
+        store = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        store.put_many([_digest("a")], _vectors(1))
+        with open(store.path / VECTORS_FILE, "ab") as fh:
+            fh.write(_vectors(1, seed=3).tobytes()[:20])  # torn row
+            fh.write(_vectors(1, seed=4).tobytes())
+        with open(store.path / INDEX_FILE, "a") as fh:
+            fh.write("deadbeef")  # torn index line
+
+        reopened = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        assert len(reopened) == 1
+        assert (reopened.path / VECTORS_FILE).stat().st_size == 8 * 4
+        assert reopened.put_many([_digest("b")], _vectors(1, seed=5)) == 1
+        assert set(EmbeddingStore(tmp_path, dim=8, model_name="test-model").get_many(
+            [_digest("a"), _digest("b")],
+        )) == {_digest("a"), _digest("b")}
+
+    @pytest.mark.parametrize("failing_file", [VECTORS_FILE, INDEX_FILE])
+    def test_failed_write_is_rolled_back(self, tmp_path, monkeypatch, failing_file):
+        """A partial append (ENOSPC) leaves no orphan bytes to shift later rows."""
+        import builtins
+        import errno
+
+        store = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        store.put_many([_digest("a")], _vectors(1))
+        real_open = builtins.open
+
+        class _DiskFull:
+            def __init__(self, fh):
+                self.fh = fh
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self.fh.close()
+
+            def write(self, data):
+                self.fh.write(data[: len(data) // 2])
+                raise OSError(errno.ENOSPC, "No space left on device")
+
+        def _open(path, mode="r", *args, **kwargs):
+            fh = real_open(path, mode, *args, **kwargs)
+            return _DiskFull(fh) if str(path).endswith(failing_file) and "a" in mode else fh
+
+        monkeypatch.setattr("src.embedding_store.open", _open, raising=False)
+        with pytest.raises(OSError):
+            store.put_many([_digest("b"), _digest("c")], _vectors(2, seed=1))
+        monkeypatch.undo()
+
+        assert len(store) == 1
+        assert (store.path / VECTORS_FILE).stat().st_size == 8 * 4
+        vectors = _vectors(1, seed=2)
+        assert store.put_many([_digest("d")], vectors) == 1
+        np.testing.assert_array_equal(store.get_many([_digest("d")])[_digest("d")], vectors[0])
+
+        reopened = EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        assert len(reopened) == 2
+        np.testing.assert_array_equal(
+            reopened.get_many([_digest("d")])[_digest("d")], vectors[0],
+        )
+
+    def test_models_are_isolated(self, tmp_path):
+        """Each model gets its own subdirectory."""
+        EmbeddingStore(tmp_path, dim=8, model_name="org/model-a").put_many([_digest("a")], _vectors(1))
+        other = EmbeddingStore(tmp_path, dim=8, model_name="org/model-b")
+        assert other.get_many([_digest("a")]) == {}
+
+    def test_dimension_mismatch_on_open(self, tmp_path):
+        """Reopening a store with a different dimension is refused."""
+        EmbeddingStore(tmp_path, dim=8, model_name="test-model")
+        with pytest.raises(ValueError):
+            EmbeddingStore(tmp_path, dim=16, model_name="test-model")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# DEFAULT STORE
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestDefaultStore:
+    """Tests for get_default_store()."""
+
+    def test_uses_settings_directory(self, isolated_ingest_embedding_store):
+        """The default store lives under INGEST_EMBEDDING_STORE_DIR and is shared."""
+        store = get_default_store()
+        assert store.path.parent == isolated_ingest_embedding_store
+        assert store.dim == settings.EMBEDDING_DIMENSION
+        assert get_default_store() is store
+
+    def test_disabled(self, monkeypatch):
+        """INGEST_EMBEDDING_STORE_ENABLED=False turns the store off."""
+        monkeypatch.setattr(settings, "INGEST_EMBEDDING_STORE_ENABLED", False)
+        assert get_default_store() is None
+
+    def test_unwritable_directory_disables(self, tmp_path, monkeypatch):
+        """A directory that cannot be created disables the store."""
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        monkeypatch.setattr(settings, "INGEST_EMBEDDING_STORE_DIR", blocker / "sub")
+        assert get_default_store() is None
@@ -0,0 +1,372 @@
+"""Tests for CAR-T Intelligence Agent shared ingest HTTP client.
+
+Validates retry/backoff behaviour, per-host token-bucket rate limits,
+the ETag/Last-Modified conditional cache, record/replay cassettes, and
+that the FAERS/DailyMed/UniProt/CIBMTR pipelines go through the shared
+client (no network access required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.ingest.cibmtr_parser import CIBMTRIngestPipeline
+from src.ingest.dailymed_parser import DailyMedIngestPipeline
+from src.ingest.faers_parser import OPENFDA_EVENT_URL, FAERSIngestPipeline
+from src.ingest.uniprot_parser import UniProtIngestPipeline
+from src.utils.http_client import (
+    HTTPClient,
+    TokenBucket,
+    canonical_url,
+    get_http_client,
+)
+
+URL = "https://api.example.org/items"
+
+
+def _response(status=200, body=b"{}", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = "utf-8"
+    return response
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def client(tmp_path, sleeps):
+    client = HTTPClient(
+        max_retries=3,
+        backoff_base=1.0,
+        backoff_max=30.0,
+        default_rate_limit=1000.0,
+        cache_dir=tmp_path / "cache",
+        cassette_dir=tmp_path / "cassettes",
+        cache_enabled=True,
+        mode="live",
+        sleep=sleeps.append,
+    )
+    client._session = MagicMock()
+    return client
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RETRIES
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestRetries:
+    """Tests for retry and backoff behaviour."""
+
+    def test_success_first_try(self, client, sleeps):
+        """A 200 is returned as-is with from_cache=False."""
+        client._session.get.return_value = _response(body=b'{"ok": 1}')
+        response = client.get(URL, {"q": "x"}, headers={"Accept": "application/json"})
+        assert response.json() == {"ok": 1}
+        assert response.from_cache is False
+        assert sleeps == []
+
+    def test_transient_errors_are_retried_with_backoff(self, client, sleeps):
+        """5xx and connection errors back off exponentially, then succeed."""
+        client._session.get.side_effect = [
+            _response(503),
+            requests.ConnectionError("reset"),
+            _response(body=b"[]"),
+        ]
+        assert client.get(URL).json() == []
+        assert len(sleeps) == 2
+        assert 0.5 <= sleeps[0] <= 1.0 and 1.0 <= sleeps[1] <= 2.0
+        assert client.stats["retries"] == 2
+
+    def test_retry_after_is_honoured(self, client, sleeps):
+        """429 waits for the server-provided Retry-After."""
+        client._session.get.side_effect = [
+            _response(429, headers={"Retry-After": "7"}),
+            _response(),
+        ]
+        assert client.get(URL) is not None
+        assert sleeps == [7.0]
+
+    def test_gives_up_after_max_retries(self, client, sleeps):
+        """Exhausted retries return None."""
+        client._session.get.return_value = _response(502)
+        assert client.get(URL) is None
+        assert client._session.get.call_count == 3
+        assert client.stats["failures"] == 1
+
+    def test_client_errors_fail_fast(self, client, sleeps):
+        """404 and other 4xx are not retried."""
+        client._session.get.return_value = _response(404)
+        assert client.get(URL) is None
+        client._session.get.return_value = _response(400)
+        assert client.get(URL) is None
+        assert client._session.get.call_count == 2
+        assert sleeps == []
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RATE LIMITING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestTokenBucket:
+    """Tests for the TokenBucket rate limiter."""
+
+    def _bucket(self, rate, capacity=1.0):
+        clock = {"now": 0.0}
+        sleeps = []
+
+        def _sleep(seconds):
+            sleeps.append(seconds)
+            clock["now"] += seconds
+
+        bucket = TokenBucket(rate, capacity, clock=lambda: clock["now"], sleep=_sleep)
+        return bucket, clock, sleeps
+
+    def test_paces_requests_at_rate(self):
+        """Back-to-back acquires are spaced 1/rate apart."""
+        bucket, clock, sleeps = self._bucket(rate=10)
+        for _ in range(5):
+            bucket.acquire()
+        assert sleeps == pytest.approx([0.1] * 4)
+        assert clock["now"] == pytest.approx(0.4)
+
+    def test_idle_time_refills_up_to_capacity(self):
+        """Unused time accrues tokens, but never beyond capacity."""
+        bucket, clock, sleeps = self._bucket(rate=3, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        clock["now"] += 60
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(1 / 3)
+
+    def test_concurrent_callers_never_exceed_rate(self):
+        """Threads sharing a bucket are paced collectively."""
+        bucket = TokenBucket(rate=50)
+        stamps = []
+        lock = threading.Lock()
+
+        def _worker():
+            for _ in range(5):
+                bucket.acquire()
+                with lock:
+                    stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=_worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 20 tokens, first free: at least 19 intervals of 1/50 s
+        assert max(stamps) - min(stamps) >= 19 / 50 * 0.9
+
+    def test_rejects_nonpositive_rate(self):
+        """A zero or negative rate is a configuration error."""
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+
+class TestHostRateLimits:
+    """Tests for per-host buckets in HTTPClient."""
+
+    def test_each_host_gets_its_configured_rate(self, client):
+        """Hosts map to their own bucket at the configured rate."""
+        client.host_rate_limits = {"api.fda.gov": 4.0}
+        client._session.get.return_value = _response()
+        client.get("https://api.fda.gov/drug/event.json")
+        client.get("https://rest.uniprot.org/uniprotkb/search")
+
+        assert client._buckets["api.fda.gov"].rate == 4.0
+        assert client._buckets["rest.uniprot.org"].rate == client.default_rate_limit
+
+    def test_cache_hits_do_not_consume_tokens(self, client):
+        """Fresh cache hits never reach the rate limiter."""
+        client._session.get.return_value = _response(headers={"Cache-Control": "max-age=600"})
+        client.get(URL)
+        bucket = client._buckets[URL.split("/")[2]]
+        bucket.acquire = MagicMock()
+        client.get(URL)
+        bucket.acquire.assert_not_called()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONDITIONAL CACHE
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestConditionalCache:
+    """Tests for the on-disk ETag/Last-Modified cache."""
+
+    def test_revalidates_with_etag_and_serves_304_from_disk(self, client):
+        """A cached ETag is sent back; a 304 yields the cached body."""
+        client._session.get.return_value = _response(
+            body=b'{"v": 1}', headers={"ETag": '"abc"', "Content-Type": "application/json"},
+        )
+        client.get(URL, {"page": 1})
+
+        client._session.get.return_value = _response(304, body=b"", headers={"ETag": '"abc"'})
+        response = client.get(URL, {"page": 1})
+
+        sent = client._session.get.call_args.kwargs["headers"]
+        assert sent["If-None-Match"] == '"abc"'
+        assert response.status_code == 200
+        assert response.json() == {"v": 1}
+        assert response.from_cache is True
+        assert client.stats["not_modified"] == 1
+
+    def test_last_modified_validator(self, client):
+        """Last-Modified is sent back as If-Modified-Since."""
+        stamp = "Wed, 04 Mar 2026 10:00:00 GMT"
+        client._session.get.return_value = _response(headers={"Last-Modified": stamp})
+        client.get(URL)
+        client._session.get.return_value = _response(body=b'{"v": 2}')
+        assert client.get(URL).json() == {"v": 2}
+        assert client._session.get.call_args.kwargs["headers"]["If-Modified-Since"] == stamp
+
+    def test_fresh_max_age_served_without_request(self, client):
+        """Within max-age the network is not touched at all."""
+        client._session.get.return_value = _response(
+            body=b"[1]", headers={"Cache-Control": "public, max-age=600"},
+        )
+        client.get(URL)
+        assert client.get(URL).json() == [1]
+        assert client._session.get.call_count == 1
+        assert client.stats["cache_hits"] == 1
+
+    def test_uncacheable_responses_are_not_stored(self, client):
+        """No validators, or no-store, means no cache entry."""
+        client._session.get.return_value = _response(headers={"Cache-Control": "no-store", "ETag": '"x"'})
+        client.get(URL)
+        client.get(URL)
+        assert "If-None-Match" not in client._session.get.call_args.kwargs["headers"]
+
+    def test_api_keys_never_reach_the_cache(self, client, tmp_path):
+        """Secrets are stripped from cache keys and stored URLs."""
+        client._session.get.return_value = _response(headers={"ETag": '"k"'})
+        client.get(URL, {"search": "x", "api_key": "SECRET"})
+        stored = "".join(p.read_text() for p in (tmp_path / "cache").rglob("*.json"))
+        assert "SECRET" not in stored
+
+        client.get(URL, {"search": "x", "api_key": "OTHER"})
+        assert client._session.get.call_args.kwargs["headers"]["If-None-Match"] == '"k"'
+
+    def test_stream_bypasses_cache(self, client):
+        """stream() leaves the body unread and never consults the cache."""
+        client._session.get.return_value = _response(headers={"ETag": '"s"'})
+        response = client.stream(URL, {"q": 1})
+
+        assert client._session.get.call_args.kwargs["stream"] is True
+        assert response.from_cache is False
+        client.stream(URL, {"q": 1})
+        assert "If-None-Match" not in client._session.get.call_args.kwargs["headers"]
+        assert not list(client.cache.directory.rglob("*.json"))
+
+    def test_canonical_url_sorts_and_merges(self):
+        """Parameter order and url-vs-params placement do not matter."""
+        assert canonical_url(URL + "?b=2", {"a": 1}) == canonical_url(URL, {"b": "2", "a": "1"})
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RECORD / REPLAY
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestRecordReplay:
+    """Tests for capturing responses and replaying them offline."""
+
+    def test_record_then_replay_offline(self, client, tmp_path):
+        """Recorded responses are served in replay mode with no network."""
+        client.mode = "record"
+        client._session.get.return_value = _response(
+            body=json.dumps({"results": [1, 2]}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        client.get(URL, {"skip": 0}, headers={"Accept": "application/json"})
+        assert client.stats["recorded"] == 1
+
+        replay = HTTPClient(
+            mode="replay", cassette_dir=tmp_path / "cassettes", cache_enabled=False,
+        )
+        replay._session = MagicMock()
+        response = replay.get(URL, {"skip": 0}, headers={"Accept": "application/json"})
+
+        assert response.json() == {"results": [1, 2]}
+        replay._session.get.assert_not_called()
+        assert replay.get(URL, {"skip": 100}, headers={"Accept": "application/json"}) is None
+
+    def test_streamed_payload_replays(self, client, tmp_path):
+        """stream() is recorded in record mode and readable in replay."""
+        client.mode = "record"
+        client._session.get.return_value = _response(body=b'{"results": [1]}')
+        client.stream(URL, {"format": "json"})
+
+        replay = HTTPClient(
+            mode="replay", cassette_dir=tmp_path / "cassettes", cache_enabled=False,
+        )
+        response = replay.stream(URL, {"format": "json"})
+        assert b"".join(response.iter_content(4)) == b'{"results": [1]}'
+
+    def test_invalid_mode(self):
+        """Unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            HTTPClient(mode="playback")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PIPELINES
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestPipelinesUseSharedClient:
+    """The four REST ingest pipelines share one client."""
+
+    @pytest.mark.parametrize(
+        "pipeline_cls",
+        [FAERSIngestPipeline, DailyMedIngestPipeline, UniProtIngestPipeline, CIBMTRIngestPipeline],
+    )
+    def test_default_client_is_shared(self, pipeline_cls, mock_collection_manager):
+        """Pipelines default to the process-wide client."""
+        pipeline = pipeline_cls(mock_collection_manager, MagicMock())
+        assert pipeline.http is get_http_client()
+        assert not hasattr(pipeline, "_request_with_retry")
+
+    def test_faers_requests_go_through_client(self, mock_collection_manager):
+        """FAERS count and page queries are issued via http.get."""
+        http = MagicMock()
+        http.get.side_effect = lambda url, params, headers=None: _response(
+            body=json.dumps({
+                "meta": {"results": {"total": 1}},
+                "results": [{"safetyreportid": "1"}],
+            }).encode()
+        )
+        pipeline = FAERSIngestPipeline(mock_collection_manager, MagicMock(), http_client=http)
+        assert len(pipeline.fetch(max_results=5)) == 1
+        assert {c.args[0] for c in http.get.call_args_list} == {OPENFDA_EVENT_URL}
+
+    def test_uniprot_follows_link_header(self, mock_collection_manager):
+        """Paged UniProt search follows the Link URL through the client."""
+        http = MagicMock()
+        http.get.side_effect = [
+            _response(
+                body=json.dumps({"results": [{"primaryAccession": "P1"}]}).encode(),
+                headers={"Link": '<https://rest.uniprot.org/next?cursor=2>; rel="next"'},
+            ),
+            _response(body=json.dumps({"results": [{"primaryAccession": "P2"}]}).encode()),
+        ]
+        pipeline = UniProtIngestPipeline(mock_collection_manager, MagicMock(), http_client=http)
+        assert len(pipeline.fetch(max_results=5, stream=False)) == 2
+        assert http.get.call_args_list[1].args[0] == "https://rest.uniprot.org/next?cursor=2"
@@ -0,0 +1,137 @@
+"""Tests for CAR-T Intelligence Agent size-aware index selection.
+
+Validates size bands, recall-driven search effort, IVF list sizing,
+rebuild detection, and plan reporting (no Milvus server required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import pytest
+
+from src.index_policy import IndexPlan, IndexPolicy, format_plan_table
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# INDEX TYPE SELECTION
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestChooseIndexType:
+    """Tests for IndexPolicy.choose_index_type() size bands."""
+
+    def test_small_collections_use_flat(self):
+        """Seed-sized collections get an exact FLAT index."""
+        policy = IndexPolicy()
+        assert policy.choose_index_type(0) == "FLAT"
+        assert policy.choose_index_type(350) == "FLAT"
+        assert policy.choose_index_type(20_000) == "FLAT"
+
+    def test_mid_band_high_recall_uses_hnsw(self):
+        """Mid-sized collections at recall >= 0.95 get HNSW."""
+        assert IndexPolicy(recall_target=0.95).choose_index_type(500_000) == "HNSW"
+
+    def test_mid_band_low_recall_uses_ivf_flat(self):
+        """Mid-sized collections at a relaxed recall target get IVF_FLAT."""
+        assert IndexPolicy(recall_target=0.9).choose_index_type(500_000) == "IVF_FLAT"
+
+    def test_large_collections_use_sq8(self):
+        """Very large collections get memory-lean IVF_SQ8 by default."""
+        assert IndexPolicy(recall_target=0.95).choose_index_type(5_000_000) == "IVF_SQ8"
+
+    def test_large_collections_very_high_recall_use_hnsw(self):
+        """A 0.99 recall target keeps large collections on HNSW."""
+        assert IndexPolicy(recall_target=0.99).choose_index_type(5_000_000) == "HNSW"
+
+    def test_invalid_configuration(self):
+        """Out-of-range recall and inverted thresholds are rejected."""
+        with pytest.raises(ValueError):
+            IndexPolicy(recall_target=0.0)
+        with pytest.raises(ValueError):
+            IndexPolicy(flat_max_rows=10, large_min_rows=5)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# BUILD & SEARCH PARAMS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestParams:
+    """Tests for build and search parameter derivation."""
+
+    def test_nlist_scales_with_sqrt_rows(self):
+        """IVF nlist is ~4 * sqrt(rows), never more clusters than sensible."""
+        policy = IndexPolicy()
+        assert policy.build_params("IVF_FLAT", 1_000_000)["nlist"] == 4000
+        assert policy.build_params("IVF_FLAT", 10)["nlist"] == 16
+
+    def test_flat_has_no_params(self):
+        """FLAT needs neither build nor search params."""
+        plan = IndexPolicy().plan("cart_trials", 100)
+        assert plan.build_params == {}
+        assert plan.search_params == {}
+
+    def test_nprobe_grows_with_recall(self):
+        """A higher recall target probes more IVF lists."""
+        low = IndexPolicy(recall_target=0.9).search_params("IVF_FLAT", {"nlist": 4000})
+        high = IndexPolicy(recall_target=0.99).search_params("IVF_FLAT", {"nlist": 4000})
+        assert low["nprobe"] < high["nprobe"] <= 4000
+
+    def test_nprobe_never_exceeds_nlist(self):
+        """nprobe is clamped to nlist for tiny IVF indexes."""
+        params = IndexPolicy().search_params("IVF_FLAT", {"nlist": 4})
+        assert params["nprobe"] == 4
+
+    def test_existing_legacy_index(self):
+        """Search params can be derived for the legacy nlist=1024 index."""
+        params = IndexPolicy(recall_target=0.95).search_params("IVF_FLAT", {"nlist": 1024})
+        assert params == {"nprobe": 31}
+
+    def test_hnsw_ef_grows_with_recall(self):
+        """HNSW ef increases with the recall target."""
+        low = IndexPolicy(recall_target=0.9).search_params("HNSW", {})
+        high = IndexPolicy(recall_target=0.99).search_params("HNSW", {})
+        assert low["ef"] < high["ef"]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PLANS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestIndexPlan:
+    """Tests for IndexPlan construction and reporting."""
+
+    def test_index_params_shape(self):
+        """index_params matches Collection.create_index expectations."""
+        plan = IndexPolicy().plan("genomic_evidence", 5_000_000)
+        assert plan.index_params == {
+            "metric_type": "COSINE",
+            "index_type": "IVF_SQ8",
+            "params": {"nlist": 8944},
+        }
+        assert plan.search_param["metric_type"] == "COSINE"
+        assert "nprobe" in plan.search_param["params"]
+
+    def test_needs_rebuild_on_band_change(self):
+        """A rebuild is needed only when the index type changes."""
+        policy = IndexPolicy()
+        assert policy.plan("cart_trials", 100, current_index_type="IVF_FLAT").needs_rebuild
+        assert not policy.plan("cart_trials", 100, current_index_type="FLAT").needs_rebuild
+        assert policy.plan("cart_trials", 100).needs_rebuild
+
+    def test_to_dict_and_table(self):
+        """Plans serialize and render for reports."""
+        plan = IndexPolicy().plan("cart_trials", 100, current_index_type="IVF_FLAT")
+        data = plan.to_dict()
+        assert data["index_type"] == "FLAT"
+        assert data["needs_rebuild"] is True
+        table = format_plan_table({"cart_trials": plan})
+        assert "cart_trials" in table
+        assert "IVF_FLAT" in table and "FLAT" in table
+
+    def test_plan_is_dataclass(self):
+        """IndexPlan carries a human-readable reason."""
+        plan = IndexPolicy().plan("cart_trials", 100)
+        assert isinstance(plan, IndexPlan)
+        assert "exact" in plan.reason
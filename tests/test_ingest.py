@@ -6,6 +6,7 @@ Covers:
   3. Schema validation -- parsed records match expected field names and types
   4. Edge cases: empty responses, malformed data, missing fields
   5. Seed data file loading -- all 13 JSON seed files load without error
+  6. Idempotent re-ingest -- content-hash skip / insert / upsert routing
 
 Author: Adam Jones
 Date: March 2026
@@ -13,9 +14,10 @@ Date: March 2026
 
 import json
 import sys
+import threading
 from pathlib import Path
 from typing import Any, Dict, List
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 from pydantic import BaseModel
@@ -27,7 +29,7 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.ingest.base import BaseIngestPipeline
+from src.ingest.base import BaseIngestPipeline, content_hash
 from src.ingest.literature_parser import PubMedIngestPipeline
 from src.ingest.clinical_trials_parser import ClinicalTrialsIngestPipeline
 from src.ingest.construct_parser import ConstructIngestPipeline
@@ -40,7 +42,13 @@ from src.ingest.sequence_parser import SequenceIngestPipeline
 from src.ingest.realworld_parser import RealWorldIngestPipeline
 from src.ingest.faers_parser import FAERSIngestPipeline
 from src.ingest.dailymed_parser import DailyMedIngestPipeline
-from src.ingest.uniprot_parser import UniProtIngestPipeline
+from src.ingest.uniprot_parser import (
+    STREAM_CHUNK_SIZE,
+    UNIPROT_FIELDS,
+    UNIPROT_STREAM_URL,
+    UniProtIngestPipeline,
+    iter_results,
+)
 from src.ingest.cibmtr_parser import CIBMTRIngestPipeline
 
 from src.models import (
@@ -201,6 +209,31 @@ class TestBaseIngestPipeline:
         assert count == 1
         mock_collection_manager.insert_batch.assert_called_once()
 
+    def test_embed_and_store_uses_one_bulk_session(self, mock_collection_manager, mock_embedder):
+        """embed_and_store() wraps all batches in a single bulk_ingest() session."""
+
+        class MinimalPipeline(BaseIngestPipeline):
+            def fetch(self, **kwargs):
+                return []
+
+            def parse(self, raw_data):
+                return []
+
+        pipeline = MinimalPipeline(mock_collection_manager, mock_embedder)
+        records = []
+        for i in range(5):
+            record = MagicMock()
+            record.to_embedding_text.return_value = f"text {i}"
+            record.model_dump.return_value = {"id": f"test-{i}"}
+            records.append(record)
+        mock_embedder.encode.side_effect = lambda texts: [[0.0] * 384 for _ in texts]
+
+        count = pipeline.embed_and_store(records, "test_collection", batch_size=2)
+        assert count == 5
+        assert mock_collection_manager.insert_batch.call_count == 3
+        mock_collection_manager.bulk_ingest.assert_called_once_with()
+        mock_collection_manager.bulk_ingest.return_value.__exit__.assert_called_once()
+
     def test_embed_and_store_handles_empty_records(self, mock_collection_manager, mock_embedder):
         """embed_and_store() returns 0 for empty records list."""
 
@@ -853,6 +886,114 @@ class TestFAERSParser:
         assert expected_fields == set(SafetyRecord.model_fields.keys())
 
 
+class _FakeOpenFDA:
+    """Stand-in for HTTPClient serving a drug/event result set of ``total``."""
+
+    def __init__(self, total, fail_skips=(), barrier=None):
+        self.total = total
+        self.fail_skips = set(fail_skips)
+        self.barrier = barrier
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params, headers=None):
+        with self.lock:
+            self.calls.append(dict(params))
+        skip, limit = params["skip"], params["limit"]
+        if limit == 1:  # count query
+            return self._response({"meta": {"results": {"total": self.total}}, "results": []})
+        if self.barrier is not None:
+            self.barrier.wait()
+        if skip in self.fail_skips:
+            return None
+        results = [
+            {"safetyreportid": f"R{i}", "patient": {"reaction": [{"reactionmeddrapt": "crs"}]}}
+            for i in range(skip, min(skip + limit, self.total))
+        ]
+        return self._response({"results": results})
+
+    @staticmethod
+    def _response(payload):
+        response = MagicMock()
+        response.json.return_value = payload
+        return response
+
+
+class TestFAERSFetch:
+    """Tests for count-first, concurrent FAERSIngestPipeline.fetch_stream()."""
+
+    def _pipeline(self, manager, http):
+        return FAERSIngestPipeline(manager, MagicMock(), http_client=http)
+
+    def test_count_first_then_planned_windows(self, mock_collection_manager):
+        """One count query, then exactly the windows needed."""
+        http = _FakeOpenFDA(total=250)
+        events = self._pipeline(mock_collection_manager, http).fetch(max_results=1000, page_size=100)
+
+        assert http.calls[0]["limit"] == 1
+        windows = sorted((c["skip"], c["limit"]) for c in http.calls[1:])
+        assert windows == [(0, 100), (100, 100), (200, 50)]
+        assert [e["safetyreportid"] for e in events] == [f"R{i}" for i in range(250)]
+
+    def test_windows_respect_max_results_and_openfda_cap(self):
+        """Plans stop at max_results and at skip + limit = 26,000."""
+        plan = FAERSIngestPipeline._plan_windows(total=10, max_results=5, page_size=2)
+        assert plan == [(0, 2), (2, 2), (4, 1)]
+        capped = FAERSIngestPipeline._plan_windows(total=90000, max_results=90000, page_size=1000)
+        assert capped[-1] == (25000, 1000)
+
+    @pytest.mark.parametrize("page_size", [100, 300, 1000])
+    def test_windows_never_skip_past_25000(self, page_size):
+        """openFDA caps skip at 25,000: the tail is one window at skip 25,000."""
+        plan = FAERSIngestPipeline._plan_windows(
+            total=40000, max_results=30000, page_size=page_size,
+        )
+        assert max(skip for skip, _ in plan) == 25000
+        assert plan[-1] == (25000, 1000)
+        assert all(0 < limit <= 1000 for _, limit in plan)
+        # contiguous, non-overlapping coverage of the first 26,000 results
+        assert plan[0][0] == 0
+        assert all(skip + limit == nxt for (skip, limit), (nxt, _) in zip(plan, plan[1:]))
+        assert sum(limit for _, limit in plan) == 26000
+
+        partial = FAERSIngestPipeline._plan_windows(
+            total=25400, max_results=30000, page_size=100,
+        )
+        assert partial[-1] == (25000, 400)
+
+    def test_pages_fetched_concurrently(self, mock_collection_manager):
+        """Workers overlap page requests."""
+        http = _FakeOpenFDA(total=300, barrier=threading.Barrier(3, timeout=5))
+        pages = list(self._pipeline(mock_collection_manager, http).fetch_stream(
+            max_results=300, page_size=100, workers=3,
+        ))
+        assert sorted(len(p) for p in pages) == [100, 100, 100]
+
+    def test_failed_page_skipped(self, mock_collection_manager):
+        """One failed window does not stop the others."""
+        http = _FakeOpenFDA(total=300, fail_skips={100})
+        events = self._pipeline(mock_collection_manager, http).fetch(max_results=300, page_size=100)
+        assert len(events) == 200
+
+    def test_no_matches(self, mock_collection_manager):
+        """A failed or empty count query fetches nothing."""
+        http = MagicMock()
+        http.get.return_value = None
+        assert self._pipeline(mock_collection_manager, http).fetch() == []
+        assert http.get.call_count == 1
+
+    def test_fallback_ids_stable_across_pages(self, mock_collection_manager):
+        """Events without a report id get their result-set offset as id."""
+        http = _FakeOpenFDA(total=4)
+        pipeline = self._pipeline(mock_collection_manager, http)
+        pages = list(pipeline.fetch_stream(max_results=4, page_size=2))
+        for page in pages:
+            for event in page:
+                event.pop("safetyreportid")
+        ids = sorted(r.id for page in pages for r in pipeline.parse(page))
+        assert ids == ["FAERS-000000", "FAERS-000001", "FAERS-000002", "FAERS-000003"]
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # 13. DailyMed Parser
 # ═══════════════════════════════════════════════════════════════════════
@@ -1004,6 +1145,98 @@ class TestUniProtParser:
         assert UniProtIngestPipeline._extract_protein_name(desc) == "Unknown protein"
 
 
+def _uniprot_entry(accession: str) -> Dict[str, Any]:
+    return {
+        "primaryAccession": accession,
+        "proteinDescription": {"recommendedName": {"fullName": {"value": "CD19"}}},
+        "genes": [{"geneName": {"value": "CD19"}}],
+        "organism": {"scientificName": "Homo sapiens"},
+        "sequence": {"value": "MPPPRLLFFL", "length": 556, "molWeight": 61120},
+    }
+
+
+def _uniprot_stream(body: bytes, read_size: int = 7) -> MagicMock:
+    """Streamed response delivering ``body`` in small, unaligned reads."""
+    response = MagicMock()
+    response.iter_content.side_effect = lambda size: (
+        body[i:i + read_size] for i in range(0, len(body), read_size)
+    )
+    response.__enter__.return_value = response
+    return response
+
+
+class TestUniProtStream:
+    """Test UniProtIngestPipeline.fetch_stream() and iter_results()."""
+
+    def _body(self, count: int) -> bytes:
+        entries = [_uniprot_entry(f"P{i:05d}") for i in range(count)]
+        return json.dumps({"results": entries}, indent=1).encode()
+
+    def test_iter_results_across_split_reads(self):
+        """Entries are decoded even when reads split tokens and braces."""
+        body = self._body(3).decode()
+        pieces = [body[i:i + 5] for i in range(0, len(body), 5)]
+        accessions = [e["primaryAccession"] for e in iter_results(pieces)]
+        assert accessions == ["P00000", "P00001", "P00002"]
+
+    def test_iter_results_truncated_body(self):
+        """A body cut off mid-array raises after the complete entries."""
+        body = self._body(2).decode()[:-40]
+        seen = []
+        with pytest.raises(ValueError):
+            for entry in iter_results([body]):
+                seen.append(entry["primaryAccession"])
+        assert seen == ["P00000"]
+
+    def test_requests_projected_stream(self, mock_collection_manager):
+        """One stream request with a fields= projection; chunks are bounded."""
+        http = MagicMock()
+        http.stream.return_value = _uniprot_stream(self._body(STREAM_CHUNK_SIZE + 3))
+        pipeline = UniProtIngestPipeline(mock_collection_manager, MagicMock(), http_client=http)
+
+        chunks = list(pipeline.fetch_stream(query="CD19", max_results=500))
+        assert [len(c) for c in chunks] == [STREAM_CHUNK_SIZE, 3]
+        url, params = http.stream.call_args.args
+        assert url == UNIPROT_STREAM_URL
+        assert params["fields"] == ",".join(UNIPROT_FIELDS)
+        assert "size" not in params
+        http.get.assert_not_called()
+
+    def test_stops_and_closes_at_max_results(self, mock_collection_manager):
+        """Reading stops once max_results entries arrived."""
+        http = MagicMock()
+        response = http.stream.return_value = _uniprot_stream(self._body(50))
+        pipeline = UniProtIngestPipeline(mock_collection_manager, MagicMock(), http_client=http)
+
+        entries = pipeline.fetch(max_results=5, stream=True)
+        assert [e["primaryAccession"] for e in entries] == [f"P{i:05d}" for i in range(5)]
+        response.__exit__.assert_called_once()
+
+    def test_interrupted_stream_keeps_received_entries(self, mock_collection_manager):
+        """A truncated body still yields the complete entries."""
+        http = MagicMock()
+        http.stream.return_value = _uniprot_stream(self._body(3)[:-60])
+        pipeline = UniProtIngestPipeline(mock_collection_manager, MagicMock(), http_client=http)
+        assert len(pipeline.fetch(max_results=10, stream=True)) == 2
+
+    def test_unavailable(self, mock_collection_manager):
+        """A failed request yields nothing."""
+        http = MagicMock()
+        http.stream.return_value = None
+        pipeline = UniProtIngestPipeline(mock_collection_manager, MagicMock(), http_client=http)
+        assert pipeline.fetch(stream=True) == []
+
+    def test_projected_entry_parses(self, mock_collection_manager):
+        """Projected entries carry everything parse() reads."""
+        http = MagicMock()
+        http.stream.return_value = _uniprot_stream(self._body(1))
+        pipeline = UniProtIngestPipeline(mock_collection_manager, MagicMock(), http_client=http)
+        (record,) = pipeline.parse(pipeline.fetch(stream=True))
+        assert record.id == "UNIPROT-P00000"
+        assert record.target_antigen == "CD19"
+        assert "Length: 556 aa" in record.text_summary
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # 15. CIBMTR Parser
 # ═══════════════════════════════════════════════════════════════════════
@@ -1036,14 +1269,16 @@ class TestCIBMTRParser:
         records = pipeline.parse([{"id": "test", "text_summary": ""}])
         assert records == []
 
-    @patch("src.ingest.cibmtr_parser.CIBMTRIngestPipeline._request_with_retry")
     def test_fetch_falls_back_on_network_failure(
-        self, mock_request, mock_collection_manager, mock_embedder
+        self, mock_collection_manager, mock_embedder
     ):
         """When CIBMTR website is unreachable, fetch returns curated data."""
-        mock_request.return_value = None
+        http = MagicMock()
+        http.get.return_value = None
 
-        pipeline = CIBMTRIngestPipeline(mock_collection_manager, mock_embedder)
+        pipeline = CIBMTRIngestPipeline(
+            mock_collection_manager, mock_embedder, http_client=http
+        )
         data = pipeline.fetch()
 
         assert len(data) == 10  # curated data count
@@ -1099,3 +1334,181 @@ class TestSeedDataFiles:
                 f"{filename}[{i}] (id={record.get('id', '?')}) "
                 "missing both 'text_summary' and 'text_chunk'"
             )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# 17. Idempotent re-ingest — content-hash change detection
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class _HashPipeline(BaseIngestPipeline):
+    def fetch(self, **kwargs):
+        return []
+
+    def parse(self, raw_data):
+        return []
+
+
+def _hash_record(record_id: str, text: str):
+    record = MagicMock()
+    record.to_embedding_text.return_value = text
+    record.model_dump.return_value = {"id": record_id, "text_summary": text}
+    return record
+
+
+class TestIdempotentIngest:
+    """embed_and_store() skips unchanged records and upserts changed ones."""
+
+    @pytest.fixture
+    def manager(self, mock_collection_manager):
+        mock_collection_manager.has_content_hash.return_value = True
+        mock_collection_manager.get_content_hashes.return_value = {
+            "same": content_hash("unchanged text"),
+            "edited": content_hash("old text"),
+        }
+        return mock_collection_manager
+
+    @pytest.fixture
+    def embedder(self, mock_embedder):
+        mock_embedder.encode.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        return mock_embedder
+
+    def _records(self):
+        return [
+            _hash_record("same", "unchanged text"),
+            _hash_record("edited", "new text"),
+            _hash_record("fresh", "brand new"),
+        ]
+
+    def test_new_changed_unchanged_routing(self, manager, embedder):
+        """New rows are inserted, changed rows upserted, unchanged skipped."""
+        pipeline = _HashPipeline(manager, embedder)
+        count = pipeline.embed_and_store(self._records(), "cart_literature")
+
+        assert count == 2
+        assert pipeline.last_stats.to_dict() == {
+            "new": 1, "changed": 1, "unchanged": 1, "failed": 0, "written": 2, "reused": 0,
+        }
+        inserted = manager.insert_batch.call_args.args[1]
+        upserted = manager.upsert_batch.call_args.args[1]
+        assert [r["id"] for r in inserted] == ["fresh"]
+        assert [r["id"] for r in upserted] == ["edited"]
+        assert upserted[0]["content_hash"] == content_hash("new text")
+
+    def test_unchanged_records_are_not_embedded(self, manager, embedder):
+        """Only new and changed texts reach the embedder."""
+        _HashPipeline(manager, embedder).embed_and_store(self._records(), "cart_literature")
+        embedder.encode.assert_called_once_with(["new text", "brand new"])
+
+    def test_hashes_checked_in_one_bulk_lookup(self, manager, embedder):
+        """Existing hashes are fetched once for all incoming ids."""
+        _HashPipeline(manager, embedder).embed_and_store(
+            self._records(), "cart_literature", batch_size=1,
+        )
+        manager.get_content_hashes.assert_called_once_with(
+            "cart_literature", ["same", "edited", "fresh"],
+        )
+
+    def test_rerun_is_a_no_op(self, manager, embedder):
+        """A second run over identical records writes nothing."""
+        records = self._records()
+        manager.get_content_hashes.return_value = {
+            r.model_dump()["id"]: content_hash(r.to_embedding_text()) for r in records
+        }
+        pipeline = _HashPipeline(manager, embedder)
+        assert pipeline.embed_and_store(records, "cart_literature") == 0
+        assert pipeline.last_stats.unchanged == 3
+        embedder.encode.assert_not_called()
+        manager.insert_batch.assert_not_called()
+
+    def test_skip_unchanged_false_reembeds(self, manager, embedder):
+        """skip_unchanged=False upserts existing records regardless of hash."""
+        pipeline = _HashPipeline(manager, embedder)
+        pipeline.embed_and_store(self._records(), "cart_literature", skip_unchanged=False)
+        assert pipeline.last_stats.changed == 2
+        assert pipeline.last_stats.unchanged == 0
+
+    def test_lookup_failure_upserts_everything(self, manager, embedder):
+        """If existence is unknown, every record is upserted (never duplicated)."""
+        manager.get_content_hashes.side_effect = RuntimeError("milvus down")
+        pipeline = _HashPipeline(manager, embedder)
+        assert pipeline.embed_and_store(self._records(), "cart_literature") == 3
+        manager.insert_batch.assert_not_called()
+        assert len(manager.upsert_batch.call_args.args[1]) == 3
+
+    def test_legacy_collection_without_hash_field(self, manager, embedder):
+        """Collections lacking content_hash get no hash column written."""
+        manager.has_content_hash.return_value = False
+        manager.get_content_hashes.return_value = {"same": None}
+        pipeline = _HashPipeline(manager, embedder)
+        pipeline.embed_and_store([_hash_record("same", "unchanged text")], "cart_literature")
+        upserted = manager.upsert_batch.call_args.args[1]
+        assert "content_hash" not in upserted[0]
+        assert pipeline.last_stats.changed == 1
+
+    def test_duplicate_ids_in_one_run(self, manager, embedder):
+        """A repeated id is written once, with its last version."""
+        manager.get_content_hashes.return_value = {}
+        records = [_hash_record("dup", "first"), _hash_record("dup", "second")]
+        pipeline = _HashPipeline(manager, embedder)
+        assert pipeline.embed_and_store(records, "cart_literature") == 1
+        assert manager.insert_batch.call_args.args[1][0]["text_summary"] == "second"
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# 18. Persistent embedding store — reuse across runs and rebuilds
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestEmbeddingStoreReuse:
+    """embed_and_store() consults the embedding store before encoding."""
+
+    @pytest.fixture
+    def embedder(self, mock_embedder):
+        mock_embedder.encode.side_effect = (
+            lambda texts: [[float(len(t))] * 384 for t in texts]
+        )
+        return mock_embedder
+
+    @pytest.fixture
+    def empty_milvus(self, mock_collection_manager):
+        mock_collection_manager.has_content_hash.return_value = True
+        mock_collection_manager.get_content_hashes.return_value = {}
+        return mock_collection_manager
+
+    def test_rebuild_needs_no_inference(self, empty_milvus, embedder):
+        """A second load into an empty Milvus serves every vector from disk."""
+        records = [_hash_record(f"r{i}", f"text {i}" * (i + 1)) for i in range(4)]
+        first = _HashPipeline(empty_milvus, embedder)
+        first.embed_and_store(records, "cart_literature", batch_size=2)
+        assert embedder.encode.call_count == 2
+        first_rows = [row for call in empty_milvus.insert_batch.call_args_list for row in call.args[1]]
+
+        embedder.encode.reset_mock()
+        empty_milvus.insert_batch.reset_mock()
+        second = _HashPipeline(empty_milvus, embedder)
+        assert second.embed_and_store(records, "cart_literature", batch_size=2) == 4
+        embedder.encode.assert_not_called()
+        assert second.last_stats.reused == 4
+        second_rows = [row for call in empty_milvus.insert_batch.call_args_list for row in call.args[1]]
+        assert [r["embedding"] for r in second_rows] == [r["embedding"] for r in first_rows]
+
+    def test_only_unseen_text_is_encoded(self, empty_milvus, embedder):
+        """Mixed batches encode just the texts missing from the store."""
+        pipeline = _HashPipeline(empty_milvus, embedder)
+        pipeline.embed_and_store([_hash_record("a", "seen")], "cart_literature")
+        embedder.encode.reset_mock()
+        pipeline.embed_and_store(
+            [_hash_record("a", "seen"), _hash_record("b", "unseen")], "cart_literature",
+        )
+        embedder.encode.assert_called_once_with(["unseen"])
+        assert pipeline.last_stats.reused == 1
+
+    def test_store_failure_falls_back_to_encoding(self, empty_milvus, embedder):
+        """A broken store never fails ingest."""
+        store = MagicMock()
+        store.get_many.side_effect = OSError("disk gone")
+        store.put_many.side_effect = OSError("disk gone")
+        pipeline = _HashPipeline(empty_milvus, embedder, embedding_store=store)
+        assert pipeline.embed_and_store([_hash_record("a", "text")], "cart_literature") == 1
+        embedder.encode.assert_called_once_with(["text"])
@@ -0,0 +1,276 @@
+"""Tests for CAR-T Intelligence Agent pipelined ingest runner.
+
+Validates that fetch -> parse -> embed -> insert stages overlap, that the
+bounded queues apply backpressure, error handling, per-stage metrics, and
+that existing ingest pipelines get run_pipelined() for free (no Milvus or
+embedding model required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.ingest.base import BaseIngestPipeline
+from src.ingest.pipeline_runner import PipelinedIngestRunner
+from src.ingest.safety_parser import SafetyIngestPipeline
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _record(record_id: str):
+    return SimpleNamespace(
+        to_embedding_text=lambda: f"text for {record_id}",
+        model_dump=lambda: {"id": record_id, "text_summary": f"text for {record_id}"},
+    )
+
+
+class _ChunkPipeline(BaseIngestPipeline):
+    """Pipeline whose fetch_stream yields pre-built chunks of ids."""
+
+    COLLECTION_NAME = "cart_safety"
+
+    def __init__(self, manager, embedder, chunks):
+        super().__init__(manager, embedder)
+        self.chunks = chunks
+
+    def fetch(self, **kwargs):
+        return [i for chunk in self.chunks for i in chunk]
+
+    def fetch_stream(self, **kwargs):
+        yield from self.chunks
+
+    def parse(self, raw_data):
+        return [_record(i) for i in raw_data]
+
+
+@pytest.fixture
+def manager(mock_collection_manager):
+    mock_collection_manager.has_content_hash.return_value = True
+    mock_collection_manager.get_content_hashes.return_value = {}
+    return mock_collection_manager
+
+
+@pytest.fixture
+def embedder():
+    embedder = MagicMock()
+    embedder.encode.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+    return embedder
+
+
+def _written_ids(manager, method="insert_batch"):
+    return sorted(
+        row["id"]
+        for call in getattr(manager, method).call_args_list
+        for row in call.args[1]
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# END-TO-END
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestPipelinedRun:
+    """Tests for PipelinedIngestRunner.run() results."""
+
+    def test_all_records_written_once(self, manager, embedder):
+        """Every parsed record is embedded and inserted exactly once."""
+        chunks = [[f"r{c}-{i}" for i in range(7)] for c in range(5)]
+        pipeline = _ChunkPipeline(manager, embedder, chunks)
+        written = pipeline.run_pipelined(batch_size=3, parse_workers=2, insert_workers=3)
+
+        assert written == 35
+        assert _written_ids(manager) == sorted(i for chunk in chunks for i in chunk)
+        assert pipeline.last_stats.new == 35
+        assert pipeline.last_stats.failed == 0
+        manager.bulk_ingest.assert_called_once_with()
+
+    def test_stage_metrics_reported(self, manager, embedder):
+        """Each stage reports durations through record_pipeline_stage."""
+        pipeline = _ChunkPipeline(manager, embedder, [["a", "b"], ["c"]])
+        runner = PipelinedIngestRunner(pipeline, "cart_safety", batch_size=2)
+        with patch("src.ingest.pipeline_runner.record_pipeline_stage") as record:
+            runner.run(pipeline.fetch_stream())
+
+        stages = {call.args[0] for call in record.call_args_list}
+        assert stages == {"ingest_fetch", "ingest_parse", "ingest_embed", "ingest_insert"}
+        assert runner.stage_metrics["fetch"].items == 2
+        assert runner.stage_metrics["parse"].records == 3
+        assert runner.stage_metrics["insert"].records == 3
+
+    def test_unchanged_records_skip_embed_and_insert(self, manager, embedder):
+        """Content-hash skipping applies per batch in pipelined mode."""
+        from src.ingest.base import content_hash
+
+        manager.get_content_hashes.side_effect = lambda name, ids: {
+            i: content_hash(f"text for {i}") for i in ids if i.startswith("old")
+        }
+        pipeline = _ChunkPipeline(manager, embedder, [["old1", "new1"], ["old2"]])
+        assert pipeline.run_pipelined() == 1
+        assert pipeline.last_stats.unchanged == 2
+        embedder.encode.assert_called_once_with(["text for new1"])
+
+    def test_repeated_id_across_batches_is_upserted(self, manager, embedder):
+        """An id seen in an earlier batch is never inserted twice."""
+        pipeline = _ChunkPipeline(manager, embedder, [["dup"], ["dup"]])
+        pipeline.run_pipelined(parse_workers=1, embed_workers=1)
+        assert _written_ids(manager) == ["dup"]
+        assert _written_ids(manager, "upsert_batch") == ["dup"]
+
+    def test_repeated_id_upsert_waits_for_insert(self, manager, embedder):
+        """With parallel insert workers the upsert still lands after the insert."""
+        writes = []
+
+        def _insert(name, rows):
+            threading.Event().wait(0.3)  # a slow insert the upsert must not overtake
+            writes.append(("insert", [r["id"] for r in rows]))
+
+        manager.insert_batch.side_effect = _insert
+        manager.upsert_batch.side_effect = lambda name, rows: writes.append(
+            ("upsert", [r["id"] for r in rows])
+        )
+        pipeline = _ChunkPipeline(manager, embedder, [["dup"], ["dup"]])
+        pipeline.run_pipelined(parse_workers=2, embed_workers=2, insert_workers=2)
+
+        assert writes == [("insert", ["dup"]), ("upsert", ["dup"])]
+        assert pipeline.last_stats.written == 2
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONCURRENCY
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestOverlapAndBackpressure:
+    """Tests that stages overlap and queues stay bounded."""
+
+    def test_insert_overlaps_next_embed(self, manager, embedder):
+        """Batch N's insert is still running when batch N+1 is embedded."""
+        second_embed = threading.Event()
+        calls = []
+
+        def _encode(texts):
+            calls.append(texts)
+            if len(calls) == 2:
+                second_embed.set()
+            return [[0.1] * 384 for _ in texts]
+
+        overlapped = []
+
+        def _insert(name, rows):
+            if not overlapped:
+                # Sequential execution would never embed batch 2 here
+                overlapped.append(second_embed.wait(timeout=5))
+
+        embedder.encode.side_effect = _encode
+        manager.insert_batch.side_effect = _insert
+        pipeline = _ChunkPipeline(manager, embedder, [["a"], ["b"], ["c"]])
+        pipeline.run_pipelined(batch_size=1, insert_workers=1)
+        assert overlapped == [True]
+
+    def test_bounded_queues_apply_backpressure(self, manager, embedder):
+        """A stalled insert stage stops the fetcher after a few chunks."""
+        release = threading.Event()
+        produced = []
+
+        def _chunks():
+            for i in range(100):
+                produced.append(i)
+                yield [f"r{i}"]
+
+        manager.insert_batch.side_effect = lambda name, rows: release.wait(timeout=5)
+        pipeline = _ChunkPipeline(manager, embedder, [])
+        runner = PipelinedIngestRunner(
+            pipeline, "cart_safety", batch_size=1,
+            parse_workers=1, embed_workers=1, insert_workers=1, queue_size=1,
+        )
+        thread = threading.Thread(target=runner.run, args=(_chunks(),))
+        thread.start()
+        threading.Event().wait(0.3)
+        in_flight = len(produced)
+        release.set()
+        thread.join(timeout=10)
+
+        assert in_flight <= 10
+        assert runner.stats.written == 100
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# ERRORS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestErrors:
+    """Tests for stage failures."""
+
+    def test_fetch_error_raised_after_in_flight_written(self, manager, embedder):
+        """Chunks fetched before the error are still written."""
+
+        def _chunks():
+            yield ["a", "b"]
+            raise ConnectionError("source went away")
+
+        pipeline = _ChunkPipeline(manager, embedder, [])
+        runner = PipelinedIngestRunner(pipeline, "cart_safety")
+        with pytest.raises(ConnectionError):
+            runner.run(_chunks())
+        assert _written_ids(manager) == ["a", "b"]
+
+    def test_embed_failure_counts_and_continues(self, manager, embedder):
+        """A failed embed batch is counted; other batches still land."""
+        embedder.encode.side_effect = lambda texts: (
+            (_ for _ in ()).throw(RuntimeError("OOM")) if "text for bad" in texts
+            else [[0.1] * 384 for _ in texts]
+        )
+        pipeline = _ChunkPipeline(manager, embedder, [["ok1"], ["bad"], ["ok2"]])
+        assert pipeline.run_pipelined(batch_size=1) == 2
+        assert pipeline.last_stats.failed == 1
+
+    def test_insert_failure_counts_and_continues(self, manager, embedder):
+        """A failed Milvus write is counted; the run completes."""
+        manager.insert_batch.side_effect = lambda name, rows: (
+            (_ for _ in ()).throw(RuntimeError("milvus")) if rows[0]["id"] == "bad" else None
+        )
+        pipeline = _ChunkPipeline(manager, embedder, [["ok"], ["bad"]])
+        assert pipeline.run_pipelined(batch_size=1) == 1
+        assert pipeline.last_stats.failed == 1
+
+    def test_missing_collection_name(self, manager, embedder):
+        """Pipelines without COLLECTION_NAME need an explicit target."""
+
+        class _NoTarget(_ChunkPipeline):
+            COLLECTION_NAME = None
+
+        with pytest.raises(ValueError):
+            _NoTarget(manager, embedder, []).run_pipelined()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# EXISTING PIPELINES
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestExistingPipelines:
+    """Subclasses get run_pipelined() without changes."""
+
+    def test_safety_seed_pipelined_matches_sequential(self, manager, embedder):
+        """The safety seed loads the same records either way."""
+        seed = PROJECT_ROOT / "data" / "reference" / "safety_seed_data.json"
+        sequential = SafetyIngestPipeline(manager, embedder).run(data_file=str(seed))
+        sequential_ids = _written_ids(manager)
+        manager.insert_batch.reset_mock()
+
+        pipelined = SafetyIngestPipeline(manager, embedder).run_pipelined(data_file=str(seed))
+        assert pipelined == sequential > 0
+        assert _written_ids(manager) == sequential_ids
@@ -0,0 +1,417 @@
+"""Tests for CAR-T Intelligence Agent PubMed E-utilities client.
+
+Validates streaming efetch parsing (iterparse over a response body),
+per-article field extraction, batch error handling, API-key rate
+limits, concurrent efetch batches, WebEnv history pagination, and the
+PubMed pipeline's chunked fetch_stream() (no network access required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import io
+import threading
+import xml.etree.ElementTree as ET
+from datetime import date
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+import urllib3
+
+from src.ingest.literature_parser import STREAM_CHUNK_SIZE, PubMedIngestPipeline
+from src.utils import pubmed_client
+from src.utils.pubmed_client import (
+    RATE_LIMIT_NO_KEY,
+    RATE_LIMIT_WITH_KEY,
+    PubMedClient,
+    SearchHistory,
+    iter_articles,
+)
+
+
+def _article_xml(pmid: str, year: str = "2023", title: str = "CD19 CAR-T") -> str:
+    return f"""
+    <PubmedArticle>
+      <MedlineCitation>
+        <PMID>{pmid}</PMID>
+        <Article>
+          <Journal><Title>Blood</Title>
+            <JournalIssue><PubDate><Year>{year}</Year></PubDate></JournalIssue>
+          </Journal>
+          <ArticleTitle>{title}</ArticleTitle>
+          <Abstract>
+            <AbstractText Label="BACKGROUND">Relapsed B-ALL.</AbstractText>
+            <AbstractText Label="RESULTS">CR in 80%.</AbstractText>
+          </Abstract>
+          <AuthorList>
+            <Author><LastName>June</LastName><ForeName>Carl</ForeName></Author>
+            <Author><LastName>Consortium</LastName></Author>
+          </AuthorList>
+        </Article>
+        <MeshHeadingList>
+          <MeshHeading><DescriptorName>Immunotherapy, Adoptive</DescriptorName></MeshHeading>
+        </MeshHeadingList>
+      </MedlineCitation>
+    </PubmedArticle>"""
+
+
+def _document(*articles: str) -> bytes:
+    return ("<PubmedArticleSet>" + "".join(articles) + "</PubmedArticleSet>").encode()
+
+
+def _streamed_response(body: bytes) -> MagicMock:
+    """A requests.Response stand-in whose raw body is a byte stream."""
+    response = MagicMock()
+    response.raw = io.BytesIO(body)
+    response.__enter__.return_value = response
+    response.__exit__.return_value = False
+    return response
+
+
+def _esearch_response(ids, count, webenv="MCID_1", querykey="1") -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = {"esearchresult": {
+        "idlist": ids, "count": str(count), "webenv": webenv, "querykey": querykey,
+    }}
+    return response
+
+
+def _params(url: str) -> dict:
+    return {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# ITERPARSE
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestIterArticles:
+    """Tests for the iter_articles() streaming parser."""
+
+    def test_parses_article_fields(self):
+        """All fields are extracted from a streamed document."""
+        (article,) = iter_articles(io.BytesIO(_document(_article_xml("111"))))
+        assert article["pmid"] == "111"
+        assert article["title"] == "CD19 CAR-T"
+        assert article["abstract"] == "BACKGROUND: Relapsed B-ALL. RESULTS: CR in 80%."
+        assert article["authors"] == ["June Carl", "Consortium"]
+        assert article["journal"] == "Blood"
+        assert article["year"] == "2023"
+        assert article["mesh_terms"] == ["Immunotherapy, Adoptive"]
+
+    def test_medline_date_fallback(self):
+        """Freeform MedlineDate yields its leading year."""
+        xml = _article_xml("222").replace(
+            "<Year>2023</Year>", "<MedlineDate>2021 Jan-Feb</MedlineDate>",
+        )
+        (article,) = iter_articles(io.BytesIO(_document(xml)))
+        assert article["year"] == "2021"
+
+    def test_is_lazy_and_skips_book_articles(self):
+        """Articles are yielded one at a time; book records are skipped."""
+        body = _document(
+            _article_xml("1"),
+            "<PubmedBookArticle><BookDocument><PMID>9</PMID></BookDocument></PubmedBookArticle>",
+            _article_xml("2"),
+        )
+        articles = iter_articles(io.BytesIO(body))
+        assert next(articles)["pmid"] == "1"
+        assert [a["pmid"] for a in articles] == ["2"]
+
+    def test_malformed_tail_raises_after_yielding(self):
+        """Articles before a parse error are still delivered."""
+        body = b"<PubmedArticleSet>" + _article_xml("1").encode() + b"<PubmedArticle><oops"
+        seen = []
+        with pytest.raises(ET.ParseError):
+            for article in iter_articles(io.BytesIO(body)):
+                seen.append(article["pmid"])
+        assert seen == ["1"]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CLIENT
+# ═══════════════════════════════════════════════════════════════════════
+
+
+@pytest.fixture
+def client():
+    client = PubMedClient(api_key="test-key")
+    client._rate_limit = MagicMock()
+    client._session = MagicMock()
+    return client
+
+
+class TestIterAbstracts:
+    """Tests for PubMedClient.iter_abstracts() / fetch_abstracts()."""
+
+    def test_streams_each_batch(self, client):
+        """Each batch is requested with stream=True and parsed from raw."""
+        bodies = {
+            "1,2": _document(_article_xml("1"), _article_xml("2")),
+            "3": _document(_article_xml("3")),
+        }
+        client._session.get.side_effect = lambda url, **kw: _streamed_response(
+            bodies[_params(url)["id"]]
+        )
+        articles = client.fetch_abstracts(["1", "2", "3"], batch_size=2)
+
+        assert [a["pmid"] for a in articles] == ["1", "2", "3"]
+        assert client._session.get.call_count == 2
+        assert all(call.kwargs["stream"] for call in client._session.get.call_args_list)
+        assert client._rate_limit.call_count == 2
+
+    def test_failed_batch_is_skipped(self, client):
+        """HTTP and XML errors drop only the affected batch."""
+
+        def _get(url, **kwargs):
+            pmid = _params(url)["id"]
+            if pmid == "1":
+                raise requests.ConnectionError("reset")
+            if pmid == "2":
+                return _streamed_response(b"<PubmedArticleSet><PubmedArticle>")
+            return _streamed_response(_document(_article_xml(pmid)))
+
+        client._session.get.side_effect = _get
+        articles = list(client.iter_abstracts(["1", "2", "3"], batch_size=1))
+        assert [a["pmid"] for a in articles] == ["3"]
+
+    @pytest.mark.parametrize("error", [
+        urllib3.exceptions.ProtocolError("Connection broken: IncompleteRead"),
+        urllib3.exceptions.ReadTimeoutError(None, None, "Read timed out."),
+        urllib3.exceptions.DecodeError("Received response with content-encoding: gzip"),
+        ConnectionResetError(104, "Connection reset by peer"),
+    ])
+    def test_truncated_stream_is_reported(self, client, error):
+        """A raw stream dying mid-body keeps earlier articles and fails the batch."""
+        body = _document(_article_xml("1"), _article_xml("2"))
+        cut = body.index(b"<PubmedArticle>", body.index(b"</PubmedArticle>"))
+
+        class _Truncated(io.BytesIO):
+            def read(self, size=-1):
+                if self.tell() >= cut:
+                    raise error
+                return super().read(min(size, cut - self.tell()) if size > 0 else cut)
+
+        response = _streamed_response(b"")
+        response.raw = _Truncated(body)
+        client._session.get.side_effect = lambda url, **kwargs: (
+            response if _params(url)["id"] == "1,2"
+            else _streamed_response(_document(_article_xml("3")))
+        )
+        failed = []
+        articles = list(client.iter_abstracts(["1", "2", "3"], batch_size=2, failed=failed))
+
+        assert [a["pmid"] for a in articles] == ["1", "3"]
+        assert len(failed) == 1 and _params(failed[0])["id"] == "1,2"
+
+    def test_empty_pmids(self, client):
+        """No PMIDs means no requests."""
+        assert client.fetch_abstracts([]) == []
+        client._session.get.assert_not_called()
+
+    def test_batches_run_concurrently_in_order(self, client):
+        """Batches overlap on the worker pool but are yielded in order."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def _get(url, **kwargs):
+            barrier.wait()  # only passes if three requests are in flight
+            return _streamed_response(_document(_article_xml(_params(url)["id"])))
+
+        client.max_workers = 3
+        client._session.get.side_effect = _get
+        articles = list(client.iter_abstracts(["1", "2", "3"], batch_size=1))
+        assert [a["pmid"] for a in articles] == ["1", "2", "3"]
+
+    def test_articles_stream_before_batch_ends(self, client):
+        """The consumer gets a batch's first article while the body is still arriving."""
+        body = _document(*(_article_xml(str(i)) for i in range(1, 6)))
+        cut = body.index(b"<PubmedArticle>", body.index(b"</PubmedArticle>"))
+        release, waits = threading.Event(), []
+
+        class _Stalled(io.BytesIO):
+            def read(self, size=-1):
+                if self.tell() >= cut and not release.is_set():
+                    waits.append(release.wait(timeout=5))
+                return super().read(min(size, cut - self.tell()) if self.tell() < cut else size)
+
+        response = _streamed_response(b"")
+        response.raw = _Stalled(body)
+        client._session.get.return_value = response
+
+        articles = client.iter_abstracts([str(i) for i in range(1, 6)], batch_size=5)
+        assert next(articles)["pmid"] == "1"
+        release.set()
+        assert [a["pmid"] for a in articles] == ["2", "3", "4", "5"]
+        assert waits == [True]
+
+    def test_buffer_bounds_parsed_articles(self, client, monkeypatch):
+        """A stalled consumer holds at most EFETCH_BUFFER_ARTICLES per batch."""
+        monkeypatch.setattr("src.utils.pubmed_client.EFETCH_BUFFER_ARTICLES", 3)
+        parsed = []
+        real_parse = pubmed_client.parse_article
+        monkeypatch.setattr(
+            "src.utils.pubmed_client.parse_article",
+            lambda elem: parsed.append(1) or real_parse(elem),
+        )
+        client._session.get.side_effect = lambda url, **kwargs: _streamed_response(
+            _document(*(_article_xml(str(i)) for i in range(50)))
+        )
+
+        articles = client.iter_abstracts([str(i) for i in range(50)], batch_size=50)
+        next(articles)
+        threading.Event().wait(0.3)  # let the worker run ahead as far as it can
+        # one yielded, three buffered, one blocked on put()
+        assert len(parsed) <= 5
+        articles.close()  # abandons the worker instead of parsing the rest
+        assert len(parsed) <= 5
+
+
+class TestHistoryServer:
+    """Tests for usehistory=y search and WebEnv-based efetch paging."""
+
+    def test_search_pages_through_stored_result_set(self, client):
+        """Later esearch pages reuse WebEnv/query_key."""
+        client._session.get.side_effect = [
+            _esearch_response(["1", "2"], count=3),
+            _esearch_response(["3"], count=3),
+        ]
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("src.utils.pubmed_client.ESEARCH_PAGE_SIZE", 2)
+            assert client.search("CAR-T", max_results=10) == ["1", "2", "3"]
+
+        first, second = (_params(c.args[0]) for c in client._session.get.call_args_list)
+        assert first["usehistory"] == "y" and "WebEnv" not in first
+        assert second["WebEnv"] == "MCID_1"
+        assert second["query_key"] == "1"
+        assert second["retstart"] == "2"
+
+    def test_search_history_downloads_no_ids(self, client):
+        """search_history() asks for zero ids and caps the count."""
+        client._session.get.return_value = _esearch_response([], count=12000)
+        history = client.search_history("CAR-T", max_results=5000)
+
+        assert history == SearchHistory(
+            webenv="MCID_1", query_key="1", count=5000, total=12000,
+        )
+        assert _params(client._session.get.call_args.args[0])["retmax"] == "0"
+
+    def test_search_history_failure_returns_none(self, client):
+        """HTTP errors are logged and yield None."""
+        client._session.get.side_effect = requests.ConnectionError("down")
+        assert client.search_history("CAR-T") is None
+
+    def test_iter_history_pages_by_retstart(self, client):
+        """efetch pages carry WebEnv/retstart/retmax and no id list."""
+        client._session.get.side_effect = lambda url, **kw: _streamed_response(
+            _document(_article_xml(_params(url)["retstart"]))
+        )
+        history = SearchHistory(webenv="MCID_9", query_key="2", count=450)
+        articles = list(client.iter_history(history, batch_size=200))
+
+        assert [a["pmid"] for a in articles] == ["0", "200", "400"]
+        pages = sorted(
+            (_params(c.args[0]) for c in client._session.get.call_args_list),
+            key=lambda p: int(p["retstart"]),
+        )
+        assert [p["retmax"] for p in pages] == ["200", "200", "50"]
+        assert all(p["WebEnv"] == "MCID_9" and "id" not in p for p in pages)
+
+    def test_failed_pages_are_reported(self, client):
+        """URLs of failed efetch pages land in the caller's ``failed`` list."""
+
+        def _get(url, **kwargs):
+            if _params(url)["retstart"] == "200":
+                raise requests.ConnectionError("reset")
+            return _streamed_response(_document(_article_xml(_params(url)["retstart"])))
+
+        client._session.get.side_effect = _get
+        failed = []
+        history = SearchHistory(webenv="MCID_9", query_key="2", count=450)
+        articles = list(client.iter_history(history, batch_size=200, failed=failed))
+
+        assert [a["pmid"] for a in articles] == ["0", "400"]
+        assert len(failed) == 1 and _params(failed[0])["retstart"] == "200"
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RATE LIMIT & POOLING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestClientConfiguration:
+    """Tests for API-key-dependent limits and the pooled session."""
+
+    def test_rate_and_workers_follow_api_key(self, monkeypatch):
+        """3 req/s without a key, 10 with; workers default to the rate."""
+        monkeypatch.delenv("NCBI_API_KEY", raising=False)
+        monkeypatch.setattr("config.settings.settings.NCBI_API_KEY", None)
+        keyless = PubMedClient()
+        keyed = PubMedClient(api_key="k")
+
+        assert (keyless.rate_limit, keyless.max_workers) == (RATE_LIMIT_NO_KEY, 3)
+        assert (keyed.rate_limit, keyed.max_workers) == (RATE_LIMIT_WITH_KEY, 10)
+        assert keyed._bucket.rate == RATE_LIMIT_WITH_KEY
+
+    def test_session_pool_sized_for_workers(self):
+        """The HTTPS adapter keeps one connection per worker."""
+        client = PubMedClient(api_key="k", max_workers=4)
+        adapter = client._session.get_adapter("https://eutils.ncbi.nlm.nih.gov/")
+        assert adapter._pool_maxsize == 4
+        client.close()
+
+
+class TestPipelineFetchStream:
+    """Tests for PubMedIngestPipeline.fetch_stream()."""
+
+    def test_yields_bounded_chunks(self, mock_collection_manager):
+        """Streamed articles are grouped into STREAM_CHUNK_SIZE chunks."""
+        pubmed = MagicMock()
+        history = SearchHistory("MCID", "1", STREAM_CHUNK_SIZE + 5)
+        pubmed.search_history.return_value = history
+        pubmed.iter_history.return_value = iter(
+            {"pmid": str(i)} for i in range(STREAM_CHUNK_SIZE + 5)
+        )
+        pipeline = PubMedIngestPipeline(mock_collection_manager, MagicMock(), pubmed)
+
+        chunks = list(pipeline.fetch_stream(query="CD19", max_results=200))
+        assert [len(c) for c in chunks] == [STREAM_CHUNK_SIZE, 5]
+        pubmed.search_history.assert_called_once_with("CD19", 200, mindate=None)
+        pubmed.iter_history.assert_called_once_with(history, failed=[])
+        pubmed.fetch_abstracts.assert_not_called()
+        assert pipeline.last_fetch_complete
+
+    def test_incomplete_fetch_is_flagged(self, mock_collection_manager):
+        """A failed page or a result set cut off at max_results is incomplete."""
+        pubmed = MagicMock()
+        pipeline = PubMedIngestPipeline(mock_collection_manager, MagicMock(), pubmed)
+
+        pubmed.search_history.return_value = SearchHistory("MCID", "1", 2, total=2)
+        pubmed.iter_history.side_effect = lambda history, failed: (
+            failed.append("efetch?retstart=1") or iter([{"pmid": "1"}])
+        )
+        assert pipeline.fetch() == [{"pmid": "1"}]
+        assert not pipeline.last_fetch_complete
+
+        pubmed.search_history.return_value = SearchHistory("MCID", "1", 1, total=9000)
+        pubmed.iter_history.side_effect = lambda history, failed: iter([{"pmid": "1"}])
+        pipeline.fetch(max_results=1, since=date(2026, 3, 1))
+        assert not pipeline.last_fetch_complete
+
+    def test_capped_backfill_is_complete(self, mock_collection_manager):
+        """Without since=, stopping at max_results is a finished backfill."""
+        pubmed = MagicMock()
+        pubmed.search_history.return_value = SearchHistory("MCID", "1", 1, total=9000)
+        pubmed.iter_history.side_effect = lambda history, failed: iter([{"pmid": "1"}])
+        pipeline = PubMedIngestPipeline(mock_collection_manager, MagicMock(), pubmed)
+        pipeline.fetch(max_results=1)
+        assert pipeline.last_fetch_complete
+
+    def test_failed_search_yields_nothing(self, mock_collection_manager):
+        """A failed search produces an empty, incomplete fetch()."""
+        pubmed = MagicMock()
+        pubmed.search_history.return_value = None
+        pipeline = PubMedIngestPipeline(mock_collection_manager, MagicMock(), pubmed)
+        assert pipeline.fetch() == []
+        assert not pipeline.last_fetch_complete
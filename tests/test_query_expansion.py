@@ -215,3 +215,66 @@ class TestAllExpansionMaps:
         assert len(REGULATORY_EXPANSION) > 0
         assert len(SEQUENCE_EXPANSION) > 0
         assert len(REALWORLD_EXPANSION) > 0
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PRECOMPUTED EXPANSION EMBEDDINGS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class _HashEmbedder:
+    """Deterministic fake embedder: 4-dim vectors derived from text length."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        return [[float(len(t)), 1.0, 0.0, -1.0] for t in texts]
+
+
+class TestExpansionEmbeddingTable:
+    """Tests for src/expansion_embeddings.py build + load round trip."""
+
+    def test_collects_every_term_once(self):
+        """collect_expansion_terms() covers all maps without duplicates."""
+        from src.expansion_embeddings import collect_expansion_terms
+
+        terms = collect_expansion_terms()
+        assert len(terms) == len(set(terms))
+        assert "tocilizumab" in terms
+        assert "CD19" in terms
+
+    def test_round_trip(self, tmp_path):
+        """A built table loads memory-mapped and returns prefixed vectors."""
+        from src.embedding_cache import BGE_QUERY_PREFIX
+        from src.expansion_embeddings import (
+            ExpansionEmbeddingTable,
+            build_expansion_table,
+            collect_expansion_terms,
+        )
+
+        embedder = _HashEmbedder()
+        count = build_expansion_table(embedder, tmp_path, batch_size=500, model_name="fake")
+        assert count == len(collect_expansion_terms())
+
+        table = ExpansionEmbeddingTable.load(tmp_path, model_name="fake")
+        assert table is not None
+        assert len(table) == count
+        assert "tocilizumab" in table
+        expected_len = float(len(BGE_QUERY_PREFIX + "tocilizumab"))
+        assert table.get("tocilizumab") == [expected_len, 1.0, 0.0, -1.0]
+        assert table.get("not an expansion term") is None
+
+    def test_rejects_other_model(self, tmp_path):
+        """A table built for a different embedding model is not loaded."""
+        from src.expansion_embeddings import ExpansionEmbeddingTable, build_expansion_table
+
+        build_expansion_table(_HashEmbedder(), tmp_path, batch_size=500, model_name="old-model")
+        assert ExpansionEmbeddingTable.load(tmp_path, model_name="new-model") is None
+
+    def test_missing_table_returns_none(self, tmp_path):
+        """Loading from an empty directory returns None instead of raising."""
+        from src.expansion_embeddings import ExpansionEmbeddingTable
+
+        assert ExpansionEmbeddingTable.load(tmp_path / "absent") is None
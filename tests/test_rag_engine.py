@@ -2,16 +2,26 @@
 
 Validates initialization, embedding prefixing, comparative detection,
 citation formatting, merge-and-rank logic, knowledge context extraction,
-retrieval, and COLLECTION_CONFIG structure.
+retrieval, COLLECTION_CONFIG structure, the async worker-pool request
+path, and single-flight coalescing of identical retrievals.
 
 Author: Adam Jones
 Date: February 2026
 """
 
+import asyncio
+import threading
+
 import pytest
 
+from src.embedding_cache import BGE_QUERY_PREFIX
 from src.models import AgentQuery, CARTStage, CrossCollectionResult, SearchHit
-from src.rag_engine import COLLECTION_CONFIG, STAGE_COLLECTION_BOOST, CARTRAGEngine
+from src.rag_engine import (
+    COLLECTION_CONFIG,
+    STAGE_COLLECTION_BOOST,
+    CARTRAGEngine,
+    retrieval_lane,
+)
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -102,6 +112,29 @@ class TestEmbedQuery:
         assert isinstance(result, list)
         assert len(result) == 384
 
+    def test_repeated_query_uses_cache(self, rag_engine, mock_embedder):
+        """A repeated question is embedded once and then served from cache."""
+        rag_engine._embed_query("BCMA resistance")
+        rag_engine._embed_query("BCMA resistance")
+        assert mock_embedder.embed_text.call_count == 1
+        assert rag_engine.embedding_cache.stats()["hits"] == 1
+
+    def test_cache_can_be_disabled(self, mock_embedder, mock_llm_client,
+                                   mock_collection_manager, monkeypatch):
+        """With EMBEDDING_CACHE_ENABLED off, every call reaches the embedder."""
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+        engine = CARTRAGEngine(
+            collection_manager=mock_collection_manager,
+            embedder=mock_embedder,
+            llm_client=mock_llm_client,
+        )
+        engine._embed_query("BCMA resistance")
+        engine._embed_query("BCMA resistance")
+        assert engine.embedding_cache is None
+        assert mock_embedder.embed_text.call_count == 2
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # COMPARATIVE DETECTION
@@ -425,3 +458,468 @@ class TestComputeBoostedWeights:
         query = AgentQuery(question="CD19 clinical trials")
         result = rag_engine.retrieve(query, stages=[CARTStage.CLINICAL])
         assert isinstance(result, CrossCollectionResult)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# QUERY EXPANSION
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestExpandedSearch:
+    """Tests for _expanded_search() with the precomputed expansion table."""
+
+    def test_uses_precomputed_vectors(self, mock_embedder, mock_llm_client,
+                                      mock_collection_manager):
+        """Non-antigen expansion terms are looked up, not embedded."""
+        from unittest.mock import MagicMock
+
+        table = MagicMock()
+        table.get.return_value = [0.5] * 384
+        engine = CARTRAGEngine(
+            collection_manager=mock_collection_manager,
+            embedder=mock_embedder,
+            llm_client=mock_llm_client,
+            query_expander="expander_module",
+            expansion_table=table,
+        )
+        engine._expanded_search(
+            "How is crs managed?", [0.0] * 384, list(COLLECTION_CONFIG), 5,
+        )
+        assert table.get.called
+        mock_embedder.embed_text.assert_not_called()
+        # All non-antigen terms share one multi-vector fan-out
+        assert mock_collection_manager.search_all_many.call_count == 1
+
+    def test_falls_back_for_unknown_terms(self, mock_embedder, mock_llm_client,
+                                          mock_collection_manager):
+        """Terms missing from the table are embedded live."""
+        from unittest.mock import MagicMock
+
+        table = MagicMock()
+        table.get.return_value = None
+        engine = CARTRAGEngine(
+            collection_manager=mock_collection_manager,
+            embedder=mock_embedder,
+            llm_client=mock_llm_client,
+            query_expander="expander_module",
+            expansion_table=table,
+        )
+        engine._expanded_search(
+            "How is crs managed?", [0.0] * 384, list(COLLECTION_CONFIG), 5,
+        )
+        assert mock_embedder.embed_text.called
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# BATCHED RETRIEVAL
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestRetrieveMany:
+    """Tests for retrieve_many() multi-vector batching."""
+
+    def test_returns_one_result_per_query(self, rag_engine):
+        """retrieve_many() preserves input order and length."""
+        queries = [AgentQuery(question="CRS onset"), AgentQuery(question="ICANS grading")]
+        results = rag_engine.retrieve_many(queries)
+        assert [r.query for r in results] == ["CRS onset", "ICANS grading"]
+
+    def test_same_filters_share_one_search(self, rag_engine, mock_collection_manager):
+        """Queries with identical filters go out as one multi-vector search."""
+        queries = [AgentQuery(question=f"question {i}") for i in range(3)]
+        rag_engine.retrieve_many(queries)
+        assert mock_collection_manager.search_all_many.call_count == 1
+        embeddings = mock_collection_manager.search_all_many.call_args.args[0]
+        assert len(embeddings) == 3
+
+    def test_different_filters_are_grouped(self, rag_engine, mock_collection_manager):
+        """Queries with different antigen filters are searched separately."""
+        queries = [
+            AgentQuery(question="efficacy", target_antigen="CD19"),
+            AgentQuery(question="efficacy", target_antigen="BCMA"),
+            AgentQuery(question="durability", target_antigen="CD19"),
+        ]
+        rag_engine.retrieve_many(queries)
+        sizes = sorted(
+            len(call.args[0])
+            for call in mock_collection_manager.search_all_many.call_args_list
+        )
+        assert sizes == [1, 2]
+
+    def test_timed_out_collections_are_reported(self, rag_engine, mock_collection_manager):
+        """Collections that missed the search deadline are flagged on the result."""
+        from src.collections import SearchAllResult
+
+        mock_collection_manager.search_all_many.side_effect = (
+            lambda query_embeddings, *args, **kwargs: SearchAllResult(
+                {"cart_literature": [[] for _ in query_embeddings]},
+                timed_out=["cart_safety"],
+            )
+        )
+        result = rag_engine.retrieve(AgentQuery(question="CRS onset"))
+        assert result.timed_out_collections == ["cart_safety"]
+
+    def test_no_timeouts_by_default(self, rag_engine):
+        """A complete search leaves timed_out_collections empty."""
+        result = rag_engine.retrieve(AgentQuery(question="CRS onset"))
+        assert result.timed_out_collections == []
+
+    def test_empty_input(self, rag_engine, mock_collection_manager):
+        """An empty batch performs no searches."""
+        assert rag_engine.retrieve_many([]) == []
+        mock_collection_manager.search_all_many.assert_not_called()
+
+    def test_queries_embedded_in_one_call(self, rag_engine, mock_embedder):
+        """All questions go to the model in a single prefixed encode() call."""
+        rag_engine.embedding_cache = None
+        queries = [AgentQuery(question=q) for q in ("CRS onset", "ICANS grading", "CRS onset")]
+        rag_engine.retrieve_many(queries)
+
+        (texts,), _ = mock_embedder.encode.call_args
+        assert mock_embedder.encode.call_count == 1
+        assert texts == [BGE_QUERY_PREFIX + q.question for q in queries]
+        mock_embedder.embed_text.assert_not_called()
+
+    def test_precomputed_embeddings_skip_encoding(self, rag_engine, mock_embedder,
+                                                  mock_collection_manager):
+        """Embeddings passed in are searched as-is."""
+        queries = [AgentQuery(question="a"), AgentQuery(question="b")]
+        vectors = [[0.1] * 384, [0.2] * 384]
+        rag_engine.retrieve_many(queries, embeddings=vectors)
+
+        mock_embedder.encode.assert_not_called()
+        mock_embedder.embed_text.assert_not_called()
+        assert mock_collection_manager.search_all_many.call_args.args[0] == vectors
+
+    def test_embedder_without_encode_falls_back(self, rag_engine, mock_embedder):
+        """Embedders exposing only embed_text() are called once per question."""
+        del mock_embedder.encode
+        rag_engine.embedding_cache = None
+        rag_engine.retrieve_many([AgentQuery(question="a"), AgentQuery(question="b")])
+        assert mock_embedder.embed_text.call_count == 2
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# COLLECTION ROUTING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestRouteCollections:
+    """Tests for _route_collections() and routed search fan-out."""
+
+    def test_filter_limits_rpcs(self, rag_engine, mock_collection_manager):
+        """Only the requested collections are sent to the manager."""
+        rag_engine.retrieve(
+            AgentQuery(question="test"),
+            collections_filter=["cart_literature", "cart_trials"],
+        )
+        kwargs = mock_collection_manager.search_all_many.call_args.kwargs
+        assert kwargs["collections"] == ["cart_literature", "cart_trials"]
+
+    def test_unknown_collections_dropped(self, rag_engine):
+        """Unknown names in the filter are ignored."""
+        routed = rag_engine._route_collections(
+            AgentQuery(question="test"), ["cart_safety", "not_a_collection"],
+        )
+        assert routed == ["cart_safety"]
+
+    def test_default_policy_searches_all(self, rag_engine):
+        """With the default "all" policy, stages only re-weight."""
+        routed = rag_engine._route_collections(
+            AgentQuery(question="test"), stages=[CARTStage.CLINICAL],
+        )
+        assert routed == list(COLLECTION_CONFIG)
+
+    def test_stage_policy(self, rag_engine, monkeypatch):
+        """The "stage" policy searches boosted collections plus core ones."""
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "COLLECTION_ROUTING_POLICY", "stage")
+        routed = rag_engine._route_collections(
+            AgentQuery(question="test"), stages=[CARTStage.CAR_DESIGN],
+        )
+        assert set(routed) == {
+            "cart_literature", "cart_trials", "cart_constructs", "cart_sequences",
+        }
+
+    def test_include_genomic_false(self, rag_engine):
+        """include_genomic=False skips the genomic_evidence collection."""
+        routed = rag_engine._route_collections(
+            AgentQuery(question="test", include_genomic=False),
+        )
+        assert "genomic_evidence" not in routed
+        assert len(routed) == 10
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PROJECTION & HYDRATION
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _projected_results(query_embeddings, *args, **kwargs):
+    """search_all_many side effect returning one projected trial hit per query."""
+    return {
+        "cart_trials": [
+            [{"id": f"NCT{i}", "score": 0.9, "collection": "cart_trials", "phase": "Phase 2"}]
+            for i in range(len(query_embeddings))
+        ],
+    }
+
+
+class TestHydration:
+    """Tests for projected retrieval and lazy hit hydration."""
+
+    def test_search_requests_projection(self, rag_engine, mock_collection_manager):
+        """retrieve() asks the manager for a projected search."""
+        rag_engine.retrieve(AgentQuery(question="CRS onset"))
+        assert mock_collection_manager.search_all_many.call_args.kwargs["projection"] is True
+
+    def test_surviving_hits_are_hydrated_once(self, rag_engine, mock_collection_manager):
+        """One hydrate_many call fills text and metadata for all queries' hits."""
+        mock_collection_manager.search_all_many.side_effect = _projected_results
+        mock_collection_manager.hydrate_many.return_value = {
+            "cart_trials": {
+                "NCT0": {"id": "NCT0", "text_summary": "Phase 2 study", "title": "Trial zero"},
+                "NCT1": {"id": "NCT1", "text_summary": "Phase 3 study", "title": "Trial one"},
+            },
+        }
+        results = rag_engine.retrieve_many(
+            [AgentQuery(question="a"), AgentQuery(question="b")],
+        )
+        assert mock_collection_manager.hydrate_many.call_count == 1
+        ids = mock_collection_manager.hydrate_many.call_args.args[0]["cart_trials"]
+        assert sorted(ids) == ["NCT0", "NCT1"]
+
+        hit = results[1].hits[0]
+        assert hit.text == "Phase 3 study"
+        assert hit.metadata["title"] == "Trial one"
+        assert hit.metadata["relevance"] == "high"
+        assert hit.score > 0.9
+
+    def test_unhydrated_hits_survive(self, rag_engine, mock_collection_manager):
+        """Hits missing from hydration keep their projected metadata."""
+        mock_collection_manager.search_all_many.side_effect = _projected_results
+        mock_collection_manager.hydrate_many.side_effect = RuntimeError("down")
+        result = rag_engine.retrieve(AgentQuery(question="a"))
+        assert result.hits[0].id == "NCT0"
+        assert result.hits[0].metadata["phase"] == "Phase 2"
+
+    def test_projection_disabled(self, rag_engine, mock_collection_manager, monkeypatch):
+        """With projection off, full records are searched and nothing is hydrated."""
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "SEARCH_PROJECTION_ENABLED", False)
+        rag_engine.retrieve(AgentQuery(question="a"))
+        assert mock_collection_manager.search_all_many.call_args.kwargs["projection"] is False
+        mock_collection_manager.hydrate_many.assert_not_called()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# ASYNC REQUEST PATH
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestAsyncRequestPath:
+    """Tests for aretrieve / agenerate / aquery on the worker pools."""
+
+    def test_aretrieve_matches_retrieve(self, rag_engine):
+        """aretrieve() returns retrieve()'s result from a retrieval worker."""
+        threads = []
+        original = rag_engine.retrieve
+
+        def _retrieve(query, **kwargs):
+            threads.append(threading.current_thread().name)
+            return original(query, **kwargs)
+
+        rag_engine.retrieve = _retrieve
+        result = asyncio.run(rag_engine.aretrieve(AgentQuery(question="CD19"), year_min=2020))
+        rag_engine.shutdown_pools()
+
+        assert isinstance(result, CrossCollectionResult)
+        assert threads[0].startswith("cart-rag-retrieve")
+
+    def test_aquery_generates_on_generate_pool(self, rag_engine, mock_llm_client):
+        """aquery() retrieves, builds the prompt and generates off-loop."""
+        threads = []
+        mock_llm_client.generate.side_effect = lambda **kwargs: (
+            threads.append(threading.current_thread().name) or "Mock response"
+        )
+        assert asyncio.run(rag_engine.aquery("What is CRS?")) == "Mock response"
+        rag_engine.shutdown_pools()
+
+        assert threads[0].startswith("cart-rag-generate")
+        assert "What is CRS?" in mock_llm_client.generate.call_args.kwargs["prompt"]
+
+    def test_pools_are_separate_and_restartable(self, rag_engine):
+        """Retrieval and generation have their own pools; shutdown resets them."""
+        retrieve_pool = rag_engine._get_pool("retrieve")
+        assert rag_engine._get_pool("generate") is not retrieve_pool
+        assert rag_engine._get_pool("retrieve") is retrieve_pool
+
+        rag_engine.shutdown_pools()
+        assert rag_engine._get_pool("retrieve") is not retrieve_pool
+        rag_engine.shutdown_pools()
+
+    def test_admission_lanes_get_own_retrieval_pools(self, rag_engine):
+        """llm-lane retrievals never share worker threads with search-lane ones."""
+        threads = []
+        original = rag_engine.retrieve
+
+        def _retrieve(query, **kwargs):
+            threads.append(threading.current_thread().name)
+            return original(query, **kwargs)
+
+        async def retrieve_in(lane):
+            with retrieval_lane(lane):
+                return await rag_engine.aretrieve(AgentQuery(question=f"{lane} CD19"))
+
+        rag_engine.retrieve = _retrieve
+        for lane in ("search", "llm", None):
+            asyncio.run(retrieve_in(lane))
+        pools = dict(rag_engine._pools)
+        rag_engine.shutdown_pools()
+
+        assert {"retrieve-search", "retrieve-llm", "retrieve"} <= set(pools)
+        assert len({id(pools[name]) for name in pools}) == len(pools)
+        assert threads[0].startswith("cart-rag-retrieve-search")
+        assert threads[1].startswith("cart-rag-retrieve-llm")
+        assert threads[2].startswith("cart-rag-retrieve_")
+
+    def test_aquery_stream_evidence_then_tokens(self, rag_engine, mock_llm_client):
+        """aquery_stream() yields evidence, each token, then the full answer."""
+        threads = []
+
+        def _generate_stream(**kwargs):
+            threads.append(threading.current_thread().name)
+            yield from ["CRS ", "rate ", "is 42%"]
+
+        mock_llm_client.generate_stream.side_effect = _generate_stream
+
+        async def collect():
+            return [item async for item in rag_engine.aquery_stream(
+                AgentQuery(question="CRS?"), year_min=2020,
+            )]
+
+        items = asyncio.run(collect())
+        rag_engine.shutdown_pools()
+
+        assert [i["type"] for i in items] == ["evidence", "token", "token", "token", "done"]
+        assert isinstance(items[0]["content"], CrossCollectionResult)
+        assert items[-1]["content"] == "CRS rate is 42%"
+        assert threads[0].startswith("cart-rag-generate")
+
+    def test_aquery_stream_llm_error_propagates(self, rag_engine, mock_llm_client):
+        """An LLM failure mid-stream is raised to the consumer."""
+
+        def _generate_stream(**kwargs):
+            yield "partial"
+            raise RuntimeError("overloaded")
+
+        mock_llm_client.generate_stream.side_effect = _generate_stream
+
+        async def collect():
+            seen = []
+            with pytest.raises(RuntimeError, match="overloaded"):
+                async for item in rag_engine.aquery_stream(AgentQuery(question="a")):
+                    seen.append(item["type"])
+            return seen
+
+        assert asyncio.run(collect()) == ["evidence", "token"]
+        rag_engine.shutdown_pools()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# REQUEST COALESCING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _gate_search(mock_collection_manager):
+    """Make search_all_many() block until the returned event is set."""
+    release, started = threading.Event(), threading.Event()
+    search = mock_collection_manager.search_all_many.side_effect
+
+    def _blocking(*args, **kwargs):
+        started.set()
+        release.wait(timeout=5)
+        return search(*args, **kwargs)
+
+    mock_collection_manager.search_all_many.side_effect = _blocking
+    return release, started
+
+
+class TestRetrievalCoalescing:
+    """Tests for single-flight coalescing of identical retrievals."""
+
+    def test_identical_concurrent_retrievals_search_once(self, rag_engine,
+                                                         mock_collection_manager):
+        """Concurrent duplicates share one search but get their own results."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        release, started = _gate_search(mock_collection_manager)
+        query = AgentQuery(question="CRS onset", target_antigen="CD19")
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            leader = pool.submit(rag_engine.retrieve, query, year_min=2020)
+            started.wait(timeout=5)
+            waiters = [
+                pool.submit(rag_engine.retrieve,
+                            AgentQuery(question="CRS   onset", target_antigen="CD19"),
+                            year_min=2020)
+                for _ in range(3)
+            ]
+            while rag_engine._retrievals.stats()["shared"] < 3:
+                threading.Event().wait(0.01)
+            release.set()
+            results = [leader.result()] + [w.result() for w in waiters]
+
+        assert mock_collection_manager.search_all_many.call_count == 1
+        assert results[0].query == "CRS onset"
+        assert results[1].query == "CRS   onset"
+        assert len({id(r.hits) for r in results}) == 4  # mutations stay private
+
+    def test_different_filters_not_coalesced(self, rag_engine, mock_collection_manager):
+        """A different year range is a different retrieval."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        release, started = _gate_search(mock_collection_manager)
+        query = AgentQuery(question="CRS onset")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(rag_engine.retrieve, query, year_min=2020)
+            started.wait(timeout=5)
+            second = pool.submit(rag_engine.retrieve, query, year_min=2022)
+            release.set()
+            first.result(), second.result()
+
+        assert mock_collection_manager.search_all_many.call_count == 2
+
+    def test_aretrieve_awaits_in_flight_retrieval(self, rag_engine, mock_collection_manager):
+        """Async duplicates wait on the event loop instead of a worker thread."""
+        release, started = _gate_search(mock_collection_manager)
+        query = AgentQuery(question="BCMA durability")
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            leader = asyncio.ensure_future(rag_engine.aretrieve(query))
+            await loop.run_in_executor(None, started.wait, 5)
+            waiters = [asyncio.ensure_future(rag_engine.aretrieve(query)) for _ in range(5)]
+            await asyncio.sleep(0)
+            release.set()
+            return await asyncio.gather(leader, *waiters)
+
+        results = asyncio.run(scenario())
+        rag_engine.shutdown_pools()
+
+        assert len(results) == 6
+        assert mock_collection_manager.search_all_many.call_count == 1
+        assert rag_engine._retrievals.stats()["shared"] == 5
+
+    def test_disabled_by_setting(self, mock_embedder, mock_llm_client,
+                                 mock_collection_manager, monkeypatch):
+        """RETRIEVE_SINGLE_FLIGHT_ENABLED=False turns coalescing off."""
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "RETRIEVE_SINGLE_FLIGHT_ENABLED", False)
+        engine = CARTRAGEngine(mock_collection_manager, mock_embedder, mock_llm_client)
+        assert engine._retrievals is None
+        assert engine.retrieve(AgentQuery(question="CRS")).query == "CRS"
@@ -0,0 +1,232 @@
+"""Tests for CAR-T Intelligence Agent search-param tuning.
+
+Validates brute-force ground truth, recall@k, the nprobe/ef sweep against
+a fake collection, tuned-params persistence, and pickup by
+CARTCollectionManager (no Milvus server required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.collections import CARTCollectionManager
+from src.search_tuning import (
+    exact_top_k,
+    format_tuning_table,
+    load_tuned_params,
+    recall_at_k,
+    save_tuned_params,
+    tune_collection,
+    tuned_entry_matches,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _corpus(n=300, dim=16, seed=7):
+    rng = np.random.default_rng(seed)
+    return [f"r{i}" for i in range(n)], rng.normal(size=(n, dim)).astype(np.float32)
+
+
+def _batches(ids, vectors, size):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size], vectors[start:start + size]
+
+
+class _Iterator:
+    def __init__(self, rows, batch_size):
+        self._rows = rows
+        self._batch_size = batch_size
+        self.closed = False
+
+    def next(self):
+        batch, self._rows = self._rows[:self._batch_size], self._rows[self._batch_size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+def _fake_ivf_collection(ids, vectors):
+    """A collection whose ANN recall grows with nprobe (exact at nprobe >= 8)."""
+    collection = MagicMock()
+    collection.num_entities = len(ids)
+    rows = [{"id": i, "embedding": v.tolist()} for i, v in zip(ids, vectors)]
+    collection.query_iterator.side_effect = (
+        lambda batch_size, output_fields: _Iterator(list(rows), batch_size)
+    )
+
+    def _search(data, anns_field, param, limit):
+        exact = exact_top_k(np.asarray(data), _batches(ids, vectors, 64), limit)[0]
+        nprobe = param["params"].get("nprobe", 1024)
+        correct = min(limit, nprobe * limit // 8)
+        misses = [i for i in ids if i not in exact][: limit - correct]
+        return [[SimpleNamespace(id=i) for i in exact[:correct] + misses]]
+
+    collection.search.side_effect = _search
+    return collection
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# GROUND TRUTH
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestGroundTruth:
+    """Tests for exact_top_k() and recall_at_k()."""
+
+    def test_streaming_matches_full_matrix(self):
+        """Batched brute force equals a single full cosine ranking."""
+        ids, vectors = _corpus()
+        queries = vectors[:5] + 0.01
+        streamed = exact_top_k(queries, _batches(ids, vectors, 37), k=10)
+
+        norm = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        q = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        full = np.argsort(-(q @ norm.T), axis=1)[:, :10]
+        assert streamed == [[ids[j] for j in row] for row in full]
+
+    def test_corpus_smaller_than_k(self):
+        """Fewer rows than k returns every row."""
+        ids, vectors = _corpus(n=3)
+        result = exact_top_k(vectors[:1], _batches(ids, vectors, 2), k=10)
+        assert sorted(result[0]) == sorted(ids)
+        assert result[0][0] == "r0"
+
+    def test_recall_at_k(self):
+        """Recall is the mean overlap with the exact top-k."""
+        exact = [["a", "b", "c", "d"], ["e", "f", "g", "h"]]
+        approx = [["a", "b", "x", "y"], ["e", "f", "g", "h"]]
+        assert recall_at_k(approx, exact, 4) == pytest.approx(0.75)
+        assert recall_at_k([], [], 4) == 0.0
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SWEEP
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestTuneCollection:
+    """Tests for tune_collection() against a fake IVF collection."""
+
+    def test_picks_cheapest_nprobe_meeting_target(self):
+        """The sweep stops at the first nprobe that reaches the recall target."""
+        ids, vectors = _corpus()
+        coll = _fake_ivf_collection(ids, vectors)
+        index = {"index_type": "IVF_FLAT", "metric_type": "COSINE", "params": {"nlist": 64}}
+        result = tune_collection("cart_trials", coll, index, k=8, recall_target=0.95, sample_size=10)
+
+        assert result.param_name == "nprobe"
+        assert result.chosen_value == 8
+        assert result.recall == pytest.approx(1.0)
+        assert [p.value for p in result.sweep] == [1, 2, 4, 8]
+        assert result.search_params == {"nprobe": 8}
+        assert result.meets_target
+
+    def test_unreachable_target_uses_best_recall(self):
+        """If no setting meets the target, the best-recall setting is kept."""
+        ids, vectors = _corpus()
+        coll = _fake_ivf_collection(ids, vectors)
+        index = {"index_type": "IVF_FLAT", "metric_type": "COSINE", "params": {"nlist": 2}}
+        result = tune_collection("cart_trials", coll, index, k=8, recall_target=0.95, sample_size=10)
+        assert result.chosen_value == 2
+        assert not result.meets_target
+        assert "below target" in format_tuning_table([result])
+
+    def test_flat_index_is_measured_once(self):
+        """FLAT indexes are exact; there is nothing to sweep."""
+        ids, vectors = _corpus(n=50)
+        coll = _fake_ivf_collection(ids, vectors)
+        index = {"index_type": "FLAT", "metric_type": "COSINE", "params": {}}
+        result = tune_collection("cart_trials", coll, index, k=5, sample_size=5)
+        assert result.param_name is None
+        assert result.search_params == {}
+        assert len(result.sweep) == 1
+
+    def test_empty_collection_is_skipped(self):
+        """An empty collection yields no result."""
+        coll = _fake_ivf_collection([], np.zeros((0, 16), dtype=np.float32))
+        index = {"index_type": "IVF_FLAT", "params": {"nlist": 16}}
+        assert tune_collection("cart_trials", coll, index) is None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PERSISTENCE & MANAGER PICKUP
+# ═══════════════════════════════════════════════════════════════════════
+
+
+@pytest.fixture
+def tuned_file(tmp_path):
+    """Write a tuned-params file for cart_trials on IVF_FLAT nlist=64."""
+    ids, vectors = _corpus()
+    coll = _fake_ivf_collection(ids, vectors)
+    index = {"index_type": "IVF_FLAT", "metric_type": "COSINE", "params": {"nlist": 64}}
+    result = tune_collection("cart_trials", coll, index, k=8, sample_size=10)
+    path = tmp_path / "search_params.json"
+    save_tuned_params([result], path)
+    return path
+
+
+def _manager_with_index(path, index_type, params):
+    mgr = CARTCollectionManager(tuned_params_path=path)
+    coll = MagicMock()
+    coll.indexes = [SimpleNamespace(
+        field_name="embedding",
+        params={"index_type": index_type, "metric_type": "COSINE", "params": params},
+    )]
+    mgr._collections["cart_trials"] = coll
+    return mgr
+
+
+class TestTunedParams:
+    """Tests for tuned-params persistence and manager pickup."""
+
+    def test_round_trip(self, tuned_file):
+        """Saved entries load back with their index fingerprint."""
+        entry = load_tuned_params(tuned_file)["cart_trials"]
+        assert entry["params"] == {"nprobe": 8}
+        assert entry["index_type"] == "IVF_FLAT"
+        assert tuned_entry_matches(entry, {"index_type": "IVF_FLAT", "params": {"nlist": 64}})
+        assert not tuned_entry_matches(entry, {"index_type": "IVF_FLAT", "params": {"nlist": 128}})
+
+    def test_save_merges_existing_entries(self, tuned_file):
+        """Saving other collections keeps earlier entries."""
+        ids, vectors = _corpus(n=40)
+        coll = _fake_ivf_collection(ids, vectors)
+        index = {"index_type": "FLAT", "metric_type": "COSINE", "params": {}}
+        save_tuned_params([tune_collection("cart_safety", coll, index, k=5)], tuned_file)
+        assert set(load_tuned_params(tuned_file)) == {"cart_trials", "cart_safety"}
+
+    def test_missing_or_corrupt_file(self, tmp_path):
+        """Missing or unreadable files load as empty."""
+        assert load_tuned_params(tmp_path / "nope.json") == {}
+        bad = tmp_path / "bad.json"
+        bad.write_text("{not json")
+        assert load_tuned_params(bad) == {}
+
+    def test_manager_uses_tuned_params_for_matching_index(self, tuned_file):
+        """search picks up tuned nprobe while the index is unchanged."""
+        mgr = _manager_with_index(tuned_file, "IVF_FLAT", {"nlist": 64})
+        assert mgr.get_search_params("cart_trials")["params"] == {"nprobe": 8}
+
+    def test_manager_ignores_stale_tuning(self, tuned_file):
+        """Tuned params for a different index fall back to the policy."""
+        mgr = _manager_with_index(tuned_file, "HNSW", {"M": 16})
+        assert "ef" in mgr.get_search_params("cart_trials")["params"]
+
+    def test_reload_tuned_params(self, tmp_path, tuned_file):
+        """reload_tuned_params() picks up a file written after start-up."""
+        mgr = _manager_with_index(tmp_path / "later.json", "IVF_FLAT", {"nlist": 64})
+        mgr.set_search_params("cart_trials", {"nprobe": 2})
+        assert mgr.get_search_params("cart_trials")["params"] == {"nprobe": 2}
+        mgr.tuned_params_path = tuned_file
+        mgr.reload_tuned_params()
+        assert mgr.get_search_params("cart_trials")["params"] == {"nprobe": 8}
@@ -0,0 +1,168 @@
+"""Tests for CAR-T Intelligence Agent single-flight call coalescing.
+
+Validates that concurrent calls with the same key run once and share the
+result or exception, that different keys run independently, that keys
+are forgotten once a call finishes, and that async waiters can await an
+in-flight call (no network required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.single_flight import SingleFlight
+
+
+def _gated(release: threading.Event, started: threading.Event, value="result"):
+    calls = []
+
+    def fn():
+        calls.append(threading.current_thread().name)
+        started.set()
+        release.wait(timeout=5)
+        return value
+
+    return fn, calls
+
+
+def _wait_for_waiters(flight: SingleFlight, count: int) -> None:
+    for _ in range(500):
+        if flight.stats()["shared"] >= count:
+            return
+        threading.Event().wait(0.01)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# COALESCING
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight.do()."""
+
+    def test_concurrent_same_key_runs_once(self):
+        """Waiters arriving mid-flight share the leader's result."""
+        flight = SingleFlight("test")
+        release, started = threading.Event(), threading.Event()
+        fn, calls = _gated(release, started)
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            leader = pool.submit(flight.do, "k", fn)
+            started.wait(timeout=5)
+            waiters = [pool.submit(flight.do, "k", fn) for _ in range(4)]
+            _wait_for_waiters(flight, 4)
+            release.set()
+            results = [leader.result()] + [w.result() for w in waiters]
+
+        assert results == ["result"] * 5
+        assert len(calls) == 1
+        assert flight.stats() == {"executed": 1, "shared": 4, "in_flight": 0}
+
+    def test_different_keys_run_independently(self):
+        """Only equal keys are coalesced."""
+        flight = SingleFlight()
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("b", lambda: 2) == 2
+        assert flight.stats()["executed"] == 2
+
+    def test_finished_key_is_forgotten(self):
+        """Sequential calls each execute; results are never cached."""
+        flight = SingleFlight()
+        values = iter([1, 2])
+        assert flight.do("k", lambda: next(values)) == 1
+        assert flight.do("k", lambda: next(values)) == 2
+        assert flight.pending("k") is None
+
+    def test_exception_shared_by_waiters(self):
+        """A failing leader fails every waiter, then the key is cleared."""
+        flight = SingleFlight()
+        release, started = threading.Event(), threading.Event()
+
+        def boom():
+            started.set()
+            release.wait(timeout=5)
+            raise RuntimeError("Milvus down")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "k", boom)
+            started.wait(timeout=5)
+            waiter = pool.submit(flight.do, "k", boom)
+            _wait_for_waiters(flight, 1)
+            release.set()
+            for future in (leader, waiter):
+                with pytest.raises(RuntimeError, match="Milvus down"):
+                    future.result()
+
+        assert flight.stats()["in_flight"] == 0
+        assert flight.do("k", lambda: "recovered") == "recovered"
+
+    def test_shared_calls_recorded(self):
+        """Coalesced calls feed the cart_single_flight_shared_total counter."""
+        flight = SingleFlight("retrieve")
+        release, started = threading.Event(), threading.Event()
+        fn, _ = _gated(release, started)
+
+        with patch("src.single_flight.record_single_flight_shared") as record, \
+                ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "k", fn)
+            started.wait(timeout=5)
+            waiter = pool.submit(flight.do, "k", fn)
+            _wait_for_waiters(flight, 1)
+            release.set()
+            leader.result(), waiter.result()
+
+        record.assert_called_once_with("retrieve")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# ASYNC WAITERS
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestPending:
+    """Tests for awaiting an in-flight call from a coroutine."""
+
+    def test_async_waiter_shares_result(self):
+        """pending() exposes the leader's future to the event loop."""
+        flight = SingleFlight()
+        release, started = threading.Event(), threading.Event()
+        fn, calls = _gated(release, started)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            leader = loop.run_in_executor(None, flight.do, "k", fn)
+            await loop.run_in_executor(None, started.wait, 5)
+            waiter = asyncio.ensure_future(
+                asyncio.shield(asyncio.wrap_future(flight.pending("k")))
+            )
+            release.set()
+            return await asyncio.gather(leader, waiter)
+
+        assert asyncio.run(scenario()) == ["result", "result"]
+        assert len(calls) == 1
+
+    def test_cancelled_async_waiter_does_not_cancel_call(self):
+        """A shielded waiter going away leaves the leader's call intact."""
+        flight = SingleFlight()
+        release, started = threading.Event(), threading.Event()
+        fn, _ = _gated(release, started)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            leader = loop.run_in_executor(None, flight.do, "k", fn)
+            await loop.run_in_executor(None, started.wait, 5)
+            waiter = asyncio.ensure_future(
+                asyncio.shield(asyncio.wrap_future(flight.pending("k")))
+            )
+            await asyncio.sleep(0)
+            waiter.cancel()
+            release.set()
+            return await leader
+
+        assert asyncio.run(scenario()) == "result"
@@ -0,0 +1,262 @@
+"""Tests for CAR-T Intelligence Agent delta ingest watermarks.
+
+Validates the persisted watermark store, the delta query parameters sent
+to PubMed (mindate/datetype=edat) and ClinicalTrials.gov v2
+(LastUpdatePostDate range), and how the scheduler advances watermarks
+(no network, Milvus or embedding model required).
+
+Author: Adam Jones
+Date: March 2026
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.ingest.base import IngestStats
+from src.ingest.clinical_trials_parser import ClinicalTrialsIngestPipeline
+from src.ingest.literature_parser import PubMedIngestPipeline
+from src.ingest.watermarks import WatermarkStore
+from src.utils.pubmed_client import PubMedClient
+
+STARTED = datetime(2026, 3, 10, 6, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return WatermarkStore(tmp_path / "watermarks.json", overlap_hours=24)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# STORE
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestWatermarkStore:
+    """Tests for WatermarkStore persistence and delta start dates."""
+
+    def test_no_watermark_means_full_refresh(self, store):
+        """An unknown source has no watermark and no delta start."""
+        assert store.get("pubmed") is None
+        assert store.since("pubmed") is None
+
+    def test_advance_persists_across_instances(self, store, tmp_path):
+        """Advanced watermarks survive a restart."""
+        store.advance("pubmed", STARTED, records=12)
+        reopened = WatermarkStore(tmp_path / "watermarks.json")
+        assert reopened.get("pubmed") == STARTED
+        assert reopened.get("clinical_trials") is None
+
+    def test_since_subtracts_overlap(self, store):
+        """Delta queries start one overlap window before the watermark."""
+        store.advance("pubmed", STARTED)
+        assert store.since("pubmed") == date(2026, 3, 9)
+
+    def test_naive_start_time_is_utc(self, store):
+        """Naive datetimes are stored as UTC."""
+        store.advance("pubmed", STARTED.replace(tzinfo=None))
+        assert store.get("pubmed") == STARTED
+
+    def test_unreadable_file_is_ignored(self, tmp_path):
+        """A corrupt file behaves like an empty store and is rewritten."""
+        path = tmp_path / "watermarks.json"
+        path.write_text("{not json")
+        store = WatermarkStore(path)
+        assert store.get("pubmed") is None
+        store.advance("pubmed", STARTED)
+        assert WatermarkStore(path).get("pubmed") == STARTED
+
+    def test_reset(self, store):
+        """reset() forces the next run to be a full refresh."""
+        store.advance("pubmed", STARTED)
+        store.advance("clinical_trials", STARTED)
+        store.reset("pubmed")
+        assert store.get("pubmed") is None
+        assert store.get("clinical_trials") == STARTED
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SOURCE QUERIES
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestDeltaQueries:
+    """Tests for the date filters sent upstream."""
+
+    def test_pubmed_esearch_uses_entrez_date(self):
+        """mindate is sent with datetype=edat and an open maxdate."""
+        client = PubMedClient(api_key="k")
+        url = client._build_esearch_url("CAR-T", mindate=date(2026, 3, 9))
+        params = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        assert params["datetype"] == "edat"
+        assert params["mindate"] == "2026/03/09"
+        assert params["maxdate"] == "3000"
+
+        full = client._build_esearch_url("CAR-T")
+        assert "mindate" not in full and "datetype" not in full
+
+    def test_pubmed_pipeline_passes_since(self, mock_collection_manager):
+        """fetch(since=...) restricts the stored search."""
+        pubmed = MagicMock()
+        pubmed.search_history.return_value = None
+        pipeline = PubMedIngestPipeline(mock_collection_manager, MagicMock(), pubmed)
+        pipeline.fetch(query="CD19", max_results=50, since=date(2026, 3, 9))
+        pubmed.search_history.assert_called_once_with("CD19", 50, mindate=date(2026, 3, 9))
+
+    @patch("src.ingest.clinical_trials_parser.requests.get")
+    def test_clinical_trials_last_update_range(self, mock_get, mock_collection_manager):
+        """since= adds a LastUpdatePostDate range to every page request."""
+        mock_get.return_value.json.return_value = {"studies": [{"id": 1}]}
+        pipeline = ClinicalTrialsIngestPipeline(mock_collection_manager, MagicMock())
+        pipeline.fetch(max_results=10, since=date(2026, 3, 9))
+
+        params = mock_get.call_args.kwargs["params"]
+        assert params["filter.advanced"] == "AREA[LastUpdatePostDate]RANGE[2026-03-09,MAX]"
+
+    @patch("src.ingest.clinical_trials_parser.requests.get")
+    def test_clinical_trials_cap_marks_delta_incomplete(self, mock_get, mock_collection_manager):
+        """A delta stopping at max_results with pages left is incomplete."""
+        mock_get.return_value.json.return_value = {
+            "studies": [{"id": 1}, {"id": 2}], "nextPageToken": "next",
+        }
+        pipeline = ClinicalTrialsIngestPipeline(mock_collection_manager, MagicMock())
+        assert len(pipeline.fetch(max_results=2, since=date(2026, 3, 9))) == 2
+        assert not pipeline.last_fetch_complete
+
+        pipeline.fetch(max_results=2)  # capped backfill
+        assert pipeline.last_fetch_complete
+
+        mock_get.return_value.json.return_value = {"studies": [{"id": 1}]}
+        pipeline.fetch(max_results=2, since=date(2026, 3, 9))
+        assert pipeline.last_fetch_complete
+
+    @patch("src.ingest.clinical_trials_parser.requests.get")
+    def test_clinical_trials_full_fetch_unfiltered(self, mock_get, mock_collection_manager):
+        """Without since= no date filter is sent."""
+        mock_get.return_value.json.return_value = {"studies": []}
+        ClinicalTrialsIngestPipeline(mock_collection_manager, MagicMock()).fetch()
+        assert "filter.advanced" not in mock_get.call_args.kwargs["params"]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SCHEDULER
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class TestSchedulerWatermarks:
+    """Tests for IngestScheduler delta refreshes."""
+
+    @pytest.fixture
+    def scheduler(self, store, mock_collection_manager):
+        pytest.importorskip("apscheduler")
+        from src.scheduler import IngestScheduler
+
+        mock_collection_manager.rebuild_indexes.return_value = {}
+        return IngestScheduler(mock_collection_manager, MagicMock(), watermarks=store)
+
+    def _pipeline(self, stats=None, error=None):
+        pipeline = MagicMock()
+        pipeline.last_stats = stats or IngestStats(new=3, written=3)
+        pipeline.last_fetch_complete = True
+        if error:
+            pipeline.run_pipelined.side_effect = error
+        else:
+            pipeline.run_pipelined.return_value = pipeline.last_stats.written
+        return pipeline
+
+    def test_first_run_is_full_then_delta(self, scheduler, store):
+        """The first run fetches everything; the next starts at the watermark."""
+        pipeline = self._pipeline()
+        with patch("src.ingest.literature_parser.PubMedIngestPipeline", return_value=pipeline):
+            scheduler._refresh_pubmed()
+            first_since = pipeline.run_pipelined.call_args.kwargs["since"]
+            watermark = store.get("pubmed")
+            scheduler._refresh_pubmed()
+
+        assert first_since is None
+        assert datetime.now(timezone.utc) - watermark < timedelta(minutes=1)
+        assert pipeline.run_pipelined.call_args.kwargs["since"] == store.since("pubmed")
+        assert scheduler.get_status()["watermarks"]["pubmed"] is not None
+
+    def test_failed_records_keep_watermark(self, scheduler, store):
+        """Runs with failed records do not move the watermark."""
+        store.advance("clinical_trials", STARTED)
+        pipeline = self._pipeline(IngestStats(new=5, written=4, failed=1))
+        with patch(
+            "src.ingest.clinical_trials_parser.ClinicalTrialsIngestPipeline",
+            return_value=pipeline,
+        ):
+            scheduler._refresh_clinical_trials()
+
+        assert pipeline.run_pipelined.call_args.kwargs["since"] == date(2026, 3, 9)
+        assert store.get("clinical_trials") == STARTED
+
+    def test_fetch_error_keeps_watermark(self, scheduler, store):
+        """A run that raises leaves the watermark untouched."""
+        store.advance("pubmed", STARTED)
+        pipeline = self._pipeline(error=ConnectionError("NCBI down"))
+        with patch("src.ingest.literature_parser.PubMedIngestPipeline", return_value=pipeline):
+            scheduler._refresh_pubmed()
+        assert store.get("pubmed") == STARTED
+
+    def test_failed_search_keeps_watermark(self, scheduler, store, mock_collection_manager):
+        """A failed esearch writes nothing and must not move the watermark."""
+        store.advance("pubmed", STARTED)
+        pubmed = MagicMock()
+        pubmed.search_history.return_value = None  # any esearch HTTP/parse error
+        pipeline = PubMedIngestPipeline(mock_collection_manager, MagicMock(), pubmed)
+        with patch("src.ingest.literature_parser.PubMedIngestPipeline", return_value=pipeline):
+            scheduler._refresh_pubmed()
+
+        assert pipeline.last_stats.failed == 0
+        assert store.get("pubmed") == STARTED
+
+    def test_capped_first_run_seeds_watermark(self, scheduler, store, mock_collection_manager):
+        """A first run matching more than the default cap still writes a watermark."""
+        from src.utils.pubmed_client import SearchHistory
+
+        pubmed = MagicMock()
+        pubmed.search_history.return_value = SearchHistory("MCID", "1", 5000, total=48000)
+        pubmed.iter_history.side_effect = lambda history, failed: iter([])
+        pipeline = PubMedIngestPipeline(mock_collection_manager, MagicMock(), pubmed)
+        with patch("src.ingest.literature_parser.PubMedIngestPipeline", return_value=pipeline):
+            scheduler._refresh_pubmed()
+            assert store.get("pubmed") is not None
+            scheduler._refresh_pubmed()
+
+        first, second = pubmed.search_history.call_args_list
+        assert first.kwargs["mindate"] is None
+        assert second.kwargs["mindate"] == store.since("pubmed")
+
+    @patch("src.ingest.clinical_trials_parser.time.sleep")
+    @patch("src.ingest.clinical_trials_parser.requests.get")
+    def test_capped_first_trials_run_seeds_watermark(
+        self, mock_get, _sleep, scheduler, store, mock_collection_manager,
+    ):
+        """ClinicalTrials.gov backfills stopped at 1000 studies also seed the watermark."""
+        mock_get.return_value.json.return_value = {
+            "studies": [{}] * 100, "nextPageToken": "more",
+        }
+        pipeline = ClinicalTrialsIngestPipeline(mock_collection_manager, MagicMock())
+        pipeline.parse = MagicMock(return_value=[])
+        with patch(
+            "src.ingest.clinical_trials_parser.ClinicalTrialsIngestPipeline",
+            return_value=pipeline,
+        ):
+            scheduler._refresh_clinical_trials()
+        assert mock_get.call_count == 10  # stopped at the 1000-study cap
+        assert store.get("clinical_trials") is not None
+
+    def test_incomplete_fetch_keeps_watermark(self, scheduler, store):
+        """A fetch with failed pages or cut off at max_results keeps the watermark."""
+        store.advance("clinical_trials", STARTED)
+        pipeline = self._pipeline()
+        pipeline.last_fetch_complete = False
+        with patch(
+            "src.ingest.clinical_trials_parser.ClinicalTrialsIngestPipeline",
+            return_value=pipeline,
+        ):
+            scheduler._refresh_clinical_trials()
+        assert store.get("clinical_trials") == STARTED